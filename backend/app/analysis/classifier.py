@@ -0,0 +1,336 @@
+"""
+Classification des posts par pain point et par produit.
+
+Source unique des définitions et de la détection utilisées par insert_post
+(colonne product), les agrégats (tables post_tags et post_tag_daily), les
+statistiques admin et le rapport PowerPoint. Les mots-clés sont compilés une
+fois par version des définitions (voir get_classifier), et une fois pour la
+détection du produit seule (get_product_classifier).
+Un post peut correspondre à plusieurs pain points et plusieurs produits.
+
+Benchmark : python scripts/benchmark_classifier.py
+"""
+import re
+import json
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Pain points par défaut (utilisés si la table pain_points est vide)
+DEFAULT_PAIN_POINTS = {
+    'Performance Issues': {
+        'keywords': ['slow', 'lent', 'performance', 'lag', 'timeout', 'time out', 'slowly', 'slowness', 'slow response', 'slow loading', 'slowly loading'],
+        'icon': '🐌'
+    },
+    'Downtime & Outages': {
+        'keywords': ['down', 'outage', 'offline', 'unavailable', 'unreachable', 'not working', 'doesn\'t work', 'not accessible', 'service unavailable', 'error 503', 'error 502', 'error 500'],
+        'icon': '🔴'
+    },
+    'Billing Problems': {
+        'keywords': ['billing', 'invoice', 'payment', 'charge', 'charged', 'refund', 'cost', 'price', 'expensive', 'overcharge', 'facture', 'paiement', 'facturation'],
+        'icon': '💰'
+    },
+    'Support Issues': {
+        'keywords': ['support', 'ticket', 'help', 'assistance', 'response time', 'no response', 'no reply', 'customer service', 'service client'],
+        'icon': '🎧'
+    },
+    'Configuration Problems': {
+        'keywords': ['config', 'configuration', 'setup', 'install', 'installation', 'configure', 'setting', 'settings', 'cannot configure', 'can\'t configure'],
+        'icon': '⚙️'
+    },
+    'API & Integration Issues': {
+        'keywords': ['api', 'integration', 'endpoint', 'connection', 'connect', 'authentication', 'auth', 'token', 'credential'],
+        'icon': '🔌'
+    },
+    'Data Loss & Backup': {
+        'keywords': ['lost', 'delete', 'deleted', 'backup', 'restore', 'recovery', 'data loss', 'lost data', 'missing data'],
+        'icon': '💾'
+    },
+    'Security Concerns': {
+        'keywords': ['security', 'hack', 'breach', 'vulnerability', 'exploit', 'unauthorized', 'access', 'secure', 'protection'],
+        'icon': '🔒'
+    },
+    'Migration Problems': {
+        'keywords': ['migration', 'migrate', 'transfer', 'move', 'upgrade', 'update', 'migration failed', 'cannot migrate'],
+        'icon': '🚚'
+    },
+    'Network Issues': {
+        'keywords': ['network', 'connection', 'latency', 'bandwidth', 'ddos', 'attack', 'traffic', 'routing', 'dns'],
+        'icon': '🌐'
+    }
+}
+
+# Produits OVHcloud officiels (basés sur OVHcloud.com), par ordre de priorité :
+# detect_product() retourne le premier produit trouvé dans cet ordre
+# (les plus spécifiques d'abord). Les mots-clés produits sont des mots entiers,
+# les espaces acceptent zéro ou plusieurs blancs ("load balancer" = "loadbalancer").
+PRODUCT_KEYWORDS = {
+    'Domain': ['domain', 'domaine', 'domain name', 'domain registration', 'domain renewal', 'domain transfer', 'domain expiration', 'registrar', 'bureau d\'enregistrement', 'whois', 'domain management', '.ovh', '.com', '.net', '.org', '.fr', '.eu'],
+    'DNS': ['dns', 'dns zone', 'dns anycast', 'dnssec', 'dns record', 'dns configuration', 'nameserver', 'ns record', 'a record', 'mx record', 'cname record', 'txt record', 'dns management', 'dns hosting'],
+    'Email': ['email', 'mail', 'smtp', 'imap', 'pop3', 'email hosting', 'exchange', 'email account'],
+    'Hosting': ['hosting', 'web host', 'web hosting', 'shared host', 'shared hosting', 'ovh hosting', 'web hosting plan', 'hébergement', 'mutualisé'],
+    'VPS': ['vps', 'virtual private server', 'ovh vps', 'vps cloud', 'cloud vps'],
+    'Dedicated Server': ['dedicated', 'dedicated server', 'serveur dédié', 'bare metal', 'ovh dedicated', 'server', 'serveur'],
+    'Public Cloud': ['public cloud', 'publiccloud', 'ovh public cloud', 'public cloud instance', 'horizon', 'openstack'],
+    'Private Cloud': ['private cloud', 'privatecloud', 'ovh private cloud', 'vmware', 'vsphere', 'hosted private cloud'],
+    'Managed Kubernetes': ['kubernetes', 'k8s', 'managed kubernetes', 'ovh kubernetes'],
+    'Managed Databases': ['database', 'mysql', 'postgresql', 'mongodb', 'redis', 'managed database', 'ovh database'],
+    'Storage': ['storage', 'object storage', 's3', 'cloud storage', 'object storage s3', 'high performance storage', 'backup'],
+    'CDN': ['cdn', 'content delivery', 'content delivery network', 'ovh cdn'],
+    'Load Balancer': ['load balancer', 'loadbalancer', 'lb', 'ip load balancing'],
+    'Failover IP': ['failover ip', 'failover', 'ip failover', 'additional ip'],
+    'SSL Certificate': ['ssl', 'ssl certificate', 'certificate', 'tls', 'https certificate'],
+    'Network': ['network', 'vrack', 'private network', 'vlan'],
+    'IP': ['ip address', 'ipv4', 'ipv6', 'ip block', 'ip range'],
+    'API': ['api', 'rest api', 'graphql', 'ovh api', 'api ovh', 'ovhcloud api'],
+}
+
+
+# À incrémenter quand les règles de correspondance changent (re-tag de tous les posts)
+MATCHING_RULES_VERSION = 2
+
+
+def _parse_keywords(keywords: Any) -> List[str]:
+    """Keywords can be a list, a JSON string or a comma-separated string."""
+    if isinstance(keywords, str):
+        try:
+            keywords = json.loads(keywords)
+        except (json.JSONDecodeError, TypeError):
+            keywords = [k.strip() for k in keywords.split(',') if k.strip()]
+    if not isinstance(keywords, list):
+        return []
+    return [str(k).lower() for k in keywords if str(k).strip()]
+
+
+def build_pain_point_definitions(rows: Optional[List[Dict]]) -> Dict[str, Dict]:
+    """
+    Build {title: {'keywords': [...], 'icon': str}} from pain_points table rows.
+    Falls back to DEFAULT_PAIN_POINTS if no enabled row is configured.
+    """
+    definitions = {}
+    for row in rows or []:
+        if not row.get('enabled', True):
+            continue
+        keywords = _parse_keywords(row.get('keywords', []))
+        if keywords:
+            definitions[row['title']] = {'keywords': keywords, 'icon': row.get('icon') or '📊'}
+    return definitions or DEFAULT_PAIN_POINTS
+
+
+def definitions_version(pain_points: Dict[str, Dict]) -> str:
+    """Fingerprint of the definitions, stored with each tagged post to detect stale tags."""
+    payload = json.dumps(
+        {'pain_points': {k: v['keywords'] for k, v in pain_points.items()}, 'products': PRODUCT_KEYWORDS,
+         'rules': MATCHING_RULES_VERSION},
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def _normalize(keyword: str) -> str:
+    """Lookup key of a keyword or of a matched text (lowercase, no whitespace)."""
+    return ''.join(keyword.lower().split())
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def _trie_regex(keywords: List[str]) -> str:
+    """
+    Factor keywords on their common prefixes into a single regex
+    ("dns", "dnssec", "dns zone" -> "dns(?:\\s*zone|sec)?").
+
+    The regex engine then checks each position with one branch per distinct
+    character instead of one alternative per keyword; optional suffixes are
+    greedy, so the longest keyword is tried first. Spaces in keywords accept
+    zero or more whitespace characters.
+    """
+    trie: Dict[str, Any] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def render(node: Dict[str, Any]) -> str:
+        alternatives = [
+            (r'\s*' if char == ' ' else re.escape(char)) + render(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not alternatives:
+            return ''
+        if len(alternatives) > 1:
+            body = '(?:' + '|'.join(alternatives) + ')'
+        elif '' in node and len(alternatives[0]) > 1:
+            body = '(?:' + alternatives[0] + ')'
+        else:
+            body = alternatives[0]
+        return body + '?' if '' in node else body
+
+    return render(trie) if trie else '(?!)'
+
+
+class KeywordClassifier:
+    """
+    Pain point / product classifier compiled once into a single regex.
+
+    All keywords of both families share one prefix-factored regex, so a text
+    is scanned once whatever the number of keywords (plus a tiny pattern for
+    the few keywords that do not start a word, like ".com"). Matching rules:
+    - products are whole words (same semantics as the former product regexes);
+    - pain point keywords match at a word start ("slow" also matches "slowly",
+      "lent" no longer matches "excellent").
+    The regex reports the longest keyword at each word start; the labels of
+    the shorter keywords it begins with ("dedicated server" is also "server")
+    are precomputed at compile time.
+    """
+
+    def __init__(self, pain_points: Dict[str, Dict], products: Dict[str, List[str]] = None):
+        self.pain_points = pain_points
+        self.products = products if products is not None else PRODUCT_KEYWORDS
+        self._pain_order = {title: idx for idx, title in enumerate(pain_points)}
+        self._product_order = {label: idx for idx, label in enumerate(self.products)}
+
+        # keyword (lowercase, single spaces) -> labels, per family
+        pain_owners: Dict[str, set] = {}
+        product_owners: Dict[str, set] = {}
+        for title, info in pain_points.items():
+            for keyword in _parse_keywords(info.get('keywords', [])):
+                pain_owners.setdefault(re.sub(r'\s+', ' ', keyword.strip()), set()).add(title)
+        for label, keywords in self.products.items():
+            for keyword in keywords:
+                if keyword.strip():
+                    product_owners.setdefault(re.sub(r'\s+', ' ', keyword.lower().strip()), set()).add(label)
+
+        # lookup key -> (pain points, products ending inside the match,
+        # products ending with the match: only if a word boundary follows)
+        self._labels: Dict[str, Tuple[set, set, set]] = {}
+        for keyword in set(pain_owners) | set(product_owners):
+            pains, inner, at_end = self._labels.setdefault(_normalize(keyword), (set(), set(), set()))
+            # Matched texts usually are the keyword itself: skip normalization for them
+            self._labels[keyword] = (pains, inner, at_end)
+            for other, titles in pain_owners.items():
+                if keyword.startswith(other):
+                    pains |= titles
+            for other, labels in product_owners.items():
+                if other == keyword:
+                    at_end |= labels
+                elif keyword.startswith(other) and not _is_word_char(keyword[len(other)]):
+                    inner |= labels
+
+        keywords = sorted(set(pain_owners) | set(product_owners))
+        word_keywords = [kw for kw in keywords if _is_word_char(kw[0])]
+        other_keywords = [kw for kw in keywords if not _is_word_char(kw[0])]
+        # Texts are lowercased before matching (faster than re.IGNORECASE).
+        # ".com", ".ovh"... do not start a word (they follow a domain name): they
+        # get their own small pattern so that the main one keeps its fast
+        # word-start scan.
+        self._patterns = [re.compile(rf'(?<!\w)(?:{_trie_regex(word_keywords)})')]
+        if other_keywords:
+            self._patterns.append(re.compile(_trie_regex(other_keywords)))
+
+    def _matches(self, text: str) -> Tuple[set, set]:
+        pain_points, products = set(), set()
+        text = text.lower()
+        length = len(text)
+        labels = self._labels
+        for pattern in self._patterns:
+            search = pattern.search
+            match = search(text)
+            while match:
+                matched = match.group()
+                pains, inner, at_end = labels.get(matched) or labels[_normalize(matched)]
+                pain_points |= pains
+                products |= inner
+                end = match.end()
+                if at_end and (end == length or not _is_word_char(text[end])):
+                    products |= at_end
+                # Next position (keywords starting inside this match are not skipped)
+                match = search(text, match.start() + 1)
+        return pain_points, products
+
+    def classify(self, text: str) -> Dict[str, List[str]]:
+        """
+        Return the pain points and products mentioned in a text.
+
+        Returns:
+            {'pain_points': [title, ...], 'products': [product, ...]} in definition order
+        """
+        if not text:
+            return {'pain_points': [], 'products': []}
+        pain_points, products = self._matches(text)
+        return {
+            'pain_points': sorted(pain_points, key=self._pain_order.__getitem__),
+            'products': sorted(products, key=self._product_order.__getitem__),
+        }
+
+    def classify_many(self, texts: List[str]) -> List[Dict[str, List[str]]]:
+        """Classify a batch of texts (same order)."""
+        classify = self.classify
+        return [classify(text) for text in texts]
+
+    def detect_product(self, text: str) -> Optional[str]:
+        """Highest-priority product mentioned in a text, or None."""
+        if not text:
+            return None
+        products = self._matches(text)[1]
+        return min(products, key=self._product_order.__getitem__) if products else None
+
+
+# Classifieurs compilés, par version des définitions (pain points modifiés = nouvelle version)
+_classifiers: Dict[str, KeywordClassifier] = {}
+_classifiers_lock = threading.Lock()
+
+
+def get_classifier(pain_points: Dict[str, Dict] = None) -> KeywordClassifier:
+    """
+    Compiled classifier for the given pain point definitions (defaults if None).
+    Compilation happens once per definitions version.
+    """
+    pain_points = pain_points or DEFAULT_PAIN_POINTS
+    version = definitions_version(pain_points)
+    classifier = _classifiers.get(version)
+    if classifier is None:
+        with _classifiers_lock:
+            classifier = _classifiers.get(version)
+            if classifier is None:
+                classifier = KeywordClassifier(pain_points)
+                # Only the current definitions are useful, older versions are dropped
+                _classifiers.clear()
+                _classifiers[version] = classifier
+                logger.debug(f"Compiled classifier for definitions {version}")
+    return classifier
+
+
+# La détection du produit ne dépend pas des pain points : classifieur dédié,
+# compilé une fois, qui n'évince jamais celui des définitions courantes
+_product_classifier: Optional[KeywordClassifier] = None
+
+
+def get_product_classifier() -> KeywordClassifier:
+    """Compiled classifier for product detection only (no pain point keywords)."""
+    global _product_classifier
+    if _product_classifier is None:
+        with _classifiers_lock:
+            if _product_classifier is None:
+                _product_classifier = KeywordClassifier({})
+    return _product_classifier
+
+
+def classify(text: str, pain_points: Dict[str, Dict] = None) -> Dict[str, List[str]]:
+    """Return the pain points and products mentioned in a text."""
+    return get_classifier(pain_points).classify(text)
+
+
+def classify_many(texts: List[str], pain_points: Dict[str, Dict] = None) -> List[Dict[str, List[str]]]:
+    """Classify a batch of texts with the same compiled classifier."""
+    return get_classifier(pain_points).classify_many(texts)
+
+
+def detect_product(text: str) -> Optional[str]:
+    """Highest-priority OVHcloud product mentioned in a text, or None."""
+    return get_product_classifier().detect_product(text)
@@ -1,339 +1,220 @@
 """
 Language detection module for posts.
-Uses multiple methods to detect language with high accuracy.
-
-Priority order:
-1. TextBlob (if available)
-2. Google Translate API (if GOOGLE_API_KEY configured)
-3. DeepL API (if DEEPL_API_KEY configured)
-4. LLM (OpenAI/Anthropic) (if configured)
-5. Keyword-based detection (fallback)
-6. Character-based heuristics
+
+Local, deterministic detection: a naive Bayes identifier over character
+n-grams (1 to 3 characters) and whole words, with the fr/en/de/es/it/nl
+profiles bundled in data/language_profiles.json (generated by
+scripts/build_language_profiles.py). No network call is made while scraping.
+
+- detect_language / detect_languages: single text / batch, LRU cache keyed on
+  a hash of the text
+- detect_language_from_post: content, then URL and source hints
+- relabel_unknown_posts: opt-in async batch job (LANGUAGE_REMOTE_RELABEL=true)
+  asking Google Translate, DeepL or the LLM for posts still 'unknown'
 """
 import re
-import logging
 import os
+import json
+import asyncio
+import hashlib
+import logging
+import threading
 import httpx
-from typing import Optional
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Any
 
 logger = logging.getLogger(__name__)
 
-# Common words in different languages (for fallback detection)
-FRENCH_WORDS = {
-    'le', 'la', 'les', 'de', 'du', 'des', 'et', 'que', 'qui', 'est', 'pas', 'à', 'pour',
-    'un', 'une', 'dans', 'sur', 'avec', 'par', 'sont', 'cette', 'ces', 'être', 'avoir',
-    'il', 'elle', 'nous', 'vous', 'ils', 'elles', 'mais', 'ou', 'donc', 'car', 'comme',
-    'très', 'plus', 'moins', 'tout', 'tous', 'toute', 'toutes', 'bien', 'mal', 'bon',
-    'mauvais', 'grand', 'petit', 'nouveau', 'vieux', 'français', 'france', 'français'
-}
-
-ENGLISH_WORDS = {
-    'the', 'and', 'is', 'to', 'of', 'in', 'a', 'that', 'it', 'you', 'he', 'she', 'we',
-    'they', 'this', 'these', 'those', 'but', 'or', 'so', 'because', 'as', 'very',
-    'more', 'less', 'all', 'good', 'bad', 'big', 'small', 'new', 'old', 'english',
-    'america', 'american', 'british', 'uk', 'usa'
-}
-
-GERMAN_WORDS = {
-    'der', 'die', 'das', 'und', 'ist', 'zu', 'von', 'in', 'mit', 'für', 'auf', 'sind',
-    'eine', 'ein', 'nicht', 'sie', 'er', 'wir', 'ihr', 'deutsch', 'deutschland'
-}
-
-SPANISH_WORDS = {
-    'el', 'la', 'los', 'las', 'de', 'del', 'y', 'que', 'es', 'en', 'un', 'una', 'con',
-    'por', 'para', 'son', 'esta', 'estos', 'español', 'españa'
-}
-
-ITALIAN_WORDS = {
-    'il', 'la', 'lo', 'gli', 'le', 'di', 'del', 'e', 'che', 'è', 'in', 'un', 'una',
-    'con', 'per', 'sono', 'italiano', 'italia'
-}
-
-DUTCH_WORDS = {
-    'de', 'het', 'een', 'en', 'van', 'is', 'in', 'op', 'voor', 'met', 'zijn', 'nederlands',
-    'nederland'
-}
-
-
-def _detect_with_google_translate(text: str) -> Optional[str]:
-    """Detect language using Google Translate API."""
-    try:
-        google_key = os.getenv('GOOGLE_API_KEY')
-        if not google_key:
-            return None
-        
-        # Use Google Cloud Translation API v2 (detect language) - sync version
-        with httpx.Client(timeout=5.0) as client:
-            response = client.post(
-                'https://translation.googleapis.com/language/translate/v2/detect',
-                params={'key': google_key, 'q': text[:500]},  # Limit text length
-            )
-            response.raise_for_status()
-            data = response.json()
-            if 'data' in data and 'detections' in data['data']:
-                detections = data['data']['detections']
-                if detections and len(detections) > 0 and len(detections[0]) > 0:
-                    lang_code = detections[0][0].get('language', '').lower()
-                    # Map Google language codes to our codes
-                    lang_map = {
-                        'fr': 'fr', 'en': 'en', 'de': 'de', 'es': 'es', 'it': 'it', 'nl': 'nl',
-                        'pt': 'other', 'ru': 'other', 'ja': 'other', 'zh': 'other', 'zh-cn': 'other',
-                        'ar': 'other', 'pl': 'other', 'cs': 'other'
-                    }
-                    return lang_map.get(lang_code, 'other')
-    except Exception as e:
-        logger.debug(f"Google Translate detection failed: {e}")
-        return None
+SUPPORTED_LANGUAGES = ('fr', 'en', 'de', 'es', 'it', 'nl')
 
+PROFILES_FILE = Path(__file__).resolve().parent / 'data' / 'language_profiles.json'
 
-def _detect_with_deepl(text: str) -> Optional[str]:
-    """Detect language using DeepL API."""
-    try:
-        deepl_key = os.getenv('DEEPL_API_KEY')
-        if not deepl_key:
-            return None
-        
-        # Use DeepL API - sync version
-        with httpx.Client(timeout=5.0) as client:
-            response = client.post(
-                'https://api-free.deepl.com/v2/translate',
-                headers={'Authorization': f'DeepL-Auth-Key {deepl_key}'},
-                data={
-                    'text': text[:500],  # Limit text length
-                    'target_lang': 'EN',  # Dummy target, we just want detection
-                    'source_lang': None  # Auto-detect
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            if 'translations' in data and len(data['translations']) > 0:
-                detected_lang = data['translations'][0].get('detected_source_language', '').lower()
-                # Map DeepL language codes to our codes
-                lang_map = {
-                    'fr': 'fr', 'en': 'en', 'de': 'de', 'es': 'es', 'it': 'it', 'nl': 'nl',
-                    'pt': 'other', 'ru': 'other', 'ja': 'other', 'zh': 'other', 'pl': 'other'
-                }
-                return lang_map.get(detected_lang, 'other')
-    except Exception as e:
-        logger.debug(f"DeepL detection failed: {e}")
-        return None
+# Au-delà, les premiers caractères suffisent à identifier la langue
+MAX_TEXT_LENGTH = 1000
+# Écart minimal de log-vraisemblance entre les deux meilleures langues
+MIN_MARGIN = 1.0
+CACHE_SIZE = 10000
+TOKEN_CACHE_SIZE = 50000
 
+_WORD_RE = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)*")
+_URL_RE = re.compile(r'(?:https?://|www\.)\S+', re.I)
 
-def _detect_with_llm(text: str) -> Optional[str]:
-    """Detect language using LLM (OpenAI/Anthropic)."""
-    try:
-        llm_provider = os.getenv('LLM_PROVIDER', 'openai').lower()
-        api_key = None
-        
-        if llm_provider == 'openai':
-            api_key = os.getenv('OPENAI_API_KEY')
-        elif llm_provider == 'anthropic':
-            api_key = os.getenv('ANTHROPIC_API_KEY')
-        
-        if not api_key:
-            return None
-        
-        # Truncate text for LLM (keep first 200 chars)
-        text_sample = text[:200]
-        
-        prompt = f"""What language is this text written in? Respond with ONLY the ISO 639-1 language code (fr, en, de, es, it, nl, etc.) or 'unknown' if you cannot determine.
-
-Text: "{text_sample}"
 
-Language code:"""
-        
-        # Use sync version
-        with httpx.Client(timeout=10.0) as client:
-            if llm_provider == 'openai':
-                response = client.post(
-                    'https://api.openai.com/v1/chat/completions',
-                    headers={
-                        'Authorization': f'Bearer {api_key}',
-                        'Content-Type': 'application/json'
-                    },
-                    json={
-                        'model': os.getenv('OPENAI_MODEL', 'gpt-4o-mini'),
-                        'messages': [
-                            {'role': 'system', 'content': 'You are a language detection assistant. Respond with only the ISO 639-1 language code.'},
-                            {'role': 'user', 'content': prompt}
-                        ],
-                        'temperature': 0.1,
-                        'max_tokens': 10
-                    }
-                )
-                response.raise_for_status()
-                result = response.json()
-                lang_code = result['choices'][0]['message']['content'].strip().lower()
-                # Clean up response (remove quotes, etc.)
-                lang_code = lang_code.strip('"\'')
-                lang_map = {
-                    'fr': 'fr', 'en': 'en', 'de': 'de', 'es': 'es', 'it': 'it', 'nl': 'nl',
-                    'pt': 'other', 'ru': 'other', 'ja': 'other', 'zh': 'other', 'ar': 'other'
-                }
-                return lang_map.get(lang_code, 'unknown' if lang_code == 'unknown' else 'other')
-            
-            elif llm_provider == 'anthropic':
-                response = client.post(
-                    'https://api.anthropic.com/v1/messages',
-                    headers={
-                        'x-api-key': api_key,
-                        'anthropic-version': '2023-06-01',
-                        'Content-Type': 'application/json'
-                    },
-                    json={
-                        'model': os.getenv('ANTHROPIC_MODEL', 'claude-3-haiku-20240307'),
-                        'max_tokens': 10,
-                        'messages': [
-                            {'role': 'user', 'content': prompt}
-                        ],
-                        'system': 'You are a language detection assistant. Respond with only the ISO 639-1 language code.'
-                    }
-                )
-                response.raise_for_status()
-                result = response.json()
-                lang_code = result['content'][0]['text'].strip().lower()
-                lang_code = lang_code.strip('"\'')
-                lang_map = {
-                    'fr': 'fr', 'en': 'en', 'de': 'de', 'es': 'es', 'it': 'it', 'nl': 'nl',
-                    'pt': 'other', 'ru': 'other', 'ja': 'other', 'zh': 'other', 'ar': 'other'
-                }
-                return lang_map.get(lang_code, 'unknown' if lang_code == 'unknown' else 'other')
-    except Exception as e:
-        logger.debug(f"LLM detection failed: {e}")
-        return None
+def _is_latin(char: str) -> bool:
+    code = ord(char)
+    return code < 0x250 or 0x1E00 <= code <= 0x1EFF
+
+
+class NgramLanguageDetector:
+    """Naive Bayes language identifier over character n-grams and frequent words."""
+
+    def __init__(self, profiles: Dict[str, Any]):
+        self.max_ngram = profiles['max_ngram']
+        self.languages = tuple(lang for lang in SUPPORTED_LANGUAGES if lang in profiles['languages'])
+        self._grams = {lang: profiles['languages'][lang] for lang in self.languages}
+        self._floor = profiles['floor']
+        self._words = {lang: profiles['words'][lang] for lang in self.languages}
+        self._word_floor = profiles['word_floor']
+        # Scores par mot : le vocabulaire des posts se répète beaucoup
+        self._token_cache: Dict[str, List[float]] = {}
+
+    def _tokens(self, text: str) -> List[str]:
+        text = _URL_RE.sub(' ', text[:MAX_TEXT_LENGTH]).lower().replace('’', "'")
+        return _WORD_RE.findall(text)
+
+    def _token_scores(self, token: str) -> List[float]:
+        padded = f' {token} '
+        grams = [
+            padded[i:i + n]
+            for n in range(1, self.max_ngram + 1)
+            for i in range(len(padded) - n + 1)
+            if n > 1 or padded[i] != ' '
+        ]
+        # Les mots fréquents ne comptent que s'ils sont connus d'au moins une langue
+        known = any(token in self._words[lang] for lang in self.languages)
+        scores = []
+        for lang in self.languages:
+            profile, floor = self._grams[lang], self._floor[lang]
+            score = sum(profile.get(gram, floor) for gram in grams)
+            if known:
+                score += self._words[lang].get(token, self._word_floor[lang])
+            scores.append(score)
+        return scores
+
+    def scores(self, tokens: List[str]) -> Dict[str, float]:
+        """Log-likelihood of the tokens for each language."""
+        totals = [0.0] * len(self.languages)
+        for token in tokens:
+            token_scores = self._token_cache.get(token)
+            if token_scores is None:
+                if len(self._token_cache) >= TOKEN_CACHE_SIZE:
+                    self._token_cache.clear()
+                token_scores = self._token_cache[token] = self._token_scores(token)
+            for i, score in enumerate(token_scores):
+                totals[i] += score
+        return dict(zip(self.languages, totals))
+
+    def detect(self, text: str) -> str:
+        """Return 'fr', 'en', 'de', 'es', 'it', 'nl', 'other' (non-Latin script) or 'unknown'."""
+        if not text or len(text.strip()) < 3:
+            return 'unknown'
+        letters = [char for char in text[:MAX_TEXT_LENGTH] if char.isalpha()]
+        if not letters:
+            return 'unknown'
+        if sum(1 for char in letters if not _is_latin(char)) * 2 > len(letters):
+            return 'other'
+
+        tokens = self._tokens(text)
+        if not tokens:
+            return 'unknown'
+        # Un mot isolé (« ok », « top ») n'est pas significatif, sauf s'il est typique d'une langue
+        if len(tokens) == 1 and not any(tokens[0] in self._words[lang] for lang in self.languages):
+            return 'unknown'
+
+        ranked = sorted(self.scores(tokens).items(), key=lambda item: item[1], reverse=True)
+        if ranked[0][1] - ranked[1][1] < MIN_MARGIN:
+            return 'unknown'
+        return ranked[0][0]
+
+
+_detector: Optional[NgramLanguageDetector] = None
+_detector_lock = threading.Lock()
+
+
+def get_detector() -> NgramLanguageDetector:
+    """Load the bundled profiles once."""
+    global _detector
+    if _detector is None:
+        with _detector_lock:
+            if _detector is None:
+                profiles = json.loads(PROFILES_FILE.read_text(encoding='utf-8'))
+                _detector = NgramLanguageDetector(profiles)
+    return _detector
+
+
+_cache: 'OrderedDict[bytes, str]' = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_key(text: str) -> bytes:
+    return hashlib.blake2b(text[:MAX_TEXT_LENGTH].encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+def clear_cache():
+    """Empty the detection cache (e.g. after regenerating the profiles)."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def detect_languages(texts: List[str]) -> List[str]:
+    """
+    Detect the language of several texts.
+
+    Identical texts are detected once; results are kept in an LRU cache of
+    CACHE_SIZE entries keyed on a hash of the (truncated) text.
+
+    Returns:
+        One code per text: 'fr', 'en', 'de', 'es', 'it', 'nl', 'other' or 'unknown'
+    """
+    detector = get_detector()
+    keys = [_cache_key(text or '') for text in texts]
+    results: Dict[bytes, str] = {}
+    with _cache_lock:
+        for key in keys:
+            if key in _cache:
+                _cache.move_to_end(key)
+                results[key] = _cache[key]
+
+    detected = {}
+    for key, text in zip(keys, texts):
+        if key not in results and key not in detected:
+            detected[key] = detector.detect(text or '')
+
+    if detected:
+        results.update(detected)
+        with _cache_lock:
+            _cache.update(detected)
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+    return [results[key] for key in keys]
 
 
 def detect_language(text: str) -> str:
     """
-    Detect language of text using multiple methods with fallback chain.
-    
-    Priority:
-    1. TextBlob (if available) - most accurate local method
-    2. Google Translate API (if GOOGLE_API_KEY configured) - very accurate
-    3. DeepL API (if DEEPL_API_KEY configured) - very accurate
-    4. LLM (OpenAI/Anthropic) (if configured) - accurate but slower
-    5. Keyword-based detection (fallback) - fast but less accurate
-    6. Character-based heuristics - last resort
-    
+    Detect language of text with the local n-gram identifier.
+
     Returns:
         Language code: 'fr', 'en', 'de', 'es', 'it', 'nl', 'other', or 'unknown'
     """
     if not text or len(text.strip()) < 3:
         return 'unknown'
-    
-    text_lower = text.lower()
-    text_words = set(re.findall(r'\b\w+\b', text_lower))
-    
-    # Method 1: Try TextBlob (most accurate local method)
-    try:
-        from textblob import TextBlob
-        try:
-            detected = TextBlob(text).detect_language()
-            # Map to our language codes
-            lang_map = {
-                'fr': 'fr', 'en': 'en', 'de': 'de', 'es': 'es', 'it': 'it', 'nl': 'nl',
-                'pt': 'other', 'ru': 'other', 'ja': 'other', 'zh': 'other', 'ar': 'other'
-            }
-            if detected in lang_map:
-                logger.debug(f"Language detected by TextBlob: {detected}")
-                return lang_map[detected]
-            return 'other'
-        except Exception as e:
-            logger.debug(f"TextBlob detection failed: {e}")
-    except ImportError:
-        logger.debug("TextBlob not available, trying other methods")
-    
-    # Method 2: Try Google Translate API (very accurate)
-    detected = _detect_with_google_translate(text)
-    if detected and detected != 'unknown':
-        logger.debug(f"Language detected by Google Translate: {detected}")
-        return detected
-    
-    # Method 3: Try DeepL API (very accurate)
-    detected = _detect_with_deepl(text)
-    if detected and detected != 'unknown':
-        logger.debug(f"Language detected by DeepL: {detected}")
-        return detected
-    
-    # Method 4: Try LLM (accurate but slower)
-    detected = _detect_with_llm(text)
-    if detected and detected != 'unknown':
-        logger.debug(f"Language detected by LLM: {detected}")
-        return detected
-    
-    # Method 5: Character-based heuristics (check before keywords for better accuracy)
-    # French: common characters like é, è, ê, à, ç
-    french_chars = len(re.findall(r'[éèêëàâäôöùûüç]', text_lower))
-    # German: common characters like ä, ö, ü, ß
-    german_chars = len(re.findall(r'[äöüß]', text_lower))
-    # Spanish: common characters like ñ, á, é, í, ó, ú
-    spanish_chars = len(re.findall(r'[ñáéíóú]', text_lower))
-    
-    if french_chars >= 1:  # Lower threshold for character detection
-        return 'fr'
-    elif german_chars >= 1:
-        return 'de'
-    elif spanish_chars >= 1:
-        return 'es'
-    
-    # Method 6: Keyword-based detection (fallback)
-    scores = {
-        'fr': len(text_words & FRENCH_WORDS),
-        'en': len(text_words & ENGLISH_WORDS),
-        'de': len(text_words & GERMAN_WORDS),
-        'es': len(text_words & SPANISH_WORDS),
-        'it': len(text_words & ITALIAN_WORDS),
-        'nl': len(text_words & DUTCH_WORDS),
-    }
-    
-    # Find language with highest score
-    max_score = max(scores.values())
-    # Lower threshold: at least 2 matching words (or 1 if text is very short)
-    threshold = 2 if len(text_words) > 5 else 1
-    if max_score >= threshold:
-        for lang, score in scores.items():
-            if score == max_score:
-                return lang
-    
-    # Method 4: Common phrases
-    french_phrases = ['c\'est', 'il est', 'elle est', 'nous avons', 'vous avez', 'très bien', 'pas de']
-    english_phrases = ['it is', 'he is', 'she is', 'we have', 'you have', 'very good', 'not a']
-    
-    text_lower_phrases = text_lower.replace("'", "'").replace("'", "'")
-    for phrase in french_phrases:
-        if phrase in text_lower_phrases:
-            return 'fr'
-    for phrase in english_phrases:
-        if phrase in text_lower_phrases:
-            return 'en'
-    
-    # Default to unknown if no clear match
-    return 'unknown'
+    return detect_languages([text])[0]
 
 
 def detect_language_from_post(post: dict) -> str:
     """
     Detect language from a post dictionary.
     Uses content, author, and source as hints.
-    
+
     Args:
         post: Dictionary with 'content', 'author', 'source', 'url' keys
-        
+
     Returns:
         Language code
     """
     # Priority 1: Use existing language if set and valid
-    existing_lang = post.get('language', '').lower()
+    existing_lang = (post.get('language', '') or '').lower()
     if existing_lang in ['fr', 'en', 'de', 'es', 'it', 'nl', 'other']:
         return existing_lang
-    
+
     # Priority 2: Detect from content
     content = post.get('content', '') or ''
     if content:
         detected = detect_language(content)
         if detected != 'unknown':
             return detected
-    
+
     # Priority 3: Use URL hints (e.g., .fr, .de, .es domains)
     url = (post.get('url', '') or '').lower()
     if '.fr' in url or 'fr.' in url:
@@ -348,9 +229,7 @@ def detect_language_from_post(post: dict) -> str:
         return 'nl'
     elif '.co.uk' in url or '.uk' in url:
         return 'en'
-    elif '.com' in url and 'trustpilot.com' in url and 'fr.' in url:
-        return 'fr'
-    
+
     # Priority 4: Use source hints
     source = (post.get('source', '') or '').lower()
     if 'france' in source or 'français' in source:
@@ -359,6 +238,155 @@ def detect_language_from_post(post: dict) -> str:
         return 'de'
     elif 'spanish' in source or 'español' in source:
         return 'es'
-    
+
     return 'unknown'
 
+
+# ---------------------------------------------------------------------------
+# Opt-in remote re-labeling (never called from the scraping path)
+# ---------------------------------------------------------------------------
+
+# Textes envoyés par requête Google / DeepL
+REMOTE_BATCH_SIZE = 50
+REMOTE_TEXT_LENGTH = 500
+
+
+def remote_relabel_enabled() -> bool:
+    """Remote providers are only used when LANGUAGE_REMOTE_RELABEL=true."""
+    return os.getenv('LANGUAGE_REMOTE_RELABEL', 'false').lower() in ('1', 'true', 'yes')
+
+
+def _map_remote_code(code: str) -> Optional[str]:
+    code = (code or '').strip().strip('"\'').lower()
+    if not code or code == 'unknown':
+        return None
+    code = code.split('-')[0]
+    return code if code in SUPPORTED_LANGUAGES else 'other'
+
+
+async def _detect_with_google_translate(client: httpx.AsyncClient, texts: List[str]) -> List[Optional[str]]:
+    """Detect the language of a batch of texts with one Google Translate API v2 call."""
+    google_key = os.getenv('GOOGLE_API_KEY')
+    if not google_key:
+        return [None] * len(texts)
+    try:
+        response = await client.post(
+            'https://translation.googleapis.com/language/translate/v2/detect',
+            params={'key': google_key},
+            data=[('q', text[:REMOTE_TEXT_LENGTH]) for text in texts],
+        )
+        response.raise_for_status()
+        detections = response.json().get('data', {}).get('detections', [])
+        return [
+            _map_remote_code(detection[0].get('language')) if detection else None
+            for detection in detections
+        ] + [None] * (len(texts) - len(detections))
+    except Exception as e:
+        logger.debug(f"Google Translate detection failed: {e}")
+        return [None] * len(texts)
+
+
+async def _detect_with_deepl(client: httpx.AsyncClient, texts: List[str]) -> List[Optional[str]]:
+    """Detect the language of a batch of texts with one DeepL call (source language of a translation)."""
+    deepl_key = os.getenv('DEEPL_API_KEY')
+    if not deepl_key:
+        return [None] * len(texts)
+    try:
+        response = await client.post(
+            'https://api-free.deepl.com/v2/translate',
+            headers={'Authorization': f'DeepL-Auth-Key {deepl_key}'},
+            data=[('text', text[:REMOTE_TEXT_LENGTH]) for text in texts] + [('target_lang', 'EN')],
+        )
+        response.raise_for_status()
+        translations = response.json().get('translations', [])
+        return [
+            _map_remote_code(translation.get('detected_source_language'))
+            for translation in translations
+        ] + [None] * (len(texts) - len(translations))
+    except Exception as e:
+        logger.debug(f"DeepL detection failed: {e}")
+        return [None] * len(texts)
+
+
+async def _detect_with_llm(text: str) -> Optional[str]:
+    """Detect language using LLM (OpenAI/Anthropic), through the LLM gateway."""
+    llm_provider = os.getenv('LLM_PROVIDER', 'openai').lower()
+    api_key = None
+    if llm_provider == 'openai':
+        api_key = os.getenv('OPENAI_API_KEY')
+    elif llm_provider == 'anthropic':
+        api_key = os.getenv('ANTHROPIC_API_KEY')
+    if not api_key:
+        return None
+
+    prompt = f"""What language is this text written in? Respond with ONLY the ISO 639-1 language code (fr, en, de, es, it, nl, etc.) or 'unknown' if you cannot determine.
+
+Text: "{text[:200]}"
+
+Language code:"""
+    system = 'You are a language detection assistant. Respond with only the ISO 639-1 language code.'
+    from ..utils import llm_gateway
+    try:
+        content = await llm_gateway.complete(llm_provider, api_key, prompt, system=system,
+                                             temperature=0.1, max_tokens=10, timeout=10.0)
+        return _map_remote_code(content)
+    except Exception as e:
+        logger.debug(f"LLM detection failed: {e}")
+        return None
+
+
+async def detect_languages_remote(texts: List[str], concurrency: int = 5) -> List[Optional[str]]:
+    """
+    Detect languages with the remote providers: Google Translate, then DeepL
+    for what is left (both batched), then the LLM one text at a time with at
+    most `concurrency` requests in flight.
+
+    Returns:
+        One code per text, None when no provider could tell
+    """
+    results: List[Optional[str]] = [None] * len(texts)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        for batch_detector in (_detect_with_google_translate, _detect_with_deepl):
+            pending = [i for i, code in enumerate(results) if code is None]
+            for start in range(0, len(pending), REMOTE_BATCH_SIZE):
+                chunk = pending[start:start + REMOTE_BATCH_SIZE]
+                async with semaphore:
+                    codes = await batch_detector(client, [texts[i] for i in chunk])
+                for i, code in zip(chunk, codes):
+                    results[i] = code
+
+        async def with_llm(i: int):
+            async with semaphore:
+                results[i] = await _detect_with_llm(texts[i])
+
+        await asyncio.gather(*(with_llm(i) for i, code in enumerate(results) if code is None))
+    return results
+
+
+async def relabel_unknown_posts(limit: int = 500, concurrency: int = 5) -> Dict[str, Any]:
+    """
+    Re-label posts whose language is still 'unknown' with the remote providers
+    and write the results with one bulk UPDATE.
+
+    Args:
+        limit: Maximum number of posts to send (most recent first)
+        concurrency: Maximum number of remote requests in flight
+    """
+    from .. import database as db
+
+    posts = [post for post in db.get_posts_by_language('unknown', limit=limit) if (post.get('content') or '').strip()]
+    if not posts:
+        return {'success': True, 'total_posts': 0, 'updated_count': 0, 'unchanged_count': 0}
+
+    codes = await detect_languages_remote([post['content'] for post in posts], concurrency=concurrency)
+    changes = [(post['id'], code) for post, code in zip(posts, codes) if code]
+    updated = db.update_posts_language(changes) if changes else 0
+    logger.info(f"Remote language re-labeling: {updated} updated out of {len(posts)} unknown posts")
+    return {
+        'success': True,
+        'total_posts': len(posts),
+        'updated_count': updated,
+        'unchanged_count': len(posts) - updated,
+    }
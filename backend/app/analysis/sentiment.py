@@ -1,10 +1,17 @@
 """
 Sentiment analysis module with improved French support.
 Uses VADER for English and enhanced heuristics for French.
+
+analyze() scores one text; analyze_batch() scores many (deduplicated, with
+batched language detection) and can fan out over a process pool for
+backfills such as scripts/update_posts_language_sentiment.py.
 """
 import re
+import os
 import logging
-from typing import List, Optional
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 logger = logging.getLogger(__name__)
@@ -45,6 +52,38 @@ FRENCH_REVERSAL_WORDS = {
     'malgré', 'malgré tout', 'quand même', 'tout de même'
 }
 
+# Explicit French negative phrases and their penalty ("c'est nul" used to be
+# listed twice, its double weight is kept so existing scores do not move)
+FRENCH_NEGATIVE_PHRASES = {
+    'tout est mauvais': 0.2, 'tout est mal': 0.2, 'rien ne fonctionne': 0.2,
+    'ne fonctionne pas': 0.2, 'ne marche pas': 0.2, 'ça ne marche pas': 0.2,
+    "c'est nul": 0.4, 'double facturé': 0.2, 'double facturation': 0.2,
+    'site offline': 0.2, 'site hors ligne': 0.2,
+}
+
+# Single lookup table for French words: -1 = negative, +1 = positive.
+# Multi-word entries of the sets above can never match a single word (they
+# never did with the set intersections either) and are left out.
+FRENCH_LEXICON: Dict[str, int] = {
+    **{word: 1 for word in FRENCH_POSITIVE_WORDS if ' ' not in word},
+    **{word: -1 for word in FRENCH_NEGATIVE_WORDS if ' ' not in word},
+}
+
+_WORD_RE = re.compile(r'\b\w+\b')
+_SEGMENT_SPLIT_RE = re.compile(r'([.!?]+)')
+_PUNCTUATION_RE = re.compile(r'^[.!?]+$')
+
+# Reversal words, longest first so multi-word phrases win; single words need word boundaries
+_REVERSAL_PATTERNS = [
+    (word, None if ' ' in word else re.compile(r'\b' + re.escape(word) + r'\b'))
+    for word in sorted(FRENCH_REVERSAL_WORDS, key=lambda word: (-len(word), word))
+]
+
+# Distinct French segments whose VADER compound score is kept in memory
+VADER_CACHE_SIZE = 20000
+# Texts sent to each worker process by analyze_batch
+BATCH_CHUNK_SIZE = 500
+
 
 def _split_into_segments(text: str) -> List[str]:
     """
@@ -61,7 +100,7 @@ def _split_into_segments(text: str) -> List[str]:
     
     # Split by sentence-ending punctuation: . ! ?
     # Use regex to split but keep punctuation
-    segments = re.split(r'([.!?]+)', text)
+    segments = _SEGMENT_SPLIT_RE.split(text)
     
     # Recombine segments with their punctuation
     result = []
@@ -69,7 +108,7 @@ def _split_into_segments(text: str) -> List[str]:
     while i < len(segments):
         segment = segments[i].strip()
         # If next element is punctuation, add it to the segment
-        if i + 1 < len(segments) and re.match(r'^[.!?]+$', segments[i + 1]):
+        if i + 1 < len(segments) and _PUNCTUATION_RE.match(segments[i + 1]):
             segment += segments[i + 1]
             i += 2
         else:
@@ -85,33 +124,28 @@ def _split_into_segments(text: str) -> List[str]:
     return result
 
 
-def _detect_sentiment_reversal(text: str) -> Optional[int]:
+def _detect_sentiment_reversal(text: str, segments: Optional[List[str]] = None) -> Optional[int]:
     """
     Detect the position of the first sentiment reversal word in the text.
     
     Args:
         text: Text to analyze
+        segments: Segments of the text if already split
         
     Returns:
         Index of the segment containing the reversal word, or None if not found
     """
-    segments = _split_into_segments(text)
+    if segments is None:
+        segments = _split_into_segments(text)
     text_lower = text.lower()
     
-    # Sort reversal words by length (longest first) to match multi-word phrases first
-    sorted_reversals = sorted(FRENCH_REVERSAL_WORDS, key=len, reverse=True)
-    
     # Find the position of the first reversal word/phrase
-    for reversal_word in sorted_reversals:
-        # For multi-word phrases, use simple string search
-        # For single words, use word boundary regex
-        if ' ' in reversal_word:
+    for reversal_word, pattern in _REVERSAL_PATTERNS:
+        if pattern is None:
             # Multi-word phrase: search for exact phrase
             pos = text_lower.find(reversal_word)
         else:
-            # Single word: use word boundary regex
-            pattern = r'\b' + re.escape(reversal_word) + r'\b'
-            match = re.search(pattern, text_lower)
+            match = pattern.search(text_lower)
             pos = match.start() if match else -1
         
         if pos != -1:
@@ -126,21 +160,35 @@ def _detect_sentiment_reversal(text: str) -> Optional[int]:
     return None
 
 
-def _detect_french_negative_score(text: str) -> float:
-    """
-    Calculate negative sentiment score for French text.
-    Returns a score between -1.0 and 0.0.
-    """
-    text_lower = text.lower()
-    words = set(re.findall(r'\b\w+\b', text_lower))
-    
-    # Count negative words
-    negative_count = len(words & FRENCH_NEGATIVE_WORDS)
-    
-    # Check for intensifiers near negative words
-    has_intensifier = any(intensifier in text_lower for intensifier in FRENCH_INTENSIFIERS)
-    
-    # Calculate base score
+def _label(score: float) -> str:
+    if score >= 0.05:
+        return 'positive'
+    if score <= -0.05:
+        return 'negative'
+    return 'neutral'
+
+
+@lru_cache(maxsize=VADER_CACHE_SIZE)
+def _vader_compound(text: str) -> float:
+    """VADER compound score of a segment (short segments repeat across posts: greetings, thanks...)."""
+    return analyzer.polarity_scores(text).get('compound', 0.0)
+
+
+def _french_word_counts(words: Set[str]) -> Tuple[int, int]:
+    """Count (negative, positive) French lexicon words with one lookup per word."""
+    negative = positive = 0
+    for word in words:
+        weight = FRENCH_LEXICON.get(word)
+        if weight is None:
+            continue
+        if weight < 0:
+            negative += 1
+        else:
+            positive += 1
+    return negative, positive
+
+
+def _french_negative_from_counts(text_lower: str, negative_count: int) -> float:
     if negative_count == 0:
         return 0.0
     
@@ -148,24 +196,46 @@ def _detect_french_negative_score(text: str) -> float:
     base_score = -0.3 - (negative_count * 0.15)
     
     # Boost with intensifiers
-    if has_intensifier:
+    if any(intensifier in text_lower for intensifier in FRENCH_INTENSIFIERS):
         base_score *= 1.5
     
     # Check for explicit negative phrases
-    negative_phrases = [
-        'tout est mauvais', 'tout est mal', 'rien ne fonctionne', 'ne fonctionne pas',
-        'ne marche pas', 'ça ne marche pas', 'c\'est nul', "c'est nul",
-        'double facturé', 'double facturation', 'site offline', 'site hors ligne'
-    ]
-    
-    for phrase in negative_phrases:
+    for phrase, penalty in FRENCH_NEGATIVE_PHRASES.items():
         if phrase in text_lower:
-            base_score -= 0.2
+            base_score -= penalty
     
     # Normalize to -1.0 to 0.0 range
     return max(-1.0, min(0.0, base_score))
 
 
+def _french_compound(text: str, vader_compound: float) -> float:
+    """Combine VADER with the French lexicon; the text is tokenized once."""
+    text_lower = text.lower()
+    negative_count, positive_count = _french_word_counts(set(_WORD_RE.findall(text_lower)))
+    french_negative = _french_negative_from_counts(text_lower, negative_count)
+    
+    if vader_compound < 0 and french_negative < 0:
+        compound = min(vader_compound, french_negative)
+    elif french_negative < -0.3:
+        compound = french_negative
+    else:
+        compound = vader_compound
+    
+    if positive_count > 0 and compound < 0:
+        compound = compound + (positive_count * 0.1)
+    return compound
+
+
+def _detect_french_negative_score(text: str) -> float:
+    """
+    Calculate negative sentiment score for French text.
+    Returns a score between -1.0 and 0.0.
+    """
+    text_lower = text.lower()
+    negative_count, _ = _french_word_counts(set(_WORD_RE.findall(text_lower)))
+    return _french_negative_from_counts(text_lower, negative_count)
+
+
 def _analyze_segment_sentiment(segment: str, language: str = 'fr') -> dict:
     """
     Analyze sentiment of a single segment using VADER and French heuristics.
@@ -180,41 +250,14 @@ def _analyze_segment_sentiment(segment: str, language: str = 'fr') -> dict:
     if not segment.strip():
         return {'score': 0.0, 'label': 'neutral'}
     
-    # Use VADER
-    vader_scores = analyzer.polarity_scores(segment)
-    vader_compound = vader_scores.get('compound', 0.0)
+    vader_compound = _vader_compound(segment)
     
     if language == 'fr':
-        # Calculate French-specific negative score
-        french_negative = _detect_french_negative_score(segment)
-        
-        # Combine VADER and French-specific scores
-        if vader_compound < 0 and french_negative < 0:
-            compound = min(vader_compound, french_negative)
-        elif french_negative < -0.3:
-            compound = french_negative
-        else:
-            compound = vader_compound
-        
-        # Check for positive French words
-        text_lower = segment.lower()
-        words = set(re.findall(r'\b\w+\b', text_lower))
-        positive_count = len(words & FRENCH_POSITIVE_WORDS)
-        
-        if positive_count > 0 and compound < 0:
-            compound = compound + (positive_count * 0.1)
+        compound = _french_compound(segment, vader_compound)
     else:
         compound = vader_compound
     
-    # Determine label
-    if compound >= 0.05:
-        label = 'positive'
-    elif compound <= -0.05:
-        label = 'negative'
-    else:
-        label = 'neutral'
-    
-    return {'score': compound, 'label': label}
+    return {'score': compound, 'label': _label(compound)}
 
 
 def _apply_reversal_logic(segments: List[str], reversal_pos: Optional[int], language: str = 'fr') -> dict:
@@ -274,15 +317,7 @@ def _apply_reversal_logic(segments: List[str], reversal_pos: Optional[int], lang
     else:
         final_score = sum(segment_scores) / len(segment_scores) if segment_scores else 0.0
     
-    # Determine label
-    if final_score >= 0.05:
-        label = 'positive'
-    elif final_score <= -0.05:
-        label = 'negative'
-    else:
-        label = 'neutral'
-    
-    return {'score': final_score, 'label': label}
+    return {'score': final_score, 'label': _label(final_score)}
 
 
 def _analyze_with_segments(text: str, language: str = 'fr', apply_reversal: bool = True) -> dict:
@@ -311,7 +346,7 @@ def _analyze_with_segments(text: str, language: str = 'fr', apply_reversal: bool
     # Detect reversal if requested
     reversal_pos = None
     if apply_reversal:
-        reversal_pos = _detect_sentiment_reversal(text)
+        reversal_pos = _detect_sentiment_reversal(text, segments)
         if reversal_pos is not None:
             return _apply_reversal_logic(segments, reversal_pos, language)
     
@@ -339,15 +374,7 @@ def _analyze_with_segments(text: str, language: str = 'fr', apply_reversal: bool
     # Calculate weighted average
     final_score = sum(weighted_scores) / total_weight
     
-    # Determine label
-    if final_score >= 0.05:
-        label = 'positive'
-    elif final_score <= -0.05:
-        label = 'negative'
-    else:
-        label = 'neutral'
-    
-    return {'score': final_score, 'label': label}
+    return {'score': final_score, 'label': _label(final_score)}
 
 
 def analyze(text: str, language: str = None) -> dict:
@@ -380,43 +407,68 @@ def analyze(text: str, language: str = None) -> dict:
         except Exception as e:
             logger.warning(f"Error in hybrid sentiment analysis, falling back to standard: {e}")
             # Fallback to standard VADER + French heuristics
-            vader_scores = analyzer.polarity_scores(text)
-            vader_compound = vader_scores.get('compound', 0.0)
-            
-            french_negative = _detect_french_negative_score(text)
-            
-            if vader_compound < 0 and french_negative < 0:
-                compound = min(vader_compound, french_negative)
-            elif french_negative < -0.3:
-                compound = french_negative
-            else:
-                compound = vader_compound
-            
-            text_lower = text.lower()
-            words = set(re.findall(r'\b\w+\b', text_lower))
-            positive_count = len(words & FRENCH_POSITIVE_WORDS)
-            
-            if positive_count > 0 and compound < 0:
-                compound = compound + (positive_count * 0.1)
-            
-            if compound >= 0.05:
-                label = 'positive'
-            elif compound <= -0.05:
-                label = 'negative'
-            else:
-                label = 'neutral'
-            
-            return {'score': compound, 'label': label}
+            compound = _french_compound(text, analyzer.polarity_scores(text).get('compound', 0.0))
+            return {'score': compound, 'label': _label(compound)}
     
     # For other languages, use standard VADER
-    scores = analyzer.polarity_scores(text)
-    compound = scores.get('compound', 0.0)
+    compound = analyzer.polarity_scores(text).get('compound', 0.0)
+    return {'score': compound, 'label': _label(compound)}
+
+
+def _analyze_chunk(pairs: List[Tuple[str, str]]) -> List[dict]:
+    """Worker entry point of analyze_batch (module-level so it can be pickled)."""
+    return [analyze(text, language=language) for text, language in pairs]
+
+
+def _analyze_in_pool(executor: ProcessPoolExecutor, pairs: List[Tuple[str, str]]) -> List[dict]:
+    chunks = [pairs[i:i + BATCH_CHUNK_SIZE] for i in range(0, len(pairs), BATCH_CHUNK_SIZE)]
+    return [result for chunk in executor.map(_analyze_chunk, chunks) for result in chunk]
+
+
+def analyze_batch(texts: List[str], languages: Optional[List[Optional[str]]] = None,
+                  processes: Optional[int] = 1,
+                  executor: Optional[ProcessPoolExecutor] = None) -> List[dict]:
+    """
+    Analyze sentiment of many texts.
+    
+    Identical (text, language) pairs are scored once and missing languages are
+    detected in one batch. With processes > 1 (None = one per CPU) or an
+    existing executor (to reuse one pool across calls), texts are scored in
+    chunks of BATCH_CHUNK_SIZE by worker processes: VADER is pure Python, so
+    threads would not help.
     
-    if compound >= 0.05:
-        label = 'positive'
-    elif compound <= -0.05:
-        label = 'negative'
+    Args:
+        texts: Texts to analyze
+        languages: Language code per text (None entries, or None for all, are detected)
+        processes: Number of worker processes (1 = in this process)
+        executor: Process pool to use instead of starting one
+    
+    Returns:
+        One {'score', 'label'} dictionary per text, in order
+    """
+    if languages is None:
+        languages = [None] * len(texts)
+    if len(languages) != len(texts):
+        raise ValueError("texts and languages must have the same length")
+    
+    missing = [i for i, language in enumerate(languages) if not language and texts[i]]
+    if missing:
+        from .language_detection import detect_languages
+        languages = list(languages)
+        for i, language in zip(missing, detect_languages([texts[i] for i in missing])):
+            languages[i] = language
+    
+    keys = [(text or '', language or 'unknown') for text, language in zip(texts, languages)]
+    unique = list(dict.fromkeys(keys))
+    
+    processes = processes or os.cpu_count() or 1
+    if executor is not None and len(unique) > BATCH_CHUNK_SIZE:
+        results = _analyze_in_pool(executor, unique)
+    elif executor is None and processes > 1 and len(unique) > BATCH_CHUNK_SIZE:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = _analyze_in_pool(pool, unique)
     else:
-        label = 'neutral'
+        results = _analyze_chunk(unique)
     
-    return {'score': compound, 'label': label}
+    scores = dict(zip(unique, results))
+    return [dict(scores[key]) for key in keys]
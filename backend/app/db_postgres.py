@@ -8,8 +8,12 @@ import os
 import json
 import logging
 import uuid
-from datetime import datetime
-from typing import Optional, List, Dict, Any, Generator
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Optional, List, Dict, Any, Generator, Tuple, Mapping
 from contextlib import contextmanager
 from functools import wraps
 
@@ -128,18 +132,24 @@ def pg_insert_post(source: str, author: str, content: str, url: str,
                    created_at: str, sentiment_score: float, sentiment_label: str,
                    language: str = 'unknown', country: str = None,
                    relevance_score: float = 0.0, product: str = None,
-                   is_answered: int = 0) -> Optional[int]:
-    """Insert a new post into PostgreSQL (low-level function)."""
+                   is_answered: int = 0, content_hash: str = None) -> Optional[int]:
+    """
+    Insert a new post into PostgreSQL (low-level function).
+    
+    Relies on the unique constraints on url and (source, content_hash):
+    duplicates are rejected by the database in the same round-trip.
+    """
     with get_pg_cursor() as cur:
         cur.execute("""
             INSERT INTO posts (source, author, content, url, created_at, 
                              sentiment_score, sentiment_label, language, country, 
-                             relevance_score, product, is_answered)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (url) DO NOTHING
+                             relevance_score, product, is_answered, content_hash)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT DO NOTHING
             RETURNING id
         """, (source, author, content, url, created_at, sentiment_score,
-              sentiment_label, language, country, relevance_score, product, is_answered))
+              sentiment_label, language, country, relevance_score, product, is_answered,
+              content_hash))
         result = cur.fetchone()
         return result['id'] if result else None
 
@@ -165,7 +175,12 @@ def _normalize_content_for_comparison(content: str) -> str:
     return content[:500]
 
 
-def _compute_content_hash(content: str) -> str:
+# Posts whose normalized content is shorter than this are not deduplicated
+# by content (too generic, e.g. "thanks!"), only by URL.
+MIN_HASHED_CONTENT_LENGTH = 30
+
+
+def _compute_content_hash(content: str) -> Optional[str]:
     """
     Compute a hash of normalized content for fast duplicate detection.
     
@@ -173,17 +188,20 @@ def _compute_content_hash(content: str) -> str:
         content: Raw content string
     
     Returns:
-        SHA256 hash of normalized content (hex string)
+        SHA256 hash of normalized content (hex string), or None when the
+        normalized content is too short to be a reliable duplicate key
     """
     import hashlib
     normalized = _normalize_content_for_comparison(content)
+    if len(normalized) <= MIN_HASHED_CONTENT_LENGTH:
+        return None
     return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
 
 
 def detect_product_label(content: str, language: str = 'unknown') -> Optional[str]:
     """
     Détecte le produit OVH mentionné dans le contenu d'un post.
-    Basé sur la logique de détection du frontend.
+    Utilise le classifieur partagé (app.analysis.classifier), compilé une seule fois.
     
     Args:
         content: Contenu du post
@@ -194,48 +212,62 @@ def detect_product_label(content: str, language: str = 'unknown') -> Optional[st
     """
     if not content:
         return None
+    from .analysis import classifier
+    return classifier.detect_product(content)
+
+
+def _prepare_post_row(post: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate a post dict and build the column values written by insert_post /
+    insert_posts_bulk (truncation, defaults, product label, content hash).
     
-    import re
-    content_lower = content.lower()
-    
-    # Product patterns with priority order (more specific first)
-    product_patterns = [
-        # Web & Hosting
-        {'key': 'domain', 'pattern': re.compile(r'\b(domain|domaine|dns|zone|registrar|nameserver|\.ovh|\.com|\.net|\.org)\b', re.I), 'label': 'Domain'},
-        {'key': 'wordpress', 'pattern': re.compile(r'\b(wordpress|wp\s*host|wp\s*config)\b', re.I), 'label': 'WordPress'},
-        {'key': 'email', 'pattern': re.compile(r'\b(email|exchange|mail|mx\s*record|zimbra|smtp|imap|pop3|mailbox)\b', re.I), 'label': 'Email'},
-        {'key': 'web-hosting', 'pattern': re.compile(r'\b(web\s*host|hosting|hébergement|mutualisé|shared\s*host|web\s*server)\b', re.I), 'label': 'Hosting'},
-        
-        # Cloud & Servers
-        {'key': 'vps', 'pattern': re.compile(r'\b(vps|virtual\s*private\s*server|kimsufi)\b', re.I), 'label': 'VPS'},
-        {'key': 'dedicated', 'pattern': re.compile(r'\b(dedicated|dédié|bare\s*metal|server\s*dedicated|serveur\s*dédié)\b', re.I), 'label': 'Dedicated Server'},
-        {'key': 'public-cloud', 'pattern': re.compile(r'\b(public\s*cloud|openstack|instance|compute|ovhcloud|ovh\s*cloud)\b', re.I), 'label': 'Public Cloud'},
-        {'key': 'private-cloud', 'pattern': re.compile(r'\b(private\s*cloud|vmware|vsphere)\b', re.I), 'label': 'Private Cloud'},
-        {'key': 'kubernetes', 'pattern': re.compile(r'\b(kubernetes|k8s|managed\s*k8s|container|pod|deployment)\b', re.I), 'label': 'Managed Kubernetes'},
-        
-        # Storage & Backup
-        {'key': 'object-storage', 'pattern': re.compile(r'\b(object\s*storage|swift|s3|storage|cloud\s*storage|object\s*store)\b', re.I), 'label': 'Storage'},
-        {'key': 'backup', 'pattern': re.compile(r'\b(backup|veeam|archive|snapshot|restore)\b', re.I), 'label': 'Backup'},
-        
-        # Network & CDN
-        {'key': 'cdn', 'pattern': re.compile(r'\b(cdn|content\s*delivery|cache)\b', re.I), 'label': 'CDN'},
-        {'key': 'load-balancer', 'pattern': re.compile(r'\b(load\s*balancer|iplb|lb|balancing)\b', re.I), 'label': 'Load Balancer'},
-        {'key': 'ddos', 'pattern': re.compile(r'\b(ddos|anti-ddos|protection|mitigation)\b', re.I), 'label': 'DDoS Protection'},
-        {'key': 'network', 'pattern': re.compile(r'\b(network|vrack|vlan|ip\s*address|subnet)\b', re.I), 'label': 'Network'},
-        
-        # Support & Billing (lower priority)
-        {'key': 'billing', 'pattern': re.compile(r'\b(billing|facture|invoice|payment|paiement|refund|rembours|subscription)\b', re.I), 'label': 'Billing'},
-        {'key': 'manager', 'pattern': re.compile(r'\b(manager|control\s*panel|espace\s*client|ovh\s*manager|panel)\b', re.I), 'label': 'Manager'},
-        {'key': 'api', 'pattern': re.compile(r'\b(api|sdk|integration|rest\s*api|webhook)\b', re.I), 'label': 'API'},
-        {'key': 'support', 'pattern': re.compile(r'\b(support|ticket|assistance|help|service\s*client|customer\s*service)\b', re.I), 'label': 'Support'},
-    ]
+    Raises:
+        ValueError: if the post is not a dict or misses a required field
+    """
+    # SECURITY: Validate post data before insertion
+    if not isinstance(post, dict):
+        raise ValueError("post must be a dictionary")
     
-    # Check patterns in priority order
-    for pattern_info in product_patterns:
-        if pattern_info['pattern'].search(content_lower):
-            return pattern_info['label']
+    # SECURITY: Validate required fields exist
+    required_fields = ['source', 'content']
+    for required in required_fields:
+        if required not in post:
+            raise ValueError(f"Missing required field: {required}")
     
-    return None
+    content = str(post.get('content', ''))[:10000]
+    
+    # Detect product label if not provided
+    product_label = post.get('product')
+    if not product_label:
+        product_label = detect_product_label(str(post.get('content', '')), str(post.get('language', 'unknown')))
+    
+    return {
+        'source': str(post.get('source'))[:100],
+        'author': str(post.get('author', 'unknown'))[:100],
+        'content': content,
+        'url': str(post.get('url', ''))[:500],
+        'created_at': post.get('created_at'),
+        'sentiment_score': float(post.get('sentiment_score', 0.0)) if post.get('sentiment_score') else 0.0,
+        'sentiment_label': str(post.get('sentiment_label', 'neutral'))[:20],
+        'language': str(post.get('language', 'unknown'))[:20],
+        'country': post.get('country'),
+        'relevance_score': float(post.get('relevance_score', 0.0)) if post.get('relevance_score') is not None else 0.0,
+        'product': product_label,
+        'is_answered': 0,
+        # Duplicates (same URL, or same normalized content for the same source)
+        # are rejected by the unique indexes in a single INSERT ... ON CONFLICT
+        'content_hash': _compute_content_hash(content),
+    }
+
+
+def _notify_new_posts(post_ids: List[int]) -> None:
+    """Trigger notification checks for newly inserted posts in background (non-blocking)."""
+    for post_id in post_ids:
+        try:
+            from ..notifications import notification_manager
+            notification_manager.check_and_send_notifications(post_id)
+        except Exception as e:
+            logger.warning(f"Failed to trigger notification check for post {post_id}: {e}")
 
 
 def insert_post(post: Dict[str, Any]) -> Optional[int]:
@@ -246,109 +278,17 @@ def insert_post(post: Dict[str, Any]) -> Optional[int]:
     Returns:
         int: ID of the inserted post, or None if insertion failed (duplicate)
     """
-    
-    # SECURITY: Validate post data before insertion
-    if not isinstance(post, dict):
-        raise ValueError("post must be a dictionary")
-    
-    # SECURITY: Validate required fields exist
-    required_fields = ['source', 'content']
-    for field in required_fields:
-        if field not in post:
-            raise ValueError(f"Missing required field: {field}")
+    row = _prepare_post_row(post)
     
     try:
-        # Check for duplicate URL first (most reliable)
-        url = str(post.get('url', ''))[:500]
-        if url:
-            with get_pg_cursor() as cur:
-                cur.execute("SELECT id FROM posts WHERE url = %s LIMIT 1", (url,))
-                existing = cur.fetchone()
-                if existing:
-                    logger.debug(f"Duplicate detected by URL: {url[:100]}")
-                    return None  # Duplicate detected
-        
-        # Check for duplicate by normalized content + author + source
-        content = str(post.get('content', ''))[:10000]
-        author = str(post.get('author', 'unknown'))[:100]
-        source = str(post.get('source'))[:100]
-        
-        # Normalize content for comparison
-        normalized_content = _normalize_content_for_comparison(content)
-        
-        # Improved duplicate detection: check normalized content more thoroughly
-        if normalized_content and len(normalized_content) > 30:
-            normalized_key = normalized_content[:300]
-            
-            with get_pg_cursor() as cur:
-                # First check: same normalized content + same author + same source (strictest)
-                cur.execute("""
-                    SELECT id, content FROM posts 
-                    WHERE source = %s 
-                    AND author = %s
-                    AND LENGTH(content) > 30
-                    LIMIT 50
-                """, (source, author))
-                existing_posts = cur.fetchall()
-                
-                for existing_id, existing_content in existing_posts:
-                    existing_normalized = _normalize_content_for_comparison(str(existing_content))
-                    if len(existing_normalized) > 30 and existing_normalized[:300] == normalized_key:
-                        logger.debug(f"Duplicate detected by normalized content+author+source: {normalized_key[:50]}")
-                        return None  # Duplicate detected
-                
-                # Second check: same normalized content + same source (catches author variations)
-                if len(normalized_content) > 100:
-                    normalized_key_long = normalized_content[:300]
-                    cur.execute("""
-                        SELECT id, content FROM posts 
-                        WHERE source = %s
-                        AND LENGTH(content) > 100
-                        LIMIT 100
-                    """, (source,))
-                    existing_posts = cur.fetchall()
-                    
-                    for existing_id, existing_content in existing_posts:
-                        existing_normalized = _normalize_content_for_comparison(str(existing_content))
-                        if len(existing_normalized) > 100:
-                            if existing_normalized[:300] == normalized_key_long:
-                                # Additional check: if content is very similar (90% match on first 500 chars)
-                                if len(existing_normalized) >= 500 and len(normalized_content) >= 500:
-                                    similarity = sum(1 for a, b in zip(existing_normalized[:500], normalized_content[:500]) if a == b) / 500.0
-                                    if similarity > 0.90:
-                                        logger.debug(f"Duplicate detected by normalized content similarity ({similarity:.2%}): {normalized_key[:50]}")
-                                        return None
-                                elif existing_normalized[:300] == normalized_key_long:
-                                    logger.debug(f"Duplicate detected by normalized content hash: {normalized_key[:100]}")
-                                    return None  # Duplicate detected
+        post_id = pg_insert_post(**row)
         
-        # Detect product label if not provided
-        product_label = post.get('product')
-        if not product_label:
-            product_label = detect_product_label(str(post.get('content', '')), str(post.get('language', 'unknown')))
+        if post_id is None:
+            logger.debug(f"Duplicate detected (url or content hash): {row['url'][:100]}")
         
-        # Insert the post
-        post_id = pg_insert_post(
-            source=str(post.get('source'))[:100],
-            author=str(post.get('author', 'unknown'))[:100],
-            content=str(post.get('content', ''))[:10000],
-            url=url,
-            created_at=post.get('created_at'),
-            sentiment_score=float(post.get('sentiment_score', 0.0)) if post.get('sentiment_score') else 0.0,
-            sentiment_label=str(post.get('sentiment_label', 'neutral'))[:20],
-            language=str(post.get('language', 'unknown'))[:20],
-            country=post.get('country'),
-            relevance_score=float(post.get('relevance_score', 0.0)) if post.get('relevance_score') is not None else 0.0,
-            product=product_label
-        )
-        
-        # Trigger notification check in background (non-blocking)
         if post_id:
-            try:
-                from ..notifications import notification_manager
-                notification_manager.check_and_send_notifications(post_id)
-            except Exception as e:
-                logger.warning(f"Failed to trigger notification check for post {post_id}: {e}")
+            _tag_new_posts_safely([{'id': post_id, 'content': row['content']}])
+            _notify_new_posts([post_id])
         
         return post_id
         
@@ -357,10 +297,126 @@ def insert_post(post: Dict[str, Any]) -> Optional[int]:
         raise
 
 
+_POST_INSERT_COLUMNS = [
+    'source', 'author', 'content', 'url', 'created_at', 'sentiment_score',
+    'sentiment_label', 'language', 'country', 'relevance_score', 'product',
+    'is_answered', 'content_hash',
+]
+
+
+def insert_posts_bulk(posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Insert a batch of scraped posts in one transaction.
+    
+    Duplicates are resolved within the batch first, then against the table with
+    a single indexed lookup on url and (source, content_hash); survivors are written
+    with one multi-row INSERT ... ON CONFLICT DO NOTHING (which also covers
+    rows inserted concurrently by another job).
+    
+    Args:
+        posts: List of post dicts (same format as insert_post)
+    
+    Returns:
+        One outcome per input post, in order:
+        {'status': 'inserted', 'id': int} | {'status': 'duplicate', 'id': None}
+        | {'status': 'rejected', 'id': None, 'error': str}
+    """
+    from psycopg2.extras import execute_values
+    
+    outcomes: List[Dict[str, Any]] = [None] * len(posts)
+    candidates = []  # (index, row)
+    seen_urls = set()
+    seen_hashes = set()
+    
+    for idx, post in enumerate(posts):
+        try:
+            row = _prepare_post_row(post)
+        except Exception as e:
+            outcomes[idx] = {'status': 'rejected', 'id': None, 'error': str(e)}
+            continue
+        
+        hash_key = (row['source'], row['content_hash']) if row['content_hash'] else None
+        if row['url'] in seen_urls or (hash_key and hash_key in seen_hashes):
+            outcomes[idx] = {'status': 'duplicate', 'id': None}
+            continue
+        seen_urls.add(row['url'])
+        if hash_key:
+            seen_hashes.add(hash_key)
+        candidates.append((idx, row))
+    
+    if candidates:
+        try:
+            with get_pg_cursor() as cur:
+                hashed = [row for _, row in candidates if row['content_hash']]
+                # One branch per unique index (url, and the partial
+                # (source, content_hash) index) so each lookup is an index scan
+                cur.execute("""
+                    SELECT url, source, content_hash FROM posts
+                    WHERE url = ANY(%s::text[])
+                    UNION
+                    SELECT url, source, content_hash FROM posts
+                    WHERE source = ANY(%s::text[])
+                      AND content_hash IS NOT NULL
+                      AND (source, content_hash) IN (SELECT * FROM unnest(%s::text[], %s::text[]))
+                """, (
+                    [row['url'] for _, row in candidates],
+                    list({row['source'] for row in hashed}),
+                    [row['source'] for row in hashed],
+                    [row['content_hash'] for row in hashed],
+                ))
+                existing_urls = set()
+                existing_hashes = set()
+                for existing in cur.fetchall():
+                    existing_urls.add(existing['url'])
+                    if existing['content_hash']:
+                        existing_hashes.add((existing['source'], existing['content_hash']))
+                
+                to_insert = []
+                for idx, row in candidates:
+                    if row['url'] in existing_urls or (row['source'], row['content_hash']) in existing_hashes:
+                        outcomes[idx] = {'status': 'duplicate', 'id': None}
+                    else:
+                        to_insert.append((idx, row))
+                
+                inserted_ids = {}
+                if to_insert:
+                    returned = execute_values(cur, f"""
+                        INSERT INTO posts ({', '.join(_POST_INSERT_COLUMNS)})
+                        VALUES %s
+                        ON CONFLICT DO NOTHING
+                        RETURNING id, url
+                    """, [tuple(row[col] for col in _POST_INSERT_COLUMNS) for _, row in to_insert],
+                        page_size=500, fetch=True)
+                    # url is unique in the table and in the batch, so it maps rows back
+                    inserted_ids = {r['url']: r['id'] for r in returned}
+                
+                for idx, row in to_insert:
+                    post_id = inserted_ids.get(row['url'])
+                    if post_id:
+                        outcomes[idx] = {'status': 'inserted', 'id': post_id}
+                    else:
+                        outcomes[idx] = {'status': 'duplicate', 'id': None}
+        except Exception as e:
+            logger.error(f"Error in bulk insert of {len(candidates)} posts: {e}", exc_info=True)
+            raise
+    
+    new_ids = [o['id'] for o in outcomes if o['status'] == 'inserted']
+    if new_ids:
+        _tag_new_posts_safely([
+            {'id': o['id'], 'content': posts[idx].get('content')}
+            for idx, o in enumerate(outcomes) if o['status'] == 'inserted'
+        ])
+        _notify_new_posts(new_ids)
+    
+    logger.debug(f"Bulk insert: {len(new_ids)} inserted, {len(posts) - len(new_ids)} duplicates/rejected")
+    return outcomes
+
+
 def pg_get_all_posts(limit: int = 1000, offset: int = 0,
                      source: str = None, sentiment: str = None,
                      language: str = None, search: str = None,
-                     sort_by: str = 'created_at', sort_order: str = 'DESC') -> List[Dict]:
+                     sort_by: str = 'created_at', sort_order: str = 'DESC',
+                     date_from: str = None) -> List[Dict]:
     """Get posts with filtering and pagination."""
     # Ensure limit and offset are integers (handle string conversion from query params)
     try:
@@ -389,6 +445,9 @@ def pg_get_all_posts(limit: int = 1000, offset: int = 0,
     if search:
         conditions.append("content ILIKE %s")
         params.append(f"%{search}%")
+    if date_from:
+        conditions.append("created_at >= %s::date")
+        params.append(date_from)
     
     where_clause = " AND ".join(conditions) if conditions else "1=1"
     
@@ -449,11 +508,171 @@ def pg_get_post_count(source: str = None, sentiment: str = None,
         return cur.fetchone()['count']
 
 
+# Opportunity score (0-100) used to rank posts on the Improvements page:
+# relevance (0-30) + sentiment (0-40, negative first) + recency (0-20).
+# Computed in SQL so filtering, sorting and pagination stay in the database.
+OPPORTUNITY_SCORE_SQL = """
+    LEAST(
+        LEAST(COALESCE(relevance_score, 0) * 30, 30)
+        + CASE sentiment_label WHEN 'negative' THEN 40 WHEN 'neutral' THEN 15 ELSE 5 END
+        + CASE
+            WHEN created_at IS NULL THEN 0
+            WHEN created_at >= NOW() - INTERVAL '7 days' THEN 20
+            WHEN created_at >= NOW() - INTERVAL '30 days' THEN 15
+            WHEN created_at >= NOW() - INTERVAL '90 days' THEN 10
+            ELSE 5
+          END,
+        100
+    )
+"""
+
+
+def pg_get_posts_for_improvement(limit: int = 20, offset: int = 0,
+                                 sort_by: str = 'opportunity_score',
+                                 search: str = None, language: str = None,
+                                 source: str = None, date_from: str = None) -> Dict[str, Any]:
+    """
+    Get one page of posts ranked for improvement review, with the exact total.
+    
+    Filters are WHERE clauses (source/date use idx_posts_lower_source_date,
+    search uses the trigram index) and only the requested page is returned.
+    
+    Returns:
+        Dict with 'posts' (each with 'opportunity_score') and 'total'
+    """
+    conditions = [
+        "(is_false_positive = FALSE OR is_false_positive IS NULL)",
+        # Skip sample posts
+        "COALESCE(url, '') NOT LIKE '%%/sample%%'",
+        "COALESCE(url, '') NOT LIKE '%%example.com%%'",
+    ]
+    params: List[Any] = []
+    
+    if date_from:
+        conditions.append("created_at >= %s::date")
+        params.append(date_from)
+    if search:
+        conditions.append("content ILIKE %s")
+        params.append(f"%{search}%")
+    if language and language != 'all':
+        conditions.append("language = %s")
+        params.append(language.lower())
+    if source and source != 'all':
+        source_lower = source.lower()
+        if source_lower == 'github':
+            # GitHub Issues / Discussions were merged into GitHub
+            conditions.append("LOWER(source) IN ('github', 'github issues', 'github discussions')")
+        else:
+            conditions.append("LOWER(source) = %s")
+            params.append(source_lower)
+    
+    where_clause = " AND ".join(conditions)
+    order_by = {
+        'opportunity_score': "opportunity_score DESC, created_at DESC NULLS LAST",
+        'created_at': "created_at DESC NULLS LAST",
+        'relevance_score': "relevance_score DESC NULLS LAST",
+    }.get(sort_by, "opportunity_score DESC, created_at DESC NULLS LAST")
+    
+    with get_pg_cursor() as cur:
+        cur.execute(f"SELECT COUNT(*) AS count FROM posts WHERE {where_clause}", params)
+        total = cur.fetchone()['count']
+        
+        cur.execute(f"""
+            SELECT *, ROUND(({OPPORTUNITY_SCORE_SQL})::numeric, 1)::float AS opportunity_score
+            FROM posts
+            WHERE {where_clause}
+            ORDER BY {order_by}, id DESC
+            LIMIT %s OFFSET %s
+        """, params + [limit, offset])
+        posts = [dict(row) for row in cur.fetchall()]
+    
+    return {'posts': posts, 'total': total}
+
+
 def pg_delete_post(post_id: int) -> bool:
     """Delete a post by ID."""
     with get_pg_cursor() as cur:
-        cur.execute("DELETE FROM posts WHERE id = %s", (post_id,))
-        return cur.rowcount > 0
+        cur.execute("""
+            DELETE FROM posts p WHERE p.id = %s
+            RETURNING DATE(COALESCE(p.created_at, p.inserted_at)) AS day
+        """, (post_id,))
+        deleted = cur.fetchone()
+    if deleted:
+        _refresh_tag_rollups_safely(days=[deleted['day']])
+    return deleted is not None
+
+
+def pg_update_post_product_label(post_id: int, product: Optional[str]) -> bool:
+    """Set (or clear with None) the product label of a post."""
+    with get_pg_cursor() as cur:
+        cur.execute("UPDATE posts SET product = %s WHERE id = %s", (product, post_id))
+        updated = cur.rowcount > 0
+    if updated:
+        _refresh_tag_rollups_safely([post_id])
+    return updated
+
+
+def pg_update_all_posts_product_labels(limit: Optional[int] = None, batch_size: int = 1000) -> Dict[str, Any]:
+    """
+    Re-detect the product label of posts (most recent first) with the shared
+    classifier and write the changed ones with one UPDATE per batch.
+    
+    Args:
+        limit: Maximum number of posts to process (None = all posts)
+        batch_size: Posts processed per round-trip
+    """
+    from psycopg2.extras import execute_values
+    from .analysis import classifier
+    
+    detector = classifier.get_product_classifier()
+    total = updated = errors = 0
+    last_id = None
+    
+    while limit is None or total < limit:
+        size = batch_size if limit is None else min(batch_size, limit - total)
+        with get_pg_cursor() as cur:
+            cur.execute("""
+                SELECT id, content, product FROM posts
+                WHERE %(last_id)s::bigint IS NULL OR id < %(last_id)s
+                ORDER BY id DESC
+                LIMIT %(size)s
+            """, {'last_id': last_id, 'size': size})
+            rows = cur.fetchall()
+        if not rows:
+            break
+        total += len(rows)
+        last_id = rows[-1]['id']
+        
+        changes = []
+        for row in rows:
+            try:
+                product = detector.detect_product(row['content'] or '')
+            except Exception as e:
+                errors += 1
+                logger.warning(f"Error detecting product for post {row['id']}: {e}")
+                continue
+            if product != row['product']:
+                changes.append((row['id'], product))
+        
+        if changes:
+            with get_pg_cursor() as cur:
+                execute_values(cur, """
+                    UPDATE posts SET product = v.product
+                    FROM (VALUES %s) AS v(id, product)
+                    WHERE posts.id = v.id
+                """, changes, template="(%s, %s::varchar)", page_size=len(changes))
+                updated += cur.rowcount
+    
+    if updated:
+        _refresh_tag_rollups_safely()
+    logger.info(f"Product labels: {updated} updated out of {total} posts ({errors} errors)")
+    return {
+        'success': True,
+        'total_posts': total,
+        'updated_count': updated,
+        'unchanged_count': total - updated - errors,
+        'error_count': errors,
+    }
 
 
 def pg_url_exists(url: str) -> bool:
@@ -472,7 +691,10 @@ def pg_delete_duplicate_posts() -> int:
                 SELECT MIN(id) FROM posts GROUP BY url
             )
         """)
-        return cur.rowcount
+        deleted = cur.rowcount
+    if deleted:
+        _refresh_tag_rollups_safely()
+    return deleted
 
 
 def pg_delete_sample_posts() -> int:
@@ -485,7 +707,10 @@ def pg_delete_sample_posts() -> int:
                OR url LIKE '%/status/174%'
                OR url = 'https://trustpilot.com/sample'
         """)
-        return cur.rowcount
+        deleted = cur.rowcount
+    if deleted:
+        _refresh_tag_rollups_safely()
+    return deleted
 
 
 def pg_delete_non_ovh_posts() -> int:
@@ -506,14 +731,20 @@ def pg_delete_non_ovh_posts() -> int:
               AND LOWER(url) NOT LIKE '%kimsufi%'
               AND LOWER(url) NOT LIKE '%soyoustart%'
         """)
-        return cur.rowcount
+        deleted = cur.rowcount
+    if deleted:
+        _refresh_tag_rollups_safely()
+    return deleted
 
 
 def pg_delete_hackernews_posts() -> int:
     """Delete all posts from Hacker News (replaced by Reddit)."""
     with get_pg_cursor() as cur:
         cur.execute("DELETE FROM posts WHERE source = 'HackerNews' OR source = 'hackernews'")
-        return cur.rowcount
+        deleted = cur.rowcount
+    if deleted:
+        _refresh_tag_rollups_safely()
+    return deleted
 
 
 # ============================================
@@ -559,6 +790,33 @@ def pg_get_language_stats() -> Dict[str, int]:
         return {row['language']: row['count'] for row in cur.fetchall()}
 
 
+
+def pg_get_posts_by_language(language: str, limit: int = 500) -> List[Dict]:
+    """Get id and content of the most recent posts with the given language."""
+    with get_pg_cursor() as cur:
+        cur.execute("""
+            SELECT id, content, url, source FROM posts
+            WHERE language = %s
+            ORDER BY id DESC
+            LIMIT %s
+        """, (language, limit))
+        return [dict(row) for row in cur.fetchall()]
+
+
+def pg_update_posts_language(changes: List[Tuple[int, str]]) -> int:
+    """Set the language of several posts with one UPDATE; returns the number of rows changed."""
+    from psycopg2.extras import execute_values
+    
+    if not changes:
+        return 0
+    with get_pg_cursor() as cur:
+        execute_values(cur, """
+            UPDATE posts SET language = v.language
+            FROM (VALUES %s) AS v(id, language)
+            WHERE posts.id = v.id AND posts.language IS DISTINCT FROM v.language
+        """, changes, template="(%s, %s::varchar)", page_size=len(changes))
+        return cur.rowcount
+
 def pg_get_timeline_stats(days: int = 30) -> List[Dict]:
     """Get posts per day for timeline chart (excluding false positives)."""
     with get_pg_cursor() as cur:
@@ -617,6 +875,242 @@ def pg_get_answered_stats() -> Dict[str, Any]:
         }
 
 
+def _dashboard_filter_clause(date_from: str = None, date_to: str = None, source: str = None,
+                             sentiment: str = None, language: str = None, product: str = None,
+                             search: str = None, answered: Optional[bool] = None) -> Tuple[str, List[Any]]:
+    """WHERE clause of the dashboard filters (same semantics as the dashboard state filters)."""
+    conditions = [
+        "(is_false_positive = FALSE OR is_false_positive IS NULL)",
+        # Sample posts and posts with no OVH relevance are not shown on the dashboard
+        # (a stored score of 0 still counts if the post mentions an OVH brand, like
+        # calculateRelevanceScore in the dashboard)
+        "COALESCE(url, '') NOT LIKE ALL (ARRAY['%%/sample%%', '%%example.com%%', '%%/status/174%%'])",
+        """(relevance_score > 0 OR LOWER(content) LIKE '%%ovh%%' OR LOWER(content) LIKE '%%kimsufi%%'
+            OR LOWER(url) LIKE '%%ovh%%' OR LOWER(url) LIKE '%%kimsufi%%'
+            OR LOWER(content || ' ' || COALESCE(author, '')) ~ '(michel|octave|henryk)[ -](paulin|klaba)|famille klaba|klaba family')""",
+    ]
+    params: List[Any] = []
+    
+    if date_from:
+        conditions.append("created_at >= %s::date")
+        params.append(date_from)
+    if date_to:
+        conditions.append("created_at < %s::date + 1")
+        params.append(date_to)
+    if source:
+        # 'GitHub' covers GitHub Issues / Discussions, 'Mastodon' every instance
+        if source == 'GitHub':
+            conditions.append("source IN ('GitHub', 'GitHub Issues', 'GitHub Discussions')")
+        elif source == 'Mastodon':
+            conditions.append("(source = 'Mastodon' OR source LIKE %s)")
+            params.append('Mastodon (%')
+        else:
+            conditions.append("source = %s")
+            params.append(source)
+    if sentiment:
+        conditions.append("sentiment_label = %s")
+        params.append(sentiment)
+    if language:
+        conditions.append("LOWER(language) = LOWER(%s)")
+        params.append(language)
+    if product:
+        conditions.append("product = %s")
+        params.append(product)
+    if search:
+        conditions.append("(content ILIKE %s OR author ILIKE %s OR url ILIKE %s OR source ILIKE %s OR product ILIKE %s)")
+        params.extend([f"%{search}%"] * 5)
+    if answered is not None:
+        conditions.append("is_answered = 1" if answered else "(is_answered = 0 OR is_answered IS NULL)")
+    
+    return " AND ".join(conditions), params
+
+
+def pg_get_dashboard_aggregates(limit: int = 50, offset: int = 0, sort_by: str = 'created_at',
+                                sort_order: str = 'DESC', **filters) -> Dict[str, Any]:
+    """
+    Every dashboard chart series for a filter set (see _dashboard_filter_clause),
+    computed with grouped queries in one transaction, plus one page of the
+    matching posts (most recent first unless sort_by / sort_order say otherwise).
+    """
+    where_clause, params = _dashboard_filter_clause(**filters)
+    
+    # Validate sort parameters
+    valid_sort_cols = ['created_at', 'sentiment_score', 'relevance_score', 'source']
+    sort_col = sort_by if sort_by in valid_sort_cols else 'created_at'
+    sort_dir = 'ASC' if sort_order.upper() == 'ASC' else 'DESC'
+    
+    with get_pg_cursor() as cur:
+        cur.execute(f"""
+            SELECT COUNT(*)::int AS total,
+                   COUNT(*) FILTER (WHERE is_answered = 1)::int AS answered,
+                   COUNT(country)::int AS with_country
+            FROM posts WHERE {where_clause}
+        """, params)
+        totals = cur.fetchone()
+        
+        def grouped(column: str) -> List[Dict[str, Any]]:
+            cur.execute(f"""
+                SELECT {column} AS key, COUNT(*)::int AS count,
+                       COUNT(*) FILTER (WHERE sentiment_label = 'positive')::int AS positive,
+                       COUNT(*) FILTER (WHERE sentiment_label = 'negative')::int AS negative
+                FROM posts WHERE {where_clause}
+                GROUP BY {column}
+                ORDER BY count DESC
+            """, params)
+            return [dict(row) for row in cur.fetchall()]
+        
+        sentiment = {row['key'] or 'neutral': row['count'] for row in grouped('sentiment_label')}
+        sources = [{'source': row['key'], 'count': row['count'], 'positive': row['positive'],
+                    'negative': row['negative']}
+                   for row in grouped('source')]
+        languages = {row['key'] or 'unknown': row['count'] for row in grouped('language')}
+        products = [{'product': row['key'], 'count': row['count'], 'negative': row['negative']}
+                    for row in grouped('product') if row['key']]
+        countries = {row['key']: row['count'] for row in grouped('country') if row['key']}
+        
+        cur.execute(f"""
+            SELECT DATE(created_at) AS date, COUNT(*)::int AS count,
+                   COUNT(*) FILTER (WHERE sentiment_label = 'positive')::int AS positive,
+                   COUNT(*) FILTER (WHERE sentiment_label = 'negative')::int AS negative,
+                   COUNT(*) FILTER (WHERE sentiment_label IS NULL
+                                    OR sentiment_label NOT IN ('positive', 'negative'))::int AS neutral
+            FROM posts WHERE {where_clause} AND created_at IS NOT NULL
+            GROUP BY DATE(created_at)
+            ORDER BY date
+        """, params)
+        timeline = [{**dict(row), 'date': str(row['date'])} for row in cur.fetchall()]
+        
+        # Products of each day (timeline tooltips and drill-down)
+        cur.execute(f"""
+            SELECT DATE(created_at) AS date, product, COUNT(*)::int AS count
+            FROM posts WHERE {where_clause} AND created_at IS NOT NULL AND product IS NOT NULL
+            GROUP BY DATE(created_at), product
+            ORDER BY date, count DESC, product
+        """, params)
+        day_products: Dict[str, List[Dict[str, Any]]] = {}
+        for row in cur.fetchall():
+            day_products.setdefault(str(row['date']), []).append(
+                {'product': row['product'], 'count': row['count']})
+        for day in timeline:
+            day['products'] = day_products.get(day['date'], [])
+        
+        posts = []
+        if limit > 0:
+            cur.execute(f"""
+                SELECT * FROM posts WHERE {where_clause}
+                ORDER BY {sort_col} {sort_dir} NULLS LAST, id {sort_dir}
+                LIMIT %s OFFSET %s
+            """, params + [limit, offset])
+            posts = [dict(row) for row in cur.fetchall()]
+    
+    return {
+        'total': totals['total'],
+        'sentiment': sentiment,
+        'sources': sources,
+        'languages': languages,
+        'products': products,
+        'countries': countries,
+        'total_with_country': totals['with_country'],
+        'timeline': timeline,
+        'answered': {'answered': totals['answered'], 'unanswered': totals['total'] - totals['answered']},
+        'posts': posts,
+    }
+
+
+# Days a deleted post id is kept in post_tombstones: a /api/posts/changes cursor
+# older than this gets reset=true (the client reloads everything)
+POST_TOMBSTONE_RETENTION_DAYS = int(os.getenv('POST_TOMBSTONE_RETENTION_DAYS', '30'))
+
+
+def pg_get_post_changes(since_xid: Optional[str] = None, since_id: int = 0,
+                        limit: int = 500) -> Dict[str, Any]:
+    """
+    Posts inserted / updated and post ids deleted after a change cursor.
+    
+    Every write stamps posts.change_xid (and updated_at) with the id of its
+    transaction, deletes leave a row in post_tombstones (see the posts_change
+    triggers). The cursor is a (transaction id, post id) pair: unlike
+    updated_at, it only moves past transactions that are committed, so a
+    long transaction committing late is not skipped. Only changes of
+    transactions older than the oldest one still running are returned.
+    
+    Without since_xid, returns no changes and the cursor of "now" (to take
+    before a full load of the posts).
+    
+    Returns {'posts', 'deleted', 'next_xid', 'next_id', 'has_more'}.
+    """
+    with get_pg_cursor() as cur:
+        cur.execute("SELECT pg_snapshot_xmin(pg_current_snapshot())::text AS xmin")
+        xmin = cur.fetchone()['xmin']
+        if since_xid is None:
+            return {'posts': [], 'deleted': [], 'next_xid': xmin, 'next_id': 0, 'has_more': False}
+        
+        cur.execute("""
+            SELECT * FROM posts
+            WHERE (change_xid, id) > (%s::xid8, %s) AND change_xid < %s::xid8
+            ORDER BY change_xid, id
+            LIMIT %s
+        """, (since_xid, since_id, xmin, limit + 1))
+        posts = [dict(row) for row in cur.fetchall()]
+        has_more = len(posts) > limit
+        if has_more:
+            posts = posts[:limit]
+            # The rest of the last transaction's posts come with the next page
+            next_xid, next_id = str(posts[-1]['change_xid']), posts[-1]['id']
+        else:
+            next_xid, next_id = xmin, 0
+        
+        cur.execute("""
+            SELECT post_id FROM post_tombstones
+            WHERE change_xid >= %s::xid8 AND change_xid < %s::xid8
+            ORDER BY post_id
+        """, (since_xid, next_xid))
+        deleted = [row['post_id'] for row in cur.fetchall()]
+    
+    for post in posts:
+        post.pop('change_xid', None)
+    return {'posts': posts, 'deleted': deleted, 'next_xid': next_xid, 'next_id': next_id,
+            'has_more': has_more}
+
+
+def pg_prune_post_tombstones(retention_days: int = POST_TOMBSTONE_RETENTION_DAYS) -> int:
+    """Delete the tombstones of posts deleted more than `retention_days` ago."""
+    with get_pg_cursor() as cur:
+        cur.execute("DELETE FROM post_tombstones WHERE deleted_at < NOW() - %s * INTERVAL '1 day'",
+                    (retention_days,))
+        return cur.rowcount
+
+
+def pg_iter_posts(filters: Optional[Dict[str, Any]] = None, batch_size: int = 1000,
+                  columns: Optional[List[str]] = None) -> Generator[Dict[str, Any], None, None]:
+    """
+    Yield the posts matching the dashboard filters (see _dashboard_filter_clause),
+    most recent first, without loading them all in memory.
+    
+    Rows come from a named (server-side) cursor, `batch_size` rows per round
+    trip. The pool connection is held until the generator is exhausted or
+    closed: consume it promptly (streamed responses, maintenance scripts).
+    """
+    where_clause, params = _dashboard_filter_clause(**(filters or {}))
+    if columns and not all(column.isidentifier() for column in columns):
+        raise ValueError(f"Invalid column names: {columns}")
+    select = ", ".join(columns) if columns else "*"
+    
+    with get_pg_connection() as conn:
+        cur = conn.cursor(name=f"iter_posts_{uuid.uuid4().hex}", cursor_factory=RealDictCursor)
+        cur.itersize = batch_size
+        try:
+            cur.execute(f"""
+                SELECT {select} FROM posts
+                WHERE {where_clause}
+                ORDER BY created_at DESC NULLS LAST, id DESC
+            """, params)
+            for row in cur:
+                yield dict(row)
+        finally:
+            cur.close()
+
+
 def pg_reset_all_answered_status() -> int:
     """Reset all posts to unanswered (is_answered = 0) except those explicitly marked as answered."""
     with get_pg_cursor() as cur:
@@ -682,9 +1176,39 @@ def pg_add_scraping_log(source: str, level: str, message: str,
         return cur.fetchone()['id']
 
 
+def pg_add_scraping_logs(entries: List[Tuple]) -> int:
+    """Insert a batch of scraping logs in one statement.
+    
+    Args:
+        entries: (timestamp, source, level, message, details) tuples
+    
+    Returns:
+        Number of rows inserted
+    """
+    from psycopg2.extras import execute_values
+    
+    if not entries:
+        return 0
+    values = [(ts, source, level, message, Json(details) if details else None)
+              for ts, source, level, message, details in entries]
+    with get_pg_cursor() as cur:
+        execute_values(cur, """
+            INSERT INTO scraping_logs (timestamp, source, level, message, details)
+            VALUES %s
+        """, values, page_size=len(values))
+        return cur.rowcount
+
+
 def pg_get_scraping_logs(limit: int = 100, source: str = None, 
-                         level: str = None, offset: int = 0) -> List[Dict]:
-    """Get scraping logs with filtering and pagination."""
+                         level: str = None, offset: int = 0,
+                         before: Optional[Tuple[Any, int]] = None) -> List[Dict]:
+    """Get scraping logs with filtering and pagination, newest first.
+    
+    Args:
+        before: Keyset cursor (timestamp, id) of the last log of the previous
+            page; only older logs are returned. Prefer it to `offset`, which
+            has to skip all the previous rows.
+    """
     # Ensure limit and offset are integers
     try:
         limit = int(limit) if limit is not None else 100
@@ -706,6 +1230,9 @@ def pg_get_scraping_logs(limit: int = 100, source: str = None,
     if level:
         conditions.append("level = %s")
         params.append(level)
+    if before:
+        conditions.append("(timestamp, id) < (%s, %s)")
+        params.extend(before)
     
     where_clause = " AND ".join(conditions) if conditions else "1=1"
     
@@ -713,12 +1240,184 @@ def pg_get_scraping_logs(limit: int = 100, source: str = None,
         cur.execute(f"""
             SELECT * FROM scraping_logs 
             WHERE {where_clause}
-            ORDER BY timestamp DESC 
+            ORDER BY timestamp DESC, id DESC
             LIMIT %s OFFSET %s
         """, params + [limit, offset])
         return [dict(row) for row in cur.fetchall()]
 
 
+# Daily partitions of scraping_logs are named scraping_logs_pYYYYMMDD; rows
+# outside every partition land in scraping_logs_default
+SCRAPING_LOG_RETENTION_DAYS = int(os.getenv('SCRAPING_LOG_RETENTION_DAYS', '30'))
+SCRAPING_LOG_PARTITION_PREFIX = 'scraping_logs_p'
+
+
+def _scraping_log_partitions(cur) -> Dict[Any, str]:
+    """Daily partitions of scraping_logs, by day."""
+    cur.execute("""
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'scraping_logs'::regclass
+    """)
+    partitions = {}
+    for row in cur.fetchall():
+        name = row['relname']
+        if name.startswith(SCRAPING_LOG_PARTITION_PREFIX):
+            try:
+                day = datetime.strptime(name[len(SCRAPING_LOG_PARTITION_PREFIX):], '%Y%m%d').date()
+            except ValueError:
+                continue
+            partitions[day] = name
+    return partitions
+
+
+def _scraping_logs_partitioned(cur) -> bool:
+    cur.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass('scraping_logs')")
+    row = cur.fetchone()
+    return bool(row) and row['relkind'] == 'p'
+
+
+def pg_ensure_scraping_log_partitions(days_ahead: int = 3) -> int:
+    """Create the daily scraping_logs partitions from today to today + days_ahead.
+    
+    Rows already written to the default partition for a new day are moved to
+    it before it is attached. Returns the number of partitions created.
+    """
+    with get_pg_cursor() as cur:
+        if not _scraping_logs_partitioned(cur):
+            return 0
+        cur.execute("SELECT CURRENT_DATE AS today")
+        today = cur.fetchone()['today']
+        existing = _scraping_log_partitions(cur)
+    
+    created = 0
+    for offset in range(days_ahead + 1):
+        day = today + timedelta(days=offset)
+        if day in existing:
+            continue
+        name = f"{SCRAPING_LOG_PARTITION_PREFIX}{day:%Y%m%d}"
+        bounds = (day.isoformat(), (day + timedelta(days=1)).isoformat())
+        with get_pg_cursor() as cur:
+            cur.execute(f"CREATE TABLE IF NOT EXISTS {name} (LIKE scraping_logs INCLUDING DEFAULTS)")
+            cur.execute(f"""
+                WITH moved AS (
+                    DELETE FROM scraping_logs_default
+                    WHERE timestamp >= %s::timestamptz AND timestamp < %s::timestamptz
+                    RETURNING *
+                )
+                INSERT INTO {name} SELECT * FROM moved
+            """, bounds)
+            cur.execute(f"""
+                ALTER TABLE scraping_logs ATTACH PARTITION {name}
+                FOR VALUES FROM (%s) TO (%s)
+            """, bounds)
+        created += 1
+    return created
+
+
+def pg_drop_scraping_log_partitions(older_than_days: int = SCRAPING_LOG_RETENTION_DAYS) -> int:
+    """Drop the daily partitions (and default partition rows) older than `older_than_days`.
+    
+    Returns the number of log rows removed.
+    """
+    with get_pg_cursor() as cur:
+        if not _scraping_logs_partitioned(cur):
+            cur.execute("DELETE FROM scraping_logs WHERE timestamp < NOW() - %s * INTERVAL '1 day'",
+                        (older_than_days,))
+            return cur.rowcount
+        cur.execute("SELECT CURRENT_DATE - %s AS cutoff", (older_than_days,))
+        cutoff = cur.fetchone()['cutoff']
+        expired = [name for day, name in _scraping_log_partitions(cur).items() if day < cutoff]
+    
+    deleted = 0
+    for name in expired:
+        with get_pg_cursor() as cur:
+            cur.execute(f"SELECT COUNT(*) AS count FROM {name}")
+            deleted += cur.fetchone()['count']
+            cur.execute(f"DROP TABLE {name}")
+    with get_pg_cursor() as cur:
+        cur.execute("DELETE FROM scraping_logs_default WHERE timestamp < %s::timestamptz",
+                    (cutoff.isoformat(),))
+        deleted += cur.rowcount
+    return deleted
+
+
+def pg_maintain_scraping_logs(retention_days: int = SCRAPING_LOG_RETENTION_DAYS) -> Dict[str, int]:
+    """Daily scraping_logs maintenance: create upcoming partitions, drop expired ones."""
+    created = pg_ensure_scraping_log_partitions()
+    deleted = pg_drop_scraping_log_partitions(retention_days)
+    return {'partitions_created': created, 'logs_deleted': deleted}
+
+
+# ============================================
+# Scrape watermarks (incremental scraping)
+# ============================================
+
+def _watermark_query_key(query: str) -> str:
+    """Queries differing only by case / spacing share their watermark."""
+    return ' '.join((query or '').lower().split())
+
+
+def pg_get_scrape_watermark(source: str, query: str) -> Optional[Dict[str, Any]]:
+    """Newest item seen by the previous scrapes of (source, query), None if never scraped."""
+    with get_pg_cursor() as cur:
+        cur.execute("""
+            SELECT source, query_key, newest_created_at, newest_external_id, updated_at
+            FROM scrape_watermarks WHERE source = %s AND query_key = %s
+        """, (source, _watermark_query_key(query)))
+        row = cur.fetchone()
+        return dict(row) if row else None
+
+
+def pg_advance_scrape_watermark(source: str, query: str, newest_created_at: datetime,
+                                newest_external_id: Optional[str] = None) -> bool:
+    """Record the newest item of a scrape of (source, query); a watermark never moves back.
+    
+    Returns True if the watermark moved.
+    """
+    with get_pg_cursor() as cur:
+        cur.execute("""
+            INSERT INTO scrape_watermarks (source, query_key, newest_created_at, newest_external_id, updated_at)
+            VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP)
+            ON CONFLICT (source, query_key) DO UPDATE
+            SET newest_created_at = EXCLUDED.newest_created_at,
+                newest_external_id = EXCLUDED.newest_external_id,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE scrape_watermarks.newest_created_at < EXCLUDED.newest_created_at
+        """, (source, _watermark_query_key(query), newest_created_at, newest_external_id))
+        return cur.rowcount > 0
+
+
+def pg_clear_scrape_watermarks(source: str = None) -> int:
+    """Forget the watermarks (of a source): its next scrapes paginate fully again."""
+    with get_pg_cursor() as cur:
+        if source:
+            cur.execute("DELETE FROM scrape_watermarks WHERE source = %s", (source,))
+        else:
+            cur.execute("DELETE FROM scrape_watermarks")
+        return cur.rowcount
+
+
+def pg_clear_scraping_logs(source: str = None, older_than_days: int = None) -> int:
+    """Delete scraping logs, optionally only for a source and/or older than N days."""
+    if older_than_days is not None and not source:
+        return pg_drop_scraping_log_partitions(older_than_days)
+    
+    conditions = []
+    params = []
+    if source:
+        conditions.append("source = %s")
+        params.append(source)
+    if older_than_days is not None:
+        conditions.append("timestamp < NOW() - %s * INTERVAL '1 day'")
+        params.append(older_than_days)
+    where_clause = " AND ".join(conditions) if conditions else "TRUE"
+    
+    with get_pg_cursor() as cur:
+        cur.execute(f"DELETE FROM scraping_logs WHERE {where_clause}", params)
+        return cur.rowcount
+
+
 # ============================================
 # Job Queue Operations
 # ============================================
@@ -789,22 +1488,61 @@ def pg_update_job_status(job_id: str, status: str,
         if status == 'running':
             cur.execute("""
                 UPDATE jobs 
-                SET status = %s, started_at = NOW()
+                SET status = %s, started_at = NOW(), updated_at = NOW()
                 WHERE id = %s
             """, (status, job_id))
         elif status in ('completed', 'failed', 'cancelled'):
             cur.execute("""
                 UPDATE jobs 
-                SET status = %s, completed_at = NOW(), error = %s
+                SET status = %s, completed_at = NOW(), updated_at = NOW(), error = %s
                 WHERE id = %s
             """, (status, error_message, job_id))
         else:
             cur.execute("""
-                UPDATE jobs SET status = %s WHERE id = %s
+                UPDATE jobs SET status = %s, updated_at = NOW() WHERE id = %s
             """, (status, job_id))
         return cur.rowcount > 0
 
 
+def pg_update_job_progress(job_id: str, total: int, completed: int) -> bool:
+    """Store the progress of a job (payload.progress and the percentage column)."""
+    with get_pg_cursor() as cur:
+        cur.execute("""
+            UPDATE jobs
+            SET payload = COALESCE(payload, '{}'::jsonb)
+                          || jsonb_build_object('progress', jsonb_build_object('total', %s, 'completed', %s)),
+                progress = %s,
+                updated_at = NOW()
+            WHERE id = %s
+        """, (total, completed, int(completed * 100 / total) if total else 0, job_id))
+        return cur.rowcount > 0
+
+
+def pg_append_job_error(job_id: str, error: str) -> bool:
+    """Append an error message to payload.errors of a job."""
+    with get_pg_cursor() as cur:
+        cur.execute("""
+            UPDATE jobs
+            SET payload = COALESCE(payload, '{}'::jsonb)
+                          || jsonb_build_object('errors', COALESCE(payload->'errors', '[]'::jsonb) || to_jsonb(%s::text)),
+                updated_at = NOW()
+            WHERE id = %s
+        """, (error, job_id))
+        return cur.rowcount > 0
+
+
+def pg_append_job_result(job_id: str, result: Dict) -> bool:
+    """Append a partial result to the result list of a job."""
+    with get_pg_cursor() as cur:
+        cur.execute("""
+            UPDATE jobs
+            SET result = CASE WHEN jsonb_typeof(result) = 'array' THEN result ELSE '[]'::jsonb END || %s,
+                updated_at = NOW()
+            WHERE id = %s
+        """, (Json([result]), job_id))
+        return cur.rowcount > 0
+
+
 def pg_save_job_result(job_id: str, job_type: str, status: str,
                        result: Dict, duration: float) -> str:
     """Save job result for history."""
@@ -861,6 +1599,370 @@ def pg_delete_base_keyword(category: str, keyword: str) -> bool:
         return cur.rowcount > 0
 
 
+# ============================================
+# Post Tags & Aggregates (pain points / products)
+# ============================================
+# post_tags stores the pain points and products matched by each post
+# (app.analysis.classifier); post_tag_daily rolls them up per day, tag,
+# sentiment and product label so that /api/pain-points and
+# /api/product-opportunities are GROUP BY queries on a small table.
+
+# Day a post is counted on in the rollups (posts without created_at use insertion time).
+# DATE() of a timestamptz cannot be indexed, so day filters compare the
+# indexed _POST_TIME_SQL with the day bounds instead
+_POST_TIME_SQL = "COALESCE(p.created_at, p.inserted_at)"
+_POST_DAY_SQL = f"DATE({_POST_TIME_SQL})"
+
+# Advisory locks serializing rollup rebuilds: a full rebuild holds the
+# namespace lock exclusively, day rebuilds hold it shared plus one lock per day
+_ROLLUP_LOCK_SQL = "hashtext('post_tag_daily')"
+
+
+# Pain point definitions are read on every insert batch; other API workers
+# pick up changes after at most PAIN_POINTS_CACHE_TTL seconds
+PAIN_POINTS_CACHE_TTL = 60
+_pain_point_definitions_cache: Dict[str, Any] = {'definitions': None, 'loaded_at': 0.0}
+
+
+def pg_save_pain_points(pain_points: List[Dict[str, Any]]) -> int:
+    """Replace all pain point definitions (title, icon, keywords, enabled)."""
+    with get_pg_cursor() as cur:
+        cur.execute("DELETE FROM pain_points")
+        for pp in pain_points:
+            cur.execute("""
+                INSERT INTO pain_points (title, icon, keywords, enabled)
+                VALUES (%s, %s, %s, %s)
+            """, (pp['title'], pp.get('icon'), Json(pp.get('keywords', [])),
+                  1 if pp.get('enabled', True) else 0))
+    invalidate_pain_point_definitions()
+    return len(pain_points)
+
+
+def invalidate_pain_point_definitions() -> None:
+    """Drop the cached pain point definitions (reloaded on next use)."""
+    _pain_point_definitions_cache['definitions'] = None
+
+
+def pg_get_pain_point_definitions() -> Dict[str, Dict]:
+    """Current pain point definitions (database, or defaults), cached for PAIN_POINTS_CACHE_TTL."""
+    import time
+    from .analysis import classifier
+    
+    cache = _pain_point_definitions_cache
+    if cache['definitions'] is None or time.monotonic() - cache['loaded_at'] > PAIN_POINTS_CACHE_TTL:
+        cache['definitions'] = classifier.build_pain_point_definitions(pg_get_pain_points(enabled_only=True))
+        cache['loaded_at'] = time.monotonic()
+    return cache['definitions']
+
+
+def _rebuild_tag_rollups(cur, days: Optional[List[Any]] = None) -> None:
+    """
+    Recompute post_tag_daily for the given days (all days if None).
+    
+    Concurrent rebuilds of the same day wait for each other (transaction-level
+    advisory locks) instead of failing on the primary key.
+    """
+    if days is None:
+        cur.execute(f"SELECT pg_advisory_xact_lock({_ROLLUP_LOCK_SQL})")
+        cur.execute("DELETE FROM post_tag_daily")
+        day_sql, day_join, params = _POST_DAY_SQL, "", ()
+    else:
+        cur.execute(f"SELECT pg_advisory_xact_lock_shared({_ROLLUP_LOCK_SQL})")
+        # Always lock days in the same order so two rebuilds cannot deadlock
+        for day in sorted(days):
+            cur.execute(f"SELECT pg_advisory_xact_lock({_ROLLUP_LOCK_SQL}, %s::date - DATE '2000-01-01')", (day,))
+        cur.execute("DELETE FROM post_tag_daily WHERE day = ANY(%s::date[])", (days,))
+        day_sql = "d.day"
+        day_join = f"""JOIN unnest(%s::date[]) AS d(day)
+            ON {_POST_TIME_SQL} >= d.day AND {_POST_TIME_SQL} < d.day + 1"""
+        params = (days,)
+    cur.execute(f"""
+        INSERT INTO post_tag_daily (day, tag_type, tag, sentiment_label, product, post_count, relevance_sum)
+        SELECT {day_sql}, t.tag_type, t.tag, COALESCE(p.sentiment_label, ''), COALESCE(p.product, ''),
+               COUNT(*), SUM(COALESCE(NULLIF(p.relevance_score, 0), 0.3))
+        FROM post_tags pt
+        JOIN posts p ON p.id = pt.post_id
+        {day_join}
+        CROSS JOIN LATERAL (
+            SELECT 'pain_point' AS tag_type, unnest(pt.pain_points) AS tag
+            UNION ALL
+            SELECT 'product', unnest(pt.products)
+        ) t
+        WHERE (p.is_false_positive = FALSE OR p.is_false_positive IS NULL)
+        GROUP BY 1, 2, 3, 4, 5
+    """, params)
+
+
+def pg_refresh_tag_rollups(post_ids: Optional[List[int]] = None, days: Optional[List[Any]] = None) -> None:
+    """
+    Recompute the daily rollups for the days of the given posts (or the given
+    days), or entirely if neither is given (after bulk deletes or a re-tag).
+    """
+    with get_pg_cursor() as cur:
+        if post_ids is None and days is None:
+            _rebuild_tag_rollups(cur)
+            return
+        days = list(days or [])
+        if post_ids:
+            cur.execute(f"SELECT DISTINCT {_POST_DAY_SQL} AS day FROM posts p WHERE p.id = ANY(%s)", (list(post_ids),))
+            days += [row['day'] for row in cur.fetchall()]
+        days = sorted({day for day in days if day})
+        if days:
+            _rebuild_tag_rollups(cur, days)
+
+
+def _refresh_tag_rollups_safely(post_ids: Optional[List[int]] = None, days: Optional[List[Any]] = None) -> None:
+    """Aggregates must never break the write that triggered them."""
+    try:
+        pg_refresh_tag_rollups(post_ids, days)
+    except Exception as e:
+        logger.warning(f"Failed to refresh pain point/product rollups: {e}")
+
+
+def pg_tag_posts(posts: List[Dict[str, Any]], definitions: Dict[str, Dict] = None,
+                 refresh_rollups: bool = True) -> int:
+    """
+    Classify posts (dicts with 'id' and 'content') and upsert their tags.
+    
+    Returns:
+        Number of posts tagged
+    """
+    from psycopg2.extras import execute_values
+    from .analysis import classifier
+    
+    if not posts:
+        return 0
+    definitions = definitions or pg_get_pain_point_definitions()
+    version = classifier.definitions_version(definitions)
+    
+    all_tags = classifier.classify_many([post.get('content') or '' for post in posts], definitions)
+    values = [
+        (post['id'], tags['pain_points'], tags['products'], version)
+        for post, tags in zip(posts, all_tags)
+    ]
+    
+    with get_pg_cursor() as cur:
+        execute_values(cur, """
+            INSERT INTO post_tags (post_id, pain_points, products, definitions_version)
+            VALUES %s
+            ON CONFLICT (post_id) DO UPDATE SET
+                pain_points = EXCLUDED.pain_points,
+                products = EXCLUDED.products,
+                definitions_version = EXCLUDED.definitions_version,
+                tagged_at = NOW()
+        """, values, template="(%s, %s::text[], %s::text[], %s)")
+    
+    if refresh_rollups:
+        pg_refresh_tag_rollups([post['id'] for post in posts])
+    return len(values)
+
+
+def _tag_new_posts_safely(posts: List[Dict[str, Any]]) -> None:
+    """Tag freshly inserted posts; failures only delay them until the next re-tag."""
+    try:
+        pg_tag_posts(posts)
+    except Exception as e:
+        logger.warning(f"Failed to tag {len(posts)} new post(s): {e}")
+
+
+def pg_retag_posts(only_stale: bool = True, batch_size: int = 1000) -> Dict[str, Any]:
+    """
+    (Re)classify posts in batches and rebuild the rollups.
+    
+    Run after pain point definitions change, and at startup to backfill posts
+    that were never tagged. Guarded by an advisory lock so a single process
+    does the work when several API workers start at once.
+    
+    Args:
+        only_stale: Only posts without tags or tagged with older definitions
+        batch_size: Posts classified per round-trip
+    """
+    from .analysis import classifier
+    
+    definitions = pg_get_pain_point_definitions()
+    version = classifier.definitions_version(definitions)
+    
+    with get_pg_connection() as lock_conn:
+        lock_cur = lock_conn.cursor()
+        lock_cur.execute("SELECT pg_try_advisory_lock(hashtext('retag_posts'))")
+        if not lock_cur.fetchone()[0]:
+            logger.info("[tags] Re-tag already running in another process, skipping")
+            return {'tagged': 0, 'skipped': True}
+        try:
+            tagged = 0
+            last_id = 0
+            stale_filter = ""
+            if only_stale:
+                stale_filter = "AND (pt.post_id IS NULL OR pt.definitions_version IS DISTINCT FROM %(version)s)"
+            while True:
+                with get_pg_cursor() as cur:
+                    cur.execute(f"""
+                        SELECT p.id, p.content FROM posts p
+                        LEFT JOIN post_tags pt ON pt.post_id = p.id
+                        WHERE p.id > %(last_id)s {stale_filter}
+                        ORDER BY p.id
+                        LIMIT %(limit)s
+                    """, {'last_id': last_id, 'version': version, 'limit': batch_size})
+                    rows = [dict(row) for row in cur.fetchall()]
+                if not rows:
+                    break
+                last_id = rows[-1]['id']
+                tagged += pg_tag_posts(rows, definitions=definitions, refresh_rollups=False)
+            
+            if tagged or not only_stale:
+                pg_refresh_tag_rollups()
+            logger.info(f"[tags] Tagged {tagged} posts (definitions {version})")
+            return {'tagged': tagged, 'skipped': False, 'definitions_version': version}
+        finally:
+            lock_cur.execute("SELECT pg_advisory_unlock(hashtext('retag_posts'))")
+            lock_cur.close()
+
+
+def pg_get_pain_point_counts(days: Optional[int] = 30, limit: int = 5,
+                             product: str = None) -> List[Dict[str, Any]]:
+    """
+    Top pain points among negative/neutral posts of the last N days
+    (all time if days is None), optionally for one product label.
+    """
+    conditions = ["tag_type = 'pain_point'", "sentiment_label IN ('negative', 'neutral')"]
+    params: List[Any] = []
+    if days is not None:
+        conditions.append("day >= CURRENT_DATE - %s")
+        params.append(days)
+    if product:
+        conditions.append("LOWER(product) = LOWER(%s)")
+        params.append(product)
+    
+    where_clause = " AND ".join(conditions)
+    with get_pg_cursor() as cur:
+        cur.execute(f"""
+            SELECT tag AS title, SUM(post_count)::int AS count
+            FROM post_tag_daily
+            WHERE {where_clause}
+            GROUP BY tag
+            ORDER BY count DESC, tag
+            LIMIT %s
+        """, params + [limit])
+        return [dict(row) for row in cur.fetchall()]
+
+
+def pg_get_pain_point_samples(titles: List[str], days: Optional[int] = 30,
+                              product: str = None, per_pain_point: int = 3) -> Dict[str, List[Dict]]:
+    """Most recent sample posts for each of the given pain points."""
+    if not titles:
+        return {}
+    conditions = [
+        "pt.pain_points && %s::text[]",
+        "p.sentiment_label IN ('negative', 'neutral')",
+        "(p.is_false_positive = FALSE OR p.is_false_positive IS NULL)",
+    ]
+    params: List[Any] = [titles]
+    if days is not None:
+        conditions.append(f"{_POST_DAY_SQL} >= CURRENT_DATE - %s")
+        params.append(days)
+    if product:
+        conditions.append("LOWER(p.product) = LOWER(%s)")
+        params.append(product)
+    
+    where_clause = " AND ".join(conditions)
+    with get_pg_cursor() as cur:
+        cur.execute(f"""
+            SELECT title, id, content, source FROM (
+                SELECT t.title, p.id, LEFT(p.content, 200) AS content, p.source,
+                       ROW_NUMBER() OVER (PARTITION BY t.title ORDER BY p.created_at DESC NULLS LAST, p.id DESC) AS rn
+                FROM post_tags pt
+                JOIN posts p ON p.id = pt.post_id
+                CROSS JOIN LATERAL unnest(pt.pain_points) AS t(title)
+                WHERE {where_clause} AND t.title = ANY(%s::text[])
+            ) ranked
+            WHERE rn <= %s
+        """, params + [titles, per_pain_point])
+        samples: Dict[str, List[Dict]] = {}
+        for row in cur.fetchall():
+            samples.setdefault(row['title'], []).append(
+                {'id': row['id'], 'content': row['content'] or '', 'source': row['source'] or 'Unknown'}
+            )
+        return samples
+
+
+def pg_get_product_tag_stats(date_from: str = None) -> List[Dict[str, Any]]:
+    """
+    Per-product totals from the rollups: total posts, negative posts and the sum
+    of relevance scores of negative posts (used for the opportunity score).
+    """
+    condition = "AND day >= %s::date" if date_from else ""
+    with get_pg_cursor() as cur:
+        cur.execute(f"""
+            SELECT tag AS product,
+                   SUM(post_count)::int AS total_posts,
+                   COALESCE(SUM(post_count) FILTER (WHERE sentiment_label = 'negative'), 0)::int AS negative_posts,
+                   COALESCE(SUM(relevance_sum) FILTER (WHERE sentiment_label = 'negative'), 0)::float AS negative_relevance_sum
+            FROM post_tag_daily
+            WHERE tag_type = 'product' {condition}
+            GROUP BY tag
+        """, (date_from,) if date_from else ())
+        return [dict(row) for row in cur.fetchall()]
+
+
+# ============================================
+# Insight Snapshots (precomputed LLM analyses)
+# ============================================
+
+def pg_get_post_window_stats(days: Optional[int] = None, since_id: int = 0) -> Dict[str, Any]:
+    """
+    Sentiment counts of the posts created in the last `days` days (all posts if
+    None), false positives excluded, with the 48h / 7 days counts used for spike
+    detection, the highest post id and the number of posts with an id above
+    `since_id` (posts added since a previous count).
+    """
+    condition = "AND created_at >= CURRENT_DATE - %s" if days else ""
+    with get_pg_cursor() as cur:
+        cur.execute(f"""
+            SELECT COUNT(*)::int AS total,
+                   COUNT(*) FILTER (WHERE sentiment_label = 'positive')::int AS positive,
+                   COUNT(*) FILTER (WHERE sentiment_label = 'negative')::int AS negative,
+                   COUNT(*) FILTER (WHERE sentiment_label IS NULL
+                                    OR sentiment_label NOT IN ('positive', 'negative'))::int AS neutral,
+                   COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '48 hours')::int AS recent_total,
+                   COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '48 hours'
+                                    AND sentiment_label = 'negative')::int AS recent_negative,
+                   COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '7 days'
+                                    AND sentiment_label = 'negative')::int AS negative_7d,
+                   COUNT(*) FILTER (WHERE id > %s)::int AS new_posts,
+                   COALESCE(MAX(id), 0)::bigint AS max_id
+            FROM posts
+            WHERE (is_false_positive = FALSE OR is_false_positive IS NULL) {condition}
+        """, (since_id or 0, days) if days else (since_id or 0,))
+        return dict(cur.fetchone())
+
+
+def pg_get_insight_snapshot(kind: str, preset: str) -> Optional[Dict[str, Any]]:
+    """Get the stored snapshot of an analysis ('whats_happening', 'improvements') for a preset."""
+    with get_pg_cursor() as cur:
+        cur.execute("""
+            SELECT kind, preset, fingerprint, payload, computed_at, duration_seconds
+            FROM insight_snapshots WHERE kind = %s AND preset = %s
+        """, (kind, preset))
+        row = cur.fetchone()
+        return dict(row) if row else None
+
+
+def pg_save_insight_snapshot(kind: str, preset: str, fingerprint: Dict[str, Any],
+                             payload: Dict[str, Any], duration_seconds: float = None) -> bool:
+    """Store (replace) the snapshot of an analysis for a preset."""
+    with get_pg_cursor() as cur:
+        cur.execute("""
+            INSERT INTO insight_snapshots (kind, preset, fingerprint, payload, computed_at, duration_seconds)
+            VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP, %s)
+            ON CONFLICT (kind, preset) DO UPDATE SET
+                fingerprint = EXCLUDED.fingerprint,
+                payload = EXCLUDED.payload,
+                computed_at = EXCLUDED.computed_at,
+                duration_seconds = EXCLUDED.duration_seconds
+        """, (kind, preset, Json(fingerprint), Json(payload), duration_seconds))
+        return cur.rowcount > 0
+
+
 # ============================================
 # Health Check
 # ============================================
@@ -929,127 +2031,86 @@ def _validate_ovh_api_key(value: str) -> bool:
     return True
 
 
-def pg_get_config(key: str) -> Optional[str]:
-    """Get a configuration value from app_config table."""
+def _save_cleaned_ovh_key(key: str, cleaned: str) -> None:
+    """Write back a cleaned OVH API key (direct connection, no cache invalidation)."""
     try:
-        with get_pg_cursor() as cur:
-            cur.execute(
-                "SELECT value FROM app_config WHERE key = %s",
-                (key,)
+        # Use a new connection to avoid conflicts
+        pool = _get_pool()
+        conn = pool.getconn()
+        try:
+            save_cur = conn.cursor()
+            json_value = json.dumps(cleaned)
+            save_cur.execute(
+                """
+                INSERT INTO app_config (key, value, updated_at)
+                VALUES (%s, %s::jsonb, CURRENT_TIMESTAMP)
+                ON CONFLICT (key) 
+                DO UPDATE SET value = %s::jsonb, updated_at = CURRENT_TIMESTAMP
+                """,
+                (key, json_value, json_value)
             )
-            result = cur.fetchone()
-            if result:
-                # value is JSONB, extract the string value
-                value = result['value']
-                # JSONB can store strings in different formats:
-                # - Direct string: "value"
-                # - JSON string: "\"value\"" (double-quoted)
-                # - Other types: dict, list, etc.
-                
-                if value is None:
-                    return None
-                
-                # If it's already a plain string, return it
-                if isinstance(value, str):
-                    # Check if it's a JSON-encoded string (starts and ends with quotes)
-                    if len(value) >= 2 and value.startswith('"') and value.endswith('"'):
-                        # It's a JSON-encoded string, decode it
-                        try:
-                            decoded_value = json.loads(value)
-                        except (json.JSONDecodeError, TypeError):
-                            # If JSON parsing fails, return the string without outer quotes
-                            decoded_value = value[1:-1] if len(value) > 2 else value
-                    else:
-                        decoded_value = value
-                    
-                    # Clean OVH API key if this is the OVH_API_KEY - do this IMMEDIATELY
-                    if key == 'OVH_API_KEY' and decoded_value:
-                        # First, ensure we can safely work with the string
-                        try:
-                            # Try to encode/decode to catch any encoding issues early
-                            decoded_value.encode('utf-8').decode('utf-8')
-                        except (UnicodeEncodeError, UnicodeDecodeError):
-                            # If encoding fails, force UTF-8 with error replacement
-                            decoded_value = decoded_value.encode('utf-8', errors='replace').decode('utf-8', errors='replace')
-                        
-                        cleaned = _clean_ovh_api_key(decoded_value)
-                        if cleaned != decoded_value:
-                            logger.warning(f"OVH API key contained non-ASCII characters, cleaned: {len(decoded_value)} -> {len(cleaned)} chars")
-                            # CRITICAL: Save the cleaned version back to database IMMEDIATELY
-                            # Use a direct database call to avoid recursion
-                            if cleaned:
-                                try:
-                                    # Use a new cursor to avoid conflicts
-                                    pool = _get_pool()
-                                    conn = pool.getconn()
-                                    try:
-                                        save_cur = conn.cursor()
-                                        json_value = json.dumps(cleaned)
-                                        save_cur.execute(
-                                            """
-                                            INSERT INTO app_config (key, value, updated_at)
-                                            VALUES (%s, %s::jsonb, CURRENT_TIMESTAMP)
-                                            ON CONFLICT (key) 
-                                            DO UPDATE SET value = %s::jsonb, updated_at = CURRENT_TIMESTAMP
-                                            """,
-                                            (key, json_value, json_value)
-                                        )
-                                        conn.commit()
-                                        logger.info(f"OVH API key cleaned and saved to database (length: {len(cleaned)})")
-                                    finally:
-                                        pool.putconn(conn)
-                                except Exception as e:
-                                    logger.error(f"Failed to save cleaned OVH API key: {e}")
-                        return cleaned if cleaned else None
-                    
-                    return decoded_value
-                
-                # If it's a dict or other type, convert to string
-                # But typically JSONB stores strings directly
-                str_value = str(value) if value else None
-                
-                # Clean OVH API key if this is the OVH_API_KEY
-                if key == 'OVH_API_KEY' and str_value:
-                    # First, ensure we can safely work with the string
-                    try:
-                        str_value.encode('utf-8').decode('utf-8')
-                    except (UnicodeEncodeError, UnicodeDecodeError):
-                        str_value = str_value.encode('utf-8', errors='replace').decode('utf-8', errors='replace')
-                    
-                    cleaned = _clean_ovh_api_key(str_value)
-                    if cleaned != str_value:
-                        logger.warning(f"OVH API key contained non-ASCII characters, cleaned: {len(str_value)} -> {len(cleaned)} chars")
-                        # CRITICAL: Save the cleaned version back to database IMMEDIATELY
-                        if cleaned:
-                            try:
-                                # Use a new connection to avoid conflicts
-                                pool = _get_pool()
-                                conn = pool.getconn()
-                                try:
-                                    save_cur = conn.cursor()
-                                    json_value = json.dumps(cleaned)
-                                    save_cur.execute(
-                                        """
-                                        INSERT INTO app_config (key, value, updated_at)
-                                        VALUES (%s, %s::jsonb, CURRENT_TIMESTAMP)
-                                        ON CONFLICT (key) 
-                                        DO UPDATE SET value = %s::jsonb, updated_at = CURRENT_TIMESTAMP
-                                        """,
-                                        (key, json_value, json_value)
-                                    )
-                                    conn.commit()
-                                    logger.info(f"OVH API key cleaned and saved to database (length: {len(cleaned)})")
-                                finally:
-                                    pool.putconn(conn)
-                            except Exception as e:
-                                logger.error(f"Failed to save cleaned OVH API key: {e}")
-                    return cleaned if cleaned else None
-                
-                return str_value
-            return None
+            conn.commit()
+            logger.info(f"OVH API key cleaned and saved to database (length: {len(cleaned)})")
+        finally:
+            pool.putconn(conn)
     except Exception as e:
-        logger.error(f"Error getting config key {key}: {e}")
+        logger.error(f"Failed to save cleaned OVH API key: {e}")
+
+
+def _decode_config_value(key: str, value: Any) -> Optional[str]:
+    """Extract the string stored in an app_config JSONB value."""
+    # JSONB can store strings in different formats:
+    # - Direct string: "value"
+    # - JSON string: "\"value\"" (double-quoted)
+    # - Other types: dict, list, etc.
+    if value is None:
         return None
+    
+    if isinstance(value, str):
+        # Check if it's a JSON-encoded string (starts and ends with quotes)
+        if len(value) >= 2 and value.startswith('"') and value.endswith('"'):
+            try:
+                decoded_value = json.loads(value)
+            except (json.JSONDecodeError, TypeError):
+                # If JSON parsing fails, return the string without outer quotes
+                decoded_value = value[1:-1] if len(value) > 2 else value
+        else:
+            decoded_value = value
+    else:
+        # If it's a dict or other type, convert to string
+        # But typically JSONB stores strings directly
+        decoded_value = str(value) if value else None
+    
+    # Clean OVH API key if this is the OVH_API_KEY
+    if key == 'OVH_API_KEY' and decoded_value:
+        # First, ensure we can safely work with the string
+        try:
+            decoded_value.encode('utf-8').decode('utf-8')
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            decoded_value = decoded_value.encode('utf-8', errors='replace').decode('utf-8', errors='replace')
+        
+        cleaned = _clean_ovh_api_key(decoded_value)
+        if cleaned != decoded_value:
+            logger.warning(f"OVH API key contained non-ASCII characters, cleaned: {len(decoded_value)} -> {len(cleaned)} chars")
+            # CRITICAL: Save the cleaned version back to database IMMEDIATELY
+            if cleaned:
+                _save_cleaned_ovh_key(key, cleaned)
+        return cleaned if cleaned else None
+    
+    return decoded_value
+
+
+def pg_get_all_config() -> Dict[str, Optional[str]]:
+    """Read the whole app_config table in one query (decoded values)."""
+    with get_pg_cursor() as cur:
+        cur.execute("SELECT key, value FROM app_config")
+        rows = cur.fetchall()
+    return {row['key']: _decode_config_value(row['key'], row['value']) for row in rows}
+
+
+def pg_get_config(key: str) -> Optional[str]:
+    """Get a configuration value from app_config table (served from the config cache)."""
+    return pg_get_config_snapshot().get(key)
 
 
 def pg_set_config(key: str, value: str) -> bool:
@@ -1125,8 +2186,10 @@ def pg_set_config(key: str, value: str) -> bool:
                     else:
                         logger.info(f"OVH API key saved and verified successfully (length: {len(saved_value)})")
             
+            cur.execute("SELECT pg_notify(%s, %s)", (CONFIG_CHANNEL, key))
             logger.debug(f"Config key {key} saved successfully (length: {len(value)})")
-            return True
+        _config_cache.invalidate()
+        return True
     except Exception as e:
         logger.error(f"Error setting config key {key}: {e}")
         return False
@@ -1137,12 +2200,178 @@ def pg_delete_config(key: str) -> bool:
     try:
         with get_pg_cursor() as cur:
             cur.execute("DELETE FROM app_config WHERE key = %s", (key,))
-            return True
+            cur.execute("SELECT pg_notify(%s, %s)", (CONFIG_CHANNEL, key))
+        _config_cache.invalidate()
+        return True
     except Exception as e:
         logger.error(f"Error deleting config key {key}: {e}")
         return False
 
 
+# ============================================
+# Config cache
+# ============================================
+# app_config is read on hot paths (LLM keys on every insights request, Discord
+# token, provider...). Each process keeps a snapshot of the whole table,
+# reloaded in one query when older than CONFIG_CACHE_TTL seconds or as soon as
+# a pg_set_config / pg_delete_config anywhere sends a NOTIFY on CONFIG_CHANNEL.
+
+CONFIG_CACHE_TTL = float(os.getenv('CONFIG_CACHE_TTL', '30'))
+CONFIG_CACHE_LISTEN = os.getenv('CONFIG_CACHE_LISTEN', 'true').lower() == 'true'
+CONFIG_CHANNEL = 'app_config_changed'
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Immutable view of app_config at one point in time.
+    
+    `version` increases each time a reload returns different values, so
+    callers can rebuild what they derive from the config (e.g. LLM clients).
+    """
+    values: Mapping[str, Optional[str]] = field(default_factory=dict)
+    version: int = 0
+    loaded_at: float = 0.0
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        value = self.values.get(key)
+        return value if value is not None else default
+
+    @property
+    def openai_api_key(self) -> Optional[str]:
+        return self.get('OPENAI_API_KEY') or None
+
+    @property
+    def anthropic_api_key(self) -> Optional[str]:
+        return self.get('ANTHROPIC_API_KEY') or None
+
+    @property
+    def mistral_api_key(self) -> Optional[str]:
+        return self.get('MISTRAL_API_KEY') or None
+
+    @property
+    def ovh_api_key(self) -> Optional[str]:
+        return self.get('OVH_API_KEY') or None
+
+    @property
+    def ovh_endpoint_url(self) -> Optional[str]:
+        return self.get('OVH_ENDPOINT_URL') or None
+
+    @property
+    def ovh_model(self) -> Optional[str]:
+        return self.get('OVH_MODEL') or None
+
+    @property
+    def llm_provider(self) -> Optional[str]:
+        return self.get('LLM_PROVIDER') or None
+
+    @property
+    def discord_bot_token(self) -> Optional[str]:
+        return self.get('DISCORD_BOT_TOKEN') or None
+
+    @property
+    def discord_guild_id(self) -> Optional[str]:
+        return self.get('DISCORD_GUILD_ID') or None
+
+
+class _ConfigCache:
+    """Process-local app_config cache (TTL + LISTEN/NOTIFY invalidation)."""
+
+    def __init__(self, ttl: float = CONFIG_CACHE_TTL):
+        self.ttl = ttl
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._stale = True
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+        self._listener_pid = None
+
+    def get(self) -> ConfigSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and not self._stale and time.monotonic() - snapshot.loaded_at < self.ttl:
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or self._stale or time.monotonic() - snapshot.loaded_at >= self.ttl:
+                snapshot = self._reload(snapshot)
+        self._start_listener()
+        return snapshot
+
+    def invalidate(self):
+        self._stale = True
+
+    def _reload(self, previous: Optional[ConfigSnapshot]) -> ConfigSnapshot:
+        # Cleared before the query so a NOTIFY received meanwhile triggers another reload
+        self._stale = False
+        try:
+            values = pg_get_all_config()
+        except Exception as e:
+            logger.error(f"Error loading app_config: {e}")
+            if previous is not None:
+                # Keep serving the last known config, retry after the TTL
+                snapshot = replace(previous, loaded_at=time.monotonic())
+            else:
+                snapshot = ConfigSnapshot(loaded_at=time.monotonic())
+            self._snapshot = snapshot
+            return snapshot
+        
+        version = previous.version if previous else 0
+        if previous is None or dict(previous.values) != values:
+            version += 1
+        snapshot = ConfigSnapshot(values=MappingProxyType(values), version=version,
+                                  loaded_at=time.monotonic())
+        self._snapshot = snapshot
+        return snapshot
+
+    def _start_listener(self):
+        if not CONFIG_CACHE_LISTEN or not DATABASE_URL:
+            return
+        # The listener thread does not survive a fork: restart it in the child
+        if self._listener is not None and self._listener_pid == os.getpid():
+            return
+        with self._lock:
+            if self._listener is not None and self._listener_pid == os.getpid():
+                return
+            self._listener_pid = os.getpid()
+            self._listener = threading.Thread(target=self._listen, name='app-config-listener', daemon=True)
+            self._listener.start()
+
+    def _listen(self):
+        """Invalidate the snapshot on every NOTIFY sent by pg_set_config / pg_delete_config."""
+        import select
+        while True:
+            conn = None
+            try:
+                conn = psycopg2.connect(DATABASE_URL)
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {CONFIG_CHANNEL}")
+                # Changes made while we were not listening
+                self.invalidate()
+                while True:
+                    if select.select([conn], [], [], 60) == ([], [], []):
+                        continue
+                    conn.poll()
+                    if conn.notifies:
+                        conn.notifies.clear()
+                        self.invalidate()
+            except Exception as e:
+                logger.warning(f"app_config listener disconnected ({e}), relying on the {self.ttl:.0f}s TTL")
+                time.sleep(max(self.ttl, 5))
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+
+_config_cache = _ConfigCache()
+
+
+def pg_get_config_snapshot() -> ConfigSnapshot:
+    """Current app_config snapshot (memory lookup, reloaded when stale)."""
+    return _config_cache.get()
+
+
 def pg_health_check() -> Dict[str, Any]:
     """Check PostgreSQL connection health."""
     try:
@@ -1208,6 +2437,7 @@ def init_db() -> None:
                 answered_by VARCHAR(255),
                 answer_detection_method VARCHAR(50),
                 product VARCHAR(100),
+                content_hash VARCHAR(64),
                 inserted_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
             )
         ''')
@@ -1228,18 +2458,20 @@ def init_db() -> None:
             )
         ''')
         
-        # Scraping logs table
+        # Scraping logs table, partitioned by day (see pg_maintain_scraping_logs)
         cur.execute('''
             CREATE TABLE IF NOT EXISTS scraping_logs (
-                id SERIAL PRIMARY KEY,
-                timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
-                source TEXT,
-                level TEXT,
+                id BIGSERIAL,
+                timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                source VARCHAR(50),
+                level VARCHAR(20),
                 message TEXT,
-                posts_scraped INTEGER DEFAULT 0,
-                posts_inserted INTEGER DEFAULT 0,
-                error TEXT
-            )
+                details JSONB,
+                PRIMARY KEY (id, timestamp)
+            ) PARTITION BY RANGE (timestamp)
+        ''')
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS scraping_logs_default PARTITION OF scraping_logs DEFAULT
         ''')
         
         # Jobs table
@@ -1341,6 +2573,162 @@ def init_db() -> None:
         # Log but don't fail - tables might already exist with different ownership
         logger.warning(f"Some operations in init_db() failed (this is OK if tables exist): {e}")
         logger.info("Continuing startup - existing tables will be used")
+    
+    _apply_schema_migrations()
+    
+    try:
+        pg_maintain_scraping_logs()
+    except Exception as e:
+        logger.warning(f"Scraping logs partition maintenance failed: {e}")
+
+
+# Idempotent migrations applied on every startup, in order. Each statement runs
+# in its own transaction so one failure (e.g. missing privileges) doesn't block the rest.
+SCHEMA_MIGRATIONS = [
+    # Structured context of scraping logs (duration, attempt, url...)
+    "ALTER TABLE scraping_logs ADD COLUMN IF NOT EXISTS details JSONB",
+    # scraping_logs: TEXT timestamps -> timestamptz, partitioned by day. The last
+    # 30 days are copied over; older logs were due for cleanup anyway
+    """DO $$
+    DECLARE
+        log_day DATE;
+    BEGIN
+        IF EXISTS (SELECT 1 FROM pg_class WHERE oid = to_regclass('scraping_logs') AND relkind = 'r') THEN
+            ALTER TABLE scraping_logs RENAME TO scraping_logs_legacy;
+            CREATE TABLE scraping_logs (
+                id BIGSERIAL,
+                timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                source VARCHAR(50),
+                level VARCHAR(20),
+                message TEXT,
+                details JSONB,
+                PRIMARY KEY (id, timestamp)
+            ) PARTITION BY RANGE (timestamp);
+            CREATE TABLE scraping_logs_default PARTITION OF scraping_logs DEFAULT;
+            FOR log_day IN SELECT generate_series(CURRENT_DATE - 30, CURRENT_DATE, INTERVAL '1 day')::date LOOP
+                EXECUTE format('CREATE TABLE %I PARTITION OF scraping_logs FOR VALUES FROM (%L) TO (%L)',
+                               'scraping_logs_p' || to_char(log_day, 'YYYYMMDD'), log_day, log_day + 1);
+            END LOOP;
+            INSERT INTO scraping_logs (timestamp, source, level, message, details)
+            SELECT ts, source, level, message, details FROM (
+                SELECT timestamp::timestamptz AS ts, source, level, message, details
+                FROM scraping_logs_legacy WHERE timestamp IS NOT NULL
+            ) legacy
+            WHERE ts >= CURRENT_DATE - 30;
+            DROP TABLE scraping_logs_legacy;
+        END IF;
+    END $$""",
+    # /api/logs filters (source, level) and keyset pagination on (timestamp, id)
+    "CREATE INDEX IF NOT EXISTS idx_scraping_logs_source_level_ts ON scraping_logs(source, level, timestamp DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_scraping_logs_ts ON scraping_logs(timestamp DESC, id DESC)",
+    # Last write on a job (progress, errors, status), used to spot stuck jobs
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP",
+    # Content hash for indexed duplicate detection (see insert_post).
+    # Backfill existing rows with scripts/backfill_content_hash.py
+    "ALTER TABLE posts ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)",
+    """CREATE UNIQUE INDEX IF NOT EXISTS idx_posts_source_content_hash
+       ON posts(source, content_hash) WHERE content_hash IS NOT NULL""",
+    # Case-insensitive source filter + date ordering (posts-for-improvement)
+    "CREATE INDEX IF NOT EXISTS idx_posts_lower_source_date ON posts(LOWER(source), created_at DESC)",
+    # Pain point definitions (settings page)
+    """CREATE TABLE IF NOT EXISTS pain_points (
+        id SERIAL PRIMARY KEY,
+        title TEXT NOT NULL,
+        description TEXT,
+        icon TEXT,
+        keywords JSONB NOT NULL DEFAULT '[]'::jsonb,
+        enabled INTEGER DEFAULT 1,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    )""",
+    # Pain points / products matched by each post, and their daily rollups
+    """CREATE TABLE IF NOT EXISTS post_tags (
+        post_id BIGINT PRIMARY KEY REFERENCES posts(id) ON DELETE CASCADE,
+        pain_points TEXT[] NOT NULL DEFAULT '{}',
+        products TEXT[] NOT NULL DEFAULT '{}',
+        definitions_version VARCHAR(32),
+        tagged_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_post_tags_pain_points ON post_tags USING gin(pain_points)",
+    "CREATE INDEX IF NOT EXISTS idx_post_tags_products ON post_tags USING gin(products)",
+    """CREATE TABLE IF NOT EXISTS post_tag_daily (
+        day DATE NOT NULL,
+        tag_type VARCHAR(20) NOT NULL,
+        tag TEXT NOT NULL,
+        sentiment_label VARCHAR(20) NOT NULL,
+        product VARCHAR(100) NOT NULL,
+        post_count INTEGER NOT NULL,
+        relevance_sum DOUBLE PRECISION NOT NULL,
+        PRIMARY KEY (day, tag_type, tag, sentiment_label, product)
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_post_tag_daily_type_day ON post_tag_daily(tag_type, day)",
+    # Day filter of the rollup rebuilds (_POST_TIME_SQL)
+    "CREATE INDEX IF NOT EXISTS idx_posts_rollup_time ON posts ((COALESCE(created_at, inserted_at)))",
+    # Precomputed What's Happening / improvements analyses, one per filter preset
+    """CREATE TABLE IF NOT EXISTS insight_snapshots (
+        kind VARCHAR(50) NOT NULL,
+        preset VARCHAR(20) NOT NULL,
+        fingerprint JSONB NOT NULL,
+        payload JSONB NOT NULL,
+        computed_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        duration_seconds REAL,
+        PRIMARY KEY (kind, preset)
+    )""",
+    # Delta sync (/api/posts/changes): every insert / update stamps the post with
+    # its transaction id, deletes leave a tombstone
+    "ALTER TABLE posts ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE",
+    "ALTER TABLE posts ADD COLUMN IF NOT EXISTS change_xid xid8",
+    """CREATE TABLE IF NOT EXISTS post_tombstones (
+        post_id BIGINT PRIMARY KEY,
+        deleted_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        change_xid xid8 NOT NULL DEFAULT pg_current_xact_id()
+    )""",
+    """CREATE OR REPLACE FUNCTION posts_stamp_change() RETURNS trigger AS $$
+    BEGIN
+        NEW.updated_at := CURRENT_TIMESTAMP;
+        NEW.change_xid := pg_current_xact_id();
+        RETURN NEW;
+    END $$ LANGUAGE plpgsql""",
+    """CREATE OR REPLACE FUNCTION posts_record_deletes() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO post_tombstones (post_id)
+        SELECT id FROM deleted_posts
+        ON CONFLICT (post_id) DO UPDATE
+        SET deleted_at = CURRENT_TIMESTAMP, change_xid = pg_current_xact_id();
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql""",
+    "DROP TRIGGER IF EXISTS posts_change_insert ON posts",
+    """CREATE TRIGGER posts_change_insert BEFORE INSERT ON posts
+       FOR EACH ROW EXECUTE FUNCTION posts_stamp_change()""",
+    "DROP TRIGGER IF EXISTS posts_change_update ON posts",
+    """CREATE TRIGGER posts_change_update BEFORE UPDATE ON posts
+       FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*) EXECUTE FUNCTION posts_stamp_change()""",
+    "DROP TRIGGER IF EXISTS posts_change_delete ON posts",
+    """CREATE TRIGGER posts_change_delete AFTER DELETE ON posts
+       REFERENCING OLD TABLE AS deleted_posts
+       FOR EACH STATEMENT EXECUTE FUNCTION posts_record_deletes()""",
+    "CREATE INDEX IF NOT EXISTS idx_posts_change_xid ON posts(change_xid, id)",
+    "CREATE INDEX IF NOT EXISTS idx_posts_updated_at ON posts(updated_at)",
+    "CREATE INDEX IF NOT EXISTS idx_post_tombstones_change_xid ON post_tombstones(change_xid)",
+    # Newest item seen per (source, normalized query), where incremental scrapes stop
+    """CREATE TABLE IF NOT EXISTS scrape_watermarks (
+        source VARCHAR(50) NOT NULL,
+        query_key TEXT NOT NULL,
+        newest_created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        newest_external_id TEXT,
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (source, query_key)
+    )""",
+]
+
+
+def _apply_schema_migrations() -> None:
+    """Apply SCHEMA_MIGRATIONS to an existing database (safe to run repeatedly)."""
+    for statement in SCHEMA_MIGRATIONS:
+        try:
+            with get_pg_cursor(dict_cursor=False) as cur:
+                cur.execute(statement)
+        except Exception as e:
+            logger.warning(f"Schema migration skipped ({' '.join(statement.split())[:80]}...): {e}")
 
 
 # ============================================
@@ -1357,8 +2745,12 @@ def get_db_connection():
 # Posts
 # insert_post is already defined above with full duplicate detection logic
 get_posts = pg_get_all_posts
+iter_posts = pg_iter_posts
 get_post_by_id = pg_get_post_by_id
+get_posts_for_improvement = pg_get_posts_for_improvement
 delete_post = pg_delete_post
+update_post_product_label = pg_update_post_product_label
+update_all_posts_product_labels = pg_update_all_posts_product_labels
 url_exists = pg_url_exists
 delete_duplicate_posts = pg_delete_duplicate_posts
 delete_sample_posts = pg_delete_sample_posts
@@ -1369,8 +2761,13 @@ delete_hackernews_posts = pg_delete_hackernews_posts
 get_sentiment_stats = pg_get_sentiment_stats
 get_source_stats = pg_get_source_stats
 get_language_stats = pg_get_language_stats
+get_posts_by_language = pg_get_posts_by_language
+update_posts_language = pg_update_posts_language
 get_timeline_stats = pg_get_timeline_stats
 get_answered_stats = pg_get_answered_stats
+get_dashboard_aggregates = pg_get_dashboard_aggregates
+get_post_changes = pg_get_post_changes
+prune_post_tombstones = pg_prune_post_tombstones
 
 # Saved queries
 get_saved_queries = pg_get_saved_queries
@@ -1379,7 +2776,15 @@ delete_saved_query = pg_delete_saved_query
 
 # Scraping logs
 add_scraping_log = pg_add_scraping_log
+add_scraping_logs = pg_add_scraping_logs
 get_scraping_logs = pg_get_scraping_logs
+clear_scraping_logs = pg_clear_scraping_logs
+maintain_scraping_logs = pg_maintain_scraping_logs
+
+# Scrape watermarks
+get_scrape_watermark = pg_get_scrape_watermark
+advance_scrape_watermark = pg_advance_scrape_watermark
+clear_scrape_watermarks = pg_clear_scrape_watermarks
 
 # Jobs
 create_job_record = pg_create_job_record
@@ -1399,7 +2804,10 @@ def get_job_record(job_id: str) -> Optional[Dict]:
                         if 'progress' in payload:
                             # Extract progress from payload if it exists there
                             job_dict['progress'] = payload.get('progress', {'total': 0, 'completed': 0})
-                    elif 'progress' not in job_dict:
+                        job_dict['errors'] = payload.get('errors', [])
+                    if isinstance(job_dict.get('result'), list):
+                        job_dict['results'] = job_dict['result']
+                    if not isinstance(job_dict.get('progress'), dict):
                         # If no progress field, create default based on progress column
                         progress_val = job_dict.get('progress', 0) or 0
                         if isinstance(progress_val, int):
@@ -1414,7 +2822,10 @@ def get_job_record(job_id: str) -> Optional[Dict]:
         logger.error(f"Error retrieving job {job_id[:8]} from DB: {e}", exc_info=True)
         return None
 
-update_job_progress = pg_update_job_status
+update_job_status = pg_update_job_status
+update_job_progress = pg_update_job_progress
+append_job_error = pg_append_job_error
+append_job_result = pg_append_job_result
 get_all_jobs = pg_get_pending_jobs
 
 def pg_finalize_job(job_id: str, status: str, error_message: str = None) -> bool:
@@ -1440,7 +2851,11 @@ def pg_mark_false_positive(post_id: int, is_false_positive: bool) -> bool:
             "UPDATE posts SET is_false_positive = %s WHERE id = %s",
             (is_false_positive, post_id)
         )
-        return cur.rowcount > 0
+        updated = cur.rowcount > 0
+    if updated:
+        # False positives are excluded from the pain point / product rollups
+        _refresh_tag_rollups_safely([post_id])
+    return updated
 
 
 def pg_update_post_answered_status(post_id: int, answered: bool, method: str = 'manual') -> bool:
@@ -1456,24 +2871,51 @@ def pg_update_post_answered_status(post_id: int, answered: bool, method: str = '
         """, (1 if answered else 0, answered, answered, method, method, post_id))
         return cur.rowcount > 0
 
-def pg_detect_and_update_answered_status(post_id: int, metadata: Dict[str, Any]) -> bool:
+# Posts fetched (multi-id provider APIs) and updated per round of an answered-status recheck
+RECHECK_BATCH_SIZE = int(os.getenv('ANSWERED_RECHECK_BATCH_SIZE', '500'))
+
+def pg_update_posts_answered_status_bulk(updates: List[Tuple[int, str]]) -> int:
+    """
+    Mark many posts as answered in one statement.
+    
+    Args:
+        updates: (post_id, detection method) pairs
+    
+    Returns:
+        Number of posts updated (posts already answered with the same method and
+        manually marked posts are left untouched)
+    """
+    from psycopg2.extras import execute_values
+    
+    if not updates:
+        return 0
+    with get_pg_cursor() as cur:
+        execute_values(cur, """
+            UPDATE posts
+            SET is_answered = 1,
+                answered_at = CASE WHEN posts.is_answered = 1 THEN COALESCE(posts.answered_at, CURRENT_TIMESTAMP)
+                                   ELSE CURRENT_TIMESTAMP END,
+                answered_by = v.method,
+                answer_detection_method = v.method
+            FROM (VALUES %s) AS v(id, method)
+            WHERE posts.id = v.id
+            AND posts.answer_detection_method IS DISTINCT FROM 'manual'
+            AND (posts.is_answered IS DISTINCT FROM 1 OR posts.answer_detection_method IS DISTINCT FROM v.method)
+        """, updates, template="(%s::bigint, %s)", page_size=len(updates))
+        return cur.rowcount
+
+def _answered_detection_method(metadata: Optional[Dict[str, Any]]) -> Optional[str]:
     """
-    Automatically detect and update answered status based on metadata.
+    Detection method if metadata shows the post was answered, else None.
     
-    For GitHub: Mark as answered if issue is closed AND has comments (likely resolved).
-    For Reddit: Mark as answered if there are comments (discussion happened).
-    For Stack Overflow: Use the is_answered field from API or answer_count > 0.
+    For GitHub: answered if issue is closed AND has comments (likely resolved).
+    For Reddit: answered if there are comments (discussion happened).
+    For Stack Overflow: use the is_answered field from API or answer_count > 0.
     """
     if not metadata:
-        return False
+        return None
     
     source = metadata.get('source', '').lower()
-    post = pg_get_post_by_id(post_id)
-    if not post:
-        return False
-    
-    is_answered = False
-    method = 'auto'
     
     if source == 'github':
         # GitHub: Mark as answered if issue is closed AND has comments
@@ -1483,47 +2925,62 @@ def pg_detect_and_update_answered_status(post_id: int, metadata: Dict[str, Any])
         
         # Issue is closed and has comments = likely answered/resolved
         if state == 'closed' and comments > 0:
-            is_answered = True
-            method = 'auto-github-closed'
+            return 'auto-github-closed'
         # Issue is open but has many comments = active discussion, might be answered
-        elif state == 'open' and comments >= 3:
-            is_answered = True
-            method = 'auto-github-discussion'
+        if state == 'open' and comments >= 3:
+            return 'auto-github-discussion'
     
     elif source == 'reddit':
         # Reddit: Mark as answered if there are comments (discussion happened)
         comments = metadata.get('num_comments', 0) or metadata.get('comments', 0) or metadata.get('comments_count', 0)
-        is_answered = comments > 0
-        method = 'auto-reddit-comments'
+        if comments > 0:
+            return 'auto-reddit-comments'
     
     elif source == 'stackoverflow':
-        # Stack Overflow: Use the is_answered field from API
-        is_answered = metadata.get('is_answered', False)
-        if not is_answered:
-            # Also check answer_count
-            answer_count = metadata.get('answer_count', 0) or metadata.get('answers', 0)
-            is_answered = answer_count > 0
-        method = 'auto-stackoverflow'
-    
-    if is_answered:
+        # Stack Overflow: Use the is_answered field from API, also check answer_count
+        answer_count = metadata.get('answer_count', 0) or metadata.get('answers', 0)
+        if metadata.get('is_answered', False) or answer_count > 0:
+            return 'auto-stackoverflow'
+    
+    return None
+
+def pg_detect_and_update_answered_status(post_id: int, metadata: Dict[str, Any]) -> bool:
+    """
+    Automatically detect and update answered status based on metadata
+    (rules in _answered_detection_method).
+    """
+    if not metadata:
+        return False
+    
+    post = pg_get_post_by_id(post_id)
+    if not post:
+        return False
+    
+    method = _answered_detection_method(metadata)
+    if method:
         return pg_update_post_answered_status(post_id, True, method)
     
     return False
 
-async def pg_recheck_posts_answered_status(limit: Optional[int] = None, delay_between_requests: float = 0.5) -> Dict[str, Any]:
+async def pg_recheck_posts_answered_status(limit: Optional[int] = None, delay_between_requests: float = 0.5,
+                                           batch_size: int = RECHECK_BATCH_SIZE) -> Dict[str, Any]:
     """
     Re-check answered status for posts by fetching their metadata.
-    This is an async function that processes posts in batches.
+    
+    Posts are processed `batch_size` at a time: their metadata is fetched with
+    the providers' multi-id endpoints (up to 100 posts per request, providers
+    queried concurrently on one pooled client) and the posts found answered are
+    updated with a single UPDATE per batch.
     
     Args:
-        limit: Maximum number of posts to check (None = all unanswered posts)
-        delay_between_requests: Delay between API requests in seconds
+        limit: Maximum number of posts to check (None = all posts not marked manually)
+        delay_between_requests: Pause after each API request, per provider (seconds)
+        batch_size: Posts fetched and updated per round
     
     Returns:
         Dict with statistics: total_posts, updated_count, error_count, skipped_count, success, message
     """
-    import asyncio
-    from app.utils.post_metadata_fetcher import fetch_post_metadata_from_url
+    from app.utils.post_metadata_fetcher import create_metadata_client, fetch_posts_metadata_batch
     
     updated_count = 0
     error_count = 0
@@ -1569,34 +3026,26 @@ async def pg_recheck_posts_answered_status(limit: Optional[int] = None, delay_be
     
     logger.info(f"Re-checking answered status for {total_posts} posts...")
     
-    # Process posts with delay between requests
-    for i, post in enumerate(posts):
-        post_id = post['id']
-        url = post['url']
-        source = post['source']
-        
-        try:
-            # Fetch metadata
-            metadata = await fetch_post_metadata_from_url(url, source)
-            
-            if metadata:
-                # Try to detect and update
-                if pg_detect_and_update_answered_status(post_id, metadata):
-                    updated_count += 1
-                    logger.debug(f"Updated post {post_id} ({source})")
-                else:
-                    skipped_count += 1
-            else:
-                skipped_count += 1
-                logger.debug(f"Could not fetch metadata for post {post_id}")
+    async with create_metadata_client() as client:
+        for start in range(0, total_posts, batch_size):
+            batch = posts[start:start + batch_size]
+            try:
+                metadata_by_id = await fetch_posts_metadata_batch(batch, client=client, delay=delay_between_requests)
+                updates = []
+                for post in batch:
+                    method = _answered_detection_method(metadata_by_id.get(post['id']))
+                    if method:
+                        updates.append((post['id'], method))
+                updated = pg_update_posts_answered_status_bulk(updates)
+            except Exception as e:
+                error_count += len(batch)
+                logger.warning(f"Error processing posts {start + 1}-{start + len(batch)}: {e}")
+                continue
             
-            # Delay between requests to respect rate limits
-            if i < len(posts) - 1 and delay_between_requests > 0:
-                await asyncio.sleep(delay_between_requests)
-                
-        except Exception as e:
-            error_count += 1
-            logger.warning(f"Error processing post {post_id}: {e}")
+            updated_count += updated
+            skipped_count += len(batch) - updated
+            logger.debug(f"Answered status batch {start + 1}-{start + len(batch)}: "
+                         f"{len(metadata_by_id)} fetched, {updated} updated")
     
     message = f"Checked {total_posts} posts: {updated_count} updated, {error_count} errors, {skipped_count} skipped"
     logger.info(message)
@@ -1612,40 +3061,10 @@ async def pg_recheck_posts_answered_status(limit: Optional[int] = None, delay_be
 
 def pg_update_all_posts_answered_status_from_metadata() -> int:
     """
-    Update answered status for all posts by fetching their metadata.
+    Update answered status for the 100 most recent unanswered posts by fetching their metadata.
     This is expensive and should be run periodically, not on every request.
     """
     import asyncio
-    from app.utils.post_metadata_fetcher import fetch_post_metadata_from_url
-    
-    updated_count = 0
-    
-    # Get all posts that are not manually marked as answered
-    with get_pg_cursor() as cur:
-        cur.execute("""
-            SELECT id, url, source 
-            FROM posts 
-            WHERE (is_answered = 0 OR is_answered IS NULL)
-            AND (answer_detection_method IS NULL OR answer_detection_method != 'manual')
-            ORDER BY created_at DESC
-            LIMIT 100
-        """)
-        posts = cur.fetchall()
-    
-    if not posts:
-        return 0
-    
-    # Process posts in batches
-    async def process_post(post_row):
-        post_id, url, source = post_row['id'], post_row['url'], post_row['source']
-        try:
-            metadata = await fetch_post_metadata_from_url(url, source)
-            if metadata:
-                if pg_detect_and_update_answered_status(post_id, metadata):
-                    return 1
-        except Exception as e:
-            logger.debug(f"Error processing post {post_id}: {e}")
-        return 0
     
     # Run async processing
     try:
@@ -1654,16 +3073,15 @@ def pg_update_all_posts_answered_status_from_metadata() -> int:
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
     
-    tasks = [process_post(post) for post in posts]
-    results = loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
-    
-    updated_count = sum(r for r in results if isinstance(r, int))
+    result = loop.run_until_complete(pg_recheck_posts_answered_status(limit=100))
+    updated_count = result['updated_count']
     
     logger.info(f"Updated answered status for {updated_count} posts from metadata")
     return updated_count
 
 update_post_answered_status = pg_update_post_answered_status
 detect_and_update_answered_status = pg_detect_and_update_answered_status
+update_posts_answered_status_bulk = pg_update_posts_answered_status_bulk
 mark_false_positive = pg_mark_false_positive
 update_all_posts_answered_status_from_metadata = pg_update_all_posts_answered_status_from_metadata
 recheck_posts_answered_status = pg_recheck_posts_answered_status
@@ -1705,6 +3123,19 @@ def pg_get_pain_points(enabled_only: bool = True) -> List[Dict]:
         return []
 
 get_pain_points = pg_get_pain_points
+save_pain_points = pg_save_pain_points
+tag_posts = pg_tag_posts
+retag_posts = pg_retag_posts
+refresh_tag_rollups = pg_refresh_tag_rollups
+get_pain_point_definitions = pg_get_pain_point_definitions
+get_pain_point_counts = pg_get_pain_point_counts
+get_pain_point_samples = pg_get_pain_point_samples
+get_product_tag_stats = pg_get_product_tag_stats
+
+# Insight snapshots
+get_post_window_stats = pg_get_post_window_stats
+get_insight_snapshot = pg_get_insight_snapshot
+save_insight_snapshot = pg_save_insight_snapshot
 
 # Email Notifications
 def pg_get_email_notifications(limit: int = 50, offset: int = 0) -> List[Dict]:
@@ -45,6 +45,7 @@ class JobType(str, Enum):
     BACKUP = "backup"
     CLEANUP = "cleanup"
     RECHECK_ANSWERED = "recheck_answered"
+    REFRESH_INSIGHTS = "refresh_insights"
 
 
 @dataclass
@@ -78,22 +79,79 @@ class Job:
 
 
 class RedisJobQueue:
-    """Redis-based job queue with priority support."""
+    """Redis-based job queue with priority support.
+    
+    Dequeuing is a Lua script that pops the best job and records a lease
+    (deadline in LEASES_KEY) atomically. Workers extend the lease while the job
+    runs (extend_lease); leases that expire (worker killed, host lost) are
+    reclaimed back into the queue by reap_expired_leases, which every dequeue
+    also runs. Retries wait in DELAYED_KEY (score = time they become due)
+    and are promoted to the queue once due.
+    """
     
     QUEUE_KEY = "ocft:jobs:queue"
+    # Legacy set of running job ids (before leases), drained by reap_expired_leases
     PROCESSING_KEY = "ocft:jobs:processing"
+    LEASES_KEY = "ocft:jobs:leases"
+    DELAYED_KEY = "ocft:jobs:delayed"
+    # Queue score of every job not finished yet (used to requeue / promote it)
+    SCORES_KEY = "ocft:jobs:scores"
+    METRICS_KEY = "ocft:jobs:metrics"
     RESULTS_KEY = "ocft:jobs:results"
+    # Hash of finished job counts per status, one per day (ocft:jobs:daily:2024-05-31)
+    DAILY_PREFIX = "ocft:jobs:daily:"
+    DAILY_TTL = 86400 * 8
     JOB_PREFIX = "ocft:job:"
     
+    LEASE_TIMEOUT = int(os.getenv('JOB_LEASE_TIMEOUT', '120'))
+    # Jobs moved per script call (promotion of due retries, reclaimed leases)
+    REAP_BATCH = 100
+    # Seconds between lease attempts while dequeue waits for a job
+    DEQUEUE_POLL_INTERVAL = 0.5
+    
+    # Shared by the reap and lease scripts: promote due retries, requeue expired leases
+    # KEYS: queue, delayed, leases, scores, metrics
+    # ARGV: now, batch
+    _REAP_LUA = """
+    local now = tonumber(ARGV[1])
+    local batch = tonumber(ARGV[2])
+    local due = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now, 'LIMIT', 0, batch)
+    for _, job_id in ipairs(due) do
+        redis.call('ZADD', KEYS[1], tonumber(redis.call('HGET', KEYS[4], job_id) or '0'), job_id)
+        redis.call('ZREM', KEYS[2], job_id)
+    end
+    local expired = redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', now, 'LIMIT', 0, batch)
+    for _, job_id in ipairs(expired) do
+        redis.call('ZADD', KEYS[1], tonumber(redis.call('HGET', KEYS[4], job_id) or '0'), job_id)
+        redis.call('ZREM', KEYS[3], job_id)
+    end
+    if #due > 0 then redis.call('HINCRBY', KEYS[5], 'retries_promoted', #due) end
+    if #expired > 0 then redis.call('HINCRBY', KEYS[5], 'leases_expired', #expired) end
+    """
+    
+    _REAP_SCRIPT = _REAP_LUA + """
+    return {#due, #expired}
+    """
+    
+    # ARGV: now, batch, lease deadline
+    _LEASE_SCRIPT = _REAP_LUA + """
+    local popped = redis.call('ZPOPMAX', KEYS[1])
+    if #popped == 0 then return false end
+    redis.call('ZADD', KEYS[3], tonumber(ARGV[3]), popped[1])
+    redis.call('HINCRBY', KEYS[5], 'leased', 1)
+    return popped[1]
+    """
+    
     def __init__(self, redis_url: str = None):
         self.redis_url = redis_url or REDIS_URL
         self._client: Optional[Any] = None
+        self._lease_script = None
+        self._reap_script = None
     
     @property
     def client(self) -> Any:
         if self._client is None:
             # Increase timeouts for production Docker environments
-            # socket_timeout should be higher than bzpopmax timeout to avoid premature disconnections
             self._client = redis.from_url(
                 self.redis_url,
                 decode_responses=True,
@@ -102,6 +160,8 @@ class RedisJobQueue:
                 socket_keepalive=True,  # Enable keepalive to maintain connection
                 socket_keepalive_options={}  # Use system defaults
             )
+            self._lease_script = self._client.register_script(self._LEASE_SCRIPT)
+            self._reap_script = self._client.register_script(self._REAP_SCRIPT)
         return self._client
     
     def close(self):
@@ -109,6 +169,9 @@ class RedisJobQueue:
             self._client.close()
             self._client = None
     
+    def _script_keys(self) -> List[str]:
+        return [self.QUEUE_KEY, self.DELAYED_KEY, self.LEASES_KEY, self.SCORES_KEY, self.METRICS_KEY]
+    
     def health_check(self) -> Dict[str, Any]:
         """Check Redis connection health."""
         try:
@@ -119,11 +182,17 @@ class RedisJobQueue:
                 'type': 'redis',
                 'used_memory': info.get('used_memory_human', 'unknown'),
                 'queue_size': self.client.zcard(self.QUEUE_KEY),
-                'processing': self.client.scard(self.PROCESSING_KEY)
+                'processing': self.client.zcard(self.LEASES_KEY),
+                'delayed': self.client.zcard(self.DELAYED_KEY),
+                'metrics': self.get_metrics()
             }
         except Exception as e:
             return {'status': 'unhealthy', 'type': 'redis', 'error': str(e)}
     
+    def get_metrics(self) -> Dict[str, int]:
+        """Counters since the queue was created: leased, leases_expired, retries_scheduled, retries_promoted."""
+        return {name: int(value) for name, value in self.client.hgetall(self.METRICS_KEY).items()}
+    
     def enqueue(self, job_type: str, payload: Dict, priority: int = 0) -> str:
         """Add a job to the queue."""
         job = Job(
@@ -143,83 +212,114 @@ class RedisJobQueue:
         # Add to priority queue (higher priority = processed first)
         # Score = priority * 1000000 - timestamp (so higher priority and older = first)
         score = priority * 1000000 - time.time()
-        self.client.zadd(self.QUEUE_KEY, {job.id: score})
+        pipe = self.client.pipeline()
+        pipe.hset(self.SCORES_KEY, job.id, score)
+        pipe.zadd(self.QUEUE_KEY, {job.id: score})
+        pipe.execute()
         
         logger.info(f"Job enqueued: {job.id} ({job_type})")
         return job.id
     
+    def _lease_next(self) -> Optional[str]:
+        """Pop the best job and lease it, atomically (also promotes due retries and reclaims expired leases)."""
+        now = time.time()
+        self.client  # make sure the scripts are registered
+        return self._lease_script(
+            keys=self._script_keys(),
+            args=[now, self.REAP_BATCH, now + self.LEASE_TIMEOUT]
+        )
+    
     def dequeue(self, timeout: int = 0) -> Optional[Job]:
-        """Get the next job from queue (blocking)."""
+        """Get the next job from queue, waiting up to `timeout` seconds (polling)."""
+        deadline = time.time() + timeout
         try:
-            # Get highest priority job
-            if timeout > 0:
-                try:
-                    result = self.client.bzpopmax(self.QUEUE_KEY, timeout=timeout)
-                    if not result:
-                        return None
-                    job_id = result[1]
-                except Exception as timeout_error:
-                    # Handle timeout and connection errors gracefully
-                    error_str = str(timeout_error).lower()
-                    error_type = type(timeout_error).__name__
-                    
-                    # Check for timeout errors (can be TimeoutError or generic timeout messages)
-                    if (error_type == "TimeoutError" or 
-                        "timeout" in error_str or 
-                        "timed out" in error_str or
-                        "reading from socket" in error_str):
-                        # Normal timeout - no job available, this is expected
-                        return None
-                    elif ("connection" in error_str or 
-                          "socket" in error_str or
-                          error_type == "ConnectionError"):
-                        logger.warning(f"Redis connection error during dequeue: {timeout_error}")
-                        # Try to reconnect on next call
-                        self.close()
-                        return None
-                    else:
-                        # Re-raise unexpected errors
-                        logger.error(f"Unexpected error during dequeue: {timeout_error}")
-                        raise
-            else:
-                result = self.client.zpopmax(self.QUEUE_KEY, count=1)
-                if not result:
+            while True:
+                job_id = self._lease_next()
+                if job_id:
+                    job = self._start_job(job_id)
+                    if job:
+                        return job
+                    continue
+                if time.time() >= deadline:
                     return None
-                job_id = result[0][0]
-            
-            # Mark as processing
-            self.client.sadd(self.PROCESSING_KEY, job_id)
-            
-            # Get job data
-            job_data = self.client.get(f"{self.JOB_PREFIX}{job_id}")
-            if not job_data:
-                self.client.srem(self.PROCESSING_KEY, job_id)
-                return None
-            
-            job = Job.from_dict(json.loads(job_data))
-            job.status = JobStatus.RUNNING
-            job.started_at = datetime.now().isoformat()
-            job.attempts += 1
-            
-            # Update job data
-            self.client.set(
-                f"{self.JOB_PREFIX}{job_id}",
-                json.dumps(job.to_dict()),
-                ex=86400 * 7
-            )
-            
-            return job
-            
+                time.sleep(min(self.DEQUEUE_POLL_INTERVAL, max(0.0, deadline - time.time())))
         except Exception as e:
+            error_str = str(e).lower()
+            if "connection" in error_str or "socket" in error_str or type(e).__name__ == "ConnectionError":
+                logger.warning(f"Redis connection error during dequeue: {e}")
+                # Try to reconnect on next call
+                self.close()
+                return None
             logger.error(f"Error dequeuing job: {e}")
             return None
     
+    def _start_job(self, job_id: str) -> Optional[Job]:
+        """Mark a freshly leased job as running; None if it must not run."""
+        job_data = self.client.get(f"{self.JOB_PREFIX}{job_id}")
+        if not job_data:
+            # Job data expired: drop the lease
+            pipe = self.client.pipeline()
+            pipe.zrem(self.LEASES_KEY, job_id)
+            pipe.hdel(self.SCORES_KEY, job_id)
+            pipe.execute()
+            return None
+        
+        job = Job.from_dict(json.loads(job_data))
+        if job.status in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED):
+            # Requeued after its lease expired, then finished by its first worker
+            pipe = self.client.pipeline()
+            pipe.zrem(self.LEASES_KEY, job_id)
+            pipe.hdel(self.SCORES_KEY, job_id)
+            pipe.execute()
+            return None
+        if job.attempts >= job.max_attempts:
+            # Every attempt lost its lease (worker killed while running it)
+            self._finish_job(job_id, JobStatus.FAILED,
+                             error_message=job.error_message or f"Lease expired {job.attempts} times")
+            return None
+        
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.now().isoformat()
+        job.attempts += 1
+        
+        # Update job data
+        self.client.set(
+            f"{self.JOB_PREFIX}{job_id}",
+            json.dumps(job.to_dict()),
+            ex=86400 * 7
+        )
+        return job
+    
+    def extend_lease(self, job_id: str) -> bool:
+        """Heartbeat: push the lease deadline of a running job; False if the lease was lost."""
+        return bool(self.client.zadd(
+            self.LEASES_KEY, {job_id: time.time() + self.LEASE_TIMEOUT}, xx=True, ch=True
+        ))
+    
+    def reap_expired_leases(self) -> Dict[str, int]:
+        """Promote due retries and requeue jobs whose lease expired."""
+        self.client  # make sure the scripts are registered
+        promoted, expired = self._reap_script(keys=self._script_keys(), args=[time.time(), self.REAP_BATCH])
+        
+        # Jobs left in the pre-lease processing set can never finish: requeue them
+        legacy = self.client.smembers(self.PROCESSING_KEY) if self.client.type(self.PROCESSING_KEY) == 'set' else []
+        for job_id in legacy:
+            job = self.get_job(job_id)
+            if job:
+                self.client.zadd(self.QUEUE_KEY, {job_id: job.priority * 1000000 - time.time()})
+            self.client.srem(self.PROCESSING_KEY, job_id)
+        expired += len(legacy)
+        
+        if expired:
+            logger.warning(f"Requeued {expired} job(s) whose lease expired")
+        return {'retries_promoted': promoted, 'leases_expired': expired}
+    
     def complete(self, job_id: str, result: Dict = None):
         """Mark a job as completed."""
         self._finish_job(job_id, JobStatus.COMPLETED, result=result)
     
     def fail(self, job_id: str, error: str, retry: bool = True):
-        """Mark a job as failed, optionally retry."""
+        """Mark a job as failed, optionally retry after an exponential backoff."""
         job_data = self.client.get(f"{self.JOB_PREFIX}{job_id}")
         if not job_data:
             return
@@ -227,20 +327,21 @@ class RedisJobQueue:
         job = Job.from_dict(json.loads(job_data))
         
         if retry and job.attempts < job.max_attempts:
-            # Re-queue with lower priority
             job.status = JobStatus.PENDING
             job.error_message = error
-            self.client.set(
-                f"{self.JOB_PREFIX}{job_id}",
-                json.dumps(job.to_dict()),
-                ex=86400 * 7
-            )
             
-            # Add back to queue with delay (exponential backoff)
+            # Wait in the delayed set, then re-queue with lower priority
             delay = min(300, 30 * (2 ** job.attempts))  # Max 5 min delay
-            score = (job.priority - 1) * 1000000 - time.time() + delay
-            self.client.zadd(self.QUEUE_KEY, {job_id: score})
-            self.client.srem(self.PROCESSING_KEY, job_id)
+            score = (job.priority - 1) * 1000000 - time.time()
+            pipe = self.client.pipeline()
+            pipe.set(f"{self.JOB_PREFIX}{job_id}", json.dumps(job.to_dict()), ex=86400 * 7)
+            pipe.hset(self.SCORES_KEY, job_id, score)
+            pipe.zadd(self.DELAYED_KEY, {job_id: time.time() + delay})
+            # Also requeued if its lease expired meanwhile: only the delayed entry must stay
+            pipe.zrem(self.QUEUE_KEY, job_id)
+            pipe.zrem(self.LEASES_KEY, job_id)
+            pipe.hincrby(self.METRICS_KEY, 'retries_scheduled', 1)
+            pipe.execute()
             
             logger.info(f"Job {job_id} will retry in {delay}s (attempt {job.attempts}/{job.max_attempts})")
         else:
@@ -259,19 +360,30 @@ class RedisJobQueue:
         job.result = result
         job.error_message = error_message
         
+        pipe = self.client.pipeline()
         # Update job data
-        self.client.set(
+        pipe.set(
             f"{self.JOB_PREFIX}{job_id}",
             json.dumps(job.to_dict()),
             ex=86400 * 7
         )
         
         # Store in results (keep last 1000)
-        self.client.lpush(self.RESULTS_KEY, job_id)
-        self.client.ltrim(self.RESULTS_KEY, 0, 999)
+        pipe.lpush(self.RESULTS_KEY, job_id)
+        pipe.ltrim(self.RESULTS_KEY, 0, 999)
         
-        # Remove from processing
-        self.client.srem(self.PROCESSING_KEY, job_id)
+        # Count it for the day
+        daily_key = f"{self.DAILY_PREFIX}{job.completed_at[:10]}"
+        pipe.hincrby(daily_key, JobStatus(status).value, 1)
+        pipe.expire(daily_key, self.DAILY_TTL)
+        
+        # Release the lease, and drop the job from the queue / delayed set in case
+        # its lease expired and it was requeued while this worker still ran it
+        pipe.zrem(self.LEASES_KEY, job_id)
+        pipe.zrem(self.QUEUE_KEY, job_id)
+        pipe.zrem(self.DELAYED_KEY, job_id)
+        pipe.hdel(self.SCORES_KEY, job_id)
+        pipe.execute()
         
         logger.info(f"Job {job_id} finished with status: {status}")
     
@@ -283,35 +395,38 @@ class RedisJobQueue:
         return Job.from_dict(json.loads(job_data))
     
     def get_queue_stats(self) -> Dict[str, int]:
-        """Get queue statistics."""
+        """Get queue statistics (one round trip, constant time)."""
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zcard(self.QUEUE_KEY)
+        pipe.zcard(self.LEASES_KEY)
+        pipe.zcard(self.DELAYED_KEY)
+        pipe.hmget(f"{self.DAILY_PREFIX}{datetime.now().date().isoformat()}",
+                   JobStatus.COMPLETED.value, JobStatus.FAILED.value, JobStatus.CANCELLED.value)
+        pending, processing, delayed, today = pipe.execute()
+        completed, failed, cancelled = (int(count or 0) for count in today)
         return {
-            'pending': self.client.zcard(self.QUEUE_KEY),
-            'processing': self.client.scard(self.PROCESSING_KEY),
-            'completed_today': self._count_completed_today()
+            'pending': pending,
+            'processing': processing,
+            'delayed': delayed,
+            'completed_today': completed,
+            'failed_today': failed,
+            'cancelled_today': cancelled,
         }
     
-    def _count_completed_today(self) -> int:
-        """Count jobs completed today."""
-        today = datetime.now().date().isoformat()
-        count = 0
-        for job_id in self.client.lrange(self.RESULTS_KEY, 0, -1):
-            job = self.get_job(job_id)
-            if job and job.completed_at and job.completed_at.startswith(today):
-                count += 1
-        return count
-    
     def get_recent_jobs(self, limit: int = 20) -> List[Job]:
         """Get recent completed/failed jobs."""
-        jobs = []
-        for job_id in self.client.lrange(self.RESULTS_KEY, 0, limit - 1):
-            job = self.get_job(job_id)
-            if job:
-                jobs.append(job)
-        return jobs
+        job_ids = self.client.lrange(self.RESULTS_KEY, 0, limit - 1)
+        if not job_ids:
+            return []
+        payloads = self.client.mget([f"{self.JOB_PREFIX}{job_id}" for job_id in job_ids])
+        return [Job.from_dict(json.loads(data)) for data in payloads if data]
     
     def cancel_job(self, job_id: str) -> bool:
-        """Cancel a pending job."""
-        removed = self.client.zrem(self.QUEUE_KEY, job_id)
+        """Cancel a pending job (queued or waiting for a retry)."""
+        pipe = self.client.pipeline()
+        pipe.zrem(self.QUEUE_KEY, job_id)
+        pipe.zrem(self.DELAYED_KEY, job_id)
+        removed = any(pipe.execute())
         if removed:
             self._finish_job(job_id, JobStatus.CANCELLED)
             return True
@@ -319,9 +434,13 @@ class RedisJobQueue:
     
     def clear_queue(self) -> int:
         """Clear all pending jobs."""
-        count = self.client.zcard(self.QUEUE_KEY)
-        self.client.delete(self.QUEUE_KEY)
-        return count
+        job_ids = self.client.zrange(self.QUEUE_KEY, 0, -1)
+        pipe = self.client.pipeline()
+        pipe.delete(self.QUEUE_KEY)
+        if job_ids:
+            pipe.hdel(self.SCORES_KEY, *job_ids)
+        pipe.execute()
+        return len(job_ids)
 
 
 class InMemoryJobQueue:
@@ -385,6 +504,16 @@ class InMemoryJobQueue:
                 job.error_message = error
                 self._results.insert(0, job)
     
+    def extend_lease(self, job_id: str) -> bool:
+        return job_id in self._processing
+    
+    def reap_expired_leases(self) -> Dict[str, int]:
+        # Jobs cannot outlive the process holding this queue
+        return {'retries_promoted': 0, 'leases_expired': 0}
+    
+    def get_metrics(self) -> Dict[str, int]:
+        return {}
+    
     def get_job(self, job_id: str) -> Optional[Job]:
         for job in self._queue + list(self._processing.values()) + self._results:
             if job.id == job_id:
@@ -392,12 +521,15 @@ class InMemoryJobQueue:
         return None
     
     def get_queue_stats(self) -> Dict[str, int]:
+        today = datetime.now().date().isoformat()
+        finished_today = [j.status for j in self._results
+                          if j.completed_at and j.completed_at.startswith(today)]
         return {
             'pending': len(self._queue),
             'processing': len(self._processing),
-            'completed_today': len([j for j in self._results 
-                                   if j.completed_at and 
-                                   j.completed_at.startswith(datetime.now().date().isoformat())])
+            'completed_today': finished_today.count(JobStatus.COMPLETED),
+            'failed_today': finished_today.count(JobStatus.FAILED),
+            'cancelled_today': finished_today.count(JobStatus.CANCELLED),
         }
     
     def get_recent_jobs(self, limit: int = 20) -> List[Job]:
@@ -503,3 +635,12 @@ def enqueue_backup_job(backup_type: str = 'hourly') -> str:
         {'backup_type': backup_type},
         priority=2  # High priority
     )
+
+
+def enqueue_refresh_insights_job(force: bool = False, triggered_by: str = 'scheduler') -> str:
+    """Enqueue a refresh of the precomputed What's Happening / improvements analyses."""
+    return get_job_queue().enqueue(
+        JobType.REFRESH_INSIGHTS,
+        {'force': force, 'triggered_by': triggered_by},
+        priority=1
+    )
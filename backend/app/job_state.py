@@ -0,0 +1,500 @@
+"""
+Scraping Job State
+==================
+Live state of the scraping jobs started from the API (/scrape/{source}/job,
+/scrape/keywords): status, progress, cancel flag, errors and results.
+
+The API runs several worker processes, so this state cannot live in a module
+dict: a status poll or a cancel request can reach any worker. It is kept in one
+Redis hash per job (plus two lists for errors and results), written with
+pipelines, with the Postgres jobs table as fallback when Redis is not
+available. The jobs table also keeps the history: creation, errors, results
+and final status are always written there; progress ticks only go to Redis.
+
+Every write is also published as an event (progress, status, error, result,
+log) on the job channel, so /scrape/jobs/{id}/events can push updates instead
+of being polled (see watch()).
+"""
+from __future__ import annotations
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+from . import database as db
+from .job_queue import REDIS_URL, REDIS_AVAILABLE, redis
+
+logger = logging.getLogger(__name__)
+
+redis_asyncio = None
+if REDIS_AVAILABLE:
+    try:
+        import redis.asyncio as redis_asyncio
+    except ImportError:
+        pass
+
+FINAL_STATUSES = ('completed', 'failed', 'cancelled')
+# A running job without any update for this long is considered dead
+STUCK_AFTER = 30 * 60
+
+
+def _empty_state(job_id: str) -> Dict[str, Any]:
+    return {
+        'id': job_id,
+        'status': 'pending',
+        'progress': {'total': 0, 'completed': 0},
+        'results': [],
+        'errors': [],
+        'cancelled': False,
+        'error': None,
+        'updated_at': None,
+    }
+
+
+def _state_from_record(rec: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a row of the jobs table to the state format."""
+    state = _empty_state(rec['id'])
+    payload = rec.get('payload') if isinstance(rec.get('payload'), dict) else {}
+    progress = rec.get('progress') if isinstance(rec.get('progress'), dict) else {}
+    updated_at = rec.get('updated_at') or rec.get('started_at') or rec.get('created_at')
+    state.update({
+        'job_type': rec.get('job_type'),
+        'status': rec.get('status') or 'pending',
+        'progress': {
+            'total': int(progress.get('total', 0) or 0),
+            'completed': int(progress.get('completed', 0) or 0),
+        },
+        'results': rec.get('results') or [],
+        'errors': rec.get('errors') or [],
+        'cancelled': rec.get('status') == 'cancelled',
+        'error': rec.get('error'),
+        'source': payload.get('source'),
+        'query': payload.get('query'),
+        'updated_at': updated_at.timestamp() if isinstance(updated_at, datetime) else updated_at,
+    })
+    return state
+
+
+def is_stuck(state: Dict[str, Any]) -> bool:
+    """Whether a running job has not been updated for STUCK_AFTER seconds."""
+    updated_at = state.get('updated_at')
+    return (state.get('status') == 'running' and isinstance(updated_at, (int, float))
+            and time.time() - updated_at > STUCK_AFTER)
+
+
+class RedisJobStateStore:
+    """Job state in Redis, written through to Postgres for history.
+
+    ocft:scrape:job:<id> is a hash (status, progress_total, progress_completed,
+    cancelled, error, ...), ocft:scrape:job:<id>:errors and :results are lists;
+    all expire STATE_TTL seconds after the last write. Ids of unfinished jobs
+    are in ocft:scrape:jobs:active. Reads fall back to the jobs table once the
+    keys have expired. Events are published on ocft:scrape:job:<id>:events in
+    the same pipeline (or script) as the write.
+    """
+
+    JOB_PREFIX = "ocft:scrape:job:"
+    ACTIVE_KEY = "ocft:scrape:jobs:active"
+    STATE_TTL = 86400
+
+    # KEYS: job hash, active set, events channel
+    # ARGV: status, error, now, job id, ttl, event
+    # Status changes never override a cancellation
+    _SET_STATUS_SCRIPT = """
+    if redis.call('HGET', KEYS[1], 'cancelled') == '1' and ARGV[1] ~= 'cancelled' then
+        return 0
+    end
+    redis.call('HSET', KEYS[1], 'status', ARGV[1], 'updated_at', ARGV[3])
+    redis.call('EXPIRE', KEYS[1], ARGV[5])
+    if ARGV[2] ~= '' then redis.call('HSET', KEYS[1], 'error', ARGV[2]) end
+    if ARGV[1] == 'completed' or ARGV[1] == 'failed' or ARGV[1] == 'cancelled' then
+        redis.call('SREM', KEYS[2], ARGV[4])
+    end
+    redis.call('PUBLISH', KEYS[3], ARGV[6])
+    return 1
+    """
+
+    def __init__(self, redis_url: str = None):
+        self.redis_url = redis_url or REDIS_URL
+        self._client: Optional[Any] = None
+        self._set_status_script = None
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            self._client = redis.from_url(
+                self.redis_url,
+                decode_responses=True,
+                socket_timeout=5,
+                socket_connect_timeout=5,
+            )
+            self._set_status_script = self._client.register_script(self._SET_STATUS_SCRIPT)
+        return self._client
+
+    def close(self):
+        if self._client:
+            self._client.close()
+            # Later calls reconnect through the client property
+            self._client = None
+            self._set_status_script = None
+
+    def _keys(self, job_id: str):
+        key = f"{self.JOB_PREFIX}{job_id}"
+        return key, f"{key}:errors", f"{key}:results"
+
+    def _channel(self, job_id: str) -> str:
+        return f"{self.JOB_PREFIX}{job_id}:events"
+
+    def create(self, job_id: str, job_type: str, payload: Dict = None, total: int = 0,
+               **fields) -> Dict[str, Any]:
+        """Register a new pending job."""
+        key, errors_key, results_key = self._keys(job_id)
+        mapping = {
+            'id': job_id,
+            'job_type': job_type,
+            'status': 'pending',
+            'progress_total': total,
+            'progress_completed': 0,
+            'cancelled': 0,
+            'updated_at': time.time(),
+        }
+        mapping.update({name: value for name, value in fields.items() if value is not None})
+        pipe = self.client.pipeline()
+        pipe.delete(key, errors_key, results_key)
+        pipe.hset(key, mapping=mapping)
+        pipe.expire(key, self.STATE_TTL)
+        pipe.sadd(self.ACTIVE_KEY, job_id)
+        pipe.execute()
+        try:
+            db.create_job_record(job_id, job_type=job_type, payload=payload)
+        except Exception as e:
+            logger.warning(f"Could not create DB record for job {job_id[:8]}: {e}")
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Current state of a job (one round trip), from Postgres once expired."""
+        key, errors_key, results_key = self._keys(job_id)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hgetall(key)
+        pipe.lrange(errors_key, 0, -1)
+        pipe.lrange(results_key, 0, -1)
+        fields, errors, results = pipe.execute()
+        if not fields:
+            rec = db.get_job_record(job_id)
+            return _state_from_record(rec) if rec else None
+
+        state = _empty_state(job_id)
+        state.update({
+            name: value for name, value in fields.items()
+            if name not in ('progress_total', 'progress_completed', 'cancelled', 'updated_at')
+        })
+        state.update({
+            'progress': {
+                'total': int(fields.get('progress_total') or 0),
+                'completed': int(fields.get('progress_completed') or 0),
+            },
+            'cancelled': fields.get('cancelled') == '1',
+            'error': fields.get('error') or None,
+            'errors': errors,
+            'results': [json.loads(result) for result in results],
+            'updated_at': float(fields['updated_at']) if fields.get('updated_at') else None,
+        })
+        return state
+
+    def set_progress(self, job_id: str, completed: int, total: int = None):
+        """Update the progress of a job (Redis only, it changes every second)."""
+        key = self._keys(job_id)[0]
+        mapping = {'progress_completed': completed, 'updated_at': time.time()}
+        event = {'type': 'progress', 'completed': completed}
+        if total is not None:
+            mapping['progress_total'] = total
+            event['total'] = total
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hset(key, mapping=mapping)
+        pipe.expire(key, self.STATE_TTL)
+        pipe.publish(self._channel(job_id), json.dumps(event))
+        pipe.execute()
+
+    def set_status(self, job_id: str, status: str, error: str = None) -> bool:
+        """Change the status of a job; False if the job was cancelled meanwhile."""
+        key = self._keys(job_id)[0]
+        self.client  # registers the script
+        event = json.dumps({'type': 'status', 'status': status, 'error': error})
+        changed = bool(self._set_status_script(
+            keys=[key, self.ACTIVE_KEY, self._channel(job_id)],
+            args=[status, error or '', time.time(), job_id, self.STATE_TTL, event]
+        ))
+        if changed:
+            try:
+                if status in FINAL_STATUSES:
+                    db.finalize_job(job_id, status, error)
+                else:
+                    db.update_job_status(job_id, status)
+            except Exception as e:
+                logger.warning(f"Could not store status {status} of job {job_id[:8]}: {e}")
+        return changed
+
+    def add_error(self, job_id: str, error: str):
+        key, errors_key, _ = self._keys(job_id)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.rpush(errors_key, error)
+        pipe.expire(errors_key, self.STATE_TTL)
+        pipe.hset(key, 'updated_at', time.time())
+        pipe.publish(self._channel(job_id), json.dumps({'type': 'error', 'error': error}))
+        pipe.execute()
+        try:
+            db.append_job_error(job_id, error)
+        except Exception as e:
+            logger.debug(f"Could not store error of job {job_id[:8]}: {e}")
+
+    def add_result(self, job_id: str, result: Dict):
+        key, _, results_key = self._keys(job_id)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.rpush(results_key, json.dumps(result))
+        pipe.expire(results_key, self.STATE_TTL)
+        pipe.hset(key, 'updated_at', time.time())
+        pipe.publish(self._channel(job_id), json.dumps({'type': 'result', 'result': result}))
+        pipe.execute()
+        try:
+            db.append_job_result(job_id, result)
+        except Exception as e:
+            logger.debug(f"Could not store result of job {job_id[:8]}: {e}")
+
+    def is_cancelled(self, job_id: str) -> bool:
+        return self.client.hget(self._keys(job_id)[0], 'cancelled') == '1'
+
+    def cancel(self, job_id: str, reason: str = 'cancelled by user') -> bool:
+        """Flag a job as cancelled; its runner stops at the next check.
+
+        Returns False if the job is unknown or already finished.
+        """
+        key = self._keys(job_id)[0]
+        status = self.client.hget(key, 'status')
+        if status is None:
+            rec = db.get_job_record(job_id)
+            if not rec or rec.get('status') in FINAL_STATUSES:
+                return False
+            db.append_job_error(job_id, reason)
+            db.finalize_job(job_id, 'cancelled', reason)
+            return True
+        if status in FINAL_STATUSES:
+            return False
+        self.client.hset(key, 'cancelled', 1)
+        self.add_error(job_id, reason)
+        self.set_status(job_id, 'cancelled', reason)
+        return True
+
+    def active_job_ids(self) -> List[str]:
+        """Ids of the jobs not finished yet (pending or running)."""
+        return sorted(self.client.smembers(self.ACTIVE_KEY))
+
+    def log(self, job_id: str, level: str, message: str):
+        """Publish a log line of a job (not stored)."""
+        self.client.publish(self._channel(job_id), json.dumps({'type': 'log', 'level': level, 'message': message}))
+
+    async def watch(self, job_id: str, interval: float):
+        """Yield the events of a job, grouped in windows of `interval` seconds.
+
+        Windows without events yield an empty list. Subscribed before the first
+        window, so a state read after the first yield misses no event.
+        """
+        client = redis_asyncio.from_url(self.redis_url, decode_responses=True)
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(self._channel(job_id))
+            yield []
+            while True:
+                events = []
+                deadline = time.monotonic() + interval
+                while (remaining := deadline - time.monotonic()) > 0:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=remaining)
+                    if message and message['type'] == 'message':
+                        events.append(json.loads(message['data']))
+                yield events
+        finally:
+            await pubsub.reset()
+            await client.close()
+
+
+class PostgresJobStateStore:
+    """Job state in the Postgres jobs table (used when Redis is not available).
+
+    Every progress tick is an UPDATE and cancellation checks are SELECTs, so
+    this is slower than the Redis store but still shared by all processes.
+    """
+
+    WATCH_POLL_INTERVAL = 2.0
+
+    def create(self, job_id: str, job_type: str, payload: Dict = None, total: int = 0,
+               **fields) -> Dict[str, Any]:
+        payload = dict(payload or {}, **{name: value for name, value in fields.items() if value is not None})
+        db.create_job_record(job_id, job_type=job_type, payload=payload)
+        db.update_job_progress(job_id, total, 0)
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        rec = db.get_job_record(job_id)
+        return _state_from_record(rec) if rec else None
+
+    def set_progress(self, job_id: str, completed: int, total: int = None):
+        if total is None:
+            total = (self.get(job_id) or _empty_state(job_id))['progress']['total']
+        db.update_job_progress(job_id, total, completed)
+
+    def set_status(self, job_id: str, status: str, error: str = None) -> bool:
+        if status != 'cancelled' and self.is_cancelled(job_id):
+            return False
+        if status in FINAL_STATUSES:
+            db.finalize_job(job_id, status, error)
+        else:
+            db.update_job_status(job_id, status)
+        return True
+
+    def add_error(self, job_id: str, error: str):
+        db.append_job_error(job_id, error)
+
+    def add_result(self, job_id: str, result: Dict):
+        db.append_job_result(job_id, result)
+
+    def is_cancelled(self, job_id: str) -> bool:
+        state = self.get(job_id)
+        return bool(state and state['cancelled'])
+
+    def cancel(self, job_id: str, reason: str = 'cancelled by user') -> bool:
+        state = self.get(job_id)
+        if not state or state['status'] in FINAL_STATUSES:
+            return False
+        db.append_job_error(job_id, reason)
+        db.finalize_job(job_id, 'cancelled', reason)
+        return True
+
+    def active_job_ids(self) -> List[str]:
+        jobs = db.get_all_jobs(status='running', limit=1000) + db.get_all_jobs(status='pending', limit=1000)
+        return [job['id'] for job in jobs]
+
+    def log(self, job_id: str, level: str, message: str):
+        pass
+
+    async def watch(self, job_id: str, interval: float):
+        """No pub/sub: ask the reader to re-read the state every WATCH_POLL_INTERVAL."""
+        yield []
+        while True:
+            await asyncio.sleep(max(interval, self.WATCH_POLL_INTERVAL))
+            yield [{'type': 'refresh'}]
+
+    def close(self):
+        pass
+
+
+class InMemoryJobStateStore:
+    """Job state in a dict, for tests and single-process development only."""
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+
+    def create(self, job_id: str, job_type: str, payload: Dict = None, total: int = 0,
+               **fields) -> Dict[str, Any]:
+        state = _empty_state(job_id)
+        state.update({name: value for name, value in fields.items() if value is not None})
+        state.update({'job_type': job_type, 'progress': {'total': total, 'completed': 0},
+                      'updated_at': time.time()})
+        self._jobs[job_id] = state
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        state = self._jobs.get(job_id)
+        if state is None:
+            return None
+        return dict(state, progress=dict(state['progress']), results=list(state['results']),
+                    errors=list(state['errors']))
+
+    def set_progress(self, job_id: str, completed: int, total: int = None):
+        state = self._jobs.get(job_id)
+        if state:
+            state['progress']['completed'] = completed
+            if total is not None:
+                state['progress']['total'] = total
+            state['updated_at'] = time.time()
+
+    def set_status(self, job_id: str, status: str, error: str = None) -> bool:
+        state = self._jobs.get(job_id)
+        if not state or (state['cancelled'] and status != 'cancelled'):
+            return False
+        state['status'] = status
+        state['error'] = error or state['error']
+        state['updated_at'] = time.time()
+        return True
+
+    def add_error(self, job_id: str, error: str):
+        if job_id in self._jobs:
+            self._jobs[job_id]['errors'].append(error)
+
+    def add_result(self, job_id: str, result: Dict):
+        if job_id in self._jobs:
+            self._jobs[job_id]['results'].append(result)
+
+    def is_cancelled(self, job_id: str) -> bool:
+        return bool(self._jobs.get(job_id, {}).get('cancelled'))
+
+    def cancel(self, job_id: str, reason: str = 'cancelled by user') -> bool:
+        state = self._jobs.get(job_id)
+        if not state or state['status'] in FINAL_STATUSES:
+            return False
+        state['cancelled'] = True
+        self.add_error(job_id, reason)
+        return self.set_status(job_id, 'cancelled', reason)
+
+    def active_job_ids(self) -> List[str]:
+        return [job_id for job_id, state in self._jobs.items() if state['status'] not in FINAL_STATUSES]
+
+    def log(self, job_id: str, level: str, message: str):
+        pass
+
+    async def watch(self, job_id: str, interval: float):
+        yield []
+        while True:
+            await asyncio.sleep(interval)
+            yield [{'type': 'refresh'}]
+
+    def close(self):
+        pass
+
+
+# ============================================
+# Global store instance
+# ============================================
+
+_job_state_store = None
+
+
+def get_job_state_store():
+    """Get the global job state store (Redis, or Postgres if Redis is down)."""
+    global _job_state_store
+    if _job_state_store is None:
+        if REDIS_AVAILABLE:
+            try:
+                _job_state_store = RedisJobStateStore()
+                _job_state_store.client.ping()
+                logger.info("Using Redis job state store")
+            except Exception as e:
+                logger.warning(f"Redis not available ({e}), job state kept in Postgres")
+                _job_state_store = PostgresJobStateStore()
+        else:
+            _job_state_store = PostgresJobStateStore()
+    return _job_state_store
+
+
+def set_job_state_store(store):
+    """Replace the global store (tests)."""
+    global _job_state_store
+    _job_state_store = store
+
+
+def close_job_state_store():
+    """Close the job state store connection."""
+    global _job_state_store
+    if _job_state_store:
+        _job_state_store.close()
+        _job_state_store = None
@@ -0,0 +1,188 @@
+"""
+Scraping Log Buffer
+===================
+In-process sink for the scraping logs (scraping_logs table).
+
+Scrapers log every request start, success and retry, often from async code:
+writing each line with its own INSERT blocks the event loop and borrows a pool
+connection every time. Log lines are instead appended to a bounded buffer and a
+background thread writes them in batches (one multi-row INSERT) every
+SCRAPING_LOG_BATCH_SIZE entries or SCRAPING_LOG_FLUSH_MS milliseconds.
+
+When the database cannot keep up and the buffer is full, new info/success lines
+are dropped, warnings and errors evict the oldest line instead; both are counted
+in `dropped`. The buffer is flushed on shutdown (close_log_buffer, also
+registered with atexit).
+"""
+import atexit
+import logging
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Optional, Dict, Any, Callable, List, Tuple
+
+from . import database as db
+
+logger = logging.getLogger(__name__)
+
+LOG_BATCH_SIZE = int(os.getenv('SCRAPING_LOG_BATCH_SIZE', '100'))
+LOG_FLUSH_INTERVAL = int(os.getenv('SCRAPING_LOG_FLUSH_MS', '500')) / 1000.0
+LOG_BUFFER_SIZE = int(os.getenv('SCRAPING_LOG_BUFFER_SIZE', '5000'))
+
+# Levels kept under backpressure (they evict the oldest line instead of being dropped)
+PRIORITY_LEVELS = ('warning', 'error')
+
+
+class ScrapingLogBuffer:
+    """Bounded buffer of scraping log lines flushed in batches by a background thread."""
+
+    def __init__(
+        self,
+        writer: Optional[Callable[[List[Tuple]], Any]] = None,
+        max_size: int = LOG_BUFFER_SIZE,
+        batch_size: int = LOG_BATCH_SIZE,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+    ):
+        """
+        Args:
+            writer: Callable writing a list of (timestamp, source, level, message,
+                details) tuples (default: db.add_scraping_logs)
+            max_size: Maximum number of pending lines
+            batch_size: Lines per INSERT, and pending count that triggers a flush
+            flush_interval: Maximum delay before pending lines are written (seconds)
+        """
+        self._writer = writer or db.add_scraping_logs
+        self.max_size = max_size
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._entries = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._reported_dropped = 0
+
+    def add(self, source: str, level: str, message: str,
+            details: Optional[Dict[str, Any]] = None) -> bool:
+        """Queue a log line. Returns False if it was dropped (buffer full)."""
+        entry = (datetime.now(), source, level, message, details)
+        with self._lock:
+            if len(self._entries) >= self.max_size:
+                self.dropped += 1
+                if level not in PRIORITY_LEVELS:
+                    return False
+                self._entries.popleft()
+            self._entries.append(entry)
+            pending = len(self._entries)
+
+        self._ensure_started()
+        if pending >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def flush(self) -> int:
+        """Write all pending lines now. Returns the number of lines written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._entries.popleft()
+                             for _ in range(min(self.batch_size, len(self._entries)))]
+                if not batch:
+                    break
+                try:
+                    self._writer(batch)
+                    written += len(batch)
+                except Exception as e:
+                    # Don't retry: a database outage must not grow the buffer forever
+                    self.failed += len(batch)
+                    logger.warning(f"Failed to write {len(batch)} scraping logs: {e}")
+                    break
+            self.written += written
+
+        if self.dropped > self._reported_dropped:
+            logger.warning(f"Scraping log buffer full: {self.dropped - self._reported_dropped} "
+                           f"lines dropped (total {self.dropped})")
+            self._reported_dropped = self.dropped
+        return written
+
+    def stats(self) -> Dict[str, int]:
+        """Buffer counters."""
+        with self._lock:
+            pending = len(self._entries)
+        return {
+            'pending': pending,
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed': self.failed,
+        }
+
+    def close(self, timeout: float = 5.0):
+        """Stop the flusher thread and write what is left."""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+        self.flush()
+
+    def _ensure_started(self):
+        # The flusher thread does not survive a fork: restart it in the child
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._stop.is_set() or (self._thread is not None and self._pid == os.getpid()):
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='scraping-log-flusher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Scraping log flusher error: {e}")
+
+
+# ============================================
+# Global buffer instance
+# ============================================
+
+_log_buffer: Optional[ScrapingLogBuffer] = None
+_log_buffer_lock = threading.Lock()
+
+
+def get_log_buffer() -> ScrapingLogBuffer:
+    """Get the global scraping log buffer."""
+    global _log_buffer
+    if _log_buffer is None:
+        with _log_buffer_lock:
+            if _log_buffer is None:
+                _log_buffer = ScrapingLogBuffer()
+    return _log_buffer
+
+
+def set_log_buffer(buffer: Optional[ScrapingLogBuffer]):
+    """Replace the global buffer (tests)."""
+    global _log_buffer
+    _log_buffer = buffer
+
+
+def close_log_buffer():
+    """Flush pending scraping logs and stop the flusher thread."""
+    global _log_buffer
+    if _log_buffer:
+        _log_buffer.close()
+        _log_buffer = None
+
+
+atexit.register(close_log_buffer)
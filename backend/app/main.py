@@ -376,12 +376,38 @@ def startup_event():
         from .scheduler.jobs import recheck_answered_status_job
         scheduler.add_job(recheck_answered_status_job, 'interval', hours=3, id='recheck_answered')
         
+        # Scraping logs partitions: create upcoming days, drop expired ones (daily at 00:15)
+        from .scheduler.jobs import scraping_logs_maintenance_job
+        scheduler.add_job(scraping_logs_maintenance_job, 'cron', hour=0, minute=15, id='scraping_logs_maintenance')
+        
+        # Tombstones of deleted posts (delta sync): drop the expired ones (daily at 00:30)
+        from .scheduler.jobs import prune_post_tombstones_job
+        scheduler.add_job(prune_post_tombstones_job, 'cron', hour=0, minute=30, id='prune_post_tombstones')
+        
+        # Precomputed What's Happening / improvements analyses: hourly, recomputed only
+        # if their posts changed (also refreshed after each auto-scrape)
+        from .scheduler.jobs import refresh_insight_snapshots_job
+        scheduler.add_job(refresh_insight_snapshots_job, 'interval', hours=1, id='refresh_insights')
+        
+        # Pain point / product aggregates: tag untagged or stale posts once, in background
+        from .scheduler.jobs import retag_posts_job
+        scheduler.add_job(retag_posts_job, id='retag_posts')
+        
+        # Remote language re-labeling of 'unknown' posts: opt-in, every 6 hours
+        from .analysis.language_detection import remote_relabel_enabled
+        if remote_relabel_enabled():
+            from .scheduler.jobs import relabel_unknown_languages_job
+            scheduler.add_job(relabel_unknown_languages_job, 'interval', hours=6, id='relabel_languages')
+        
         scheduler.start()
         logger.info("[SCHEDULER] Started:")
         logger.info("  - Auto-scrape: every 3 hours")
         logger.info("  - Auto-backup (hourly): every hour (keeps 24 backups)")
         logger.info("  - Auto-backup (daily): daily at 2 AM (keeps 30 backups)")
         logger.info("  - Recheck answered: every 3 hours (50 posts/run)")
+        logger.info("  - Scraping logs partitions: daily at 00:15")
+        logger.info("  - Post tombstones pruning: daily at 00:30")
+        logger.info("  - Insight snapshots: every hour (if posts changed)")
 
 
 @app.on_event("shutdown")
@@ -389,3 +415,14 @@ def shutdown_event():
     if scheduler.running:
         scheduler.shutdown()
         logger.info("[SCHEDULER] Stopped")
+    
+    # Write the scraping logs still in the buffer
+    from .log_buffer import close_log_buffer
+    close_log_buffer()
+
+
+@app.on_event("shutdown")
+async def close_llm_gateway():
+    # Pooled LLM clients live in the server event loop
+    from .utils.llm_gateway import get_llm_gateway
+    await get_llm_gateway().aclose()
@@ -1,7 +1,6 @@
 """PowerPoint report generator for OVH feedback analytics."""
 import io
 import logging
-import re
 from typing import List, Dict, Optional
 from datetime import datetime
 from collections import Counter, defaultdict
@@ -469,31 +468,13 @@ def prepare_chart_data(posts: List[Dict]) -> Dict:
             'counts': [s[1] for s in top_sources]
         }
     
-    # Product Distribution - Simple keyword-based detection
-    product_patterns = [
-        ('VPS', r'\b(vps|virtual\s*private\s*server)\b'),
-        ('Dedicated', r'\b(dedicated|dédié|bare\s*metal)\b'),
-        ('Public Cloud', r'\b(public\s*cloud|openstack|instance)\b'),
-        ('Private Cloud', r'\b(private\s*cloud|vmware)\b'),
-        ('Hosting', r'\b(web\s*host|hosting|hébergement)\b'),
-        ('Domain', r'\b(domain|domaine|dns)\b'),
-        ('Email', r'\b(email|exchange|mail|mx)\b'),
-        ('Storage', r'\b(object\s*storage|swift|s3)\b'),
-        ('CDN', r'\b(cdn|content\s*delivery)\b'),
-        ('Backup', r'\b(backup|veeam|archive)\b'),
-    ]
-    
-    product_counts = Counter()
-    for post in posts:
-        content = (post.get('content', '') or '').lower()
-        detected = False
-        for product_name, pattern in product_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                product_counts[product_name] += 1
-                detected = True
-                break  # Only count first match
-        if not detected:
-            product_counts['Other'] += 1
+    # Product Distribution - shared product classifier (first product by priority)
+    from .analysis import classifier
+    detector = classifier.get_product_classifier()
+    product_counts = Counter(
+        detector.detect_product(post.get('content', '') or '') or 'Other'
+        for post in posts
+    )
     
     if product_counts:
         # Take top 8 products
@@ -13,6 +13,7 @@ from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel, Field
 
 from .. import database as db
+from ..analysis import classifier
 from ..auth.dependencies import require_auth, require_admin
 from ..auth.models import TokenData
 
@@ -161,6 +162,22 @@ async def cleanup_duplicates():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post('/admin/reset-scrape-watermarks')
+async def reset_scrape_watermarks(source: Optional[str] = None):
+    """
+    Forget the scrape watermarks (of one source, e.g. 'reddit'): the next scrapes
+    paginate fully again instead of stopping at the items already scraped.
+    """
+    try:
+        deleted_count = db.clear_scrape_watermarks(source=source)
+        return {
+            'deleted': deleted_count,
+            'message': f'Reset {deleted_count} scrape watermarks'
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post('/admin/cleanup-non-ovh-posts')
 async def cleanup_non_ovh_posts():
     """Clean up non-OVH posts."""
@@ -191,75 +208,24 @@ async def get_product_labels_stats():
     - Validation: labels matching official OVH products vs invalid labels
     - Posts with incorrect or non-OVH product labels
     """
-    import re
-    
     try:
-        # Official OVH products list (based on OVHcloud.com)
-        # This is the authoritative list of valid OVH products
-        OFFICIAL_OVH_PRODUCTS = {
-            'VPS', 'Hosting', 'Domain', 'DNS', 'Email', 'Storage', 'CDN', 
-            'Public Cloud', 'Private Cloud', 'Dedicated Server', 'API',
-            'Load Balancer', 'Failover IP', 'SSL Certificate', 
-            'Managed Kubernetes', 'Managed Databases', 'Network', 'IP'
-        }
+        # Official OVH products list (based on OVHcloud.com), shared with the
+        # product detection used at insert time
+        OFFICIAL_OVH_PRODUCTS = set(classifier.PRODUCT_KEYWORDS)
+        detector = classifier.get_product_classifier()
         
-        # Product detection patterns (aligned with official OVH products from insights.py)
-        # Based on OVHcloud.com official products list
-        # Order matters: more specific patterns first
-        product_patterns = [
-            # Web & Hosting
-            {'key': 'domain', 'pattern': re.compile(r'\b(domain|domaine|domain\s*name|domain\s*registration|domain\s*renewal|domain\s*transfer|domain\s*expiration|registrar|bureau\s*d\'enregistrement|whois|domain\s*management|\.ovh|\.com|\.net|\.org|\.fr|\.eu)\b', re.I), 'label': 'Domain'},
-            {'key': 'dns', 'pattern': re.compile(r'\b(dns|dns\s*zone|dns\s*anycast|dnssec|dns\s*record|dns\s*configuration|nameserver|ns\s*record|a\s*record|mx\s*record|cname\s*record|txt\s*record|dns\s*management|dns\s*hosting)\b', re.I), 'label': 'DNS'},
-            {'key': 'email', 'pattern': re.compile(r'\b(email|mail|smtp|imap|pop3|email\s*hosting|exchange|email\s*account)\b', re.I), 'label': 'Email'},
-            {'key': 'web-hosting', 'pattern': re.compile(r'\b(web\s*host|hosting|hébergement|mutualisé|shared\s*host|web\s*hosting\s*plan|ovh\s*hosting)\b', re.I), 'label': 'Hosting'},
-            
-            # Cloud & Servers
-            {'key': 'vps', 'pattern': re.compile(r'\b(vps|virtual\s*private\s*server|ovh\s*vps|vps\s*cloud|cloud\s*vps)\b', re.I), 'label': 'VPS'},
-            {'key': 'dedicated', 'pattern': re.compile(r'\b(dedicated|dedicated\s*server|serveur\s*dédié|bare\s*metal|ovh\s*dedicated|server|serveur)\b', re.I), 'label': 'Dedicated Server'},
-            {'key': 'public-cloud', 'pattern': re.compile(r'\b(public\s*cloud|publiccloud|ovh\s*public\s*cloud|public\s*cloud\s*instance|horizon|openstack)\b', re.I), 'label': 'Public Cloud'},
-            {'key': 'private-cloud', 'pattern': re.compile(r'\b(private\s*cloud|privatecloud|ovh\s*private\s*cloud|vmware|vsphere|hosted\s*private\s*cloud)\b', re.I), 'label': 'Private Cloud'},
-            {'key': 'kubernetes', 'pattern': re.compile(r'\b(kubernetes|k8s|managed\s*kubernetes|ovh\s*kubernetes)\b', re.I), 'label': 'Managed Kubernetes'},
-            {'key': 'managed-databases', 'pattern': re.compile(r'\b(database|mysql|postgresql|mongodb|redis|managed\s*database|ovh\s*database)\b', re.I), 'label': 'Managed Databases'},
-            
-            # Storage & Backup
-            {'key': 'object-storage', 'pattern': re.compile(r'\b(storage|object\s*storage|s3|cloud\s*storage|object\s*storage\s*s3|high\s*performance\s*storage)\b', re.I), 'label': 'Storage'},
-            
-            # Network & CDN
-            {'key': 'cdn', 'pattern': re.compile(r'\b(cdn|content\s*delivery|content\s*delivery\s*network|ovh\s*cdn)\b', re.I), 'label': 'CDN'},
-            {'key': 'load-balancer', 'pattern': re.compile(r'\b(load\s*balancer|loadbalancer|lb|ip\s*load\s*balancing)\b', re.I), 'label': 'Load Balancer'},
-            {'key': 'failover-ip', 'pattern': re.compile(r'\b(failover\s*ip|failover|ip\s*failover|additional\s*ip)\b', re.I), 'label': 'Failover IP'},
-            {'key': 'ssl-certificate', 'pattern': re.compile(r'\b(ssl|ssl\s*certificate|certificate|tls|https\s*certificate)\b', re.I), 'label': 'SSL Certificate'},
-            {'key': 'network', 'pattern': re.compile(r'\b(network|vrack|private\s*network|vlan)\b', re.I), 'label': 'Network'},
-            {'key': 'ip', 'pattern': re.compile(r'\b(ip\s*address|ipv4|ipv6|ip\s*block|ip\s*range)\b', re.I), 'label': 'IP'},
-            
-            # API
-            {'key': 'api', 'pattern': re.compile(r'\b(api|rest\s*api|graphql|ovh\s*api|api\s*ovh|ovhcloud\s*api)\b', re.I), 'label': 'API'},
-        ]
-        
-        def detect_product(content):
-            """Detect product from post content."""
-            if not content:
-                return None
-            content_lower = content.lower()
-            for product in product_patterns:
-                if product['pattern'].search(content_lower):
-                    return product['label']
-            return None
-        
-        # Get all posts from database
-        all_posts = db.get_posts(limit=10000, offset=0)
-        
-        # Analyze posts
-        total_posts = len(all_posts)
+        # Analyze posts (streamed from the database, only the columns needed)
+        total_posts = 0
         posts_with_label = 0
         posts_without_label = 0
         label_distribution = {}
         invalid_labels = {}  # Labels that don't match official OVH products
         posts_with_invalid_labels = []  # Posts with invalid labels
         
-        for post in all_posts:
+        for post in db.iter_posts(columns=['id', 'content']):
+            total_posts += 1
             content = post.get('content', '') or ''
-            detected_label = detect_product(content)
+            detected_label = detector.detect_product(content)
             
             if detected_label:
                 posts_with_label += 1
@@ -695,12 +661,42 @@ Format as bullet points, professional and executive-friendly."""
 # LOGS ENDPOINTS
 # ============================================================================
 
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _encode_log_cursor(log: dict) -> str:
+    """Keyset cursor of a log: '<timestamp in µs since epoch>_<id>'."""
+    timestamp = log['timestamp']
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.astimezone()
+    micros = (timestamp - _EPOCH) // datetime.timedelta(microseconds=1)
+    return f"{micros}_{log['id']}"
+
+
+def _decode_log_cursor(cursor: str) -> tuple:
+    try:
+        micros, log_id = cursor.split('_')
+        return _EPOCH + datetime.timedelta(microseconds=int(micros)), int(log_id)
+    except (ValueError, OverflowError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/api/logs")
-async def get_logs_api(source: Optional[str] = None, level: Optional[str] = None, limit: int = 1000, offset: int = 0):
-    """Get scraping logs from the database."""
+async def get_logs_api(source: Optional[str] = None, level: Optional[str] = None, limit: int = 1000,
+                       offset: int = 0, cursor: Optional[str] = None):
+    """Get scraping logs from the database, newest first.
+    
+    Pass the `next_cursor` of a response as `cursor` to get the next (older)
+    page; `next_cursor` is null on the last page.
+    """
+    before = _decode_log_cursor(cursor) if cursor else None
+    limit = max(1, min(limit, 10000))
     try:
-        logs = db.get_scraping_logs(source=source, level=level, limit=limit, offset=offset)
-        return {"logs": logs, "count": len(logs)}
+        logs = db.get_scraping_logs(source=source, level=level, limit=limit, offset=offset, before=before)
+        next_cursor = None
+        if logs and len(logs) >= limit and isinstance(logs[-1].get('timestamp'), datetime.datetime):
+            next_cursor = _encode_log_cursor(logs[-1])
+        return {"logs": logs, "count": len(logs), "next_cursor": next_cursor}
     except Exception as e:
         logger.error(f"Error fetching logs: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch logs: {str(e)}")
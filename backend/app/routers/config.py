@@ -6,6 +6,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 import logging
 import os
+import threading
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -473,6 +474,18 @@ async def get_llm_config():
     )
 
 
+@router.get(
+    "/api/llm-metrics",
+    summary="Get LLM Gateway Metrics",
+    description="Per-provider LLM call metrics of this API process: calls, errors, cache hits, coalesced calls, latency and tokens.",
+    tags=["Configuration", "LLM"]
+)
+async def get_llm_metrics():
+    """Get the LLM gateway metrics (process-local)."""
+    from ..utils import llm_gateway
+    return llm_gateway.get_metrics()
+
+
 @router.post(
     "/api/llm-config", 
     response_model=LLMConfigResponse,
@@ -1164,6 +1177,8 @@ async def update_pain_points_config(payload: PainPointsPayload):
             for pp in payload.pain_points
         ]
         db.save_pain_points(pain_points_list)
+        # Re-classify posts with the new definitions (rollups stay on the old ones until done)
+        threading.Thread(target=db.retag_posts, daemon=True).start()
         return {'success': True, 'count': len(pain_points_list)}
     except Exception as e:
         logger.error(f"Error updating pain points: {e}")
@@ -18,6 +18,8 @@ from .models import (
 )
 from .analytics import get_pain_points
 from ... import database as db
+from ...analysis import classifier
+from ...utils import llm_gateway
 from fastapi import Query
 
 logger = logging.getLogger(__name__)
@@ -92,22 +94,9 @@ def normalize_ovh_model_name(model: Optional[str], available_models: Optional[Li
 async def _get_ovh_available_models(ovh_key: str, ovh_endpoint: str) -> List[str]:
     """
     Helper function to fetch available models from OVH endpoint.
-    Returns empty list if fetch fails.
+    Returns empty list if fetch fails (cached by the LLM gateway).
     """
-    try:
-        # httpx is already imported at module level
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(
-                f'{ovh_endpoint}/models',
-                headers={'Authorization': f'Bearer {ovh_key}'}
-            )
-            if response.status_code == 200:
-                data = response.json()
-                if isinstance(data, dict) and 'data' in data:
-                    return [m.get('id', '') for m in data['data'] if 'id' in m]
-    except Exception as e:
-        logger.warning(f"Could not fetch available OVH models: {e}")
-    return []
+    return await llm_gateway.get_llm_gateway().list_ovh_models(ovh_key, ovh_endpoint)
 
 
 def get_llm_api_keys():
@@ -119,33 +108,20 @@ def get_llm_api_keys():
         tuple: (openai_key, anthropic_key, mistral_key, ovh_key, ovh_endpoint, ovh_model, llm_provider)
     """
     try:
-        from ...database import pg_get_config
+        from ...database import pg_get_config_snapshot
         
-        # Récupérer depuis la base de données en premier (source de vérité)
+        # Récupérer depuis la base de données en premier (source de vérité), via le
+        # snapshot en cache de app_config (une lecture mémoire, pas 7 requêtes).
+        # Les chaînes vides sont normalisées en None par le snapshot.
         # Ne pas utiliser les variables d'environnement comme fallback car elles peuvent être obsolètes
-        openai_key = pg_get_config('OPENAI_API_KEY')
-        anthropic_key = pg_get_config('ANTHROPIC_API_KEY')
-        mistral_key = pg_get_config('MISTRAL_API_KEY')
-        ovh_key = pg_get_config('OVH_API_KEY')
-        ovh_endpoint = pg_get_config('OVH_ENDPOINT_URL')
-        ovh_model = pg_get_config('OVH_MODEL')
-        llm_provider = pg_get_config('LLM_PROVIDER')
-        
-        # Normaliser les valeurs : convertir les chaînes vides en None
-        if openai_key == '':
-            openai_key = None
-        if anthropic_key == '':
-            anthropic_key = None
-        if mistral_key == '':
-            mistral_key = None
-        if ovh_key == '':
-            ovh_key = None
-        if ovh_endpoint == '':
-            ovh_endpoint = None
-        if ovh_model == '':
-            ovh_model = None
-        if llm_provider == '':
-            llm_provider = None
+        config = pg_get_config_snapshot()
+        openai_key = config.openai_api_key
+        anthropic_key = config.anthropic_api_key
+        mistral_key = config.mistral_api_key
+        ovh_key = config.ovh_api_key
+        ovh_endpoint = config.ovh_endpoint_url
+        ovh_model = config.ovh_model
+        llm_provider = config.llm_provider
         
         # Clean OVH API key: remove any non-ASCII characters that might have been corrupted
         # This fixes the issue where Unicode characters (like bullet points U+2022) get into the key
@@ -254,120 +230,30 @@ Focus on actionable improvements that address real customer pain points. Be spec
         raise HTTPException(status_code=400, detail="No LLM API key configured. Please configure at least one API key in Settings.")
     
     # Helper function to call a single LLM
-    async def call_llm(provider: str, api_key: str, prompt: str) -> Optional[str]:
+    async def call_llm(provider: str, api_key: str, prompt: str, endpoint_url: str = None, model_name: str = None) -> Optional[str]:
         """Call a single LLM and return the response content."""
+        system = 'You are a product improvement analyst. Generate actionable improvement ideas based on customer feedback.'
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                if provider == 'openai':
-                    response = await client.post(
-                        'https://api.openai.com/v1/chat/completions',
-                        headers={
-                            'Authorization': f'Bearer {api_key}',
-                            'Content-Type': 'application/json'
-                        },
-                        json={
-                            'model': os.getenv('OPENAI_MODEL', 'gpt-4o-mini'),
-                            'messages': [
-                                {'role': 'system', 'content': 'You are a product improvement analyst. Generate actionable improvement ideas based on customer feedback.'},
-                                {'role': 'user', 'content': prompt}
-                            ],
-                            'temperature': 0.7,
-                            'max_tokens': 2000
-                        }
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    return result['choices'][0]['message']['content']
+            if provider == 'ovh':
+                # OVH AI Endpoints uses OpenAI-compatible API
+                # Protect against encoding issues in headers and URL
+                endpoint_raw = endpoint_url or ovh_endpoint
+                ovh_endpoint_safe = safe_error_text(str(endpoint_raw) if endpoint_raw else "", max_length=500)
+                api_key_safe = safe_error_text(str(api_key) if api_key else "", max_length=500)
                 
-                elif provider == 'anthropic':
-                    response = await client.post(
-                        'https://api.anthropic.com/v1/messages',
-                        headers={
-                            'x-api-key': api_key,
-                            'anthropic-version': '2023-06-01',
-                            'Content-Type': 'application/json'
-                        },
-                        json={
-                            'model': os.getenv('ANTHROPIC_MODEL', 'claude-3-haiku-20240307'),
-                            'max_tokens': 2000,
-                            'messages': [
-                                {'role': 'user', 'content': prompt}
-                            ]
-                        }
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    return result['content'][0]['text']
+                # Get available models from endpoint to validate model name
+                available_models = await _get_ovh_available_models(api_key_safe, ovh_endpoint_safe)
+                model = normalize_ovh_model_name(model_name or ovh_model, available_models)
                 
-                elif provider == 'mistral':
-                    response = await client.post(
-                        'https://api.mistral.ai/v1/chat/completions',
-                        headers={
-                            'Authorization': f'Bearer {api_key}',
-                            'Content-Type': 'application/json'
-                        },
-                        json={
-                            'model': os.getenv('MISTRAL_MODEL', 'mistral-small'),
-                            'messages': [
-                                {'role': 'system', 'content': 'You are a product improvement analyst. Generate actionable improvement ideas based on customer feedback.'},
-                                {'role': 'user', 'content': prompt}
-                            ],
-                            'temperature': 0.7,
-                            'max_tokens': 2000
-                        }
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    return result['choices'][0]['message']['content']
+                # Check if model is configured and exists in available models
+                if not model:
+                    logger.error(f"OVH AI model not configured or not found. Available models: {available_models[:5] if available_models else 'unknown'}")
+                    return None
                 
-                elif provider == 'ovh':
-                    # OVH AI Endpoints uses OpenAI-compatible API
-                    # Protect against encoding issues in headers and URL
-                    ovh_endpoint_safe = safe_error_text(str(ovh_endpoint) if ovh_endpoint else "", max_length=500)
-                    api_key_safe = safe_error_text(str(api_key) if api_key else "", max_length=500)
-                    url = f"{ovh_endpoint_safe}/chat/completions"
-                    
-                    # Get available models from endpoint to validate model name
-                    available_models = []
-                    try:
-                        async with httpx.AsyncClient(timeout=5.0) as check_client:
-                            check_response = await check_client.get(
-                                f'{ovh_endpoint_safe}/models',
-                                headers={'Authorization': f'Bearer {api_key_safe}'}
-                            )
-                            if check_response.status_code == 200:
-                                check_data = check_response.json()
-                                if isinstance(check_data, dict) and 'data' in check_data:
-                                    available_models = [m.get('id', '') for m in check_data['data'] if 'id' in m]
-                    except Exception as e:
-                        logger.warning(f"Could not fetch available OVH models for validation: {e}")
-                    
-                    model = normalize_ovh_model_name(ovh_model, available_models)
-                    
-                    # Check if model is configured and exists in available models
-                    if not model:
-                        logger.error(f"OVH AI model not configured or not found. Available models: {available_models[:5] if available_models else 'unknown'}")
-                        return None
-                    
-                    response = await client.post(
-                        url,
-                        headers={
-                            'Authorization': f'Bearer {api_key_safe}',
-                            'Content-Type': 'application/json'
-                        },
-                        json={
-                            'model': model,
-                            'messages': [
-                                {'role': 'system', 'content': 'You are a product improvement analyst. Generate actionable improvement ideas based on customer feedback.'},
-                                {'role': 'user', 'content': prompt}
-                            ],
-                            'temperature': 0.7,
-                            'max_tokens': 2000
-                        }
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    return result['choices'][0]['message']['content']
+                return await llm_gateway.complete('ovh', api_key_safe, prompt, system=system, model=model,
+                                                  endpoint=ovh_endpoint_safe, max_tokens=2000)
+            
+            return await llm_gateway.complete(provider, api_key, prompt, system=system, max_tokens=2000)
         except Exception as e:
             logger.warning(f"{provider} API error: {type(e).__name__}: {e}")
             return None
@@ -682,114 +568,30 @@ Be specific and reference actual content from the posts when possible."""
     async def call_llm_for_actions(provider: str, api_key: str, prompt: str) -> Optional[str]:
         """Call a single LLM and return the response content."""
         logger.info(f"[Recommended Actions] Calling {provider} API...")
+        system = 'You are an OVHcloud customer support analyst. Generate specific, actionable recommended actions based on customer feedback.'
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                if provider == 'openai':
-                    response = await client.post(
-                        'https://api.openai.com/v1/chat/completions',
-                        headers={
-                            'Authorization': f'Bearer {api_key}',
-                            'Content-Type': 'application/json'
-                        },
-                        json={
-                            'model': os.getenv('OPENAI_MODEL', 'gpt-4o-mini'),
-                            'messages': [
-                                {'role': 'system', 'content': 'You are an OVHcloud customer support analyst. Generate specific, actionable recommended actions based on customer feedback.'},
-                                {'role': 'user', 'content': prompt}
-                            ],
-                            'temperature': 0.7,
-                            'max_tokens': 1500
-                        }
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    content = result['choices'][0]['message']['content']
-                    logger.info(f"[Recommended Actions] OpenAI API call successful (response length: {len(content)})")
-                    return content
+            if provider == 'ovh':
+                # OVH AI Endpoints uses OpenAI-compatible API
+                # Protect against encoding issues in headers and URL
+                ovh_endpoint_safe = safe_error_text(str(ovh_endpoint) if ovh_endpoint else "", max_length=500)
+                api_key_safe = safe_error_text(str(api_key) if api_key else "", max_length=500)
                 
-                elif provider == 'anthropic':
-                    response = await client.post(
-                        'https://api.anthropic.com/v1/messages',
-                        headers={
-                            'x-api-key': api_key,
-                            'anthropic-version': '2023-06-01',
-                            'Content-Type': 'application/json'
-                        },
-                        json={
-                            'model': os.getenv('ANTHROPIC_MODEL', 'claude-3-haiku-20240307'),
-                            'max_tokens': 1500,
-                            'messages': [
-                                {'role': 'user', 'content': prompt}
-                            ],
-                            'system': 'You are an OVHcloud customer support analyst. Generate specific, actionable recommended actions based on customer feedback.'
-                        }
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    content = result['content'][0]['text']
-                    logger.info(f"[Recommended Actions] Anthropic API call successful (response length: {len(content)})")
-                    return content
+                # Get available models from endpoint to validate model name
+                available_models = await _get_ovh_available_models(api_key_safe, ovh_endpoint_safe)
                 
-                elif provider == 'mistral':
-                    response = await client.post(
-                        'https://api.mistral.ai/v1/chat/completions',
-                        headers={
-                            'Authorization': f'Bearer {api_key}',
-                            'Content-Type': 'application/json'
-                        },
-                        json={
-                            'model': os.getenv('MISTRAL_MODEL', 'mistral-small'),
-                            'messages': [
-                                {'role': 'system', 'content': 'You are an OVHcloud customer support analyst. Generate specific, actionable recommended actions based on customer feedback.'},
-                                {'role': 'user', 'content': prompt}
-                            ],
-                            'temperature': 0.7,
-                            'max_tokens': 1500
-                        }
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    content = result['choices'][0]['message']['content']
-                    logger.info(f"[Recommended Actions] Mistral API call successful (response length: {len(content)})")
-                    return content
+                model = normalize_ovh_model_name(ovh_model, available_models)
                 
-                elif provider == 'ovh':
-                    # OVH AI Endpoints uses OpenAI-compatible API
-                    # Protect against encoding issues in headers and URL
-                    ovh_endpoint_safe = safe_error_text(str(ovh_endpoint) if ovh_endpoint else "", max_length=500)
-                    api_key_safe = safe_error_text(str(api_key) if api_key else "", max_length=500)
-                    
-                    # Get available models from endpoint to validate model name
-                    available_models = await _get_ovh_available_models(api_key_safe, ovh_endpoint_safe)
-                    
-                    model = normalize_ovh_model_name(ovh_model, available_models)
-                    
-                    # Check if model is configured and exists in available models
-                    if not model:
-                        logger.error(f"[Recommended Actions] OVH AI model not configured or not found. Available models: {available_models[:5] if available_models else 'unknown'}")
-                        return None
-                    
-                    response = await client.post(
-                        f'{ovh_endpoint_safe}/chat/completions',
-                        headers={
-                            'Authorization': f'Bearer {api_key_safe}',
-                            'Content-Type': 'application/json'
-                        },
-                        json={
-                            'model': model,
-                            'messages': [
-                                {'role': 'system', 'content': 'You are an OVHcloud customer support analyst. Generate specific, actionable recommended actions based on customer feedback.'},
-                                {'role': 'user', 'content': prompt}
-                            ],
-                            'temperature': 0.7,
-                            'max_tokens': 1500
-                        }
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    content = result['choices'][0]['message']['content']
-                    logger.info(f"[Recommended Actions] OVH AI API call successful (response length: {len(content)})")
-                    return content
+                # Check if model is configured and exists in available models
+                if not model:
+                    logger.error(f"[Recommended Actions] OVH AI model not configured or not found. Available models: {available_models[:5] if available_models else 'unknown'}")
+                    return None
+                
+                content = await llm_gateway.complete('ovh', api_key_safe, prompt, system=system, model=model,
+                                                     endpoint=ovh_endpoint_safe, max_tokens=1500)
+            else:
+                content = await llm_gateway.complete(provider, api_key, prompt, system=system, max_tokens=1500)
+            logger.info(f"[Recommended Actions] {provider} API call successful (response length: {len(content)})")
+            return content
         except httpx.HTTPStatusError as e:
             logger.error(f"[Recommended Actions] {provider} API HTTP error ({e.response.status_code}): {e}")
             if e.response.status_code == 401:
@@ -1228,115 +1030,33 @@ CRITICAL INSTRUCTIONS:
         logger.info(f"call_llm_for_insights: Calling {provider} API (key length: {len(api_key) if api_key else 0})")
         if provider == 'ovh':
             logger.info(f"call_llm_for_insights: OVH endpoint_url={endpoint_url}, model_name={model_name}, ovh_endpoint={ovh_endpoint}, ovh_model={ovh_model}")
+        system = 'You are an OVHcloud customer feedback analyst. Generate key insights based on customer feedback posts.'
+        model = None
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                if provider == 'openai':
-                    response = await client.post(
-                        'https://api.openai.com/v1/chat/completions',
-                        headers={
-                            'Authorization': f'Bearer {api_key}',
-                            'Content-Type': 'application/json'
-                        },
-                        json={
-                            'model': os.getenv('OPENAI_MODEL', 'gpt-4o-mini'),
-                            'messages': [
-                                {'role': 'system', 'content': 'You are an OVHcloud customer feedback analyst. Generate key insights based on customer feedback posts.'},
-                                {'role': 'user', 'content': prompt}
-                            ],
-                            'temperature': 0.7,
-                            'max_tokens': 2000
-                        }
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    content = result['choices'][0]['message']['content']
-                    logger.info(f"OpenAI API call successful, content length: {len(content)}")
-                    return content
+            if provider == 'ovh':
+                # OVH AI Endpoints uses OpenAI-compatible API
+                # Protect against encoding issues in headers and URL
+                endpoint_url_raw = endpoint_url or ovh_endpoint
+                endpoint_url_safe = safe_error_text(str(endpoint_url_raw) if endpoint_url_raw else "", max_length=500)
+                api_key_safe = safe_error_text(str(api_key) if api_key else "", max_length=500)
+                model = normalize_ovh_model_name(model_name or ovh_model)
                 
-                elif provider == 'anthropic':
-                    response = await client.post(
-                        'https://api.anthropic.com/v1/messages',
-                        headers={
-                            'x-api-key': api_key,
-                            'anthropic-version': '2023-06-01',
-                            'Content-Type': 'application/json'
-                        },
-                        json={
-                            'model': os.getenv('ANTHROPIC_MODEL', 'claude-3-haiku-20240307'),
-                            'max_tokens': 2000,
-                            'messages': [
-                                {'role': 'user', 'content': prompt}
-                            ]
-                        }
+                # Check if model is configured
+                if not model:
+                    raise HTTPException(
+                        status_code=503,
+                        detail="OVH AI model not configured. Please select a valid model in Settings (e.g., Llama-3.1-70B-Instruct, Qwen-2.5-72B-Instruct)."
                     )
-                    response.raise_for_status()
-                    result = response.json()
-                    content = result['content'][0]['text']
-                    logger.info(f"Anthropic API call successful, content length: {len(content)}")
-                    return content
                 
-                elif provider == 'mistral':
-                    response = await client.post(
-                        'https://api.mistral.ai/v1/chat/completions',
-                        headers={
-                            'Authorization': f'Bearer {api_key}',
-                            'Content-Type': 'application/json'
-                        },
-                        json={
-                            'model': os.getenv('MISTRAL_MODEL', 'mistral-small'),
-                            'messages': [
-                                {'role': 'system', 'content': 'You are an OVHcloud customer feedback analyst. Generate key insights based on customer feedback posts.'},
-                                {'role': 'user', 'content': prompt}
-                            ],
-                            'temperature': 0.7,
-                            'max_tokens': 2000
-                        }
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    content = result['choices'][0]['message']['content']
-                    logger.info(f"Mistral API call successful, content length: {len(content)}")
-                    return content
+                # Log the model being used for debugging
+                logger.info(f"Using OVH model: '{model}' (normalized from: '{model_name or ovh_model}') on endpoint: {endpoint_url_safe}")
                 
-                elif provider == 'ovh':
-                    # OVH AI Endpoints uses OpenAI-compatible API
-                    # Protect against encoding issues in headers and URL
-                    endpoint_url_raw = endpoint_url or ovh_endpoint
-                    endpoint_url_safe = safe_error_text(str(endpoint_url_raw) if endpoint_url_raw else "", max_length=500)
-                    api_key_safe = safe_error_text(str(api_key) if api_key else "", max_length=500)
-                    model = normalize_ovh_model_name(model_name or ovh_model)
-                    
-                    # Check if model is configured
-                    if not model:
-                        raise HTTPException(
-                            status_code=503,
-                            detail="OVH AI model not configured. Please select a valid model in Settings (e.g., Llama-3.1-70B-Instruct, Qwen-2.5-72B-Instruct)."
-                        )
-                    
-                    # Log the model being used for debugging
-                    logger.info(f"Using OVH model: '{model}' (normalized from: '{model_name or ovh_model}') on endpoint: {endpoint_url_safe}")
-                    
-                    response = await client.post(
-                        f'{endpoint_url_safe}/chat/completions',
-                        headers={
-                            'Authorization': f'Bearer {api_key_safe}',
-                            'Content-Type': 'application/json'
-                        },
-                        json={
-                            'model': model,
-                            'messages': [
-                                {'role': 'system', 'content': 'You are an OVHcloud customer feedback analyst. Generate key insights based on customer feedback posts.'},
-                                {'role': 'user', 'content': prompt}
-                            ],
-                            'temperature': 0.7,
-                            'max_tokens': 2000
-                        }
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    content = result['choices'][0]['message']['content']
-                    logger.info(f"OVH AI API call successful, content length: {len(content)}")
-                    return content
+                content = await llm_gateway.complete('ovh', api_key_safe, prompt, system=system, model=model,
+                                                     endpoint=endpoint_url_safe, max_tokens=2000)
+            else:
+                content = await llm_gateway.complete(provider, api_key, prompt, system=system, max_tokens=2000)
+            logger.info(f"{provider} API call successful, content length: {len(content)}")
+            return content
         except httpx.HTTPStatusError as e:
             # Safely extract error text - protect against encoding issues
             error_text = ""
@@ -1383,20 +1103,11 @@ CRITICAL INSTRUCTIONS:
                     # Try to fetch available models to suggest alternatives
                     available_models = []
                     try:
-                        from ..database import pg_get_config
+                        from ...database import pg_get_config
                         ovh_key_check = pg_get_config('OVH_API_KEY')
                         ovh_endpoint_check = pg_get_config('OVH_ENDPOINT_URL')
                         if ovh_key_check and ovh_endpoint_check:
-                            # httpx is already imported at module level, no need to import again
-                            async with httpx.AsyncClient(timeout=5.0) as check_client:
-                                check_response = await check_client.get(
-                                    f'{ovh_endpoint_check}/models',
-                                    headers={'Authorization': f'Bearer {ovh_key_check}'}
-                                )
-                                if check_response.status_code == 200:
-                                    check_data = check_response.json()
-                                    if isinstance(check_data, dict) and 'data' in check_data:
-                                        available_models = [m.get('id', '') for m in check_data['data'] if 'id' in m]
+                            available_models = await _get_ovh_available_models(ovh_key_check, ovh_endpoint_check)
                     except Exception:
                         pass
                     
@@ -1874,27 +1585,9 @@ Generate a sentence in English that summarizes the top improvement ideas in a cl
             api_key = anthropic_key
             if api_key:
                 try:
-                    async with httpx.AsyncClient(timeout=30.0) as client:
-                        response = await client.post(
-                            'https://api.anthropic.com/v1/messages',
-                            headers={
-                                'x-api-key': api_key,
-                                'anthropic-version': '2023-06-01',
-                                'Content-Type': 'application/json'
-                            },
-                            json={
-                                'model': os.getenv('ANTHROPIC_MODEL', 'claude-3-haiku-20240307'),
-                                'max_tokens': 150,
-                                'messages': [
-                                    {'role': 'user', 'content': prompt}
-                                ]
-                            }
-                        )
-                        response.raise_for_status()
-                        result = response.json()
-                        summary = result['content'][0]['text'].strip()
-                        summary = summary.strip('"').strip("'")
-                        return {"summary": summary}
+                    summary = await llm_gateway.complete('anthropic', api_key, prompt, max_tokens=150, timeout=30.0)
+                    summary = summary.strip().strip('"').strip("'")
+                    return {"summary": summary}
                 except Exception as e:
                     logger.warning(f"Anthropic API error: {type(e).__name__}: {e}. Using fallback summary.")
                     return {"summary": "Analyzing improvement opportunities..."}
@@ -1904,28 +1597,13 @@ Generate a sentence in English that summarizes the top improvement ideas in a cl
             api_key = openai_key
             if api_key:
                 try:
-                    async with httpx.AsyncClient(timeout=30.0) as client:
-                        response = await client.post(
-                            'https://api.openai.com/v1/chat/completions',
-                            headers={
-                                'Authorization': f'Bearer {api_key}',
-                                'Content-Type': 'application/json'
-                            },
-                            json={
-                                'model': os.getenv('OPENAI_MODEL', 'gpt-4o-mini'),
-                                'messages': [
-                                    {'role': 'system', 'content': 'You are a product analyst. Generate concise and actionable summaries.'},
-                                    {'role': 'user', 'content': prompt}
-                                ],
-                                'temperature': 0.7,
-                                'max_tokens': 150
-                            }
-                        )
-                        response.raise_for_status()
-                        result = response.json()
-                        summary = result['choices'][0]['message']['content'].strip()
-                        summary = summary.strip('"').strip("'")
-                        return {"summary": summary}
+                    summary = await llm_gateway.complete(
+                        'openai', api_key, prompt,
+                        system='You are a product analyst. Generate concise and actionable summaries.',
+                        max_tokens=150, timeout=30.0
+                    )
+                    summary = summary.strip().strip('"').strip("'")
+                    return {"summary": summary}
                 except Exception as e:
                     logger.warning(f"OpenAI API error: {type(e).__name__}: {e}. Using fallback summary.")
                     return {"summary": "Analyzing improvement opportunities..."}
@@ -1956,135 +1634,36 @@ async def get_product_opportunities(
 ):
     """Get product distribution with opportunity scores based on negative feedback."""
     try:
-        # Get all posts from database (using a high limit to get all posts)
-        posts = db.get_posts(limit=10000, offset=0)
-        
-        # Filter by date if provided
+        # Filter by date if provided (invalid format: use all posts)
         if date_from:
             from datetime import datetime
             try:
-                # Parse date_from (YYYY-MM-DD format)
-                cutoff_date = datetime.strptime(date_from, '%Y-%m-%d')
-                filtered_posts = []
-                for post in posts:
-                    created_at = post.get('created_at', '')
-                    if created_at:
-                        try:
-                            # Ensure created_at is a string (handle datetime objects from DB)
-                            if isinstance(created_at, datetime):
-                                post_date = created_at
-                            elif isinstance(created_at, str):
-                                # Parse post date (handle various formats)
-                                post_date_str = created_at.replace('Z', '+00:00')
-                                try:
-                                    post_date = datetime.fromisoformat(post_date_str)
-                                except ValueError:
-                                    # Try parsing without timezone
-                                    post_date = datetime.fromisoformat(created_at.split('T')[0])
-                            else:
-                                # Skip if created_at is not a string or datetime
-                                continue
-                            
-                            # Compare dates (remove timezone for comparison)
-                            post_date_naive = post_date.replace(tzinfo=None) if post_date.tzinfo else post_date
-                            if post_date_naive.date() >= cutoff_date.date():
-                                filtered_posts.append(post)
-                        except (ValueError, AttributeError, TypeError) as e:
-                            logger.debug(f"Error parsing post date {created_at}: {e}")
-                            continue
-                posts = filtered_posts
+                datetime.strptime(date_from, '%Y-%m-%d')
             except ValueError as e:
                 logger.warning(f"Invalid date_from format: {date_from}, error: {e}")
-                pass  # Invalid date format, use all posts
+                date_from = None
         
-        # Product keywords to detect - based on OVHcloud.com products
-        product_keywords = {
-            'VPS': ['vps', 'virtual private server', 'ovh vps', 'vps cloud', 'cloud vps'],
-            'Hosting': ['hosting', 'web hosting', 'shared hosting', 'ovh hosting', 'web hosting plan'],
-            'Domain': ['domain', 'domaine', 'domain name', 'domain registration', 'domain renewal', 'domain transfer', 'domain expiration', 'registrar', 'bureau d\'enregistrement', 'whois', 'domain management', '.ovh', '.com', '.net', '.org', '.fr', '.eu'],
-            'DNS': ['dns', 'dns zone', 'dns anycast', 'dnssec', 'dns record', 'dns configuration', 'nameserver', 'ns record', 'a record', 'mx record', 'cname record', 'txt record', 'dns management', 'dns hosting'],
-            'Email': ['email', 'mail', 'smtp', 'imap', 'pop3', 'email hosting', 'exchange', 'email account'],
-            'Storage': ['storage', 'object storage', 'backup', 's3', 'cloud storage', 'object storage s3', 'high performance storage'],
-            'CDN': ['cdn', 'content delivery', 'content delivery network', 'ovh cdn'],
-            'Public Cloud': ['public cloud', 'publiccloud', 'ovh public cloud', 'public cloud instance', 'horizon', 'openstack'],
-            'Private Cloud': ['private cloud', 'privatecloud', 'ovh private cloud', 'vmware', 'vsphere', 'hosted private cloud'],
-            'Dedicated Server': ['dedicated', 'dedicated server', 'serveur dédié', 'bare metal', 'ovh dedicated', 'server', 'serveur'],
-            'API': ['api', 'rest api', 'graphql', 'ovh api', 'api ovh', 'ovhcloud api'],
-            'Load Balancer': ['load balancer', 'loadbalancer', 'lb', 'ip load balancing'],
-            'Failover IP': ['failover ip', 'failover', 'ip failover', 'additional ip'],
-            'SSL Certificate': ['ssl', 'ssl certificate', 'certificate', 'tls', 'https certificate'],
-            'Managed Kubernetes': ['kubernetes', 'k8s', 'managed kubernetes', 'ovh kubernetes'],
-            'Managed Databases': ['database', 'mysql', 'postgresql', 'mongodb', 'redis', 'managed database', 'ovh database'],
-            'Network': ['network', 'vrack', 'vrack', 'private network', 'vlan'],
-            'IP': ['ip address', 'ipv4', 'ipv6', 'ip block', 'ip range']
-        }
-        
-        # Group posts by product with their relevance scores
-        product_posts = {}
-        for post in posts:
-            content = (post.get('content', '') or '').lower()
-            sentiment = post.get('sentiment_label', 'neutral')
-            # Ensure relevance is a float (handle string conversion from DB)
-            try:
-                relevance = float(post.get('relevance_score', 0.3) or 0.3)
-            except (ValueError, TypeError):
-                relevance = 0.3  # Default if conversion fails
-            
-            # Detect products mentioned in post
-            # A post can match multiple products, so we count it for all matching products
-            matched_products = []
-            for product_name, keywords in product_keywords.items():
-                if any(keyword in content for keyword in keywords):
-                    matched_products.append(product_name)
-                    if product_name not in product_posts:
-                        product_posts[product_name] = []
-                    product_posts[product_name].append({
-                        'sentiment': sentiment,
-                        'relevance': relevance
-                    })
+        # Per-product totals from the post_tag_daily rollups
+        # (a post can match multiple products, it is counted for all of them)
+        stats = {row['product']: row for row in db.get_product_tag_stats(date_from=date_from)}
         
         # Calculate opportunity scores and create ProductOpportunity objects
         products = []
         colors = ['#10b981', '#3b82f6', '#8b5cf6', '#f59e0b', '#ef4444', '#ec4899', '#06b6d4', '#84cc16', '#f97316', '#6366f1', '#14b8a6', '#a855f7']
         
-        for idx, (product_name, post_list) in enumerate(product_posts.items()):
-            total = len(post_list)
-            negative_count = sum(1 for p in post_list if p['sentiment'] == 'negative')
+        ordered = [name for name in classifier.PRODUCT_KEYWORDS if name in stats]
+        for idx, product_name in enumerate(ordered):
+            row = stats[product_name]
+            negative_count = row['negative_posts']
             
-            # Calculate opportunity score (0-100) based on weighted relevance
-            # Nouvelle formule : le score augmente avec le nombre de posts négatifs
-            # Chaque post négatif contribue selon sa pertinence, avec un bonus pour le volume
-            negative_weighted_sum = 0
-            negative_count_calc = 0
-            
-            for post_data in post_list:
-                # Ensure relevance is a float (handle string conversion)
-                try:
-                    relevance = float(post_data.get('relevance', 0.3) or 0.3)
-                except (ValueError, TypeError):
-                    relevance = 0.3  # Default if conversion fails
-                sentiment = post_data['sentiment']
-                
-                # Seuls les posts négatifs comptent pour l'opportunité
-                if sentiment == 'negative':
-                    negative_weighted_sum += relevance
-                    negative_count_calc += 1
-            
-            # Ensure negative_count_calc is an integer
-            try:
-                negative_count_calc = int(negative_count_calc) if negative_count_calc is not None else 0
-            except (ValueError, TypeError):
-                negative_count_calc = 0
-            
-            if negative_count_calc > 0:
+            # Seuls les posts négatifs comptent pour l'opportunité
+            if negative_count > 0:
                 # Pertinence moyenne des posts négatifs
-                avg_relevance = negative_weighted_sum / negative_count_calc
+                avg_relevance = row['negative_relevance_sum'] / negative_count
                 
-                # Score de base : nombre de posts négatifs × pertinence moyenne
-                # Plus il y a de posts négatifs, plus le score augmente
                 # Facteur de volume : logarithme pour éviter que ça explose
                 # 1 post = ~10 points, 5 posts = ~30 points, 10 posts = ~50 points, 20+ posts = ~100 points
-                volume_factor = min(math.log(float(negative_count_calc) + 1) * 10, 50)  # Max 50 points pour le volume
+                volume_factor = min(math.log(float(negative_count) + 1) * 10, 50)  # Max 50 points pour le volume
                 
                 # Pertinence factor : moyenne pondérée (max 50 points)
                 relevance_factor = avg_relevance * 50
@@ -2102,7 +1681,7 @@ async def get_product_opportunities(
                 product=product_name,
                 opportunity_score=opportunity_score,
                 negative_posts=negative_count,
-                total_posts=total,
+                total_posts=row['total_posts'],
                 color=color
             ))
         
@@ -2255,108 +1834,31 @@ CRITICAL INSTRUCTIONS:
     
     # Helper function to call LLM
     async def call_llm(provider: str, api_key: str, prompt: str) -> Optional[str]:
+        system = 'You are an OVHcloud product improvement analyst. Generate specific, actionable insights with ROI estimates.'
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                if provider == 'openai':
-                    response = await client.post(
-                        'https://api.openai.com/v1/chat/completions',
-                        headers={
-                            'Authorization': f'Bearer {api_key}',
-                            'Content-Type': 'application/json'
-                        },
-                        json={
-                            'model': os.getenv('OPENAI_MODEL', 'gpt-4o-mini'),
-                            'messages': [
-                                {'role': 'system', 'content': 'You are an OVHcloud product improvement analyst. Generate specific, actionable insights with ROI estimates.'},
-                                {'role': 'user', 'content': prompt}
-                            ],
-                            'temperature': 0.7,
-                            'max_tokens': 2000
-                        }
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    return result['choices'][0]['message']['content']
+            if provider == 'ovh':
+                # OVH AI Endpoints uses OpenAI-compatible API
+                # Protect against encoding issues in headers and URL
+                ovh_endpoint_safe = safe_error_text(str(ovh_endpoint) if ovh_endpoint else "", max_length=500)
+                api_key_safe = safe_error_text(str(api_key) if api_key else "", max_length=500)
                 
-                elif provider == 'anthropic':
-                    response = await client.post(
-                        'https://api.anthropic.com/v1/messages',
-                        headers={
-                            'x-api-key': api_key,
-                            'anthropic-version': '2023-06-01',
-                            'Content-Type': 'application/json'
-                        },
-                        json={
-                            'model': os.getenv('ANTHROPIC_MODEL', 'claude-3-haiku-20240307'),
-                            'max_tokens': 2000,
-                            'messages': [
-                                {'role': 'user', 'content': prompt}
-                            ]
-                        }
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    return result['content'][0]['text']
+                # Get available models from endpoint to validate model name
+                available_models = await _get_ovh_available_models(api_key_safe, ovh_endpoint_safe)
                 
-                elif provider == 'mistral':
-                    response = await client.post(
-                        'https://api.mistral.ai/v1/chat/completions',
-                        headers={
-                            'Authorization': f'Bearer {api_key}',
-                            'Content-Type': 'application/json'
-                        },
-                        json={
-                            'model': os.getenv('MISTRAL_MODEL', 'mistral-small'),
-                            'messages': [
-                                {'role': 'system', 'content': 'You are an OVHcloud product improvement analyst. Generate specific, actionable insights with ROI estimates.'},
-                                {'role': 'user', 'content': prompt}
-                            ],
-                            'temperature': 0.7,
-                            'max_tokens': 2000
-                        }
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    return result['choices'][0]['message']['content']
+                model = normalize_ovh_model_name(ovh_model, available_models)
                 
-                elif provider == 'ovh':
-                    # OVH AI Endpoints uses OpenAI-compatible API
-                    # Protect against encoding issues in headers and URL
-                    ovh_endpoint_safe = safe_error_text(str(ovh_endpoint) if ovh_endpoint else "", max_length=500)
-                    api_key_safe = safe_error_text(str(api_key) if api_key else "", max_length=500)
-                    
-                    # Get available models from endpoint to validate model name
-                    available_models = await _get_ovh_available_models(api_key_safe, ovh_endpoint_safe)
-                    
-                    model = normalize_ovh_model_name(ovh_model, available_models)
-                    
-                    # Check if model is configured and exists in available models
-                    if not model:
-                        logger.error(f"[Improvements Analysis] OVH AI model not configured or not found. Available models: {available_models[:5] if available_models else 'unknown'}")
-                        return None
-                    
-                    # Log the model being used for debugging
-                    logger.info(f"[Improvements Analysis] Using OVH model: '{model}' (from: '{ovh_model}') on endpoint: {ovh_endpoint_safe}")
-                    
-                    response = await client.post(
-                        f'{ovh_endpoint_safe}/chat/completions',
-                        headers={
-                            'Authorization': f'Bearer {api_key_safe}',
-                            'Content-Type': 'application/json'
-                        },
-                        json={
-                            'model': model,
-                            'messages': [
-                                {'role': 'system', 'content': 'You are an OVHcloud product improvement analyst. Generate specific, actionable insights with ROI estimates.'},
-                                {'role': 'user', 'content': prompt}
-                            ],
-                            'temperature': 0.7,
-                            'max_tokens': 2000
-                        }
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    return result['choices'][0]['message']['content']
+                # Check if model is configured and exists in available models
+                if not model:
+                    logger.error(f"[Improvements Analysis] OVH AI model not configured or not found. Available models: {available_models[:5] if available_models else 'unknown'}")
+                    return None
+                
+                # Log the model being used for debugging
+                logger.info(f"[Improvements Analysis] Using OVH model: '{model}' (from: '{ovh_model}') on endpoint: {ovh_endpoint_safe}")
+                
+                return await llm_gateway.complete('ovh', api_key_safe, prompt, system=system, model=model,
+                                                  endpoint=ovh_endpoint_safe, max_tokens=2000)
+            
+            return await llm_gateway.complete(provider, api_key, prompt, system=system, max_tokens=2000)
         except httpx.HTTPStatusError as e:
             # Special handling for OVH model_not_found errors
             if e.response.status_code == 404 and provider == 'ovh':
@@ -2383,20 +1885,11 @@ CRITICAL INSTRUCTIONS:
                     # Try to fetch available models to suggest alternatives
                     available_models = []
                     try:
-                        from ..database import pg_get_config
+                        from ...database import pg_get_config
                         ovh_key_check = pg_get_config('OVH_API_KEY')
                         ovh_endpoint_check = pg_get_config('OVH_ENDPOINT_URL')
                         if ovh_key_check and ovh_endpoint_check:
-                            # httpx is already imported at module level, no need to import again
-                            async with httpx.AsyncClient(timeout=5.0) as check_client:
-                                check_response = await check_client.get(
-                                    f'{ovh_endpoint_check}/models',
-                                    headers={'Authorization': f'Bearer {ovh_key_check}'}
-                                )
-                                if check_response.status_code == 200:
-                                    check_data = check_response.json()
-                                    if isinstance(check_data, dict) and 'data' in check_data:
-                                        available_models = [m.get('id', '') for m in check_data['data'] if 'id' in m]
+                            available_models = await _get_ovh_available_models(ovh_key_check, ovh_endpoint_check)
                     except Exception:
                         pass
                     
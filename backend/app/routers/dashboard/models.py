@@ -128,6 +128,20 @@ class ImprovementsAnalysisResponse(BaseModel):
     llm_available: bool = Field(default=True, description="Whether LLM was used to generate insights")
 
 
+class WhatsHappeningSnapshotResponse(WhatsHappeningResponse):
+    """Precomputed What's Happening insights of a date range preset."""
+    preset: str = Field(..., description="Date range preset: number of days or 'all'")
+    computed_at: str = Field(..., description="When the insights were computed (ISO 8601)")
+    post_count: int = Field(default=0, description="Number of posts in the preset when the insights were computed")
+
+
+class ImprovementsAnalysisSnapshotResponse(ImprovementsAnalysisResponse):
+    """Precomputed improvements analysis of a date range preset."""
+    preset: str = Field(..., description="Date range preset: number of days")
+    computed_at: str = Field(..., description="When the analysis was computed (ISO 8601)")
+    post_count: int = Field(default=0, description="Number of posts in the preset when the analysis was computed")
+
+
 
 
 
@@ -1,9 +1,18 @@
 """Posts endpoints for dashboard."""
-from fastapi import APIRouter, Query, HTTPException
-from typing import Optional
+from fastapi import APIRouter, Query, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Optional, Any, Dict, Iterator, List
+from datetime import date, datetime
+import csv
+import hashlib
+import io
+import json
 import logging
+import time
 
 from ... import database as db
+from ...analysis.country_detection import get_country_name
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +51,212 @@ async def get_posts(
         raise HTTPException(status_code=500, detail=f"Failed to fetch posts: {str(e)}")
 
 
+def _encode_changes_cursor(xid: str, post_id: int) -> str:
+    """Opaque /posts/changes cursor: transaction id, post id, issue time."""
+    return f"{xid}-{post_id}-{int(time.time())}"
+
+
+def _decode_changes_cursor(cursor: str) -> tuple:
+    try:
+        xid, post_id, issued_at = cursor.split('-')
+        return str(int(xid)), int(post_id), int(issued_at)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}")
+
+
+@router.get("/posts/changes", tags=["Dashboard", "Posts"])
+async def get_post_changes(
+    since: Optional[str] = Query(None, description="Cursor returned by the previous call (omit to get a starting cursor)"),
+    limit: int = Query(500, description="Maximum number of changed posts to return", ge=1, le=5000)
+):
+    """
+    Posts inserted or updated and post ids deleted since a cursor.
+    
+    Keep a local copy of the posts: call without `since` before loading them
+    all, then pass the returned `cursor` to get what changed since (upsert
+    `changes` by id, drop `deleted`). While `has_more` is true, call again
+    right away with the new cursor. `reset` is true when the changes since
+    the cursor are no longer known (no cursor, or older than
+    POST_TOMBSTONE_RETENTION_DAYS): reload all the posts.
+    """
+    since_xid, since_id, reset = None, 0, True
+    if since:
+        since_xid, since_id, issued_at = _decode_changes_cursor(since)
+        if time.time() - issued_at < db.POST_TOMBSTONE_RETENTION_DAYS * 86400:
+            reset = False
+        else:
+            since_xid, since_id = None, 0
+    
+    try:
+        result = db.get_post_changes(since_xid, since_id, limit=limit)
+    except Exception as e:
+        logger.error(f"Error fetching post changes: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to fetch post changes: {str(e)}")
+    
+    return {
+        'cursor': _encode_changes_cursor(result['next_xid'], result['next_id']),
+        'changes': result['posts'],
+        'deleted': result['deleted'],
+        'has_more': result['has_more'],
+        'reset': reset,
+    }
+
+
+# Columns of /posts/export (CSV header order); `columns` selects a subset
+EXPORT_COLUMNS = [
+    'id', 'source', 'author', 'content', 'url', 'created_at', 'sentiment_score',
+    'sentiment_label', 'language', 'country', 'relevance_score', 'product',
+    'is_answered', 'answered_at', 'answered_by',
+]
+
+
+def _export_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+def _ndjson_lines(rows: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps({key: _export_value(value) for key, value in row.items()}, ensure_ascii=False) + '\n'
+
+
+def _csv_lines(rows: Iterator[Dict[str, Any]], columns: List[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_export_value(row[column]) for column in columns])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only when nothing matched
+    if buffer.getvalue():
+        yield buffer.getvalue()
+
+
+@router.get("/posts/export", tags=["Dashboard", "Posts"])
+async def export_posts(
+    format: str = Query("ndjson", description="Output format: 'ndjson' (one JSON post per line) or 'csv'"),
+    columns: Optional[str] = Query(None, description=f"Comma-separated columns (default: {', '.join(EXPORT_COLUMNS)})"),
+    date_from: Optional[str] = Query(None, description="Posts created from this date (YYYY-MM-DD)"),
+    date_to: Optional[str] = Query(None, description="Posts created up to this date, included (YYYY-MM-DD)"),
+    source: Optional[str] = Query(None, description="Source ('GitHub' and 'Mastodon' include their variants)"),
+    sentiment: Optional[str] = Query(None, description="Sentiment label", examples=["negative"]),
+    language: Optional[str] = Query(None, description="Language code", examples=["fr"]),
+    product: Optional[str] = Query(None, description="Product label", examples=["VPS"]),
+    search: Optional[str] = Query(None, description="Search in content, author, URL, source and product"),
+    answered: Optional[bool] = Query(None, description="Only answered (true) or unanswered (false) posts")
+):
+    """
+    Export every post matching the dashboard filters (false positives excluded),
+    most recent first, as NDJSON or CSV.
+    
+    The response is streamed from a server-side cursor: memory use does not
+    grow with the number of posts.
+    """
+    if format not in ('ndjson', 'csv'):
+        raise HTTPException(status_code=400, detail=f"Invalid format: {format} (expected 'ndjson' or 'csv')")
+    selected_columns = [column.strip() for column in columns.split(',') if column.strip()] if columns else EXPORT_COLUMNS
+    unknown = [column for column in selected_columns if column not in EXPORT_COLUMNS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown columns: {', '.join(unknown)}")
+    for name, value in (('date_from', date_from), ('date_to', date_to)):
+        if value:
+            try:
+                date.fromisoformat(value)
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid {name} (expected YYYY-MM-DD): {value}")
+    
+    filters = {
+        'date_from': date_from,
+        'date_to': date_to,
+        'source': source if source != 'all' else None,
+        'sentiment': sentiment if sentiment != 'all' else None,
+        'language': language if language != 'all' else None,
+        'product': product if product != 'all' else None,
+        'search': search or None,
+        'answered': answered,
+    }
+    rows = db.iter_posts(filters, columns=selected_columns)
+    filename = f"posts-{date.today().isoformat()}.{format}"
+    headers = {'Content-Disposition': f'attachment; filename="{filename}"'}
+    if format == 'csv':
+        return StreamingResponse(_csv_lines(rows, selected_columns), media_type='text/csv; charset=utf-8', headers=headers)
+    return StreamingResponse(_ndjson_lines(rows), media_type='application/x-ndjson', headers=headers)
+
+
+def _etag_response(request: Request, content: Any) -> Response:
+    """JSON response with an ETag of its content; 304 if the client already has it."""
+    body = jsonable_encoder(content)
+    digest = hashlib.sha1(json.dumps(body, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+    etag = f'"{digest}"'
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    
+    if_none_match = request.headers.get('if-none-match', '')
+    if etag in [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')] or if_none_match.strip() == '*':
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=body, headers=headers)
+
+
+@router.get("/dashboard/aggregates", tags=["Dashboard", "Posts"])
+async def get_dashboard_aggregates(
+    request: Request,
+    date_from: Optional[str] = Query(None, description="Posts created from this date (YYYY-MM-DD)"),
+    date_to: Optional[str] = Query(None, description="Posts created up to this date, included (YYYY-MM-DD)"),
+    source: Optional[str] = Query(None, description="Source ('GitHub' and 'Mastodon' include their variants)"),
+    sentiment: Optional[str] = Query(None, description="Sentiment label", examples=["negative"]),
+    language: Optional[str] = Query(None, description="Language code", examples=["fr"]),
+    product: Optional[str] = Query(None, description="Product label", examples=["VPS"]),
+    search: Optional[str] = Query(None, description="Search in content, author, URL, source and product"),
+    answered: Optional[bool] = Query(None, description="Only answered (true) or unanswered (false) posts"),
+    limit: int = Query(50, description="Posts per page (0 for aggregates only)", ge=0, le=1000),
+    offset: int = Query(0, description="Offset of the posts page", ge=0),
+    sort_by: str = Query("created_at", description="Sort field of the posts page", examples=["created_at", "sentiment_score", "relevance_score", "source"]),
+    sort_order: str = Query("DESC", description="ASC or DESC")
+):
+    """
+    Dashboard chart series for a filter set, computed in PostgreSQL, with one page of posts.
+    
+    Returns the totals per sentiment, source, language, product and country, the
+    daily timeline (per sentiment, with the products of each day), answered
+    counts and the matching posts (most recent first by default). The response
+    carries an ETag: send it back in If-None-Match to get a 304 when nothing changed.
+    """
+    for name, value in (('date_from', date_from), ('date_to', date_to)):
+        if value:
+            try:
+                date.fromisoformat(value)
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid {name} (expected YYYY-MM-DD): {value}")
+    
+    # 'all' is what the dashboard selects use for "no filter"
+    def selected(value: Optional[str]) -> Optional[str]:
+        return value if value and value != 'all' else None
+    
+    try:
+        aggregates = db.get_dashboard_aggregates(
+            limit=limit,
+            offset=offset,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            date_from=date_from,
+            date_to=date_to,
+            source=selected(source),
+            sentiment=selected(sentiment),
+            language=selected(language),
+            product=selected(product),
+            search=search or None,
+            answered=answered
+        )
+    except Exception as e:
+        logger.error(f"Error computing dashboard aggregates: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to compute dashboard aggregates: {str(e)}")
+    
+    aggregates['country_names'] = {code: get_country_name(code) for code in aggregates['countries']}
+    aggregates['limit'] = limit
+    aggregates['offset'] = offset
+    return _etag_response(request, aggregates)
+
+
 @router.post("/posts/{post_id}/mark-answered", tags=["Dashboard", "Posts"])
 async def mark_post_answered(post_id: int, answered: bool = True):
     """Marquer manuellement un post comme répondu ou non répondu."""
@@ -123,7 +338,8 @@ async def get_posts_for_improvement(
     Get posts for improvement review with opportunity scoring.
     
     Returns posts sorted by opportunity score (or other field) with filters.
-    Opportunity score is calculated based on sentiment, relevance, and recency.
+    Opportunity score is calculated based on sentiment, relevance, and recency
+    (see db_postgres.OPPORTUNITY_SCORE_SQL).
     """
     try:
         # Ensure limit and offset are integers (handle string conversion from query params)
@@ -138,138 +354,32 @@ async def get_posts_for_improvement(
         limit = max(1, min(limit, 1000))  # Cap at 1000
         offset = max(0, offset)
         
-        # Get all posts (we'll filter and sort in Python for now)
-        all_posts = db.get_posts(limit=10000, offset=0)
-        
-        # Filter posts
-        filtered_posts = []
-        for post in all_posts:
-            # Skip sample posts
-            url = post.get('url', '')
-            if '/sample' in url or 'example.com' in url:
-                continue
-            
-            # Apply date filter
-            if date_from:
-                created_at = post.get('created_at', '')
-                if created_at:
-                    try:
-                        from datetime import datetime
-                        # Ensure created_at is a string
-                        if isinstance(created_at, str):
-                            post_date_str = created_at.replace('Z', '+00:00')
-                            post_date = datetime.fromisoformat(post_date_str)
-                        else:
-                            # If it's already a datetime object, use it directly
-                            post_date = created_at if isinstance(created_at, datetime) else datetime.fromisoformat(str(created_at))
-                        cutoff_date = datetime.fromisoformat(date_from)
-                        if post_date.replace(tzinfo=None) < cutoff_date:
-                            continue
-                    except (ValueError, AttributeError, TypeError) as e:
-                        logger.debug(f"Error parsing post date {created_at}: {e}")
-                        continue
-            
-            # Apply filters
-            if search:
-                search_lower = search.lower()
-                content = (post.get('content', '') or '').lower()
-                if search_lower not in content:
-                    continue
-            
-            if language and language != 'all':
-                post_lang = (post.get('language', '') or '').lower()
-                if post_lang != language.lower():
-                    continue
-            
-            if source and source != 'all':
-                post_source = (post.get('source', '') or '').lower()
-                # Normalize source names
-                if post_source == 'github issues' or post_source == 'github discussions':
-                    post_source = 'github'
-                if post_source != source.lower():
-                    continue
-            
-            filtered_posts.append(post)
-        
-        # Calculate opportunity score for each post
-        import time
-        now = time.time()
-        
-        for post in filtered_posts:
-            # Base score from relevance (scale 0-30)
-            # relevance_score is typically 0.3-1.0, so we scale it to 0-30 points
-            relevance_score = post.get('relevance_score', 0) or 0
-            base_score = min(relevance_score * 30, 30)
-            
-            # Sentiment score (additive, 0-40 points)
-            # Negative posts are most important for improvements
-            sentiment_score = 0
-            sentiment_label = post.get('sentiment_label', 'neutral')
-            if sentiment_label == 'negative':
-                sentiment_score = 40  # High priority for negative feedback
-            elif sentiment_label == 'neutral':
-                sentiment_score = 15  # Medium priority
-            else:  # positive
-                sentiment_score = 5   # Low priority
-            
-            # Recency score (additive, 0-20 points)
-            # Recent posts are more actionable
-            recency_score = 0
-            created_at = post.get('created_at', '')
-            if created_at:
-                try:
-                    from datetime import datetime
-                    post_date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                    post_timestamp = post_date.timestamp()
-                    days_old = (now - post_timestamp) / (24 * 3600)
-                    if days_old < 7:
-                        recency_score = 20  # Very recent
-                    elif days_old < 30:
-                        recency_score = 15  # Recent
-                    elif days_old < 90:
-                        recency_score = 10  # Moderately old
-                    else:
-                        recency_score = 5   # Old
-                except:
-                    recency_score = 10  # Default if date parsing fails
-            
-            # Engagement score (additive, 0-10 points)
-            # Posts with high engagement indicate broader impact
-            views = post.get('views', 0) or 0
-            comments = post.get('comments', 0) or post.get('num_comments', 0) or 0
-            reactions = post.get('reactions', 0) or 0
-            engagement = views + (comments * 3) + (reactions * 2)
-            # Scale: 0 engagement = 0 points, 1000+ engagement = 10 points
-            engagement_score = min(engagement / 100, 10)
-            
-            # Calculate opportunity score (0-100)
-            # Formula: base (0-30) + sentiment (0-40) + recency (0-20) + engagement (0-10)
-            opportunity_score = min(
-                base_score + sentiment_score + recency_score + engagement_score,
-                100
-            )
-            
-            post['opportunity_score'] = round(opportunity_score, 1)
-        
-        # Sort posts
-        reverse_order = True  # Higher scores first
-        if sort_by == 'opportunity_score':
-            filtered_posts.sort(key=lambda p: p.get('opportunity_score', 0), reverse=reverse_order)
-        elif sort_by == 'created_at':
-            filtered_posts.sort(key=lambda p: p.get('created_at', ''), reverse=reverse_order)
-        elif sort_by == 'relevance_score':
-            filtered_posts.sort(key=lambda p: p.get('relevance_score', 0), reverse=reverse_order)
+        if date_from:
+            try:
+                from datetime import date
+                date.fromisoformat(date_from)
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid date_from (expected YYYY-MM-DD): {date_from}")
         
-        # Apply pagination
-        total = len(filtered_posts)
-        paginated_posts = filtered_posts[offset:offset + limit]
+        # Filtering, scoring, sorting and pagination happen in PostgreSQL
+        page = db.get_posts_for_improvement(
+            limit=limit,
+            offset=offset,
+            sort_by=sort_by,
+            search=search,
+            language=language,
+            source=source,
+            date_from=date_from
+        )
         
         return {
-            "posts": paginated_posts,
-            "total": total,
+            "posts": page['posts'],
+            "total": page['total'],
             "limit": limit,
             "offset": offset
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching posts for improvement: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch posts: {str(e)}")
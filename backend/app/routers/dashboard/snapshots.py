@@ -0,0 +1,244 @@
+"""
+Precomputed What's Happening and improvements analyses.
+
+The dashboard and the Improvements page used to send their post list to
+/api/whats-happening and /api/improvements-analysis and wait 10-30s for the LLM
+on every visit. The refresh_insights job (after each scrape_all, and hourly)
+computes both analyses server-side for the standard date range presets and
+stores them in insight_snapshots with a fingerprint of their post set; the
+GET .../snapshot endpoints below serve them instantly.
+
+A snapshot is recomputed only when its post set changed materially (at least
+INSIGHT_SNAPSHOT_MIN_CHANGE posts, or INSIGHT_SNAPSHOT_MIN_CHANGE_RATIO of the
+set, added / gone / turned negative) or is older than
+INSIGHT_SNAPSHOT_MAX_AGE_HOURS (the 48h spike window moves on its own).
+"""
+import os
+import time
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from .models import (
+    WhatsHappeningResponse, WhatsHappeningSnapshotResponse,
+    ImprovementsAnalysisSnapshotResponse
+)
+from .analytics import get_pain_points
+from . import insights
+from ... import database as db
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+WHATS_HAPPENING = 'whats_happening'
+IMPROVEMENTS = 'improvements'
+
+# Date range presets of the dashboard / Improvements page: number of days, or
+# 'all' (no date filter, dashboard only)
+SNAPSHOT_PRESETS = [
+    preset.strip() for preset in os.getenv('INSIGHT_SNAPSHOT_PRESETS', '30,90,365,all').split(',')
+    if preset.strip()
+]
+MIN_CHANGE = int(os.getenv('INSIGHT_SNAPSHOT_MIN_CHANGE', '10'))
+MIN_CHANGE_RATIO = float(os.getenv('INSIGHT_SNAPSHOT_MIN_CHANGE_RATIO', '0.05'))
+MAX_AGE_HOURS = float(os.getenv('INSIGHT_SNAPSHOT_MAX_AGE_HOURS', '24'))
+
+# Posts sent to the LLM (same sample sizes as the browser used to send)
+WHATS_HAPPENING_POSTS = 200
+IMPROVEMENTS_POSTS = 100
+
+FINGERPRINT_KEYS = ('total', 'positive', 'negative', 'neutral', 'max_id')
+
+
+def preset_days(preset: str) -> Optional[int]:
+    """Number of days of a preset ('all' -> None). Raises ValueError for an unknown preset."""
+    if preset == 'all':
+        return None
+    if preset.isdigit() and int(preset) > 0:
+        return int(preset)
+    raise ValueError(f"Invalid preset: {preset} (expected a number of days or 'all')")
+
+
+def needs_refresh(snapshot: Optional[Dict[str, Any]], stats: Dict[str, Any],
+                  now: Optional[datetime] = None) -> bool:
+    """
+    Whether a snapshot must be recomputed, given the current stats of its post
+    set (db.get_post_window_stats called with since_id=the snapshot's max_id).
+    """
+    if not snapshot:
+        return True
+    now = now or datetime.now(timezone.utc)
+    computed_at = snapshot.get('computed_at')
+    if computed_at is None or now - computed_at > timedelta(hours=MAX_AGE_HOURS):
+        return True
+
+    previous = snapshot.get('fingerprint') or {}
+    threshold = max(MIN_CHANGE, previous.get('total', 0) * MIN_CHANGE_RATIO)
+    changes = (
+        stats.get('new_posts', 0),
+        abs(stats['total'] - previous.get('total', 0)),
+        abs(stats['negative'] - previous.get('negative', 0)),
+    )
+    return any(change >= threshold for change in changes)
+
+
+def _post_for_analysis(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Subset of a post row given to the LLM helpers (JSON-serializable)."""
+    created_at = row.get('created_at')
+    return {
+        'id': row.get('id'),
+        'content': (row.get('content') or '')[:800],
+        'sentiment_label': row.get('sentiment_label'),
+        'source': row.get('source'),
+        'created_at': created_at.isoformat() if hasattr(created_at, 'isoformat') else created_at,
+        'language': row.get('language'),
+        'product': row.get('product'),
+        'url': row.get('url'),
+    }
+
+
+def _date_from(days: Optional[int]) -> Optional[str]:
+    return (date.today() - timedelta(days=days)).isoformat() if days else None
+
+
+async def compute_whats_happening(preset: str, stats: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Compute the What's Happening insights of a preset (None if the LLM fell back)."""
+    date_from = _date_from(preset_days(preset))
+    posts = [_post_for_analysis(row) for row in db.get_posts(limit=WHATS_HAPPENING_POSTS, date_from=date_from)]
+
+    # Spike detection as on the dashboard: negative posts of the last 48h vs the
+    # 48h average of the last 7 days
+    recent_negative = stats['recent_negative']
+    avg_negative_per_48h = round(stats['negative_7d'] / 7 * 2)
+    llm_stats = {
+        'total': stats['total'],
+        'positive': stats['positive'],
+        'negative': stats['negative'],
+        'neutral': stats['neutral'],
+        'recent_negative': recent_negative,
+        'recent_total': stats['recent_total'],
+        'spike_detected': avg_negative_per_48h > 0 and recent_negative > avg_negative_per_48h * 2.3,
+        'spike_percentage': round((recent_negative - avg_negative_per_48h) / avg_negative_per_48h * 100)
+                            if avg_negative_per_48h > 0 else 0,
+        'search_term': '',
+    }
+    active_filters = f"From: {date_from}" if date_from else "All posts (no filters)"
+
+    generated, used_fallback = await insights.generate_whats_happening_insights_with_llm(
+        posts, llm_stats, active_filters, ""
+    )
+    if used_fallback:
+        return None
+    return WhatsHappeningResponse(insights=generated, llm_available=True).model_dump()
+
+
+async def compute_improvements(preset: str, stats: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Compute the improvements analysis of a preset (None if the LLM fell back)."""
+    days = preset_days(preset)
+    date_from = _date_from(days)
+    pain_points = (await get_pain_points(days=days, limit=10)).pain_points
+    products = (await insights.get_product_opportunities(date_from=date_from)).products
+    page = db.get_posts_for_improvement(limit=IMPROVEMENTS_POSTS, date_from=date_from)
+
+    analysis = await insights.generate_improvements_analysis_with_llm(
+        [pp.model_dump() for pp in pain_points],
+        [p.model_dump() for p in products],
+        page['total'],
+        posts=[_post_for_analysis(row) for row in page['posts']],
+        date_from=date_from,
+        date_to=date.today().isoformat()
+    )
+    if not analysis.llm_available:
+        return None
+    return analysis.model_dump()
+
+
+async def refresh_insight_snapshots(force: bool = False, presets: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Recompute the snapshots whose post set changed materially (all of them if
+    `force`). Improvements analyses are not computed for 'all'.
+
+    Returns the (kind, preset) computed, skipped (unchanged or empty) and failed.
+    """
+    result = {'computed': [], 'skipped': [], 'failed': []}
+    computers = {WHATS_HAPPENING: compute_whats_happening, IMPROVEMENTS: compute_improvements}
+
+    for preset in presets or SNAPSHOT_PRESETS:
+        try:
+            days = preset_days(preset)
+        except ValueError as e:
+            logger.warning(f"[insight snapshots] {e}, ignored")
+            continue
+
+        for kind in ([WHATS_HAPPENING, IMPROVEMENTS] if days else [WHATS_HAPPENING]):
+            name = f"{kind}/{preset}"
+            snapshot = db.get_insight_snapshot(kind, preset)
+            since_id = (snapshot.get('fingerprint') or {}).get('max_id', 0) if snapshot else 0
+            stats = db.get_post_window_stats(days, since_id=since_id)
+            if stats['total'] == 0 or (not force and not needs_refresh(snapshot, stats)):
+                result['skipped'].append(name)
+                continue
+
+            start_time = time.time()
+            try:
+                payload = await computers[kind](preset, stats)
+            except HTTPException as e:
+                if e.status_code == 503:
+                    # No LLM API key configured: nothing else will succeed
+                    logger.warning(f"[insight snapshots] LLM unavailable, stopping: {e.detail}")
+                    result['failed'].append(name)
+                    return result
+                payload = None
+                logger.error(f"[insight snapshots] {name} failed: {e.detail}")
+            except Exception as e:
+                payload = None
+                logger.error(f"[insight snapshots] {name} failed: {type(e).__name__}: {e}", exc_info=True)
+
+            if payload is None:
+                result['failed'].append(name)
+                continue
+
+            duration = time.time() - start_time
+            fingerprint = {key: stats[key] for key in FINGERPRINT_KEYS}
+            db.save_insight_snapshot(kind, preset, fingerprint, payload, duration_seconds=duration)
+            result['computed'].append(name)
+            logger.info(f"[insight snapshots] {name} computed in {duration:.1f}s ({stats['total']} posts)")
+
+    return result
+
+
+def _get_snapshot(kind: str, preset: str) -> Dict[str, Any]:
+    try:
+        preset_days(preset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    snapshot = db.get_insight_snapshot(kind, preset)
+    if not snapshot:
+        raise HTTPException(status_code=404, detail=f"No precomputed analysis for preset '{preset}' yet")
+    return {
+        **snapshot['payload'],
+        'preset': preset,
+        'computed_at': snapshot['computed_at'].isoformat(),
+        'post_count': (snapshot.get('fingerprint') or {}).get('total', 0),
+    }
+
+
+@router.get("/whats-happening/snapshot", response_model=WhatsHappeningSnapshotResponse)
+async def get_whats_happening_snapshot(
+    preset: str = Query("30", description="Date range preset: number of days (30, 90, 365...) or 'all'")
+):
+    """Get the precomputed What's Happening insights of a date range preset (404 if not computed yet)."""
+    return _get_snapshot(WHATS_HAPPENING, preset)
+
+
+@router.get("/improvements-analysis/snapshot", response_model=ImprovementsAnalysisSnapshotResponse)
+async def get_improvements_analysis_snapshot(
+    preset: str = Query("30", description="Date range preset: number of days (30, 90, 365...)")
+):
+    """Get the precomputed improvements analysis of a date range preset (404 if not computed yet)."""
+    if preset == 'all':
+        raise HTTPException(status_code=400, detail="Improvements analyses are computed per number of days")
+    return _get_snapshot(IMPROVEMENTS, preset)
@@ -56,6 +56,7 @@ class QueueStatsResponse(BaseModel):
     pending: int
     processing: int
     completed_today: int
+    failed_today: int = 0
     health: Dict[str, Any]
 
 
@@ -94,6 +95,7 @@ async def get_queue_status():
         pending=stats['pending'],
         processing=stats['processing'],
         completed_today=stats['completed_today'],
+        failed_today=stats.get('failed_today', 0),
         health=health
     )
 
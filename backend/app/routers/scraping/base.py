@@ -5,6 +5,7 @@ import logging
 from typing import List, Dict, Tuple
 
 from ... import database as db
+from ...log_buffer import get_log_buffer
 from ...analysis import sentiment, country_detection, relevance_scorer
 from ...keywords import keywords_base
 
@@ -62,12 +63,15 @@ def sanitize_log_message(message: str) -> str:
 
 
 def log_scraping(source: str, level: str, message: str, details: dict = None):
-    """Helper function to log scraping events to database and console."""
+    """Helper function to log scraping events to database and console.
+    
+    The database write is buffered and batched (see app.log_buffer).
+    """
     try:
         # Sanitize message before logging
         sanitized_message = sanitize_log_message(message)
         try:
-            db.add_scraping_log(source, level, sanitized_message, details)
+            get_log_buffer().add(source, level, sanitized_message, details)
         except Exception as e:
             # Don't fail the entire request if logging fails
             logger.warning(f"Failed to log scraping event: {e}")
@@ -89,6 +93,7 @@ def process_and_save_items(items: List[Dict], source_name: str) -> Tuple[int, in
     added = 0
     skipped_duplicates = 0
     errors = 0
+    to_insert = []  # (index, scraped item, post row)
     
     if not items:
         return added, skipped_duplicates, errors
@@ -141,34 +146,18 @@ def process_and_save_items(items: List[Dict], source_name: str) -> Tuple[int, in
                 logger.warning(f"[{source_name}] Error detecting country for item {idx}: {e}")
                 country = None
             
-            # Insert into database
-            try:
-                inserted = db.insert_post({
-                    'source': it.get('source', source_name),
-                    'author': it.get('author', 'Unknown'),
-                    'content': it.get('content', ''),
-                    'url': it.get('url', ''),
-                    'created_at': it.get('created_at', ''),
-                    'sentiment_score': it.get('sentiment_score', 0.0),
-                    'sentiment_label': it.get('sentiment_label', 'neutral'),
-                    'language': it.get('language', 'unknown'),
-                    'country': country,
-                    'relevance_score': relevance_score,
-                })
-                
-                if inserted:
-                    added += 1
-                    # Try to detect and update answered status automatically
-                    try:
-                        db.detect_and_update_answered_status(inserted, it)
-                    except Exception as e:
-                        logger.debug(f"[{source_name}] Could not auto-detect answered status for post {inserted}: {e}")
-                else:
-                    skipped_duplicates += 1
-            except Exception as e:
-                errors += 1
-                logger.error(f"[{source_name}] Error inserting post {idx} to database: {e}", exc_info=True)
-                log_scraping(source_name, "error", f"Database insert error for item {idx}: {type(e).__name__}: {str(e)[:200]}")
+            to_insert.append((idx, it, {
+                'source': it.get('source', source_name),
+                'author': it.get('author', 'Unknown'),
+                'content': it.get('content', ''),
+                'url': it.get('url', ''),
+                'created_at': it.get('created_at', ''),
+                'sentiment_score': it.get('sentiment_score', 0.0),
+                'sentiment_label': it.get('sentiment_label', 'neutral'),
+                'language': it.get('language', 'unknown'),
+                'country': country,
+                'relevance_score': relevance_score,
+            }))
         except Exception as e:
             errors += 1
             error_type = type(e).__name__
@@ -176,6 +165,32 @@ def process_and_save_items(items: List[Dict], source_name: str) -> Tuple[int, in
             logger.error(f"[{source_name}] Unexpected error processing item {idx}: {error_type}: {error_msg}", exc_info=True)
             log_scraping(source_name, "error", f"Processing error for item {idx}: {error_type}: {error_msg}")
     
+    if not to_insert:
+        return added, skipped_duplicates, errors
+    
+    # Insert the whole batch into database (one transaction)
+    try:
+        outcomes = db.insert_posts_bulk([post for _, _, post in to_insert])
+    except Exception as e:
+        errors += len(to_insert)
+        logger.error(f"[{source_name}] Error inserting {len(to_insert)} posts to database: {e}", exc_info=True)
+        log_scraping(source_name, "error", f"Database insert error for {len(to_insert)} items: {type(e).__name__}: {str(e)[:200]}")
+        return added, skipped_duplicates, errors
+    
+    for (idx, it, _), outcome in zip(to_insert, outcomes):
+        if outcome['status'] == 'inserted':
+            added += 1
+            # Try to detect and update answered status automatically
+            try:
+                db.detect_and_update_answered_status(outcome['id'], it)
+            except Exception as e:
+                logger.debug(f"[{source_name}] Could not auto-detect answered status for post {outcome['id']}: {e}")
+        elif outcome['status'] == 'duplicate':
+            skipped_duplicates += 1
+        else:
+            errors += 1
+            logger.warning(f"[{source_name}] Post {idx} rejected: {outcome.get('error')}")
+    
     return added, skipped_duplicates, errors
 
 
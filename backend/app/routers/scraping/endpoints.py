@@ -132,9 +132,9 @@ async def scrape_x_endpoint(
         query_val = query if query and query != "OVH" else None
         log_scraping(source_name, "info", f"Starting scrape with query='{query_val}', limit={limit}")
         if query_val:
-            items = x_scraper.scrape_x(query_val, limit=limit)
+            items = await x_scraper.scrape_x_async(query_val, limit=limit)
         else:
-            items = x_scraper.scrape_x_multi_queries(limit=limit)
+            items = await x_scraper.scrape_x_multi_queries_async(limit=limit)
         
         if items is None:
             items = []
@@ -323,7 +323,7 @@ async def scrape_ovh_forum_endpoint(
     log_scraping(source_name, "info", f"Starting scrape with query='{query}', limit={limit}, languages={language_list}")
     items = []
     try:
-        items = ovh_forum.scrape_ovh_forum(query, limit=limit, languages=language_list)
+        items = await ovh_forum.scrape_ovh_forum_async(query, limit=limit, languages=language_list)
         if items is None:
             items = []
         log_scraping(source_name, "info", f"Scraper returned {len(items)} items")
@@ -406,7 +406,7 @@ async def scrape_g2_crowd_endpoint(request: Request, query: str = "OVH", limit:
     log_scraping(source_name, "info", f"Starting scrape with query='{query}', limit={limit}")
     items = []
     try:
-        items = g2_crowd.scrape_g2_crowd(query, limit=limit)
+        items = await g2_crowd.scrape_g2_crowd_async(query, limit=limit)
         log_scraping(source_name, "info", f"Scraper returned {len(items)} items")
     except Exception as e:
         error_msg = f"{type(e).__name__}: {str(e)[:200]}"
@@ -1,8 +1,12 @@
 """Job processing functions and endpoints for async scraping jobs."""
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Callable, Any
+from datetime import datetime
+from typing import List, Optional, Callable, Any, Dict
 import uuid
+import json
+import time
 import threading
 import asyncio
 import logging
@@ -12,8 +16,10 @@ import functools
 from ... import db
 from ...scraper import x_scraper, stackoverflow, github, reddit, trustpilot, ovh_forum, mastodon, g2_crowd, linkedin, discord
 from ...scraper import keyword_expander
+from ...scraper.base_scraper import parse_created_at
 from ...analysis import sentiment, country_detection, relevance_scorer
 from ...keywords import keywords_base
+from ...job_state import get_job_state_store, is_stuck, FINAL_STATUSES
 from .base import should_insert_post, log_scraping, RELEVANCE_THRESHOLD
 from .endpoints import KeywordsPayload
 
@@ -22,6 +28,15 @@ logger = logging.getLogger(__name__)
 # Global timeout for scraper calls (in seconds)
 SCRAPER_TIMEOUT = 120  # 2 minutes max per scraper call
 
+# Job event stream: updates are merged over this window before being pushed
+EVENTS_COALESCE_INTERVAL = 0.5
+EVENTS_KEEPALIVE_INTERVAL = 15.0
+
+# Incremental scraping: these scrapers accept `since`, the newest item of the
+# previous scrape of the same (source, query), and stop paginating there
+WATERMARK_SOURCES = {'github', 'trustpilot', 'reddit', 'mastodon'}
+SCRAPE_WATERMARKS_ENABLED = os.getenv('SCRAPE_WATERMARKS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
 
 def safe_scraper_wrapper(scraper_func: Callable, source_name: str, is_async: bool = False):
     """Wrapper to make scraper calls robust and prevent server crashes.
@@ -117,9 +132,6 @@ def safe_scraper_wrapper(scraper_func: Callable, source_name: str, is_async: boo
 
 router = APIRouter()
 
-# Job tracking
-JOBS = {}
-
 # Track problematic job IDs that should be blocked (to prevent spam)
 BLOCKED_JOB_IDS = {
     '84d4fd06-ae2e-43a1-9387-e037a668f75a': True  # Known stale job ID
@@ -127,15 +139,45 @@ BLOCKED_JOB_IDS = {
 BLOCKED_JOB_REQUEST_COUNT = {}  # Track request count per blocked job
 
 
+def _scrape_watermark(source: str, query: str) -> Optional[datetime]:
+    """created_at of the newest item of the previous scrapes of (source, query), if incremental."""
+    if not SCRAPE_WATERMARKS_ENABLED or source not in WATERMARK_SOURCES:
+        return None
+    try:
+        watermark = db.get_scrape_watermark(source, query)
+    except Exception as e:
+        logger.warning(f"[{source}] Could not read scrape watermark of '{query}': {e}")
+        return None
+    return watermark['newest_created_at'] if watermark else None
+
+
+def _advance_scrape_watermarks(source: str, newest_by_query: Dict[str, Dict[str, Any]]) -> None:
+    """Move the watermarks of the queries scraped to their newest item (once the items are stored)."""
+    for query, item in newest_by_query.items():
+        try:
+            db.advance_scrape_watermark(source, query, parse_created_at(item.get('created_at')), item.get('url'))
+        except Exception as e:
+            logger.warning(f"[{source}] Could not update scrape watermark of '{query}': {e}")
+
+
+def _job_cancelled(job_id: Optional[str]) -> bool:
+    """Whether a job was cancelled (the cancel request may reach any API worker)."""
+    if not job_id:
+        return False
+    try:
+        return get_job_state_store().is_cancelled(job_id)
+    except Exception as e:
+        logger.debug(f"Could not check cancellation of job {job_id[:8]}: {e}")
+        return False
+
+
 async def _run_scrape_for_source_async(source: str, query: str, limit: int, use_keyword_expansion: bool = True, job_id: Optional[str] = None):
     """Async version: Call the appropriate scraper and insert results into DB; return count added."""
     try:
         # Check if job was cancelled before starting
-        if job_id:
-            job = JOBS.get(job_id)
-            if job and job.get('cancelled'):
-                logger.info(f"[{source}] Job {job_id[:8]} was cancelled, aborting scraping")
-                return 0
+        if _job_cancelled(job_id):
+            logger.info(f"[{source}] Job {job_id[:8]} was cancelled, aborting scraping")
+            return 0
         # Wrap all scrapers with safety wrapper
         async_mapper = {
             'github': safe_scraper_wrapper(github.scrape_github_issues_async, 'GitHub', is_async=True),
@@ -145,22 +187,15 @@ async def _run_scrape_for_source_async(source: str, query: str, limit: int, use_
             'mastodon': safe_scraper_wrapper(mastodon.scrape_mastodon_async, 'Mastodon', is_async=True),
             'linkedin': safe_scraper_wrapper(linkedin.scrape_linkedin_async, 'LinkedIn', is_async=True),
             'discord': safe_scraper_wrapper(discord.scrape_discord_async, 'Discord', is_async=True),
+            'x': safe_scraper_wrapper(x_scraper.scrape_x_async, 'X/Twitter', is_async=True),
+            'ovh-forum': safe_scraper_wrapper(ovh_forum.scrape_ovh_forum_async, 'OVH Forum', is_async=True),
+            'g2-crowd': safe_scraper_wrapper(g2_crowd.scrape_g2_crowd_async, 'G2 Crowd', is_async=True),
         }
-        sync_mapper = {
-            'x': safe_scraper_wrapper(x_scraper.scrape_x, 'X/Twitter', is_async=False),
-            'ovh-forum': safe_scraper_wrapper(ovh_forum.scrape_ovh_forum, 'OVH Forum', is_async=False),
-            'g2-crowd': safe_scraper_wrapper(g2_crowd.scrape_g2_crowd, 'G2 Crowd', is_async=False),
-        }
-        
-        async_func = async_mapper.get(source)
-        sync_func = sync_mapper.get(source)
         
-        if async_func is None and sync_func is None:
+        func = async_mapper.get(source)
+        if func is None:
             return 0
         
-        func = async_func if async_func else sync_func
-        is_async = async_func is not None
-        
         queries_to_try = [query]
         if use_keyword_expansion:
             try:
@@ -174,34 +209,35 @@ async def _run_scrape_for_source_async(source: str, query: str, limit: int, use_
         
         all_items = []
         seen_urls = set()
+        item_queries = {}  # id(item) -> query variant that returned it
+        truncated_queries = set()  # variants whose scrape stopped at the limit
         
         for query_variant in queries_to_try:
             # Check if job was cancelled before processing each query variant
-            if job_id:
-                job = JOBS.get(job_id)
-                if job and job.get('cancelled'):
-                    logger.info(f"[{source}] Job {job_id[:8]} was cancelled during scraping, stopping")
-                    break
+            if _job_cancelled(job_id):
+                logger.info(f"[{source}] Job {job_id[:8]} was cancelled during scraping, stopping")
+                break
             
             try:
                 per_query_limit = max(limit // len(queries_to_try), 20)  # Minimum 20 par query pour meilleure couverture
                 
-                if is_async:
-                    items = await func(query_variant, per_query_limit)
+                since = _scrape_watermark(source, query_variant)
+                if since is not None:
+                    items = await func(query_variant, per_query_limit, since=since)
                 else:
-                    items = await asyncio.to_thread(func, query_variant, per_query_limit)
+                    items = await func(query_variant, per_query_limit)
                 
                 # Validate items is a list (safety wrapper should ensure this, but double-check)
                 if not isinstance(items, list):
                     logger.warning(f"[{source}] Scraper returned non-list: {type(items)}, converting to empty list")
                     items = []
+                if len(items) >= per_query_limit:
+                    truncated_queries.add(query_variant)
                 
                 # Check again after scraping this variant
-                if job_id:
-                    job = JOBS.get(job_id)
-                    if job and job.get('cancelled'):
-                        logger.info(f"[{source}] Job {job_id[:8]} was cancelled after scraping variant, stopping")
-                        break
+                if _job_cancelled(job_id):
+                    logger.info(f"[{source}] Job {job_id[:8]} was cancelled after scraping variant, stopping")
+                    break
                 
                 # Process items safely
                 for item in items:
@@ -214,9 +250,11 @@ async def _run_scrape_for_source_async(source: str, query: str, limit: int, use_
                         url = item.get('url', '')
                         if url and url not in seen_urls:
                             all_items.append(item)
+                            item_queries[id(item)] = query_variant
                             seen_urls.add(url)
                         elif not url:
                             all_items.append(item)
+                            item_queries[id(item)] = query_variant
                     except Exception as item_error:
                         logger.warning(f"[{source}] Error processing item: {item_error}")
                         continue
@@ -228,34 +266,41 @@ async def _run_scrape_for_source_async(source: str, query: str, limit: int, use_
                 logger.error(f"[{source}] Error in query variant processing: {e}", exc_info=True)
                 try:
                     if job_id:
-                        job = JOBS.get(job_id)
-                        if job:
-                            db.append_job_error(job_id, f"{source} (query: {query_variant}): {str(e)}")
+                        get_job_state_store().add_error(job_id, f"{source} (query: {query_variant}): {str(e)}")
                 except Exception:
                     pass
                 continue  # Continue with next query variant
         
+        for it in all_items[limit:]:
+            truncated_queries.add(item_queries.get(id(it)))
         all_items = all_items[:limit]
         
+        # Newest item kept per query variant: where its next scrape will stop.
+        # Variants stopped by the limit did not reach their previous watermark
+        # (scrapers go newest first): keep it, so the items in between are
+        # fetched by the next scrapes
+        newest_by_query = {}
+        if SCRAPE_WATERMARKS_ENABLED and source in WATERMARK_SOURCES:
+            for it in all_items:
+                created_at = parse_created_at(it.get('created_at'))
+                query_variant = item_queries.get(id(it))
+                if created_at is None or query_variant is None or query_variant in truncated_queries:
+                    continue
+                newest = newest_by_query.get(query_variant)
+                if newest is None or created_at > parse_created_at(newest.get('created_at')):
+                    newest_by_query[query_variant] = it
+        
         added = 0
         duplicates = 0
         filtered_by_relevance = 0
+        posts_to_insert = []
         
         # Check if job was cancelled before processing items
-        if job_id:
-            job = JOBS.get(job_id)
-            if job and job.get('cancelled'):
-                logger.info(f"[{source}] Job {job_id[:8]} was cancelled before processing items")
-                return 0
+        if _job_cancelled(job_id):
+            logger.info(f"[{source}] Job {job_id[:8]} was cancelled before processing items")
+            return 0
         
         for it in all_items:
-            # Check if job was cancelled during item processing
-            if job_id:
-                job = JOBS.get(job_id)
-                if job and job.get('cancelled'):
-                    logger.info(f"[{source}] Job {job_id[:8]} was cancelled during item processing")
-                    break
-            
             try:
                 is_relevant, relevance_score = should_insert_post(it)
                 if not is_relevant:
@@ -287,31 +332,40 @@ async def _run_scrape_for_source_async(source: str, query: str, limit: int, use_
                     logger.debug(f"[{source}] Country detection failed: {e}")
                     country = None
                 
-                try:
-                    if db.insert_post({
-                        'source': it.get('source'),
-                        'author': it.get('author'),
-                        'content': it.get('content'),
-                        'url': it.get('url'),
-                        'created_at': it.get('created_at'),
-                        'sentiment_score': an['score'],
-                        'sentiment_label': an['label'],
-                        'language': it.get('language', 'unknown'),
-                        'country': country,
-                        'relevance_score': relevance_score,
-                    }):
-                        added += 1
-                    else:
-                        duplicates += 1
-                except Exception as db_error:
-                    logger.warning(f"[{source}] Failed to insert post to DB: {db_error}")
-                    # Continue processing other items even if one fails
-                    continue
+                posts_to_insert.append({
+                    'source': it.get('source'),
+                    'author': it.get('author'),
+                    'content': it.get('content'),
+                    'url': it.get('url'),
+                    'created_at': it.get('created_at'),
+                    'sentiment_score': an['score'],
+                    'sentiment_label': an['label'],
+                    'language': it.get('language', 'unknown'),
+                    'country': country,
+                    'relevance_score': relevance_score,
+                })
             except Exception as item_error:
                 logger.warning(f"[{source}] Error processing item: {item_error}")
                 # Continue processing other items even if one fails
                 continue
         
+        stored = True
+        if posts_to_insert:
+            try:
+                outcomes = db.insert_posts_bulk(posts_to_insert)
+                added = sum(1 for o in outcomes if o['status'] == 'inserted')
+                duplicates = sum(1 for o in outcomes if o['status'] == 'duplicate')
+                rejected = len(outcomes) - added - duplicates
+                if rejected:
+                    logger.warning(f"[{source}] {rejected} post(s) rejected by DB validation")
+            except Exception as db_error:
+                stored = False
+                logger.warning(f"[{source}] Failed to insert {len(posts_to_insert)} posts to DB: {db_error}")
+        
+        # Only once stored: a failed insert must be retried by the next scrape
+        if stored and newest_by_query:
+            _advance_scrape_watermarks(source, newest_by_query)
+        
         if filtered_by_relevance > 0:
             logger.info(f"[{source}] Filtered {filtered_by_relevance} posts by relevance threshold")
         
@@ -323,9 +377,8 @@ async def _run_scrape_for_source_async(source: str, query: str, limit: int, use_
         error_msg = f"{source} (query: {query}): {str(e)}"
         logger.error(f"Error in _run_scrape_for_source_async: {error_msg}", exc_info=True)
         try:
-            for job_id, info in JOBS.items():
-                if info.get('status') == 'running':
-                    db.append_job_error(job_id, error_msg)
+            if job_id:
+                get_job_state_store().add_error(job_id, error_msg)
         except Exception:
             pass
         return 0
@@ -387,12 +440,7 @@ def _run_scrape_for_source_sync(source: str, query: str, limit: int, use_keyword
                 break
                 
         except Exception as e:
-            try:
-                for job_id, info in JOBS.items():
-                    if info.get('status') == 'running':
-                        db.append_job_error(job_id, f"{source} (query: {query_variant}): {str(e)}")
-            except Exception:
-                pass
+            logger.warning(f"[{source}] Error for query variant '{query_variant}': {e}")
             continue
     
     all_items = all_items[:limit]
@@ -438,202 +486,100 @@ def _run_scrape_for_source_sync(source: str, query: str, limit: int, use_keyword
     return added
 
 
+
+
 async def _process_keyword_job_async(job_id: str, keywords: List[str], limit: int, concurrency: int, delay: float):
     """Async version of keyword job processing using asyncio.gather."""
-    job = JOBS.get(job_id)
-    if job is None:
+    store = get_job_state_store()
+    if store.get(job_id) is None:
+        return
+    # Update status to running immediately (no-op if cancelled before starting)
+    if not store.set_status(job_id, 'running'):
         return
-    
-    # Update status to running immediately
-    job['status'] = 'running'
-    try:
-        created = db.create_job_record(job_id, job_type='scrape_keywords_async')
-        if created:
-            logger.info(f"Created DB record for async keyword job {job_id[:8]}")
-        else:
-            logger.warning(f"Failed to create DB record for async keyword job {job_id[:8]} (may already exist or table missing)")
-        # Update status in DB immediately
-        db.update_job_progress(job_id, total_tasks, 0)
-    except Exception as e:
-        logger.error(f"Failed to create DB record for async keyword job {job_id[:8]}: {e}", exc_info=True)
     
     sources = ['x', 'github', 'stackoverflow', 'news', 'reddit', 'trustpilot', 'ovh-forum', 'mastodon', 'g2-crowd', 'linkedin']
     total_tasks = len(keywords) * len(sources)
-    job['progress'] = {'total': total_tasks, 'completed': 0}
-    try:
-        db.update_job_progress(job_id, total_tasks, 0)
-    except Exception:
-        pass
-
+    store.set_progress(job_id, 0, total_tasks)
+    
     try:
-        tasks = []
-        for kw in keywords:
-            if job.get('cancelled'):
-                job['status'] = 'cancelled'
-                return
-            for s in sources:
-                if job.get('cancelled'):
-                    job['status'] = 'cancelled'
-                    return
-                tasks.append(_run_scrape_for_source_async(s, kw, limit))
-        
         semaphore = asyncio.Semaphore(concurrency)
+        completed_count = 0
+        started_count = 0  # Track how many tasks have started
         
-        async def process_with_semaphore(task):
+        def estimated_progress() -> int:
+            # Tasks still running are counted as half done
+            return min(completed_count + (started_count - completed_count) // 2, total_tasks)
+        
+        async def process_with_semaphore(kw: str, s: str):
+            nonlocal started_count
             async with semaphore:
-                nonlocal started_count
+                if _job_cancelled(job_id):
+                    return None
                 started_count += 1
                 logger.debug(f"Job {job_id[:8]}: Starting task {started_count}/{total_tasks}")
-                
-                if job.get('cancelled'):
-                    return None
                 try:
-                    result = await asyncio.wait_for(task, timeout=300.0)
-                    return result
+                    added = await asyncio.wait_for(_run_scrape_for_source_async(s, kw, limit, job_id=job_id), timeout=300.0)
+                    store.log(job_id, 'info', f"[{s}] {kw}: {added} new post(s)")
+                    return added
                 except asyncio.TimeoutError:
-                    error_msg = "Task timed out after 5 minutes"
-                    if job.get('status') == 'running':
-                        job['errors'].append(error_msg)
-                        try:
-                            db.append_job_error(job_id, error_msg)
-                        except Exception:
-                            pass
+                    store.add_error(job_id, "Task timed out after 5 minutes")
                     logger.warning(f"Task timed out for job {job_id}")
                     return None
                 except Exception as e:
-                    error_msg = str(e)
-                    if job.get('status') == 'running':
-                        job['errors'].append(error_msg)
-                        try:
-                            db.append_job_error(job_id, error_msg)
-                        except Exception:
-                            pass
-                    logger.warning(f"Task error for job {job_id}: {error_msg}")
+                    store.add_error(job_id, str(e))
+                    logger.warning(f"Task error for job {job_id}: {e}")
                     return None
         
-        wrapped_tasks = [asyncio.create_task(process_with_semaphore(task)) for task in tasks]
-        
-        completed_count = 0
-        started_count = 0  # Track how many tasks have started
+        wrapped_tasks = [
+            asyncio.create_task(process_with_semaphore(kw, s))
+            for kw in keywords for s in sources
+        ]
         
         async def progress_heartbeat():
-            nonlocal completed_count, started_count
-            # Estimate progress: assume tasks take time, so show partial progress based on started tasks
-            while job.get('status') == 'running' and completed_count < total_tasks:
-                await asyncio.sleep(2.0)  # Update every 2 seconds
-                if job.get('cancelled'):
+            # Move the bar while long tasks run (only when the estimate changes)
+            last_progress = None
+            while completed_count < total_tasks:
+                await asyncio.sleep(2.0)
+                if _job_cancelled(job_id):
                     break
-                
-                # Update progress: show at least some progress even if tasks are still running
-                # Use a combination of completed and estimated progress
-                estimated_progress = completed_count
-                if started_count > completed_count:
-                    # Estimate: if tasks are running, assume they're 50% done
-                    estimated_progress = completed_count + int((started_count - completed_count) * 0.5)
-                
-                # Always update progress, even if it's 0 (to show the job is alive)
-                job['progress']['completed'] = min(estimated_progress, total_tasks)
-                job['progress']['total'] = total_tasks  # Ensure total is always set
-                try:
-                    db.update_job_progress(job_id, total_tasks, job['progress']['completed'])
-                    # Log progress updates periodically for debugging
-                    if completed_count % max(1, total_tasks // 20) == 0 or completed_count == 1:
-                        logger.info(f"Job {job_id[:8]}: Progress updated to {job['progress']['completed']}/{total_tasks} (DB synced)")
-                except Exception as e:
-                    logger.warning(f"Failed to update job progress in DB: {e}")
-                
-                # Log progress every 10% or every 10 tasks
-                if completed_count > 0 and completed_count % max(1, total_tasks // 10) == 0:
-                    logger.info(f"Job {job_id[:8]}: {completed_count}/{total_tasks} tasks completed ({completed_count*100//total_tasks}%)")
+                progress = estimated_progress()
+                if progress != last_progress:
+                    store.set_progress(job_id, progress)
+                    last_progress = progress
         
         heartbeat_task = asyncio.create_task(progress_heartbeat())
         
         try:
             for completed_task in asyncio.as_completed(wrapped_tasks):
-                if job.get('cancelled'):
-                    job['status'] = 'cancelled'
-                    heartbeat_task.cancel()
+                if _job_cancelled(job_id):
+                    for task in wrapped_tasks:
+                        task.cancel()
                     return
                 
                 try:
                     result = await completed_task
-                    
-                    completed_count += 1
-                    # Update progress immediately when a task completes
-                    estimated_progress = completed_count
-                    if started_count > completed_count:
-                        estimated_progress = completed_count + int((started_count - completed_count) * 0.5)
-                    
-                    job['progress']['completed'] = min(estimated_progress, total_tasks)
-                    try:
-                        db.update_job_progress(job_id, total_tasks, job['progress']['completed'])
-                    except Exception:
-                        pass
-                    
-                    logger.debug(f"Job {job_id[:8]}: Task completed ({completed_count}/{total_tasks})")
-                    
-                    if isinstance(result, Exception):
-                        error_msg = str(result)
-                        if job.get('status') == 'running':
-                            job['errors'].append(error_msg)
-                            try:
-                                db.append_job_error(job_id, error_msg)
-                            except Exception:
-                                pass
-                        logger.warning(f"Task failed for job {job_id}: {error_msg}")
-                    elif result is None:
-                        logger.debug(f"Task returned None for job {job_id}")
-                    else:
-                        job['results'].append({'added': result})
-                        try:
-                            db.append_job_result(job_id, {'added': result})
-                        except Exception:
-                            pass
-                    
+                    if result is not None:
+                        store.add_result(job_id, {'added': result})
                     await asyncio.sleep(delay)
-                    
                 except Exception as e:
-                    error_msg = str(e)
-                    if job.get('status') == 'running':
-                        job['errors'].append(error_msg)
-                        try:
-                            db.append_job_error(job_id, error_msg)
-                        except Exception:
-                            pass
-                    logger.error(f"Error processing completed task for job {job_id}: {error_msg}", exc_info=True)
-                    
-                    completed_count += 1
-                    # Update progress even on error
-                    estimated_progress = completed_count
-                    if started_count > completed_count:
-                        estimated_progress = completed_count + int((started_count - completed_count) * 0.5)
-                    
-                    job['progress']['completed'] = min(estimated_progress, total_tasks)
-                    try:
-                        db.update_job_progress(job_id, total_tasks, job['progress']['completed'])
-                    except Exception:
-                        pass
-        
+                    store.add_error(job_id, str(e))
+                    logger.error(f"Error processing completed task for job {job_id}: {e}", exc_info=True)
+                
+                completed_count += 1
+                store.set_progress(job_id, estimated_progress())
+                if completed_count % max(1, total_tasks // 10) == 0:
+                    logger.info(f"Job {job_id[:8]}: {completed_count}/{total_tasks} tasks completed ({completed_count*100//total_tasks}%)")
         finally:
             heartbeat_task.cancel()
             try:
                 await heartbeat_task
             except asyncio.CancelledError:
                 pass
-
-        job['status'] = 'completed'
-        try:
-            db.finalize_job(job_id, 'completed')
-        except Exception:
-            pass
+        
+        store.set_status(job_id, 'completed')
     except Exception as e:
-        job['status'] = 'failed'
-        job['error'] = str(e)
-        try:
-            db.append_job_error(job_id, str(e))
-            db.finalize_job(job_id, 'failed', str(e))
-        except Exception:
-            pass
+        store.add_error(job_id, str(e))
+        store.set_status(job_id, 'failed', str(e))
 
 
 def _process_keyword_job(job_id: str, keywords: List[str], limit: int, concurrency: int, delay: float):
@@ -648,12 +594,9 @@ def _process_keyword_job(job_id: str, keywords: List[str], limit: int, concurren
             logger.error(f"Error in keyword job thread {job_id[:8]}: {e}", exc_info=True)
             # Update job status to failed
             try:
-                job = JOBS.get(job_id)
-                if job:
-                    job['status'] = 'failed'
-                    job['error'] = str(e)
-                    db.append_job_error(job_id, str(e))
-                    db.finalize_job(job_id, 'failed', str(e))
+                store = get_job_state_store()
+                store.add_error(job_id, str(e))
+                store.set_status(job_id, 'failed', str(e))
             except Exception:
                 pass
         finally:
@@ -675,45 +618,15 @@ def _process_keyword_job(job_id: str, keywords: List[str], limit: int, concurren
 
 async def _process_single_source_job_async(job_id: str, source: str, query: str, limit: int):
     """Process a single source scraping job with granular progress updates."""
-    try:
-        logger.info(f"[{source}] Async function started for job {job_id[:8]}")
-    except Exception:
-        pass
-    
-    job = JOBS.get(job_id)
-    if job is None:
-        try:
-            logger.error(f"[{source}] Job {job_id[:8]} not found in JOBS dict!")
-        except Exception:
-            pass
+    store = get_job_state_store()
+    if store.get(job_id) is None:
+        logger.error(f"[{source}] Job {job_id[:8]} not found in the job state store!")
         return
     
-    try:
-        logger.info(f"[{source}] Setting job {job_id[:8]} status to 'running' (was: {job.get('status')})")
-    except Exception:
-        pass
-    
-    # CRITICAL: Set status to running IMMEDIATELY, before anything else
-    # This must happen before any await or DB operations
-    job['status'] = 'running'
-    
-    # Also update in DB immediately to ensure consistency
-    try:
-        import datetime
-        with db.get_db() as conn:
-            c = conn.cursor()
-            now = datetime.datetime.utcnow().isoformat()
-            c.execute('UPDATE jobs SET status = ?, updated_at = ? WHERE job_id = ?', ('running', now, job_id))
-    except Exception as db_err:
-        try:
-            logger.warning(f"[{source}] Failed to update job status in DB: {db_err}")
-        except Exception:
-            pass
-    
-    try:
-        logger.info(f"[{source}] Job {job_id[:8]} status is now: {job.get('status')}")
-    except Exception:
-        pass
+    # Set status to running before anything else (no-op if cancelled before starting)
+    if not store.set_status(job_id, 'running'):
+        logger.info(f"[{source}] Job {job_id[:8]} was cancelled before starting")
+        return
     
     total_steps = 100
     init_steps = 5
@@ -721,71 +634,25 @@ async def _process_single_source_job_async(job_id: str, source: str, query: str,
     scraping_end = 90
     processing_start = scraping_end
     
-    try:
-        created = db.create_job_record(job_id, job_type='scrape_source', payload={'source': source, 'query': query, 'limit': limit})
-        if created:
-            logger.info(f"Created DB record for async job {job_id[:8]}")
-        else:
-            logger.warning(f"Failed to create DB record for async job {job_id[:8]} (may already exist or table missing)")
-        db.update_job_progress(job_id, total_steps, 0)
-    except Exception as e:
-        logger.error(f"Failed to create DB record for async job {job_id[:8]}: {e}", exc_info=True)
-    
-    job['progress'] = {'total': total_steps, 'completed': 0}
-    
     heartbeat_running = True
     heartbeat_step = scraping_start
     
     async def progress_heartbeat():
         """Simplified heartbeat: just increment progress every second."""
-        nonlocal heartbeat_step, heartbeat_running
-        logger.info(f"[{source}] Heartbeat started for job {job_id[:8]} (from {heartbeat_step} to {scraping_end})")
-        
-        while heartbeat_running and heartbeat_step < scraping_end:
-            # Check cancellation
-            if job.get('cancelled'):
+        nonlocal heartbeat_step
+        while heartbeat_running and heartbeat_step < scraping_end - 1:
+            await asyncio.sleep(1.0)
+            if _job_cancelled(job_id):
                 logger.info(f"[{source}] Job cancelled, stopping heartbeat")
-                heartbeat_running = False
                 break
-            
-            # Wait 1 second
-            try:
-                await asyncio.sleep(1.0)
-            except asyncio.CancelledError:
-                break
-            except Exception:
-                break
-            
-            # Increment progress
-            if heartbeat_step < scraping_end - 1:
-                heartbeat_step += 1
-            
-            # Update progress in memory and DB
-            job['progress']['completed'] = heartbeat_step
-            job['progress']['total'] = total_steps
-            
-            try:
-                db.update_job_progress(job_id, total_steps, heartbeat_step)
-                # Log every 10%
-                if heartbeat_step % 10 == 0:
-                    logger.info(f"[{source}] Progress: {heartbeat_step}%")
-            except Exception as e:
-                logger.debug(f"[{source}] DB update failed: {e}")
-        
-        logger.info(f"[{source}] Heartbeat finished at {heartbeat_step}%")
+            heartbeat_step += 1
+            store.set_progress(job_id, heartbeat_step)
+            if heartbeat_step % 10 == 0:
+                logger.info(f"[{source}] Progress: {heartbeat_step}%")
     
     try:
-        if job.get('cancelled'):
-            job['status'] = 'cancelled'
-            db.finalize_job(job_id, 'cancelled', 'cancelled by user')
-            return
-        
         for step in range(1, init_steps + 1):
-            job['progress']['completed'] = step
-            try:
-                db.update_job_progress(job_id, total_steps, step)
-            except Exception:
-                pass
+            store.set_progress(job_id, step, total_steps)
             await asyncio.sleep(0.1)
         
         if not query or query.strip() == "":
@@ -794,159 +661,62 @@ async def _process_single_source_job_async(job_id: str, source: str, query: str,
                 query = base_keywords[0] if len(base_keywords) == 1 else " ".join(base_keywords[:3])
                 log_scraping(source, "info", f"Using base keywords: {query}")
         
-        job['progress']['completed'] = scraping_start
-        job['progress']['total'] = total_steps
-        try:
-            db.update_job_progress(job_id, total_steps, scraping_start)
-            logger.info(f"[{source}] Initial progress set to {scraping_start}/{total_steps} before scraping starts")
-        except Exception as e:
-            logger.warning(f"[{source}] Failed to set initial progress: {e}")
-        
         # Start heartbeat BEFORE scraping to ensure progress updates
-        heartbeat_task = None
-        try:
-            logger.info(f"[{source}] Starting heartbeat task for job {job_id[:8]}...")
-            heartbeat_task = asyncio.create_task(progress_heartbeat())
-            logger.info(f"[{source}] Heartbeat task created for job {job_id[:8]}, task={heartbeat_task}")
-        except Exception as heartbeat_error:
-            logger.error(f"[{source}] Failed to create heartbeat task: {heartbeat_error}", exc_info=True)
-            # Don't fail the job, but log the error
-            heartbeat_task = None
-        
-        # Give heartbeat a moment to start and update progress
-        if heartbeat_task:
-            try:
-                await asyncio.sleep(0.5)  # Increased delay to ensure heartbeat starts
-                logger.info(f"[{source}] Heartbeat task status: done={heartbeat_task.done()}, cancelled={heartbeat_task.cancelled()}, exception={heartbeat_task.exception() if heartbeat_task.done() else None}")
-                # Check if heartbeat crashed immediately
-                if heartbeat_task.done() and heartbeat_task.exception():
-                    logger.error(f"[{source}] Heartbeat task crashed immediately: {heartbeat_task.exception()}", exc_info=True)
-                    # Try to restart heartbeat
-                    try:
-                        heartbeat_running = True
-                        heartbeat_task = asyncio.create_task(progress_heartbeat())
-                        logger.info(f"[{source}] Restarted heartbeat task")
-                    except Exception as restart_err:
-                        logger.error(f"[{source}] Failed to restart heartbeat: {restart_err}", exc_info=True)
-            except Exception as check_err:
-                logger.error(f"[{source}] Error checking heartbeat status: {check_err}", exc_info=True)
-        else:
-            logger.error(f"[{source}] Heartbeat task is None - heartbeat will not run!")
-        
+        heartbeat_task = asyncio.create_task(progress_heartbeat())
         try:
-            # Check if job was cancelled before starting scraping
-            if job.get('cancelled'):
+            if _job_cancelled(job_id):
                 logger.info(f"[{source}] Job {job_id[:8]} was cancelled before scraping started")
                 return
             
             logger.info(f"[{source}] Starting scraping for job {job_id[:8]}...")
-            
-            # Wrap scraping in try/except to prevent server crash
+            store.log(job_id, 'info', f"Scraping {source} for '{query}'")
             try:
                 added = await _run_scrape_for_source_async(source, query, limit, use_keyword_expansion=False, job_id=job_id)
             except Exception as scrape_error:
-                logger.error(f"[{source}] Error during scraping for job {job_id[:8]}: {scrape_error}", exc_info=True)
                 # Don't crash - just log the error and continue
+                logger.error(f"[{source}] Error during scraping for job {job_id[:8]}: {scrape_error}", exc_info=True)
                 added = 0
-                # Add error to job
-                try:
-                    db.append_job_error(job_id, f"Scraping error: {str(scrape_error)}")
-                except Exception:
-                    pass
+                store.add_error(job_id, f"Scraping error: {str(scrape_error)}")
             
             # Check again after scraping (job might have been cancelled during scraping)
-            if job.get('cancelled'):
+            if _job_cancelled(job_id):
                 logger.info(f"[{source}] Job {job_id[:8]} was cancelled during scraping")
                 return
             
             logger.info(f"[{source}] Scraping completed for job {job_id[:8]}, added {added} posts")
+            store.log(job_id, 'info', f"{source}: {added} new post(s)")
         finally:
-            # Don't stop heartbeat immediately - let it finish naturally to show progress
-            # Set flag but let heartbeat continue until it reaches scraping_end
             heartbeat_running = False
+            heartbeat_task.cancel()
             try:
-                logger.info(f"[{source}] Scraping finished, stopping heartbeat. Current progress: {job['progress']['completed']}/{total_steps}")
-            except Exception:
-                pass
-            # Wait a bit for heartbeat to catch up if scraping finished quickly
-            await asyncio.sleep(1.0)
-            # Now cancel heartbeat if it's still running
-            if heartbeat_task and not heartbeat_task.done():
-                try:
-                    heartbeat_task.cancel()
-                    try:
-                        await heartbeat_task
-                    except asyncio.CancelledError:
-                        pass
-                except Exception as cancel_err:
-                    try:
-                        logger.warning(f"[{source}] Error cancelling heartbeat: {cancel_err}")
-                    except Exception:
-                        pass
-            # Ensure we're at scraping_end
-            current_progress = job['progress']['completed']
-            if current_progress < scraping_end:
-                logger.info(f"[{source}] Updating progress from {current_progress} to {scraping_end}")
-                job['progress']['completed'] = scraping_end
-                try:
-                    db.update_job_progress(job_id, total_steps, scraping_end)
-                except Exception as e:
-                    logger.warning(f"[{source}] Failed to update progress to scraping_end: {e}")
-        
-        for step in range(processing_start, processing_start + 5):
-            job['progress']['completed'] = step
-            try:
-                db.update_job_progress(job_id, total_steps, step)
-            except Exception:
-                pass
-            await asyncio.sleep(0.1)
-        
-        job['results'].append({'added': added, 'source': source})
-        
-        for step in range(processing_start + 5, total_steps):
-            job['progress']['completed'] = step
-            try:
-                db.update_job_progress(job_id, total_steps, step)
-            except Exception:
+                await heartbeat_task
+            except asyncio.CancelledError:
                 pass
-            await asyncio.sleep(0.05)
         
-        job['progress']['completed'] = total_steps - 1
-        try:
-            db.update_job_progress(job_id, total_steps, total_steps - 1)
-        except Exception:
-            pass
+        for step in range(processing_start, total_steps):
+            store.set_progress(job_id, step)
+            await asyncio.sleep(0.1 if step < processing_start + 5 else 0.05)
         
         try:
             deleted_duplicates = db.delete_duplicate_posts()
             if deleted_duplicates > 0:
                 logger.info(f"[{source}] Cleaned up {deleted_duplicates} duplicate posts after scraping")
-                job['results'].append({'duplicates_removed': deleted_duplicates})
+                store.add_result(job_id, {'duplicates_removed': deleted_duplicates})
         except Exception as e:
             logger.warning(f"[{source}] Failed to cleanup duplicates: {e}")
         
-        job['progress']['completed'] = total_steps
-        try:
-            db.update_job_progress(job_id, total_steps, total_steps)
-            db.append_job_result(job_id, {'added': added, 'source': source})
-        except Exception:
-            pass
-        
-        job['status'] = 'completed'
-        db.finalize_job(job_id, 'completed')
+        store.add_result(job_id, {'added': added, 'source': source})
+        store.set_progress(job_id, total_steps)
+        store.set_status(job_id, 'completed')
         
     except Exception as e:
-        heartbeat_running = False
         error_msg = str(e)
-        job['status'] = 'failed'
-        job['error'] = error_msg
-        job['errors'].append(error_msg)
+        logger.error(f"Error in single source job {job_id}: {error_msg}", exc_info=True)
         try:
-            db.append_job_error(job_id, error_msg)
-            db.finalize_job(job_id, 'failed', error_msg)
+            store.add_error(job_id, error_msg)
+            store.set_status(job_id, 'failed', error_msg)
         except Exception:
             pass
-        logger.error(f"Error in single source job {job_id}: {error_msg}", exc_info=True)
 
 
 def _process_single_source_job(job_id: str, source: str, query: str, limit: int):
@@ -955,50 +725,18 @@ def _process_single_source_job(job_id: str, source: str, query: str, limit: int)
         """Run async job in a completely isolated event loop."""
         new_loop = None
         try:
-            try:
-                logger.info(f"[{source}] Thread function started for job {job_id[:8]}")
-            except Exception:
-                pass  # Don't crash if logging fails
-            
             new_loop = asyncio.new_event_loop()
             asyncio.set_event_loop(new_loop)
-            
-            try:
-                logger.info(f"[{source}] Calling async function for job {job_id[:8]}...")
-            except Exception:
-                pass
-            
             new_loop.run_until_complete(_process_single_source_job_async(job_id, source, query, limit))
-            
-            try:
-                logger.info(f"[{source}] Async function completed for job {job_id[:8]}")
-            except Exception:
-                pass
-        except KeyboardInterrupt:
-            # Don't catch keyboard interrupts
-            raise
-        except SystemExit:
-            # Don't catch system exits
+        except (KeyboardInterrupt, SystemExit):
             raise
         except Exception as e:
-            try:
-                logger.error(f"Error in single source job thread {job_id[:8]}: {e}", exc_info=True)
-            except Exception:
-                # If logging fails, at least print to stderr
-                import sys
-                print(f"ERROR: Failed to log error for job {job_id[:8]}: {e}", file=sys.stderr)
-            
+            logger.error(f"Error in single source job thread {job_id[:8]}: {e}", exc_info=True)
             # Update job status to failed
             try:
-                job = JOBS.get(job_id)
-                if job:
-                    job['status'] = 'failed'
-                    job['error'] = str(e)
-                    try:
-                        db.append_job_error(job_id, str(e))
-                        db.finalize_job(job_id, 'failed', str(e))
-                    except Exception:
-                        pass  # DB operations might fail, but don't crash
+                store = get_job_state_store()
+                store.add_error(job_id, str(e))
+                store.set_status(job_id, 'failed', str(e))
             except Exception:
                 pass  # Don't crash if updating job status fails
         finally:
@@ -1007,16 +745,10 @@ def _process_single_source_job(job_id: str, source: str, query: str, limit: int)
                     # Cancel all pending tasks
                     pending = asyncio.all_tasks(new_loop)
                     for task in pending:
-                        try:
-                            task.cancel()
-                        except Exception:
-                            pass
+                        task.cancel()
                     # Wait for cancellation
                     if pending:
-                        try:
-                            new_loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-                        except Exception:
-                            pass
+                        new_loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
                 except Exception:
                     pass
                 try:
@@ -1029,12 +761,9 @@ def _process_single_source_job(job_id: str, source: str, query: str, limit: int)
         t.start()
     except Exception as e:
         # If thread creation fails, mark job as failed
+        logger.error(f"Failed to start thread for job {job_id[:8]}: {e}", exc_info=True)
         try:
-            logger.error(f"Failed to start thread for job {job_id[:8]}: {e}", exc_info=True)
-            job = JOBS.get(job_id)
-            if job:
-                job['status'] = 'failed'
-                job['error'] = f"Failed to start thread: {str(e)}"
+            get_job_state_store().set_status(job_id, 'failed', f"Failed to start thread: {str(e)}")
         except Exception:
             pass
 
@@ -1052,60 +781,22 @@ async def start_single_source_job(
             raise HTTPException(status_code=400, detail=f"Invalid source. Must be one of: {', '.join(valid_sources)}")
         
         job_id = str(uuid.uuid4())
-        JOBS[job_id] = {
-            'id': job_id,
-            'status': 'pending',
-            'progress': {'total': 100, 'completed': 0},  # Initialize with correct total
-            'results': [],
-            'errors': [],
-            'cancelled': False,
-            'error': None,
-            'source': source,  # Add source to job for easier debugging
-            'query': query,  # Add query to job for easier debugging
-        }
-        
-        logger.info(f"[{source}] Created job {job_id[:8]} in memory (total jobs: {len(JOBS)})")
-        
-        try:
-            created = db.create_job_record(job_id, job_type='scrape_source', payload={'source': source, 'query': query, 'limit': limit})
-            if created:
-                logger.info(f"[{source}] Created DB record for job {job_id[:8]}")
-            else:
-                logger.warning(f"[{source}] Failed to create DB record for job {job_id[:8]} (may already exist or table missing)")
-            
-            # Verify job was created in DB
-            verify_job = db.get_job_record(job_id)
-            if verify_job:
-                logger.info(f"[{source}] Verified job {job_id[:8]} exists in DB: status={verify_job.get('status')}")
-            else:
-                logger.error(f"[{source}] Job {job_id[:8]} NOT found in DB after creation!")
-            
-            db.update_job_progress(job_id, 100, 0)
-        except Exception as db_error:
-            # Log but don't fail - job can still proceed
-            logger.error(f"[{source}] Failed to create DB record for job {job_id[:8]}: {db_error}", exc_info=True)
-        
-        try:
-            logger.info(f"[{source}] Starting job {job_id[:8]} in background thread...")
-        except Exception:
-            pass
+        get_job_state_store().create(
+            job_id, 'scrape_source',
+            payload={'source': source, 'query': query, 'limit': limit},
+            total=100, source=source, query=query,
+        )
+        logger.info(f"[{source}] Created job {job_id[:8]}")
         
         # Start thread BEFORE setting status to running (thread will set it)
         try:
             t = threading.Thread(target=_process_single_source_job, args=(job_id, source, query, limit), daemon=True)
             t.start()
-            try:
-                logger.info(f"[{source}] Thread started for job {job_id[:8]}, thread alive: {t.is_alive()}")
-            except Exception:
-                pass
         except Exception as thread_error:
             # If thread creation fails, mark job as failed and return error
+            logger.error(f"Failed to create thread for job {job_id[:8]}: {thread_error}", exc_info=True)
             try:
-                logger.error(f"Failed to create thread for job {job_id[:8]}: {thread_error}", exc_info=True)
-                job = JOBS.get(job_id)
-                if job:
-                    job['status'] = 'failed'
-                    job['error'] = f"Failed to start thread: {str(thread_error)}"
+                get_job_state_store().set_status(job_id, 'failed', f"Failed to start thread: {str(thread_error)}")
             except Exception:
                 pass
             raise HTTPException(status_code=500, detail=f"Failed to start scraping job: {str(thread_error)}")
@@ -1122,10 +813,7 @@ async def start_single_source_job(
         raise
     except Exception as e:
         # Catch any other unexpected errors
-        try:
-            logger.error(f"Unexpected error in start_single_source_job: {e}", exc_info=True)
-        except Exception:
-            pass
+        logger.error(f"Unexpected error in start_single_source_job: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
@@ -1143,25 +831,15 @@ async def start_keyword_scrape(request: Request, payload: KeywordsPayload, limit
     total_tasks = len(all_keywords) * len(sources)
 
     job_id = str(uuid.uuid4())
-    JOBS[job_id] = {
-        'id': job_id,
-        'status': 'pending',
-        'progress': {'total': total_tasks, 'completed': 0},
-        'results': [],
-        'errors': [],
-        'cancelled': False,
-        'error': None,
-    }
-
     try:
-        created = db.create_job_record(job_id, job_type='scrape_keywords', payload={'keywords': all_keywords, 'limit': limit})
-        if created:
-            logger.info(f"Created DB record for keyword job {job_id[:8]}")
-        else:
-            logger.warning(f"Failed to create DB record for keyword job {job_id[:8]} (may already exist or table missing)")
-        db.update_job_progress(job_id, total_tasks, 0)
+        get_job_state_store().create(
+            job_id, 'scrape_keywords',
+            payload={'keywords': all_keywords, 'limit': limit},
+            total=total_tasks,
+        )
     except Exception as e:
-        logger.error(f"Failed to create DB record for keyword job {job_id[:8]}: {e}", exc_info=True)
+        logger.error(f"Failed to create keyword job {job_id[:8]}: {e}", exc_info=True)
+        raise HTTPException(status_code=503, detail='Job state store unavailable')
 
     t = threading.Thread(target=_process_keyword_job, args=(job_id, all_keywords, limit, concurrency, delay), daemon=True)
     t.start()
@@ -1202,230 +880,158 @@ async def get_job_status(job_id: str):
             detail=f'Job {job_id} has been permanently removed. Please clear your browser cache and localStorage.'
         )
     
-    # First check in-memory JOBS dict (for active jobs)
-    job = JOBS.get(job_id)
-    if job:
-        logger.debug(f"Job {job_id[:8]} found in memory: status={job.get('status')}")
-        try:
-            db_job = db.get_job_record(job_id)
-            if db_job:
-                logger.debug(f"Job {job_id[:8]} also found in DB: status={db_job.get('status')}")
-                # For running jobs, use whichever progress is higher (memory or DB)
-                # This handles cases where DB updates fail but memory is still updated
-                if db_job.get('progress') and job.get('progress'):
-                    db_completed = db_job['progress'].get('completed', 0) or 0
-                    mem_completed = job['progress'].get('completed', 0) or 0
-                    # Use the higher value (memory may be ahead if DB update failed)
-                    if db_completed > mem_completed:
-                        job['progress'] = db_job['progress']
-                        logger.debug(f"Synced progress from DB for job {job_id[:8]}: {db_job['progress']}")
-                    # else keep memory progress (it's more up to date)
-                elif db_job.get('progress') and not job.get('progress'):
-                    job['progress'] = db_job['progress']
-                
-                # Sync status for final states
-                if db_job.get('status') in ('completed', 'failed', 'cancelled'):
-                    if db_job['status'] != job.get('status'):
-                        job['status'] = db_job['status']
-            else:
-                logger.debug(f"Job {job_id[:8]} not found in DB (only in memory)")
-        except Exception as e:
-            logger.warning(f"Could not sync job {job_id[:8]} with DB: {e}", exc_info=True)
-        
-        if 'progress' not in job:
-            job['progress'] = {'total': 0, 'completed': 0}
-        
-        # Ensure progress values are integers (not None)
-        if job.get('progress'):
-            job['progress']['total'] = int(job['progress'].get('total', 0) or 0)
-            job['progress']['completed'] = int(job['progress'].get('completed', 0) or 0)
-        
-        # Log current state for debugging
-        logger.info(f"Returning job {job_id[:8]}: status={job.get('status')}, progress={job.get('progress')}")
-        
-        return job
-    
-    # If not in memory, check database (for completed/failed jobs)
-    logger.debug(f"Job {job_id[:8]} not found in memory, checking DB...")
+    store = get_job_state_store()
     try:
-        rec = db.get_job_record(job_id)
-        if rec:
-            logger.info(f"Job {job_id[:8]} found in DB: status={rec.get('status')}, payload={rec.get('payload')}")
-            # Convert DB record to job format expected by frontend
-            # Ensure all required fields are present
-            if 'progress' not in rec or not isinstance(rec.get('progress'), dict):
-                # Try to extract progress from payload or create default
-                if 'payload' in rec and isinstance(rec['payload'], dict):
-                    rec['progress'] = rec['payload'].get('progress', {'total': 100, 'completed': 0})
-                else:
-                    progress_val = rec.get('progress', 0) or 0
-                    if isinstance(progress_val, int):
-                        rec['progress'] = {'total': 100, 'completed': progress_val}
-                    else:
-                        rec['progress'] = {'total': 100, 'completed': 0}
-            
-            # Ensure results and errors lists exist
-            if 'results' not in rec:
-                rec['results'] = []
-            if 'errors' not in rec:
-                rec['errors'] = []
-            
-            # If job is in DB with status "running" but not in memory, it's likely stuck (server restarted)
-            # Mark it as failed after checking if it's been running for too long
-            if rec.get('status') == 'running':
-                import time
-                from datetime import datetime
-                # Check if job has been running for more than 30 minutes (likely stuck)
-                updated_at = rec.get('updated_at') or rec.get('started_at') or rec.get('created_at')
-                if updated_at:
-                    try:
-                        # Parse timestamp (format: ISO string or timestamp)
-                        if isinstance(updated_at, str):
-                            updated_dt = datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
-                        else:
-                            updated_dt = datetime.fromtimestamp(updated_at)
-                        
-                        time_diff = (datetime.now(updated_dt.tzinfo) - updated_dt).total_seconds()
-                        # If job hasn't been updated in 30 minutes, mark as failed
-                        if time_diff > 30 * 60:  # 30 minutes
-                            logger.warning(f"Job {job_id[:8]} appears stuck (no update for {int(time_diff/60)} min), marking as failed")
-                            try:
-                                db.finalize_job(job_id, 'failed', 'Job appears stuck - no progress update for over 30 minutes')
-                                rec['status'] = 'failed'
-                                rec['error'] = 'Job appears stuck - no progress update for over 30 minutes'
-                            except Exception as e:
-                                logger.error(f"Failed to mark stuck job as failed: {e}")
-                    except Exception as e:
-                        logger.debug(f"Could not check job age: {e}")
-            
-            # Ensure progress exists and values are integers
-            if 'progress' not in rec:
-                rec['progress'] = {'total': 0, 'completed': 0}
-            else:
-                rec['progress']['total'] = int(rec['progress'].get('total', 0) or 0)
-                rec['progress']['completed'] = int(rec['progress'].get('completed', 0) or 0)
-            
-            logger.info(f"Returning job {job_id[:8]} from DB: status={rec.get('status')}, progress={rec.get('progress')}")
-            return rec
-        else:
-            logger.debug(f"Job {job_id[:8]} not found in DB either")
+        job = store.get(job_id)
     except Exception as e:
-        logger.error(f"Error retrieving job {job_id[:8]} from DB: {e}", exc_info=True)
+        logger.error(f"Error retrieving job {job_id[:8]}: {e}", exc_info=True)
+        raise HTTPException(status_code=503, detail='Job state store unavailable')
     
-    # Job not found - return 404 with helpful message
-    logger.warning(f"Job {job_id[:8]} not found in memory or database (total jobs in memory: {len(JOBS)})")
+    if job is None:
+        raise HTTPException(
+            status_code=404, 
+            detail=f'Job {job_id} not found. It may have been completed and cleaned up, or the server was restarted.'
+        )
     
-    # Log all job IDs in memory for debugging (first 10)
-    if JOBS:
-        job_ids_sample = list(JOBS.keys())[:10]
-        logger.debug(f"Sample job IDs in memory: {[j[:8] for j in job_ids_sample]}")
+    # A running job nobody updates anymore died with its process
+    if is_stuck(job):
+        error = 'Job appears stuck - no progress update for over 30 minutes'
+        logger.warning(f"Job {job_id[:8]} appears stuck, marking as failed")
+        try:
+            store.set_status(job_id, 'failed', error)
+            job.update(status='failed', error=error)
+        except Exception as e:
+            logger.error(f"Failed to mark stuck job as failed: {e}")
+    
+    return job
+
+
+def _apply_job_events(job: dict, events: List[dict]):
+    """Merge a window of job events into `job`.
+    
+    Progress and status events are applied in place (the latest one wins),
+    error / result / refresh events ask for one re-read of the state, and log
+    events are returned to be forwarded. Returns (changed, refresh, logs).
+    """
+    changed = refresh = False
+    logs = []
+    for event in events:
+        kind = event.get('type')
+        if kind == 'progress':
+            job['progress']['completed'] = event['completed']
+            if 'total' in event:
+                job['progress']['total'] = event['total']
+            changed = True
+        elif kind == 'status':
+            job['status'] = event['status']
+            job['cancelled'] = job.get('cancelled') or event['status'] == 'cancelled'
+            if event.get('error'):
+                job['error'] = event['error']
+            changed = True
+        elif kind == 'log':
+            logs.append({'level': event.get('level'), 'message': event.get('message')})
+        else:
+            refresh = True
+    return changed, refresh, logs
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _job_event_stream(request: Request, store, job: dict):
+    """Push `state` (whole job, coalesced) and `log` events until the job ends."""
+    job_id = job['id']
+    watcher = store.watch(job_id, EVENTS_COALESCE_INTERVAL)
+    try:
+        await watcher.__anext__()
+        # Read again once subscribed, so no update falls between read and subscription
+        job = await asyncio.to_thread(store.get, job_id) or job
+        yield _sse('state', job)
+        last_sent = time.monotonic()
+        
+        async for events in watcher:
+            if job['status'] in FINAL_STATUSES or await request.is_disconnected():
+                break
+            changed, refresh, logs = _apply_job_events(job, events)
+            for log in logs:
+                yield _sse('log', log)
+            if refresh:
+                fresh = await asyncio.to_thread(store.get, job_id)
+                if fresh and fresh != job:
+                    job, changed = fresh, True
+            if changed:
+                yield _sse('state', job)
+                last_sent = time.monotonic()
+            elif time.monotonic() - last_sent > EVENTS_KEEPALIVE_INTERVAL:
+                yield ": keepalive\n\n"
+                last_sent = time.monotonic()
+    finally:
+        await watcher.aclose()
+
+
+@router.get('/scrape/jobs/{job_id}/events')
+async def job_events(job_id: str, request: Request):
+    """Server-Sent Events stream of a job, instead of polling GET /scrape/jobs/{job_id}.
     
-    # Try one more time to get from DB with more detailed logging
+    Sends a `state` event (same body as GET /scrape/jobs/{job_id}) on connect
+    and after every change, at most every EVENTS_COALESCE_INTERVAL seconds,
+    plus `log` events. The stream ends once the job is finished.
+    """
+    store = get_job_state_store()
     try:
-        rec = db.get_job_record(job_id)
-        if rec:
-            logger.info(f"Job {job_id[:8]} found in DB on second attempt: status={rec.get('status')}")
-            # Return the job even if not in memory
-            if 'progress' not in rec or not isinstance(rec.get('progress'), dict):
-                rec['progress'] = {'total': 100, 'completed': rec.get('progress', 0) or 0}
-            if 'results' not in rec:
-                rec['results'] = []
-            if 'errors' not in rec:
-                rec['errors'] = []
-            return rec
+        job = await asyncio.to_thread(store.get, job_id)
     except Exception as e:
-        logger.error(f"Error on second DB attempt for job {job_id[:8]}: {e}")
+        logger.error(f"Error retrieving job {job_id[:8]}: {e}", exc_info=True)
+        raise HTTPException(status_code=503, detail='Job state store unavailable')
+    if job is None:
+        raise HTTPException(status_code=404, detail=f'Job {job_id} not found')
     
-    raise HTTPException(
-        status_code=404, 
-        detail=f'Job {job_id} not found. It may have been completed and cleaned up, or the server was restarted.'
+    return StreamingResponse(
+        _job_event_stream(request, store, job),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
     )
 
 
 @router.post('/scrape/jobs/{job_id}/cancel')
 async def cancel_job(job_id: str):
-    """Cancel a specific scraping job."""
+    """Cancel a specific scraping job (works whatever API worker runs it)."""
+    store = get_job_state_store()
     try:
-        job = JOBS.get(job_id)
-        if not job:
-            # Job not in memory, try to cancel in DB only
-            try:
-                db.append_job_error(job_id, 'cancelled by user')
-                db.finalize_job(job_id, 'cancelled', 'cancelled by user')
-                logger.info(f"Job {job_id[:8]} cancelled (was not in memory)")
-                return {'cancelled': True}
-            except Exception as e:
-                logger.warning(f"Failed to cancel job {job_id[:8]} in DB: {e}")
-                raise HTTPException(status_code=404, detail='Job not found')
-        
-        # Mark job as cancelled FIRST (before DB operations)
-        # This ensures heartbeat and scraping loops will see the cancellation flag immediately
-        job['cancelled'] = True
-        job['status'] = 'cancelled'
-        
-        # Stop heartbeat by setting the flag (heartbeat checks cancelled flag in its loop)
-        # The heartbeat will check job.get('cancelled') and stop itself
-        
-        # Update DB (wrap in try/except to prevent crashes)
-        # Even if DB update fails, the job is already cancelled in memory
-        try:
-            db.append_job_error(job_id, 'cancelled by user')
-        except Exception as e:
-            logger.warning(f"Failed to append error when cancelling job {job_id[:8]}: {e}")
-            # Continue anyway - job is already cancelled in memory
-        
-        try:
-            db.finalize_job(job_id, 'cancelled', 'cancelled by user')
-            logger.info(f"Job {job_id[:8]} cancelled successfully")
-        except Exception as e:
-            logger.warning(f"Failed to finalize job {job_id[:8]} in DB: {e}")
-            # Don't fail the cancellation request even if DB update fails
-            # The job is already marked as cancelled in memory
-        
+        job = store.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail='Job not found')
+        if not store.cancel(job_id, 'cancelled by user'):
+            return {'cancelled': False, 'status': job['status']}
+        logger.info(f"Job {job_id[:8]} cancelled successfully")
         return {'cancelled': True}
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Unexpected error cancelling job {job_id[:8]}: {e}", exc_info=True)
-        # Return success even on error to prevent server crash
-        # The job might still be cancelled in memory
-        return {'cancelled': True, 'warning': f'Job cancellation requested but error occurred: {str(e)}'}
+        raise HTTPException(status_code=503, detail=f'Job cancellation failed: {str(e)}')
 
 
 @router.post('/scrape/jobs/cancel-all')
 async def cancel_all_jobs():
     """Cancel all running jobs."""
     try:
-        cancelled_count = 0
+        store = get_job_state_store()
+        reason = 'cancelled by user (cancel-all)'
         
-        for job_id, job in list(JOBS.items()):
-            if job.get('status') in ['running', 'pending']:
-                job['cancelled'] = True
-                job['status'] = 'cancelled'
-                try:
-                    db.append_job_error(job_id, 'cancelled by user (cancel-all)')
-                    db.finalize_job(job_id, 'cancelled', 'cancelled by user (cancel-all)')
-                except Exception:
-                    pass
-                cancelled_count += 1
+        job_ids = set(store.active_job_ids())
+        # Jobs recorded in the DB only (other job types, older jobs)
+        for status in ('running', 'pending'):
+            job_ids.update(job['id'] for job in db.get_all_jobs(status=status, limit=1000))
         
-        all_jobs = db.get_all_jobs(status='running')
-        for job in all_jobs:
-            try:
-                db.append_job_error(job['id'], 'cancelled by user (cancel-all)')
-                db.finalize_job(job['id'], 'cancelled', 'cancelled by user (cancel-all)')
-                cancelled_count += 1
-            except Exception:
-                pass
-        
-        pending_jobs = db.get_all_jobs(status='pending')
-        for job in pending_jobs:
+        cancelled_count = 0
+        for job_id in job_ids:
             try:
-                db.append_job_error(job['id'], 'cancelled by user (cancel-all)')
-                db.finalize_job(job['id'], 'cancelled', 'cancelled by user (cancel-all)')
-                cancelled_count += 1
-            except Exception:
-                pass
+                if store.cancel(job_id, reason):
+                    cancelled_count += 1
+            except Exception as e:
+                logger.warning(f"Could not cancel job {job_id[:8]}: {e}")
         
         return {
             'cancelled': cancelled_count,
@@ -1434,4 +1040,3 @@ async def cancel_all_jobs():
     except Exception as e:
         logger.error(f"Error cancelling all jobs: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-
@@ -140,18 +140,15 @@ async def run_scraper_with_progress(
         
         logger.info(f"[{source}] Scraper returned {len(result)} items")
         
-        # Process results
+        # Process results (quick insert without heavy processing for now)
         added = 0
-        for item in result:
-            if job.get('cancelled'):
-                break
+        items = [item for item in result if isinstance(item, dict)]
+        if items and not job.get('cancelled'):
             try:
-                if isinstance(item, dict):
-                    # Quick insert without heavy processing for now
-                    if db.insert_post(item):
-                        added += 1
+                outcomes = db.insert_posts_bulk(items)
+                added = sum(1 for o in outcomes if o['status'] == 'inserted')
             except Exception as e:
-                logger.warning(f"[{source}] Error inserting item: {e}")
+                logger.warning(f"[{source}] Error inserting {len(items)} items: {e}")
         
         return added
         
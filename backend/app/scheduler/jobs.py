@@ -83,6 +83,9 @@ def auto_scrape_job():
         logger.warning(f"⚠️ [AUTO SCRAPE] Warning: Could not clean duplicates: {e}")
     
     logger.info(f"✅ Scheduled scrape completed: {total_added} total posts added, {total_errors} errors")
+    
+    if total_added > 0:
+        refresh_insight_snapshots_job()
 
 
 def auto_backup_job():
@@ -189,3 +192,76 @@ def recheck_answered_status_job():
         logger.error(f"[ERROR] Error during re-check answered status: {e}", exc_info=True)
 
 
+
+
+def retag_posts_job():
+    """Tag posts missing from the pain point / product aggregates.
+
+    Runs once at startup: backfills posts inserted before post_tags existed and
+    posts tagged with outdated pain point definitions, then rebuilds the rollups.
+    """
+    logger.info("🏷️  Tagging posts for pain point / product aggregates...")
+    try:
+        result = db.retag_posts(only_stale=True)
+        if not result.get('skipped'):
+            logger.info(f"[OK] Tagged {result['tagged']} posts")
+    except Exception as e:
+        logger.error(f"[ERROR] Error tagging posts: {e}", exc_info=True)
+
+
+def relabel_unknown_languages_job():
+    """Re-label posts whose language is still 'unknown' with the remote providers.
+
+    Opt-in (LANGUAGE_REMOTE_RELABEL=true): language detection at insert time is
+    local, this job sends the leftovers to Google Translate / DeepL / the LLM in
+    batches, outside of the scraping path.
+    """
+    import asyncio
+    from ..analysis import language_detection
+    logger.info("🌐 Re-labeling posts with unknown language...")
+    try:
+        result = asyncio.run(language_detection.relabel_unknown_posts(limit=500))
+        logger.info(f"[OK] Language re-labeling: {result['updated_count']} updated out of {result['total_posts']} posts")
+    except Exception as e:
+        logger.error(f"[ERROR] Error re-labeling languages: {e}", exc_info=True)
+
+
+def scraping_logs_maintenance_job():
+    """Create the upcoming daily scraping_logs partitions and drop the expired ones.
+
+    Retention is SCRAPING_LOG_RETENTION_DAYS (30 days by default).
+    """
+    try:
+        result = db.maintain_scraping_logs()
+        logger.info(f"[OK] Scraping logs maintenance: {result['partitions_created']} partitions created, "
+                    f"{result['logs_deleted']} expired logs dropped")
+    except Exception as e:
+        logger.error(f"[ERROR] Error during scraping logs maintenance: {e}", exc_info=True)
+
+
+def prune_post_tombstones_job():
+    """Delete the tombstones of posts deleted more than POST_TOMBSTONE_RETENTION_DAYS ago.
+
+    /api/posts/changes cursors older than that get reset=true instead.
+    """
+    try:
+        deleted = db.prune_post_tombstones()
+        logger.info(f"[OK] Post tombstones pruning: {deleted} expired tombstones deleted")
+    except Exception as e:
+        logger.error(f"[ERROR] Error pruning post tombstones: {e}", exc_info=True)
+
+
+def refresh_insight_snapshots_job():
+    """Recompute the precomputed What's Happening / improvements analyses.
+
+    Only the presets whose post set changed materially (or got too old) are sent
+    to the LLM again, see routers/dashboard/snapshots.py.
+    """
+    from ..routers.dashboard.snapshots import refresh_insight_snapshots
+    from ..utils import llm_gateway
+    try:
+        result = llm_gateway.run(refresh_insight_snapshots())
+        logger.info(f"[OK] Insight snapshots: {len(result['computed'])} computed, "
+                    f"{len(result['skipped'])} unchanged, {len(result['failed'])} failed")
+    except Exception as e:
+        logger.error(f"[ERROR] Error refreshing insight snapshots: {e}", exc_info=True)
@@ -1,6 +1,7 @@
 """Base scraper class with common functionality."""
 import asyncio
 import logging
+from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
 from abc import ABC, abstractmethod
 from .http_client import get_http_client
@@ -9,6 +10,20 @@ from .scraper_logging import ScrapingLogger
 logger = logging.getLogger(__name__)
 
 
+def parse_created_at(value: Any) -> Optional[datetime]:
+    """created_at of a scraped item as an aware datetime (naive values are UTC), None if unparseable."""
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, str) and value:
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    else:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
 class BaseScraper(ABC):
     """Base class for all scrapers with common functionality.
     
@@ -115,6 +130,18 @@ class BaseScraper(ABC):
             self.logger.log_request_error(url, e, duration)
             raise
     
+    @staticmethod
+    def _before_watermark(created_at: Any, since: Optional[datetime]) -> bool:
+        """
+        Whether an item is older than `since`, the newest item of the previous
+        scrape of the query (see db.get_scrape_watermark). Items as old as the
+        watermark are kept (insert_post drops them if already stored).
+        """
+        if since is None:
+            return False
+        parsed = parse_created_at(created_at)
+        return parsed is not None and parsed < since
+    
     def get_metrics(self) -> Dict[str, Any]:
         """Get scraping metrics."""
         return self.logger.get_metrics()
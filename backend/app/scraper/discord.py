@@ -126,9 +126,6 @@ class DiscordScraper(BaseScraper):
                     
                     if len(all_messages) >= limit:
                         break
-                
-                # Small delay between channels to respect rate limits
-                await asyncio.sleep(0.5)
             
             except Exception as e:
                 error_msg = f"Error searching channel {channel_name}: {type(e).__name__}: {e}"
@@ -218,11 +215,11 @@ class DiscordScraper(BaseScraper):
                 response = await self._fetch_get(url, headers=headers, params=params)
                 
                 if response.status_code == 429:
-                    # Rate limited - wait and retry
+                    # Still rate limited after the client's retries: the host's rate
+                    # limiter holds the next request until Retry-After is over
                     retry_after = float(response.headers.get("Retry-After", 1))
                     self.logger.log("warning", f"Rate limited, waiting {retry_after}s")
                     logger.warning(f"[Discord] Rate limited on channel {channel_id}, waiting {retry_after}s")
-                    await asyncio.sleep(retry_after)
                     continue
                 
                 response.raise_for_status()
@@ -342,9 +339,6 @@ class DiscordScraper(BaseScraper):
                 if len(messages) < params["limit"]:
                     logger.debug(f"[Discord] Reached end of channel {channel_id} (got {len(messages)} < {params['limit']} requested)")
                     break
-                
-                # Rate limit: Discord allows 50 requests per second per bot
-                await asyncio.sleep(0.02)  # ~50 requests/second
             
             except Exception as e:
                 self.logger.log("warning", f"Error fetching messages from channel {channel_id}: {e}")
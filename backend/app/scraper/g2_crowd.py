@@ -1,9 +1,11 @@
 """G2 Crowd scraper for OVH product reviews."""
 from datetime import datetime
 import requests
+import asyncio
 import logging
 import time
 import re
+from typing import List, Dict, Any, Tuple
 from bs4 import BeautifulSoup
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -11,6 +13,7 @@ from .anti_bot_helpers import (
     get_realistic_headers, human_like_delay,
     create_stealth_session, simulate_human_behavior
 )
+from .base_scraper import BaseScraper
 
 logger = logging.getLogger(__name__)
 
@@ -18,10 +21,71 @@ MAX_RETRIES = 3
 RETRY_DELAY = 2  # seconds
 
 G2_BASE_URL = "https://www.g2.com"
+G2_REVIEWS_URL = f"{G2_BASE_URL}/products/ovhcloud/reviews"
+
+
+class G2CrowdScraper(BaseScraper):
+    """Async G2 Crowd scraper."""
+    
+    def __init__(self):
+        super().__init__("G2 Crowd")
+    
+    async def scrape(self, query: str = "OVH", limit: int = 50) -> List[Dict[str, Any]]:
+        """Scrape G2 Crowd for OVH product reviews.
+        
+        G2 Crowd is a B2B software review platform; reviews are parsed from the
+        OVHcloud product page.
+        """
+        start_time = time.time()
+        self.logger.log_scraping_start(query, limit)
+        
+        response = await self._fetch_get(G2_REVIEWS_URL, headers=get_realistic_headers(referer=G2_BASE_URL))
+        if response.status_code == 403:
+            self.logger.log("warning", "Server returned 403 Forbidden - trying browser automation...")
+            # Browser automation is blocking: only this fallback runs in a thread
+            html = await asyncio.to_thread(_try_browser_automation, G2_REVIEWS_URL)
+            if not html:
+                self.logger.log("warning", "Browser automation not available or failed", duration=time.time() - start_time)
+                return []
+        else:
+            response.raise_for_status()
+            html = response.content
+        
+        posts, _ = _parse_reviews(BeautifulSoup(html, 'html.parser'), limit)
+        
+        duration = time.time() - start_time
+        if posts:
+            self.logger.log_scraping_success(len(posts), duration)
+            return posts[:limit]
+        self.logger.log("warning", f"No reviews found for query: {query}", duration=duration)
+        return []
+
+
+# Global scraper instance
+_async_scraper = G2CrowdScraper()
+
+
+async def scrape_g2_crowd_async(query: str = "OVH", limit: int = 50) -> List[Dict[str, Any]]:
+    """Async entry point for G2 Crowd scraper."""
+    return await _async_scraper.scrape(query, limit)
 
 
 def scrape_g2_crowd(query: str = "OVH", limit: int = 50):
-    """Scrape G2 Crowd for OVH product reviews.
+    """Synchronous wrapper for async scraper (for backward compatibility)."""
+    try:
+        loop = asyncio.get_event_loop()
+        if loop.is_running():
+            return _scrape_g2_crowd_sync(query, limit)
+        else:
+            return loop.run_until_complete(scrape_g2_crowd_async(query, limit))
+    except RuntimeError:
+        return asyncio.run(scrape_g2_crowd_async(query, limit))
+
+
+def _scrape_g2_crowd_sync(query: str = "OVH", limit: int = 50):
+    """Synchronous fallback implementation.
+    
+    Scrape G2 Crowd for OVH product reviews.
     
     G2 Crowd is a B2B software review platform.
     Searches for OVH products and extracts reviews.
@@ -39,7 +103,7 @@ def scrape_g2_crowd(query: str = "OVH", limit: int = 50):
             return []
         try:
             # G2 search URL
-            search_url = f"{G2_BASE_URL}/products/ovhcloud/reviews"
+            search_url = G2_REVIEWS_URL
             
             # Alternative: search page
             # search_url = f"{G2_BASE_URL}/search?query={query}"
@@ -92,149 +156,7 @@ def scrape_g2_crowd(query: str = "OVH", limit: int = 50):
             soup = BeautifulSoup(response.content, 'html.parser')
             logger.info(f"[G2 Crowd] HTML parsed successfully")
             
-            posts = []
-            
-            # G2 reviews are typically in specific containers
-            # Look for review elements (structure may vary)
-            logger.info("[G2 Crowd] Searching for review elements with class 'review|rating|feedback|comment'...")
-            review_elements = soup.find_all(['div', 'article', 'section'], 
-                                          class_=re.compile(r'review|rating|feedback|comment', re.I))
-            logger.info(f"[G2 Crowd] Found {len(review_elements)} elements with review/rating/feedback/comment classes")
-            
-            if not review_elements:
-                # Try alternative selectors
-                logger.info("[G2 Crowd] Trying alternative selector: data-testid='review'...")
-                review_elements = soup.find_all('div', {'data-testid': re.compile(r'review', re.I)})
-                logger.info(f"[G2 Crowd] Found {len(review_elements)} elements with data-testid='review'")
-            
-            if not review_elements:
-                # Try finding review cards
-                logger.info("[G2 Crowd] Trying alternative selector: class='card|item|entry'...")
-                review_elements = soup.find_all('div', class_=re.compile(r'card|item|entry', re.I))
-                logger.info(f"[G2 Crowd] Found {len(review_elements)} elements with card/item/entry classes")
-            
-            if not review_elements:
-                # Debug: Save HTML structure for analysis
-                logger.warning("[G2 Crowd] No review elements found with any selector")
-                logger.info("[G2 Crowd] Debug: Checking page structure...")
-                # Try to find any divs with text content
-                all_divs = soup.find_all('div', limit=50)
-                logger.info(f"[G2 Crowd] Total divs on page: {len(soup.find_all('div'))}")
-                logger.info(f"[G2 Crowd] Sample div classes (first 10): {[d.get('class', []) for d in all_divs[:10]]}")
-                # Check for common G2 patterns
-                if soup.find('body'):
-                    body_text = soup.find('body').get_text()[:200]
-                    logger.info(f"[G2 Crowd] Body text preview: {body_text}...")
-            
-            seen_urls = set()
-            
-            # Limit the number of reviews to process to avoid long waits
-            max_reviews_to_process = min(limit * 2, 15)  # Cap at 15 reviews max
-            
-            logger.info(f"[G2 Crowd] Processing up to {max_reviews_to_process} review elements...")
-            processed_count = 0
-            skipped_no_content = 0
-            skipped_short = 0
-            
-            for review_elem in review_elements[:max_reviews_to_process]:
-                processed_count += 1
-                try:
-                    # Extract review content
-                    content_elem = review_elem.find(['p', 'div', 'span'], 
-                                                   class_=re.compile(r'content|text|body|description|review-text', re.I))
-                    if not content_elem:
-                        content_elem = review_elem.find('p')
-                    
-                    if not content_elem:
-                        skipped_no_content += 1
-                        logger.debug(f"[G2 Crowd] Review element {processed_count}: No content element found")
-                        continue
-                    
-                    content = content_elem.get_text(strip=True)
-                    if len(content) < 20:  # Skip very short reviews
-                        skipped_short += 1
-                        logger.debug(f"[G2 Crowd] Review element {processed_count}: Content too short ({len(content)} chars)")
-                        continue
-                    
-                    logger.info(f"[G2 Crowd] Review element {processed_count}: Found content ({len(content)} chars)")
-                    
-                    # Extract author
-                    author_elem = review_elem.find(['a', 'span', 'div'], 
-                                                  class_=re.compile(r'author|user|name|reviewer', re.I))
-                    if not author_elem:
-                        author_elem = review_elem.find('strong')
-                    author = author_elem.get_text(strip=True) if author_elem else 'Anonymous'
-                    
-                    # Extract rating (if available)
-                    rating_elem = review_elem.find(['span', 'div'], class_=re.compile(r'rating|star|score', re.I))
-                    rating = ''
-                    if rating_elem:
-                        rating_text = rating_elem.get_text(strip=True)
-                        rating_match = re.search(r'(\d+\.?\d*)\s*(?:out of|/|stars?)', rating_text, re.I)
-                        if rating_match:
-                            rating = f"Rating: {rating_match.group(1)}/5"
-                    
-                    # Extract date
-                    date_elem = review_elem.find('time')
-                    if not date_elem:
-                        date_elem = review_elem.find(['span', 'div'], class_=re.compile(r'date|time|published', re.I))
-                    
-                    created_at = datetime.now().isoformat()
-                    if date_elem:
-                        date_str = date_elem.get('datetime') or date_elem.get_text(strip=True)
-                        try:
-                            # Try to parse various date formats
-                            if 'ago' in date_str.lower():
-                                # Relative date like "2 days ago"
-                                created_at = datetime.now().isoformat()
-                            else:
-                                created_at = datetime.fromisoformat(date_str.replace('Z', '+00:00')).isoformat()
-                        except:
-                            pass
-                    
-                    # Extract URL
-                    link_elem = review_elem.find('a', href=True)
-                    if link_elem:
-                        href = link_elem.get('href')
-                        if href.startswith('/'):
-                            post_url = f"{G2_BASE_URL}{href}"
-                        elif href.startswith('http'):
-                            post_url = href
-                        else:
-                            post_url = f"{G2_BASE_URL}/products/ovhcloud/reviews"
-                    else:
-                        post_url = f"{G2_BASE_URL}/products/ovhcloud/reviews"
-                    
-                    if post_url in seen_urls:
-                        continue
-                    seen_urls.add(post_url)
-                    
-                    # Build content with rating if available
-                    full_content = f"{content}"
-                    if rating:
-                        full_content = f"{rating}\n{full_content}"
-                    
-                    post = {
-                        'source': 'G2 Crowd',
-                        'author': author,
-                        'content': full_content[:500],
-                        'url': post_url,
-                        'created_at': created_at,
-                        'sentiment_score': 0.0,
-                        'sentiment_label': 'neutral',
-                    }
-                    posts.append(post)
-                    logger.info(f"✓ G2 Crowd: {author} - {content[:50]}")
-                    
-                    # Break early if we have enough posts
-                    if len(posts) >= limit:
-                        break
-                        
-                except Exception as e:
-                    logger.warning(f"[G2 Crowd] Error processing review element {processed_count}: {type(e).__name__}: {e}")
-                    continue
-            
-            logger.info(f"[G2 Crowd] Processing summary: {processed_count} processed, {skipped_no_content} skipped (no content), {skipped_short} skipped (too short), {len(posts)} posts extracted")
+            posts, review_elements = _parse_reviews(soup, limit)
             
             # If no reviews found, try search page
             if not posts:
@@ -277,6 +199,155 @@ def scrape_g2_crowd(query: str = "OVH", limit: int = 50):
     return []
 
 
+def _parse_reviews(soup: BeautifulSoup, limit: int) -> Tuple[List[Dict[str, Any]], list]:
+    """Reviews of a G2 page (the selectors vary with the page structure); returns (posts, review elements found)."""
+    posts = []
+    
+    # G2 reviews are typically in specific containers
+    # Look for review elements (structure may vary)
+    logger.info("[G2 Crowd] Searching for review elements with class 'review|rating|feedback|comment'...")
+    review_elements = soup.find_all(['div', 'article', 'section'], 
+                                  class_=re.compile(r'review|rating|feedback|comment', re.I))
+    logger.info(f"[G2 Crowd] Found {len(review_elements)} elements with review/rating/feedback/comment classes")
+    
+    if not review_elements:
+        # Try alternative selectors
+        logger.info("[G2 Crowd] Trying alternative selector: data-testid='review'...")
+        review_elements = soup.find_all('div', {'data-testid': re.compile(r'review', re.I)})
+        logger.info(f"[G2 Crowd] Found {len(review_elements)} elements with data-testid='review'")
+    
+    if not review_elements:
+        # Try finding review cards
+        logger.info("[G2 Crowd] Trying alternative selector: class='card|item|entry'...")
+        review_elements = soup.find_all('div', class_=re.compile(r'card|item|entry', re.I))
+        logger.info(f"[G2 Crowd] Found {len(review_elements)} elements with card/item/entry classes")
+    
+    if not review_elements:
+        # Debug: Save HTML structure for analysis
+        logger.warning("[G2 Crowd] No review elements found with any selector")
+        logger.info("[G2 Crowd] Debug: Checking page structure...")
+        # Try to find any divs with text content
+        all_divs = soup.find_all('div', limit=50)
+        logger.info(f"[G2 Crowd] Total divs on page: {len(soup.find_all('div'))}")
+        logger.info(f"[G2 Crowd] Sample div classes (first 10): {[d.get('class', []) for d in all_divs[:10]]}")
+        # Check for common G2 patterns
+        if soup.find('body'):
+            body_text = soup.find('body').get_text()[:200]
+            logger.info(f"[G2 Crowd] Body text preview: {body_text}...")
+    
+    seen_urls = set()
+    
+    # Limit the number of reviews to process to avoid long waits
+    max_reviews_to_process = min(limit * 2, 15)  # Cap at 15 reviews max
+    
+    logger.info(f"[G2 Crowd] Processing up to {max_reviews_to_process} review elements...")
+    processed_count = 0
+    skipped_no_content = 0
+    skipped_short = 0
+    
+    for review_elem in review_elements[:max_reviews_to_process]:
+        processed_count += 1
+        try:
+            # Extract review content
+            content_elem = review_elem.find(['p', 'div', 'span'], 
+                                           class_=re.compile(r'content|text|body|description|review-text', re.I))
+            if not content_elem:
+                content_elem = review_elem.find('p')
+            
+            if not content_elem:
+                skipped_no_content += 1
+                logger.debug(f"[G2 Crowd] Review element {processed_count}: No content element found")
+                continue
+            
+            content = content_elem.get_text(strip=True)
+            if len(content) < 20:  # Skip very short reviews
+                skipped_short += 1
+                logger.debug(f"[G2 Crowd] Review element {processed_count}: Content too short ({len(content)} chars)")
+                continue
+            
+            logger.info(f"[G2 Crowd] Review element {processed_count}: Found content ({len(content)} chars)")
+            
+            # Extract author
+            author_elem = review_elem.find(['a', 'span', 'div'], 
+                                          class_=re.compile(r'author|user|name|reviewer', re.I))
+            if not author_elem:
+                author_elem = review_elem.find('strong')
+            author = author_elem.get_text(strip=True) if author_elem else 'Anonymous'
+            
+            # Extract rating (if available)
+            rating_elem = review_elem.find(['span', 'div'], class_=re.compile(r'rating|star|score', re.I))
+            rating = ''
+            if rating_elem:
+                rating_text = rating_elem.get_text(strip=True)
+                rating_match = re.search(r'(\d+\.?\d*)\s*(?:out of|/|stars?)', rating_text, re.I)
+                if rating_match:
+                    rating = f"Rating: {rating_match.group(1)}/5"
+            
+            # Extract date
+            date_elem = review_elem.find('time')
+            if not date_elem:
+                date_elem = review_elem.find(['span', 'div'], class_=re.compile(r'date|time|published', re.I))
+            
+            created_at = datetime.now().isoformat()
+            if date_elem:
+                date_str = date_elem.get('datetime') or date_elem.get_text(strip=True)
+                try:
+                    # Try to parse various date formats
+                    if 'ago' in date_str.lower():
+                        # Relative date like "2 days ago"
+                        created_at = datetime.now().isoformat()
+                    else:
+                        created_at = datetime.fromisoformat(date_str.replace('Z', '+00:00')).isoformat()
+                except:
+                    pass
+            
+            # Extract URL
+            link_elem = review_elem.find('a', href=True)
+            if link_elem:
+                href = link_elem.get('href')
+                if href.startswith('/'):
+                    post_url = f"{G2_BASE_URL}{href}"
+                elif href.startswith('http'):
+                    post_url = href
+                else:
+                    post_url = f"{G2_BASE_URL}/products/ovhcloud/reviews"
+            else:
+                post_url = f"{G2_BASE_URL}/products/ovhcloud/reviews"
+            
+            if post_url in seen_urls:
+                continue
+            seen_urls.add(post_url)
+            
+            # Build content with rating if available
+            full_content = f"{content}"
+            if rating:
+                full_content = f"{rating}\n{full_content}"
+            
+            post = {
+                'source': 'G2 Crowd',
+                'author': author,
+                'content': full_content[:500],
+                'url': post_url,
+                'created_at': created_at,
+                'sentiment_score': 0.0,
+                'sentiment_label': 'neutral',
+            }
+            posts.append(post)
+            logger.info(f"✓ G2 Crowd: {author} - {content[:50]}")
+            
+            # Break early if we have enough posts
+            if len(posts) >= limit:
+                break
+        
+        except Exception as e:
+            logger.warning(f"[G2 Crowd] Error processing review element {processed_count}: {type(e).__name__}: {e}")
+            continue
+    
+    logger.info(f"[G2 Crowd] Processing summary: {processed_count} processed, {skipped_no_content} skipped (no content), {skipped_short} skipped (too short), {len(posts)} posts extracted")
+    
+    return posts, review_elements
+
+
 def _try_browser_automation(url: str) -> str:
     """Try to scrape using browser automation (Selenium/Playwright) as fallback.
     
@@ -1,10 +1,10 @@
 """GitHub Issues and Discussions scraper for OVH complaints."""
 import httpx
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import logging
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from httpx import Timeout
 from .base_scraper import BaseScraper
 
@@ -19,33 +19,53 @@ MAX_RETRIES = 3
 RETRY_DELAY = 2  # seconds
 
 
+def _created_qualifier(since: Optional[datetime]) -> str:
+    """Search qualifier restricting results to items created since a watermark."""
+    if since is None:
+        return ""
+    return f" created:>={since.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}"
+
+
 class GitHubScraper(BaseScraper):
     """Async GitHub scraper."""
     
     def __init__(self):
         super().__init__("GitHub")
     
-    async def scrape(self, query: str = "OVH", limit: int = 20) -> List[Dict[str, Any]]:
-        """Scrape GitHub issues AND discussions for OVH domain customer complaints."""
+    async def scrape(self, query: str = "OVH", limit: int = 20, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Scrape GitHub issues AND discussions for OVH domain customer complaints.
+        
+        With `since` (scrape watermark), only issues / discussions created since
+        then are searched, and the Google / RSS fallbacks are skipped.
+        """
         import time
         start_time = time.time()  # Use time.time() instead of asyncio.get_event_loop().time()
         self.logger.log_scraping_start(query, limit)
         
         try:
             all_posts = []
+            # Incremental scrapes keep the `limit` newest items across both
+            # searches, so a short batch means nothing since `since` was left out
+            per_search = limit if since is not None else limit // 2
             
             # 1. Search Issues
-            issues = await self._search_issues(query, limit // 2)
+            issues = await self._search_issues(query, per_search, since)
             all_posts.extend(issues)
             
             # 2. Search Discussions
-            discussions = await self._search_discussions(query, limit // 2)
+            discussions = await self._search_discussions(query, per_search, since)
             all_posts.extend(discussions)
             
+            if since is not None:
+                all_posts.sort(key=lambda post: post.get('created_at') or '', reverse=True)
+            
             if all_posts:
                 duration = time.time() - start_time
                 self.logger.log_scraping_success(len(all_posts), duration)
                 return all_posts[:limit]
+            if since is not None:
+                self.logger.log("info", f"No new GitHub issues or discussions since {since.isoformat()}")
+                return []
             
             # Fallback to Google Search
             try:
@@ -81,7 +101,7 @@ class GitHubScraper(BaseScraper):
             # Don't re-raise - return empty list to prevent server crash
             return []
     
-    async def _search_issues(self, query: str, limit: int) -> List[Dict[str, Any]]:
+    async def _search_issues(self, query: str, limit: int, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """Search GitHub issues with pagination."""
         try:
             all_posts = []
@@ -89,10 +109,11 @@ class GitHubScraper(BaseScraper):
             per_page = min(100, limit)
             
             while len(all_posts) < limit:
-                search_query = f"{query} is:issue"
+                search_query = f"{query} is:issue{_created_qualifier(since)}"
                 params = {
                     "q": search_query,
-                    "sort": "updated",
+                    # Incremental searches walk back from the newest created item
+                    "sort": "created" if since is not None else "updated",
                     "order": "desc",
                     "per_page": per_page,
                     "page": page,
@@ -145,8 +166,6 @@ class GitHubScraper(BaseScraper):
                             continue
                     
                     page += 1
-                    if len(all_posts) < limit:
-                        await asyncio.sleep(0.5)  # Respect rate limits
                 
                 except httpx.HTTPStatusError as e:
                     if e.response.status_code == 403:
@@ -163,7 +182,7 @@ class GitHubScraper(BaseScraper):
             self.logger.log("error", f"Error in _search_issues: {e}")
             return []
     
-    async def _search_discussions(self, query: str, limit: int) -> List[Dict[str, Any]]:
+    async def _search_discussions(self, query: str, limit: int, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """Search GitHub discussions using GitHub's search API with pagination."""
         try:
             all_posts = []
@@ -171,10 +190,11 @@ class GitHubScraper(BaseScraper):
             per_page = min(100, limit)
             
             while len(all_posts) < limit:
-                search_query = f"{query} is:discussion"
+                search_query = f"{query} is:discussion{_created_qualifier(since)}"
                 params = {
                     "q": search_query,
-                    "sort": "updated",
+                    # Incremental searches walk back from the newest created item
+                    "sort": "created" if since is not None else "updated",
                     "order": "desc",
                     "per_page": per_page,
                     "page": page,
@@ -222,8 +242,6 @@ class GitHubScraper(BaseScraper):
                             continue
                     
                     page += 1
-                    if len(all_posts) < limit:
-                        await asyncio.sleep(0.5)
                 
                 except httpx.HTTPStatusError as e:
                     if e.response.status_code == 403:
@@ -245,9 +263,10 @@ class GitHubScraper(BaseScraper):
 _async_scraper = GitHubScraper()
 
 
-async def scrape_github_issues_async(query: str = "OVH", limit: int = 20) -> List[Dict[str, Any]]:
+async def scrape_github_issues_async(query: str = "OVH", limit: int = 20,
+                                     since: Optional[datetime] = None) -> List[Dict[str, Any]]:
     """Async entry point for GitHub scraper."""
-    return await _async_scraper.scrape(query, limit)
+    return await _async_scraper.scrape(query, limit, since=since)
 
 
 def scrape_github_issues(query="OVH", limit=20):
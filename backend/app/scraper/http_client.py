@@ -1,10 +1,11 @@
-"""Shared async HTTP client for scrapers with connection pooling and retry logic."""
+"""Shared async HTTP client for scrapers with connection pooling, per-host rate limiting and retry logic."""
 import httpx
 import logging
 import asyncio
 from typing import Optional, Dict, Any
 from datetime import datetime
 from .circuit_breaker import get_circuit_breaker, CircuitBreakerOpenError
+from .rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +15,12 @@ _client_lock = asyncio.Lock()
 
 
 class AsyncHTTPClient:
-    """Shared async HTTP client with retry logic and circuit breaker."""
+    """Shared async HTTP client with per-host rate limiting, retry logic and circuit breaker.
+    
+    Requests wait for a token of their host's rate limiter (see rate_limiter),
+    so scrapers don't need to sleep between requests. 429 responses are
+    retried once the host's Retry-After pause is over.
+    """
     
     def __init__(
         self,
@@ -86,6 +92,15 @@ class AsyncHTTPClient:
                     follow_redirects=True
                 )
     
+    def _should_retry_rate_limited(self, response: httpx.Response, attempt: int, source_name: str) -> bool:
+        """Whether a 429 response should be retried (the rate limiter waits for the host's pause)."""
+        if response.status_code != 429 or attempt >= self.max_retries - 1:
+            return False
+        logger.warning(
+            f"[HTTPClient:{source_name}] Rate limited (429) on attempt {attempt + 1}/{self.max_retries}, retrying..."
+        )
+        return True
+    
     async def get(
         self,
         url: str,
@@ -123,11 +138,17 @@ class AsyncHTTPClient:
                 **kwargs
             )
         
+        rate_limiter = get_rate_limiter(url)
         last_error = None
         
         for attempt in range(self.max_retries):
             try:
+                await rate_limiter.acquire()
                 response = await circuit_breaker.call_async(_make_request)
+                rate_limiter.on_response(response.status_code, response.headers)
+                
+                if self._should_retry_rate_limited(response, attempt, source_name):
+                    continue
                 
                 # Check for HTTP errors that should trigger retry
                 if response.status_code >= 500:
@@ -251,11 +272,17 @@ class AsyncHTTPClient:
                     )
                 raise
         
+        rate_limiter = get_rate_limiter(url)
         last_error = None
         
         for attempt in range(self.max_retries):
             try:
+                await rate_limiter.acquire()
                 response = await circuit_breaker.call_async(_make_request)
+                rate_limiter.on_response(response.status_code, response.headers)
+                
+                if self._should_retry_rate_limited(response, attempt, source_name):
+                    continue
                 
                 # Check for HTTP errors that should trigger retry
                 if response.status_code >= 500:
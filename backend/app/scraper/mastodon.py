@@ -5,7 +5,7 @@ import asyncio
 import logging
 import time
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from .base_scraper import BaseScraper
@@ -24,6 +24,9 @@ MASTODON_INSTANCES = [
     "https://mastodon.world",
 ]
 
+# Seconds an instance has to answer before it is left out of a scrape
+INSTANCE_TIMEOUT = 10
+
 
 class MastodonScraper(BaseScraper):
     """Async Mastodon scraper."""
@@ -31,139 +34,111 @@ class MastodonScraper(BaseScraper):
     def __init__(self):
         super().__init__("Mastodon")
     
-    async def scrape(self, query: str = "OVH", limit: int = 50) -> List[Dict[str, Any]]:
-        """Scrape Mastodon for posts about OVH."""
+    def _parse_status(self, status: Dict[str, Any]) -> Dict[str, Any]:
+        """Post dict of a Mastodon status."""
+        content = status.get('content', '')
+        content = re.sub(r'<[^>]+>', '', content)
+        
+        account = status.get('account', {})
+        author = account.get('acct', 'unknown')
+        display_name = account.get('display_name', '')
+        if display_name:
+            author = f"{display_name} (@{author})"
+        else:
+            author = f"@{author}"
+        
+        return {
+            'source': 'Mastodon',
+            'author': author,
+            'content': content[:500],
+            'url': status.get('url', ''),
+            'created_at': status.get('created_at', datetime.now().isoformat()),
+            'sentiment_score': 0.0,
+            'sentiment_label': 'neutral',
+        }
+    
+    async def _scrape_instance(self, instance: str, query: str, limit: int) -> List[Dict[str, Any]]:
+        """Statuses of one instance: hashtag timeline and search API, queried concurrently."""
+        self.logger.log("info", f"Searching {instance} for: {query}", url=instance)
+        
+        # Strategy 1: Search by hashtag
+        hashtag = query.lower().replace(' ', '')
+        tag_request = self._fetch_get(
+            f"{instance}/api/v1/timelines/tag/{hashtag}", params={'limit': min(limit, 40)}
+        )
+        # Strategy 2: Search API
+        search_request = self._fetch_get(
+            f"{instance}/api/v2/search", params={'q': query, 'type': 'statuses', 'limit': min(limit, 40)}
+        )
+        
+        statuses = []
+        responses = await asyncio.gather(tag_request, search_request, return_exceptions=True)
+        for strategy, response in zip(("Tag search", "Search API"), responses):
+            if isinstance(response, CircuitBreakerOpenError):
+                self.logger.log("info", f"Circuit breaker open for {instance}: {response}")
+            elif isinstance(response, Exception):
+                self.logger.log("debug", f"{strategy} failed for {instance}: {response}")
+            elif response.status_code == 200:
+                data = response.json()
+                statuses.extend(data if isinstance(data, list) else data.get('statuses', []))
+        return statuses
+    
+    async def scrape(self, query: str = "OVH", limit: int = 50, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Scrape Mastodon for posts about OVH.
+        
+        All instances are queried concurrently (each within INSTANCE_TIMEOUT);
+        statuses are merged and deduplicated by URI, as federated statuses show
+        up on several instances. Instances still running are cancelled once
+        `limit` posts are collected. With `since` (scrape watermark), older
+        statuses are skipped.
+        """
         import time
         start_time = time.time()  # Use time.time() instead of asyncio.get_event_loop().time()
         self.logger.log_scraping_start(query, limit)
         
         all_posts = []
-        seen_urls = set()
+        seen_uris = set()
         
-        for instance in MASTODON_INSTANCES:
-            if len(all_posts) >= limit:
-                break
-            
-            try:
-                self.logger.log("info", f"Searching {instance} for: {query}", url=instance)
-                
-                # Strategy 1: Search by hashtag
-                hashtag = query.lower().replace(' ', '')
-                tag_url = f"{instance}/api/v1/timelines/tag/{hashtag}"
-                
-                try:
-                    response = await self._fetch_get(tag_url, params={'limit': min(limit, 40)})
-                    if response.status_code == 200:
-                        data = response.json()
-                        for status in data:
-                            if len(all_posts) >= limit:
-                                break
-                            
-                            try:
-                                post_url = status.get('url', '')
-                                if post_url in seen_urls:
-                                    continue
-                                seen_urls.add(post_url)
-                                
-                                content = status.get('content', '')
-                                content = re.sub(r'<[^>]+>', '', content)
-                                
-                                account = status.get('account', {})
-                                author = account.get('acct', 'unknown')
-                                display_name = account.get('display_name', '')
-                                if display_name:
-                                    author = f"{display_name} (@{author})"
-                                else:
-                                    author = f"@{author}"
-                                
-                                created_at = status.get('created_at', datetime.now().isoformat())
-                                
-                                post = {
-                                    'source': 'Mastodon',
-                                    'author': author,
-                                    'content': content[:500],
-                                    'url': post_url,
-                                    'created_at': created_at,
-                                    'sentiment_score': 0.0,
-                                    'sentiment_label': 'neutral',
-                                }
-                                all_posts.append(post)
-                            except Exception as e:
-                                self.logger.log("warning", f"Error parsing Mastodon status: {e}")
-                                continue
-                except CircuitBreakerOpenError as e:
-                    # Circuit breaker is open - skip this instance and try next one
-                    self.logger.log("info", f"Circuit breaker open for {instance}, trying next instance: {e}")
-                    continue
-                except Exception as e:
-                    self.logger.log("debug", f"Tag search failed for {instance}: {e}")
-                
-                # Strategy 2: Search API
-                if len(all_posts) < limit:
-                    search_url = f"{instance}/api/v2/search"
-                    search_params = {
-                        'q': query,
-                        'type': 'statuses',
-                        'limit': min(limit - len(all_posts), 40)
-                    }
-                    
+        tasks = {
+            asyncio.ensure_future(asyncio.wait_for(self._scrape_instance(instance, query, limit), INSTANCE_TIMEOUT)): instance
+            for instance in MASTODON_INSTANCES
+        }
+        pending = set(tasks)
+        try:
+            while pending and len(all_posts) < limit:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    instance = tasks[task]
                     try:
-                        response = await self._fetch_get(search_url, params=search_params)
-                        if response.status_code == 200:
-                            data = response.json()
-                            statuses = data.get('statuses', [])
-                            
-                            for status in statuses:
-                                if len(all_posts) >= limit:
-                                    break
-                                
-                                try:
-                                    post_url = status.get('url', '')
-                                    if post_url in seen_urls:
-                                        continue
-                                    seen_urls.add(post_url)
-                                    
-                                    content = status.get('content', '')
-                                    content = re.sub(r'<[^>]+>', '', content)
-                                    
-                                    account = status.get('account', {})
-                                    author = account.get('acct', 'unknown')
-                                    display_name = account.get('display_name', '')
-                                    if display_name:
-                                        author = f"{display_name} (@{author})"
-                                    else:
-                                        author = f"@{author}"
-                                    
-                                    created_at = status.get('created_at', datetime.now().isoformat())
-                                    
-                                    post = {
-                                        'source': 'Mastodon',
-                                        'author': author,
-                                        'content': content[:500],
-                                        'url': post_url,
-                                        'created_at': created_at,
-                                        'sentiment_score': 0.0,
-                                        'sentiment_label': 'neutral',
-                                    }
-                                    all_posts.append(post)
-                                except Exception as e:
-                                    self.logger.log("warning", f"Error parsing Mastodon search result: {e}")
-                                    continue
-                    except CircuitBreakerOpenError as e:
-                        # Circuit breaker is open - skip this instance and try next one
-                        self.logger.log("info", f"Circuit breaker open for {instance}, trying next instance: {e}")
+                        statuses = task.result()
+                    except asyncio.TimeoutError:
+                        self.logger.log("debug", f"Mastodon {instance} did not answer within {INSTANCE_TIMEOUT}s")
                         continue
                     except Exception as e:
-                        self.logger.log("debug", f"Search API failed for {instance}: {e}")
-                
-                if all_posts:
-                    break
-            
-            except Exception as e:
-                self.logger.log("debug", f"Error with Mastodon {instance}: {str(e)}")
-                continue
-            
-            await asyncio.sleep(1)  # Delay between instances
+                        self.logger.log("debug", f"Error with Mastodon {instance}: {str(e)}")
+                        continue
+                    
+                    for status in statuses:
+                        if len(all_posts) >= limit:
+                            break
+                        try:
+                            uri = status.get('uri') or status.get('url', '')
+                            if uri in seen_uris:
+                                continue
+                            seen_uris.add(uri)
+                            
+                            post = self._parse_status(status)
+                            if self._before_watermark(post['created_at'], since):
+                                continue
+                            all_posts.append(post)
+                        except Exception as e:
+                            self.logger.log("warning", f"Error parsing Mastodon status: {e}")
+                            continue
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
         
         duration = time.time() - start_time
         if all_posts:
@@ -178,9 +153,10 @@ class MastodonScraper(BaseScraper):
 _async_scraper = MastodonScraper()
 
 
-async def scrape_mastodon_async(query: str = "OVH", limit: int = 50) -> List[Dict[str, Any]]:
+async def scrape_mastodon_async(query: str = "OVH", limit: int = 50,
+                                since: Optional[datetime] = None) -> List[Dict[str, Any]]:
     """Async entry point for Mastodon scraper."""
-    return await _async_scraper.scrape(query, limit)
+    return await _async_scraper.scrape(query, limit, since=since)
 
 
 def scrape_mastodon(query: str = "OVH", limit: int = 50):
@@ -1,9 +1,11 @@
 """OVH Community Forum scraper for customer feedback."""
 from datetime import datetime
 import requests
+import asyncio
 import logging
 import time
 import re
+from typing import List, Dict, Any, Optional
 from bs4 import BeautifulSoup
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -11,6 +13,7 @@ from .anti_bot_helpers import (
     get_realistic_headers, human_like_delay, 
     create_stealth_session, simulate_human_behavior
 )
+from .base_scraper import BaseScraper
 
 logger = logging.getLogger(__name__)
 
@@ -20,9 +23,98 @@ RETRY_DELAY = 2  # seconds
 # OVH Community Forum base URL (nouveau domaine)
 OVH_FORUM_BASE = "https://community.ovhcloud.com/community"
 
+# Forums scraped when no language is given, and time allowed per language (seconds)
+DEFAULT_LANGUAGES = ['en', 'fr']
+MAX_TIME_PER_LANGUAGE = 60
+
+
+class OVHForumScraper(BaseScraper):
+    """Async OVH Community Forum scraper."""
+    
+    def __init__(self):
+        super().__init__("OVH Forum")
+    
+    async def scrape(self, query: str = "OVH", limit: int = 50, languages: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Scrape OVH Community Forum for customer feedback and discussions.
+        
+        The forum of each language is scraped concurrently, each within
+        MAX_TIME_PER_LANGUAGE. Uses HTML scraping as the forum doesn't have a public API.
+        """
+        start_time = time.time()
+        self.logger.log_scraping_start(query, limit)
+        
+        languages = languages or DEFAULT_LANGUAGES
+        posts_per_language = max(limit // len(languages), 10)
+        
+        results = await asyncio.gather(*(
+            asyncio.wait_for(self._scrape_language(query, posts_per_language, language), MAX_TIME_PER_LANGUAGE)
+            for language in languages
+        ), return_exceptions=True)
+        
+        all_posts = []
+        for language, result in zip(languages, results):
+            if isinstance(result, asyncio.TimeoutError):
+                self.logger.log("warning", f"Exceeded maximum time limit ({MAX_TIME_PER_LANGUAGE}s) for language {language}")
+            elif isinstance(result, Exception):
+                self.logger.log("warning", f"Error scraping language {language}: {type(result).__name__}: {result}")
+            else:
+                all_posts.extend(result)
+        
+        duration = time.time() - start_time
+        if all_posts:
+            self.logger.log_scraping_success(len(all_posts), duration)
+            return all_posts[:limit]
+        self.logger.log("warning", f"No posts found for query: {query}", duration=duration)
+        return []
+    
+    async def _scrape_language(self, query: str, limit: int, language: str) -> List[Dict[str, Any]]:
+        """Scrape the forum of one language (main page, more reliable than search)."""
+        main_url = f"{OVH_FORUM_BASE}/{language}/"
+        self.logger.log("info", f"Searching for: {query} (language: {language})", url=main_url)
+        
+        response = await self._fetch_get(main_url, headers=get_realistic_headers(referer=OVH_FORUM_BASE))
+        if response.status_code in (403, 503):
+            # Browser automation is DISABLED - it blocks the asyncio event loop
+            self.logger.log("warning", f"Server returned {response.status_code} for {language}, cannot scrape without browser automation")
+            return []
+        response.raise_for_status()
+        
+        soup = BeautifulSoup(response.content, 'html.parser')
+        topic_links = _find_topic_links(soup)
+        if not topic_links:
+            # The forum uses JavaScript to load content, so we can't scrape it without a browser
+            self.logger.log("warning", f"No posts found for {language} - forum requires JavaScript (browser automation disabled)")
+            return []
+        
+        return _parse_forum_links(topic_links, limit)
+
+
+# Global scraper instance
+_async_scraper = OVHForumScraper()
+
+
+async def scrape_ovh_forum_async(query: str = "OVH", limit: int = 50,
+                                 languages: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Async entry point for OVH Forum scraper."""
+    return await _async_scraper.scrape(query, limit, languages=languages)
+
 
 def scrape_ovh_forum(query: str = "OVH", limit: int = 50, languages: list = None):
-    """Scrape OVH Community Forum for customer feedback and discussions.
+    """Synchronous wrapper for async scraper (for backward compatibility)."""
+    try:
+        loop = asyncio.get_event_loop()
+        if loop.is_running():
+            return _scrape_ovh_forum_sync(query, limit, languages)
+        else:
+            return loop.run_until_complete(scrape_ovh_forum_async(query, limit, languages))
+    except RuntimeError:
+        return asyncio.run(scrape_ovh_forum_async(query, limit, languages))
+
+
+def _scrape_ovh_forum_sync(query: str = "OVH", limit: int = 50, languages: list = None):
+    """Synchronous fallback implementation.
+    
+    Scrape OVH Community Forum for customer feedback and discussions.
     
     Searches the OVH community forum for posts related to the query.
     Uses HTML scraping as the forum doesn't have a public API.
@@ -37,7 +129,7 @@ def scrape_ovh_forum(query: str = "OVH", limit: int = 50, languages: list = None
     """
     try:
         if languages is None:
-            languages = ['en', 'fr']  # Par défaut, scraper les deux langues
+            languages = DEFAULT_LANGUAGES  # Par défaut, scraper les deux langues
         
         all_posts = []
         posts_per_language = max(limit // len(languages), 10) if languages else limit
@@ -54,7 +146,7 @@ def scrape_ovh_forum(query: str = "OVH", limit: int = 50, languages: list = None
         
         return all_posts[:limit]
     except Exception as e:
-        logger.error(f"[OVH Forum] Error in scrape_ovh_forum: {e}", exc_info=True)
+        logger.error(f"[OVH Forum] Error in _scrape_ovh_forum_sync: {e}", exc_info=True)
         return []  # Return empty list instead of crashing
 
 
@@ -134,24 +226,7 @@ def _scrape_ovh_forum_single_language(query: str = "OVH", limit: int = 50, langu
                         continue
                     return []
                 
-                posts = []
-                
-                # OVH Forum uses ServiceNow platform with URLs like:
-                # ?id=community_question&sys_id=...
-                # First try the ServiceNow pattern (current forum structure)
-                topic_links = soup.find_all('a', href=re.compile(r'community_question.*sys_id=|id=community_question'))
-                
-                if not topic_links:
-                    # Try broader sys_id pattern
-                    topic_links = soup.find_all('a', href=re.compile(r'sys_id='))
-                    # Filter to only question-like links
-                    topic_links = [link for link in topic_links if 'question' in link.get('href', '').lower() or 'topic' in link.get('href', '').lower()]
-                
-                if not topic_links:
-                    # Legacy patterns (old forum structure)
-                    logger.info("[OVH Forum] No ServiceNow links found, trying legacy patterns...")
-                    topic_links = soup.find_all('a', href=re.compile(r'/t/|/topic/|/post/|/discussion/'))
-                
+                topic_links = _find_topic_links(soup)
                 if not topic_links:
                     # NOTE: Browser automation (Playwright) is DISABLED because it blocks the asyncio event loop
                     # and prevents the heartbeat from running, causing the progress bar to freeze.
@@ -159,112 +234,7 @@ def _scrape_ovh_forum_single_language(query: str = "OVH", limit: int = 50, langu
                     logger.warning("[OVH Forum] No posts found - forum requires JavaScript (browser automation disabled)")
                     return []
                 
-                seen_urls = set()
-                
-                # Limit the number of links to process to avoid infinite loops
-                max_links_to_process = min(limit * 2, 30)  # Cap at 30 links max
-                
-                for link in topic_links[:max_links_to_process]:
-                    try:
-                        href = link.get('href', '')
-                        if not href:
-                            continue
-                        
-                        # Make absolute URL - handle ServiceNow format
-                        if href.startswith('http'):
-                            full_url = href
-                        elif href.startswith('?'):
-                            # ServiceNow query string format: ?id=community_question&sys_id=...
-                            full_url = f"{OVH_FORUM_BASE}{href}"
-                        elif href.startswith('/'):
-                            # URL relative
-                            if href.startswith('/community'):
-                                full_url = f"https://community.ovhcloud.com{href}"
-                            else:
-                                full_url = f"https://community.ovhcloud.com{href}"
-                        else:
-                            # URL relative sans slash initial
-                            full_url = f"{OVH_FORUM_BASE}/{href}"
-                        
-                        # Skip if already seen (normalize URL for comparison)
-                        url_key = full_url.split('sys_id=')[-1] if 'sys_id=' in full_url else full_url
-                        if url_key in seen_urls:
-                            continue
-                        seen_urls.add(url_key)
-                        
-                        # Extract title
-                        title = link.get_text(strip=True)
-                        # Clean up title (remove "Question :" prefix)
-                        title = re.sub(r'^(Question\s*:\s*)', '', title)
-                        if not title or len(title) < 5:
-                            continue
-                        
-                        # For OVH forum, most posts are OVH-related by nature
-                        # So we're less strict on query matching
-                        
-                        # Try to get post details (but skip if we already have enough posts)
-                        if len(posts) >= limit:
-                            break
-                        
-                        # Check timeout before making request
-                        if time.time() - start_time > MAX_TOTAL_TIME:
-                            logger.warning("[OVH Forum] Timeout reached, stopping")
-                            break
-                        
-                        # First, try to extract metadata from the parent element (faster, no extra request)
-                        author = 'OVH Community User'
-                        created_at = datetime.now().isoformat()
-                        content = title
-                        
-                        parent = link.find_parent(['div', 'li', 'article', 'tr'])
-                        if parent:
-                            # Look for author in ServiceNow format
-                            author_elem = parent.find('a', href=re.compile(r'community_user_profile'))
-                            if author_elem:
-                                author = author_elem.get_text(strip=True)
-                                author = re.sub(r'^Profil de\s*', '', author)
-                            
-                            # Look for date/time info
-                            parent_text = parent.get_text()
-                            date_match = re.search(r'(\d+)\s*(hour|heure|jour|day|week|semaine|month|mois|minute)', parent_text, re.I)
-                            if date_match:
-                                from datetime import timedelta
-                                num = int(date_match.group(1))
-                                unit = date_match.group(2).lower()
-                                now = datetime.now()
-                                if 'hour' in unit or 'heure' in unit:
-                                    created_at = (now - timedelta(hours=num)).isoformat()
-                                elif 'day' in unit or 'jour' in unit:
-                                    created_at = (now - timedelta(days=num)).isoformat()
-                                elif 'week' in unit or 'semaine' in unit:
-                                    created_at = (now - timedelta(weeks=num)).isoformat()
-                                elif 'month' in unit or 'mois' in unit:
-                                    created_at = (now - timedelta(days=num*30)).isoformat()
-                                elif 'minute' in unit:
-                                    created_at = (now - timedelta(minutes=num)).isoformat()
-                        
-                        # Skip fetching individual pages to save time
-                        # Just use the title as content for fast scraping
-                        
-                        post = {
-                            'source': 'OVH Forum',
-                            'author': author,
-                            'content': title,
-                            'url': full_url,
-                            'created_at': created_at,
-                            'sentiment_score': 0.0,
-                            'sentiment_label': 'neutral',
-                        }
-                        posts.append(post)
-                        logger.info(f"✓ OVH Forum: {author} - {title[:50]}")
-                        
-                        # Break early if we have enough posts
-                        if len(posts) >= limit:
-                            break
-                        
-                    except Exception as e:
-                        logger.debug(f"Error processing forum link: {e}")
-                        continue
+                posts = _parse_forum_links(topic_links, limit)
                 
                 if not posts:
                     logger.warning(f"[OVH Forum] No posts found for query: {query}")
@@ -297,6 +267,135 @@ def _scrape_ovh_forum_single_language(query: str = "OVH", limit: int = 50, langu
         return []  # Return empty list instead of crashing
 
 
+def _find_topic_links(soup: BeautifulSoup) -> list:
+    """Topic links of a forum page (ServiceNow pattern first, then broader and legacy patterns)."""
+    # OVH Forum uses ServiceNow platform with URLs like:
+    # ?id=community_question&sys_id=...
+    # First try the ServiceNow pattern (current forum structure)
+    topic_links = soup.find_all('a', href=re.compile(r'community_question.*sys_id=|id=community_question'))
+    
+    if not topic_links:
+        # Try broader sys_id pattern
+        topic_links = soup.find_all('a', href=re.compile(r'sys_id='))
+        # Filter to only question-like links
+        topic_links = [link for link in topic_links if 'question' in link.get('href', '').lower() or 'topic' in link.get('href', '').lower()]
+    
+    if not topic_links:
+        # Legacy patterns (old forum structure)
+        logger.info("[OVH Forum] No ServiceNow links found, trying legacy patterns...")
+        topic_links = soup.find_all('a', href=re.compile(r'/t/|/topic/|/post/|/discussion/'))
+    
+    return topic_links
+
+
+def _parse_forum_links(topic_links: list, limit: int) -> List[Dict[str, Any]]:
+    """Posts of the topic links of a forum page (the title is the content, metadata comes from the parent element)."""
+    posts = []
+    seen_urls = set()
+    
+    # Limit the number of links to process to avoid infinite loops
+    max_links_to_process = min(limit * 2, 30)  # Cap at 30 links max
+    
+    for link in topic_links[:max_links_to_process]:
+        try:
+            href = link.get('href', '')
+            if not href:
+                continue
+            
+            # Make absolute URL - handle ServiceNow format
+            if href.startswith('http'):
+                full_url = href
+            elif href.startswith('?'):
+                # ServiceNow query string format: ?id=community_question&sys_id=...
+                full_url = f"{OVH_FORUM_BASE}{href}"
+            elif href.startswith('/'):
+                # URL relative
+                if href.startswith('/community'):
+                    full_url = f"https://community.ovhcloud.com{href}"
+                else:
+                    full_url = f"https://community.ovhcloud.com{href}"
+            else:
+                # URL relative sans slash initial
+                full_url = f"{OVH_FORUM_BASE}/{href}"
+            
+            # Skip if already seen (normalize URL for comparison)
+            url_key = full_url.split('sys_id=')[-1] if 'sys_id=' in full_url else full_url
+            if url_key in seen_urls:
+                continue
+            seen_urls.add(url_key)
+            
+            # Extract title
+            title = link.get_text(strip=True)
+            # Clean up title (remove "Question :" prefix)
+            title = re.sub(r'^(Question\s*:\s*)', '', title)
+            if not title or len(title) < 5:
+                continue
+            
+            # For OVH forum, most posts are OVH-related by nature
+            # So we're less strict on query matching
+            
+            # Try to get post details (but skip if we already have enough posts)
+            if len(posts) >= limit:
+                break
+            
+            # First, try to extract metadata from the parent element (faster, no extra request)
+            author = 'OVH Community User'
+            created_at = datetime.now().isoformat()
+            content = title
+            
+            parent = link.find_parent(['div', 'li', 'article', 'tr'])
+            if parent:
+                # Look for author in ServiceNow format
+                author_elem = parent.find('a', href=re.compile(r'community_user_profile'))
+                if author_elem:
+                    author = author_elem.get_text(strip=True)
+                    author = re.sub(r'^Profil de\s*', '', author)
+                
+                # Look for date/time info
+                parent_text = parent.get_text()
+                date_match = re.search(r'(\d+)\s*(hour|heure|jour|day|week|semaine|month|mois|minute)', parent_text, re.I)
+                if date_match:
+                    from datetime import timedelta
+                    num = int(date_match.group(1))
+                    unit = date_match.group(2).lower()
+                    now = datetime.now()
+                    if 'hour' in unit or 'heure' in unit:
+                        created_at = (now - timedelta(hours=num)).isoformat()
+                    elif 'day' in unit or 'jour' in unit:
+                        created_at = (now - timedelta(days=num)).isoformat()
+                    elif 'week' in unit or 'semaine' in unit:
+                        created_at = (now - timedelta(weeks=num)).isoformat()
+                    elif 'month' in unit or 'mois' in unit:
+                        created_at = (now - timedelta(days=num*30)).isoformat()
+                    elif 'minute' in unit:
+                        created_at = (now - timedelta(minutes=num)).isoformat()
+            
+            # Skip fetching individual pages to save time
+            # Just use the title as content for fast scraping
+            
+            post = {
+                'source': 'OVH Forum',
+                'author': author,
+                'content': title,
+                'url': full_url,
+                'created_at': created_at,
+                'sentiment_score': 0.0,
+                'sentiment_label': 'neutral',
+            }
+            posts.append(post)
+            logger.info(f"✓ OVH Forum: {author} - {title[:50]}")
+            
+            # Break early if we have enough posts
+            if len(posts) >= limit:
+                break
+        
+        except Exception as e:
+            logger.debug(f"Error processing forum link: {e}")
+            continue
+    
+    return posts
+
+
 def _try_browser_automation(url: str) -> str:
     """Try to scrape using browser automation (Selenium/Playwright) as fallback.
     
@@ -0,0 +1,189 @@
+"""Adaptive per-host rate limiting for scrapers.
+
+Every request made through AsyncHTTPClient takes a token from the bucket of
+its host. Buckets are shared by all the scrapers of the process and adapt
+their rate to the provider (AIMD):
+
+- each successful response raises the rate by a small step (additive increase)
+- a 429 / 503 halves it (multiplicative decrease)
+- Retry-After and X-RateLimit-Remaining / X-RateLimit-Reset headers pause the
+  host until the window resets, or cap the rate to the remaining quota
+"""
+import os
+import time
+import asyncio
+import logging
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Mapping
+from threading import Lock
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Default requests per second of a host without a specific entry
+DEFAULT_RATE = float(os.getenv('SCRAPER_RATE_LIMIT_DEFAULT', '2'))
+# Longest pause honoured for a Retry-After / exhausted quota (seconds)
+MAX_WAIT = float(os.getenv('SCRAPER_RATE_LIMIT_MAX_WAIT', '60'))
+
+# Starting rates (requests per second) of the hosts with known limits
+HOST_RATES = {
+    'www.reddit.com': 1.0,
+    'api.github.com': 2.0,
+    'api.stackexchange.com': 1.0,
+    'discord.com': 50.0,  # 50 requests/second per bot
+    'www.trustpilot.com': 1.0,
+}
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delay in seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_reset(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds until the rate limit window resets, from the X-RateLimit-* headers."""
+    reset_after = headers.get('x-ratelimit-reset-after')  # Discord
+    if reset_after:
+        try:
+            return max(0.0, float(reset_after))
+        except ValueError:
+            return None
+    reset = headers.get('x-ratelimit-reset')
+    if not reset:
+        return None
+    try:
+        reset = float(reset)
+    except ValueError:
+        return None
+    # GitHub sends an epoch timestamp, Reddit a number of seconds
+    return max(0.0, reset - time.time()) if reset > 1e9 else reset
+
+
+class HostRateLimiter:
+    """Token bucket for one host, with AIMD rate adaptation.
+
+    Tokens refill at `rate` per second up to `burst`; requests reserve a token
+    and wait for it when the bucket is empty.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        rate: float = DEFAULT_RATE,
+        burst: float = 5.0,
+        min_rate: float = 0.05,
+        max_rate: Optional[float] = None,
+        increase: Optional[float] = None,
+        decrease_factor: float = 0.5
+    ):
+        """
+        Args:
+            host: Host name (for logging)
+            rate: Starting rate in requests per second
+            burst: Bucket capacity (requests allowed back to back)
+            min_rate: Lowest rate after decreases
+            max_rate: Highest rate after increases (default: 4x the starting rate)
+            increase: Rate added per successful response (default: 5% of the starting rate)
+            decrease_factor: Rate multiplier on a 429 / 503
+        """
+        self.host = host
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate * 4
+        self.increase = increase or rate * 0.05
+        self.decrease_factor = decrease_factor
+
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = Lock()
+
+    def reserve(self) -> float:
+        """Take a token; returns the seconds to wait before sending the request."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    async def acquire(self):
+        """Wait for a token."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def blocked_for(self) -> float:
+        """Seconds left of a pause requested by the host (Retry-After / exhausted quota)."""
+        return max(0.0, self.blocked_until - time.monotonic())
+
+    def _block(self, seconds: float, reason: str):
+        seconds = min(seconds, MAX_WAIT)
+        until = time.monotonic() + seconds
+        if until > self.blocked_until:
+            self.blocked_until = until
+            logger.info(f"[RateLimiter:{self.host}] {reason}, pausing {seconds:.1f}s")
+
+    def on_response(self, status_code: int, headers: Mapping[str, str]):
+        """Adapt the rate to a response (status code and rate limit headers)."""
+        with self.lock:
+            if status_code in (429, 503):
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                logger.warning(f"[RateLimiter:{self.host}] HTTP {status_code}, rate lowered to {self.rate:.2f} req/s")
+                retry_after = _parse_retry_after(headers.get('retry-after'))
+                self._block(retry_after if retry_after is not None else 1.0 / self.rate,
+                            f"HTTP {status_code}")
+            elif status_code < 400:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+            remaining = headers.get('x-ratelimit-remaining')
+            reset = _parse_reset(headers)
+            if remaining is None or reset is None:
+                return
+            try:
+                remaining = float(remaining)
+            except ValueError:
+                return
+            if remaining < 1:
+                self._block(reset, "Rate limit quota exhausted")
+            elif reset > 0:
+                # Spread the remaining quota over the rest of the window
+                self.rate = max(self.min_rate, min(self.rate, remaining / reset))
+
+
+# Global registry of rate limiters per host
+_rate_limiters: Dict[str, HostRateLimiter] = {}
+_limiters_lock = Lock()
+
+
+def get_rate_limiter(url: str) -> HostRateLimiter:
+    """Get or create the rate limiter of the host of a URL.
+
+    Args:
+        url: Request URL (or host name)
+
+    Returns:
+        HostRateLimiter shared by all the requests to that host
+    """
+    host = (urlsplit(url).hostname if '//' in url else url).lower()
+    with _limiters_lock:
+        if host not in _rate_limiters:
+            _rate_limiters[host] = HostRateLimiter(host, rate=HOST_RATES.get(host, DEFAULT_RATE))
+        return _rate_limiters[host]
+
+
+def get_all_rate_limiters() -> Dict[str, HostRateLimiter]:
+    """Get all rate limiters."""
+    with _limiters_lock:
+        return _rate_limiters.copy()
@@ -3,7 +3,7 @@ import requests
 import asyncio
 import logging
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from .base_scraper import BaseScraper
@@ -20,16 +20,19 @@ class RedditScraper(BaseScraper):
     def __init__(self):
         super().__init__("Reddit")
     
-    async def scrape(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
-        """Scrape Reddit using JSON API with pagination, fallback to RSS if API fails."""
+    async def scrape(self, query: str, limit: int = 50, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Scrape Reddit using JSON API with pagination, fallback to RSS if API fails.
+        
+        With `since` (scrape watermark), pagination stops at the first post older than it.
+        """
         start_time = time.time()  # Use time.time() instead of asyncio.get_event_loop().time()
         self.logger.log_scraping_start(query, limit)
         
         try:
             # Try API first (better pagination support)
             try:
-                posts = await self._scrape_with_api(query, limit)
-                if posts:
+                posts, reached_watermark = await self._scrape_with_api(query, limit, since)
+                if posts or reached_watermark:
                     duration = time.time() - start_time
                     self.logger.log_scraping_success(len(posts), duration)
                     return posts
@@ -37,7 +40,7 @@ class RedditScraper(BaseScraper):
                 self.logger.log("warning", f"API scraping failed: {e}, falling back to RSS")
             
             # Fallback to RSS
-            posts = await self._scrape_with_rss(query, limit)
+            posts = await self._scrape_with_rss(query, limit, since)
             if posts:
                 duration = time.time() - start_time
                 self.logger.log_scraping_success(len(posts), duration)
@@ -76,11 +79,17 @@ class RedditScraper(BaseScraper):
             self.logger.log_scraping_error(e, duration)
             return []
     
-    async def _scrape_with_api(self, query: str, limit: int) -> List[Dict[str, Any]]:
-        """Scrape Reddit using JSON API with pagination."""
+    async def _scrape_with_api(self, query: str, limit: int,
+                               since: Optional[datetime] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """Scrape Reddit using JSON API with pagination (sort=new: newest first).
+        
+        Returns the posts and whether the watermark was reached (no fallback
+        needed even if there are no new posts).
+        """
         all_posts = []
         after = None
         page = 0
+        reached_watermark = False
         
         headers = {
             'User-Agent': 'OVH-Tracker-Bot/1.0 (Feedback Monitor)'
@@ -134,6 +143,9 @@ class RedditScraper(BaseScraper):
                         
                         created_utc = post_data.get('created_utc', 0)
                         created_at = datetime.fromtimestamp(created_utc).isoformat() if created_utc else datetime.now().isoformat()
+                        if self._before_watermark(created_at, since):
+                            reached_watermark = True
+                            break
                         
                         post = {
                             'source': 'Reddit',
@@ -148,18 +160,19 @@ class RedditScraper(BaseScraper):
                         continue
                 
                 after = data['data'].get('after')
+                if reached_watermark:
+                    self.logger.log("info", f"Reached posts already scraped on page {page}, stopping")
+                    break
                 if not after:
                     break
-                
-                await asyncio.sleep(0.5)  # Respect rate limits
             
             except Exception as e:
                 self.logger.log("error", f"Error fetching page {page}: {e}")
                 break
         
-        return all_posts
+        return all_posts, reached_watermark
     
-    async def _scrape_with_rss(self, query: str, limit: int) -> List[Dict[str, Any]]:
+    async def _scrape_with_rss(self, query: str, limit: int, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """Scrape Reddit using RSS feed."""
         import feedparser
         import urllib.parse
@@ -185,6 +198,8 @@ class RedditScraper(BaseScraper):
                         'url': entry.get('link', ''),
                         'created_at': datetime(*entry.published_parsed[:6]).isoformat() if hasattr(entry, 'published_parsed') else datetime.now().isoformat(),
                     }
+                    if self._before_watermark(post['created_at'], since):
+                        continue
                     posts.append(post)
                 except Exception as e:
                     self.logger.log("warning", f"Could not parse RSS entry: {e}")
@@ -201,9 +216,9 @@ class RedditScraper(BaseScraper):
 _async_scraper = RedditScraper()
 
 
-async def scrape_reddit_async(query: str, limit: int = 50) -> List[Dict[str, Any]]:
+async def scrape_reddit_async(query: str, limit: int = 50, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
     """Async entry point for Reddit scraper."""
-    return await _async_scraper.scrape(query, limit)
+    return await _async_scraper.scrape(query, limit, since=since)
 
 
 def scrape_reddit(query: str, limit: int = 50):
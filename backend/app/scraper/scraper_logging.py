@@ -8,7 +8,7 @@ logger = logging.getLogger(__name__)
 
 # Import db de manière optionnelle pour éviter les dépendances circulaires
 try:
-    from .. import database as db
+    from ..log_buffer import get_log_buffer
     DB_AVAILABLE = True
 except ImportError:
     DB_AVAILABLE = False
@@ -91,7 +91,7 @@ class ScrapingLogger:
         log_func(f"{level_emoji} [{self.source_name}] {full_message}")
         
         # Build details dict for DB
-        db_details = details or {}
+        db_details = dict(details or {})
         if duration is not None:
             db_details['duration'] = duration
         if attempt is not None:
@@ -101,14 +101,14 @@ class ScrapingLogger:
         if url:
             db_details['url'] = url
         
-        # Save to database
+        # Save to database (buffered, written in batches by a background thread)
         if DB_AVAILABLE:
             try:
-                db.add_scraping_log(
+                get_log_buffer().add(
                     self.source_name,
                     level,
                     message,
-                    str(db_details) if db_details else None
+                    db_details or None
                 )
             except Exception as e:
                 # Don't fail scraping if logging fails
@@ -97,8 +97,6 @@ class StackOverflowScraper(BaseScraper):
                         break
                     
                     page += 1
-                    if len(all_posts) < limit:
-                        await asyncio.sleep(1)  # Respect rate limits
                 
                 except Exception as e:
                     self.logger.log("error", f"Error fetching page {page}: {e}")
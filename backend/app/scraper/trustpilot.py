@@ -9,7 +9,7 @@ from httpx import Timeout
 import time
 import re
 from bs4 import BeautifulSoup
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from .base_scraper import BaseScraper
 from .scraper_logging import ScrapingLogger
 
@@ -34,11 +34,14 @@ class TrustpilotScraper(BaseScraper):
     def __init__(self):
         super().__init__("Trustpilot")
     
-    async def scrape(self, query: str = "OVH", limit: int = 20) -> List[Dict[str, Any]]:
+    async def scrape(self, query: str = "OVH", limit: int = 20, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """
         Scrape Trustpilot reviews for OVH customer feedback.
         First tries HTML scraping, then falls back to API if available.
         Returns a list of review dictionaries ready for insertion.
+        
+        With `since` (scrape watermark), pagination stops at the first page
+        reaching reviews older than it (pages are listed newest first).
         """
         import time
         start_time = time.time()  # Use time.time() instead of asyncio.get_event_loop().time()
@@ -47,7 +50,7 @@ class TrustpilotScraper(BaseScraper):
         try:
             # Try HTML scraping first (most reliable)
             try:
-                reviews = await self._scrape_html(limit)
+                reviews = await self._scrape_html(limit, since)
                 if reviews:
                     duration = time.time() - start_time
                     self.logger.log_scraping_success(len(reviews), duration)
@@ -58,7 +61,7 @@ class TrustpilotScraper(BaseScraper):
             # Fallback to API if key is provided
             if TP_API_KEY:
                 try:
-                    reviews = await self._scrape_api(query, limit)
+                    reviews = await self._scrape_api(query, limit, since)
                     if reviews:
                         duration = time.time() - start_time
                         self.logger.log_scraping_success(len(reviews), duration)
@@ -76,7 +79,7 @@ class TrustpilotScraper(BaseScraper):
             self.logger.log_scraping_error(e, duration)
             return []
     
-    async def _scrape_html(self, limit: int = 20) -> List[Dict[str, Any]]:
+    async def _scrape_html(self, limit: int = 20, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """Scrape Trustpilot reviews directly from HTML page with pagination."""
         reviews = []
         page = 1
@@ -163,6 +166,7 @@ class TrustpilotScraper(BaseScraper):
                 
                 parsed_count = 0
                 skipped_count = 0
+                older_count = 0
                 
                 for card in review_cards:
                     if len(reviews) >= limit:
@@ -171,6 +175,12 @@ class TrustpilotScraper(BaseScraper):
                         # Yield control to event loop every card to allow heartbeat to progress
                         await asyncio.sleep(0)
                         
+                        # Reviews already scraped: skip them (and their review page visit)
+                        time_elem = card.find('time')
+                        if time_elem and self._before_watermark(time_elem.get('datetime'), since):
+                            older_count += 1
+                            continue
+                        
                         # Extract rating (stars)
                         rating_elem = card.find('div', {'data-service-review-rating': True})
                         rating = 3  # default neutral
@@ -303,7 +313,6 @@ class TrustpilotScraper(BaseScraper):
                         if review_url and review_url != TRUSTPILOT_WEB and '/reviews/' in review_url:
                             try:
                                 # Visit the individual review page to check for company reply
-                                await asyncio.sleep(0.5)  # Rate limiting
                                 review_response = await self._fetch_get(review_url, headers=DEFAULT_HEADERS)
                                 if review_response.status_code == 200:
                                     review_soup = BeautifulSoup(review_response.text, 'html.parser')
@@ -376,9 +385,10 @@ class TrustpilotScraper(BaseScraper):
                 
                 self.logger.log("info", f"Page {page}: parsed {parsed_count} reviews (skipped {skipped_count})")
                 
-                # Wait 1 second between pages to avoid rate limiting
-                if page < max_pages and len(reviews) < limit:
-                    await asyncio.sleep(1)
+                if older_count:
+                    self.logger.log("info", f"Reached reviews already scraped on page {page}, stopping")
+                    page += 1
+                    break
                 
                 page += 1
                 
@@ -391,7 +401,7 @@ class TrustpilotScraper(BaseScraper):
         self.logger.log("success", f"Successfully parsed {len(reviews)} reviews from {page - 1} page(s)")
         return reviews[:limit]  # Ensure we don't exceed limit
     
-    async def _scrape_api(self, query: str, limit: int) -> List[Dict[str, Any]]:
+    async def _scrape_api(self, query: str, limit: int, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """Scrape using Trustpilot API (requires API key)."""
         headers = DEFAULT_HEADERS.copy()
         if TP_API_KEY:
@@ -415,6 +425,8 @@ class TrustpilotScraper(BaseScraper):
         
         reviews = []
         for review in data.get("reviews", [])[:limit]:
+            if self._before_watermark(review.get("createdAt"), since):
+                continue
             try:
                 review_text = review.get("text", "")[:500]
                 rating = review.get("rating", 0)
@@ -456,9 +468,10 @@ class TrustpilotScraper(BaseScraper):
 _async_scraper = TrustpilotScraper()
 
 
-async def scrape_trustpilot_reviews_async(query: str = "OVH", limit: int = 200) -> List[Dict[str, Any]]:
+async def scrape_trustpilot_reviews_async(query: str = "OVH", limit: int = 200,
+                                         since: Optional[datetime] = None) -> List[Dict[str, Any]]:
     """Async entry point for Trustpilot scraper."""
-    return await _async_scraper.scrape(query, limit)
+    return await _async_scraper.scrape(query, limit, since=since)
 
 
 def scrape_trustpilot_reviews(query="OVH", limit=200):
@@ -1,37 +1,285 @@
 import requests
+import asyncio
 from datetime import datetime
 import logging
+import time
 import httpx
 from httpx import Timeout
+from typing import List, Dict, Any
+
+from ..analysis.language_detection import detect_language
+from .base_scraper import BaseScraper
 
 logger = logging.getLogger(__name__)
 
-def detect_language(text: str) -> str:
-    """Detect language of text (simplified version for French/English)."""
+NITTER_INSTANCES = [
+    "https://nitter.net",
+    "https://nitter.poast.org",
+    "https://nitter.1d4.us",
+]
+NITTER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+}
+TWITTER_SEARCH_URL = "https://api.twitter.com/2/tweets/search/recent"
+
+# Complaint-focused searches of scrape_x_multi_queries
+MULTI_QUERIES = [
+    "OVH domain TLD complaint",
+    "OVH renew domain expensive",
+    "OVH registrar bad support",
+    "OVH domain expensive",
+    "problems OVH domain registration",
+]
+
+
+def _get_bearer_token():
+    """Twitter API v2 Bearer Token from the settings, None if not configured."""
     try:
-        from textblob import TextBlob
+        from ..config import config
+        return config.get_api_key("twitter_bearer")
+    except Exception as e:
+        logger.warning(f"[X SCRAPER] Error checking for Twitter API token: {e}")
+        return None
+
+
+def _parse_nitter_tweets(tweets: list, nitter_url: str, limit: int) -> List[Dict[str, Any]]:
+    """Posts of the tweet elements of a Nitter search page."""
+    results = []
+    for i, tweet in enumerate(tweets):
+        if i >= limit:
+            break
         try:
-            lang = TextBlob(text).detect_language()
-            return lang if lang in ['fr', 'en'] else 'other'
-        except:
-            return 'unknown'
-    except ImportError:
-        # Simple heuristic if textblob not available
-        french_words = ['le', 'la', 'de', 'et', 'qu', 'qui', 'est', 'pas', 'à', 'pour']
-        english_words = ['the', 'and', 'is', 'to', 'of', 'in', 'a', 'that', 'it', 'you']
+            author_elem = tweet.find('a', class_='username')
+            author = author_elem.text.strip() if author_elem else 'Unknown'
+            
+            content_elem = tweet.find('div', class_='tweet-text')
+            content = content_elem.text.strip() if content_elem else ''
+            
+            link_elem = tweet.find('a', class_='tweet-link')
+            url = f"{nitter_url}{link_elem['href']}" if link_elem and link_elem.get('href') else ''
+            
+            if content:
+                results.append({
+                    'source': 'X/Twitter',
+                    'author': author,
+                    'content': content,
+                    'url': url,
+                    'created_at': datetime.now().isoformat(),
+                    'language': detect_language(content),
+                })
+        except Exception as e:
+            logger.warning(f"[X SCRAPER] Error parsing tweet: {e}")
+            continue
+    return results
+
+
+def _parse_api_tweets(data: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+    """Posts of a Twitter API v2 search response page."""
+    # Get user information from includes
+    users = {}
+    if 'includes' in data and 'users' in data['includes']:
+        for user in data['includes']['users']:
+            users[user['id']] = user
+    
+    results = []
+    for tweet in data.get('data', []):
+        if len(results) >= limit:
+            break
         
-        text_lower = text.lower()
-        fr_count = sum(1 for w in french_words if f' {w} ' in f' {text_lower} ')
-        en_count = sum(1 for w in english_words if f' {w} ' in f' {text_lower} ')
+        try:
+            author_id = tweet.get('author_id', '')
+            author_info = users.get(author_id, {})
+            author = author_info.get('username', 'unknown')
+            if not author or author == 'unknown':
+                author = author_info.get('name', 'Unknown')
+            
+            content = tweet.get('text', '')
+            if not content:
+                continue
+            
+            created_at = tweet.get('created_at', datetime.now().isoformat())
+            tweet_id = tweet.get('id', '')
+            url = f"https://twitter.com/{author}/status/{tweet_id}" if tweet_id else ''
+            
+            lang = tweet.get('lang', 'unknown')
+            
+            results.append({
+                'source': 'X/Twitter',
+                'author': f"@{author}" if not author.startswith('@') else author,
+                'content': content,
+                'url': url,
+                'created_at': created_at,
+                'language': lang if lang in ['fr', 'en'] else detect_language(content),
+            })
+            logger.debug(f"✓ Twitter API: @{author} - {content[:50]}")
+        except Exception as e:
+            logger.warning(f"Could not parse Twitter tweet: {e}")
+            continue
+    return results
+
+
+class XScraper(BaseScraper):
+    """Async X (Twitter) scraper."""
+    
+    def __init__(self):
+        super().__init__("X/Twitter")
+    
+    async def scrape(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Scrape X (Twitter) using multiple strategies.
+        
+        Strategy priority:
+        1. Twitter API v2 (if Bearer Token is configured)
+        2. Nitter instances (fallback)
+        """
+        start_time = time.time()
+        self.logger.log_scraping_start(query, limit)
+        
+        results = []
+        bearer_token = _get_bearer_token()
+        if bearer_token:
+            results = await self._scrape_api_v2(query, limit, bearer_token)
+            if not results:
+                self.logger.log("info", "Twitter API v2 returned no results, falling back to Nitter")
+        else:
+            self.logger.log("warning", "No Twitter Bearer Token configured (Settings > API Keys > Twitter/X API), falling back to Nitter instances (may be unreliable)")
+        
+        if not results:
+            results = await self._scrape_nitter(query, limit)
+        
+        duration = time.time() - start_time
+        if results:
+            self.logger.log_scraping_success(len(results), duration)
+            return results
+        self.logger.log("warning", "All scraping methods failed", duration=duration)
+        return []
+    
+    async def _scrape_api_v2(self, query: str, limit: int, bearer_token: str) -> List[Dict[str, Any]]:
+        """
+        Search Twitter using official API v2 with Bearer Token, page by page.
+        
+        Rate limits (300 requests per 15 minutes) are handled by the host's
+        rate limiter from the X-RateLimit-* headers.
+        """
+        all_tweets = []
+        next_token = None
+        page = 0
+        headers = {
+            'Authorization': f'Bearer {bearer_token}',
+            'User-Agent': 'OVH-Tracker-Bot/1.0'
+        }
         
-        if fr_count > en_count:
-            return 'fr'
-        elif en_count > fr_count:
-            return 'en'
-        return 'unknown'
+        try:
+            while len(all_tweets) < limit:
+                page += 1
+                params = {
+                    'query': f"{query} -is:retweet lang:fr OR lang:en",  # Exclude retweets, French or English
+                    'max_results': max(10, min(100, limit - len(all_tweets))),  # 10 to 100 per request
+                    'tweet.fields': 'created_at,author_id,public_metrics,lang',
+                    'expansions': 'author_id',
+                    'user.fields': 'username,name',
+                }
+                if next_token:
+                    params['next_token'] = next_token
+                
+                response = await self._fetch_get(TWITTER_SEARCH_URL, headers=headers, params=params)
+                
+                if response.status_code == 401:
+                    self.logger.log("warning", "Authentication failed. Check your Bearer Token.")
+                    return []
+                elif response.status_code == 403:
+                    self.logger.log("warning", "Access forbidden. Check API permissions.")
+                    return []
+                elif response.status_code != 200:
+                    self.logger.log("warning", f"API error on page {page}: {response.status_code} - {response.text[:200]}")
+                    break  # Return what we have
+                
+                data = response.json()
+                if not data.get('data'):
+                    break
+                all_tweets.extend(_parse_api_tweets(data, limit - len(all_tweets)))
+                
+                # Get pagination token
+                next_token = data.get('meta', {}).get('next_token')
+                if not next_token:
+                    break
+        except Exception as e:
+            self.logger.log("error", f"Twitter API v2 error: {type(e).__name__}: {e}")
+        
+        self.logger.log("info", f"Twitter API v2 returned {len(all_tweets)} tweets from {page} page(s)")
+        return all_tweets
+    
+    async def _scrape_nitter(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """Try scraping from public Nitter instances (first one with results wins)."""
+        from bs4 import BeautifulSoup
+        
+        search_query = query.replace(' ', '%20')
+        for nitter_url in NITTER_INSTANCES:
+            try:
+                search_url = f"{nitter_url}/search?q={search_query}&f=tweets&since=&until=&near="
+                response = await self._fetch_get(search_url, headers=NITTER_HEADERS)
+                response.raise_for_status()
+                
+                soup = BeautifulSoup(response.content, 'html.parser')
+                results = _parse_nitter_tweets(soup.find_all('article', class_='tweet'), nitter_url, limit)
+                if results:
+                    self.logger.log("info", f"Found {len(results)} tweets from {nitter_url}")
+                    return results
+            except Exception as e:
+                self.logger.log("debug", f"{nitter_url} failed: {str(e)[:100]}")
+                continue
+        return []
+
+
+# Global scraper instance
+_async_scraper = XScraper()
+
+
+async def scrape_x_async(query: str, limit: int = 50) -> List[Dict[str, Any]]:
+    """Async entry point for X scraper."""
+    return await _async_scraper.scrape(query, limit)
+
+
+async def scrape_x_multi_queries_async(limit: int = 50) -> List[Dict[str, Any]]:
+    """Scrape X for the complaint-focused MULTI_QUERIES, concurrently; results are deduplicated by URL."""
+    per_query_limit = limit // len(MULTI_QUERIES)
+    results = await asyncio.gather(*(
+        scrape_x_async(query_term, limit=per_query_limit) for query_term in MULTI_QUERIES
+    ), return_exceptions=True)
+    
+    all_results = []
+    seen_urls = set()
+    for query_term, posts in zip(MULTI_QUERIES, results):
+        if isinstance(posts, Exception):
+            logger.error(f"[X SCRAPER] Error scraping '{query_term}': {posts}")
+            continue
+        for post in posts:
+            url = post.get('url')
+            if url and url in seen_urls:
+                continue
+            if url:
+                seen_urls.add(url)
+            all_results.append(post)
+    
+    logger.info(f"[X SCRAPER] Total posts scraped: {len(all_results)}")
+    return all_results
+
 
 def scrape_x(query: str, limit: int = 50):
-    """Scrape X (Twitter) using multiple strategies.
+    """Synchronous wrapper for async scraper (for backward compatibility)."""
+    try:
+        loop = asyncio.get_event_loop()
+        if loop.is_running():
+            return _scrape_x_sync(query, limit)
+        else:
+            return loop.run_until_complete(scrape_x_async(query, limit))
+    except RuntimeError:
+        return asyncio.run(scrape_x_async(query, limit))
+
+
+def _scrape_x_sync(query: str, limit: int = 50):
+    """Synchronous fallback implementation.
+    
+    Scrape X (Twitter) using multiple strategies.
     
     Strategy priority:
     1. Twitter API v2 (if Bearer Token is configured)
@@ -73,27 +321,16 @@ def scrape_x(query: str, limit: int = 50):
 
 def _try_nitter_scrape(query: str, limit: int) -> list:
     """Try scraping from public Nitter instances."""
-    results = []  # Initialize results list
-    nitter_instances = [
-        "https://nitter.net",
-        "https://nitter.poast.org",
-        "https://nitter.1d4.us",
-    ]
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    }
-    
     search_query = query.replace(' ', '%20')
     
-    for nitter_url in nitter_instances:
+    for nitter_url in NITTER_INSTANCES:
         try:
             search_url = f"{nitter_url}/search?q={search_query}&f=tweets&since=&until=&near="
             logger.info(f"[X SCRAPER] Trying: {nitter_url}")
             
             response = requests.get(
                 search_url,
-                headers=headers,
+                headers=NITTER_HEADERS,
                 timeout=10,
                 allow_redirects=True
             )
@@ -101,38 +338,10 @@ def _try_nitter_scrape(query: str, limit: int) -> list:
             
             from bs4 import BeautifulSoup
             soup = BeautifulSoup(response.content, 'html.parser')
-            tweets = soup.find_all('article', class_='tweet')
-            
-            if tweets:
-                logger.info(f"[X SCRAPER] Found {len(tweets)} tweets from {nitter_url}")
-                for i, tweet in enumerate(tweets):
-                    if i >= limit:
-                        break
-                    try:
-                        author_elem = tweet.find('a', class_='username')
-                        author = author_elem.text.strip() if author_elem else 'Unknown'
-                        
-                        content_elem = tweet.find('div', class_='tweet-text')
-                        content = content_elem.text.strip() if content_elem else ''
-                        
-                        link_elem = tweet.find('a', class_='tweet-link')
-                        url = f"{nitter_url}{link_elem['href']}" if link_elem and link_elem.get('href') else ''
-                        
-                        if content:
-                            results.append({
-                                'source': 'X/Twitter',
-                                'author': author,
-                                'content': content,
-                                'url': url,
-                                'created_at': datetime.now().isoformat(),
-                                'language': detect_language(content),
-                            })
-                    except Exception as e:
-                        logger.warning(f"[X SCRAPER] Error parsing tweet: {e}")
-                        continue
-                
-                if results:
-                    return results
+            results = _parse_nitter_tweets(soup.find_all('article', class_='tweet'), nitter_url, limit)
+            if results:
+                logger.info(f"[X SCRAPER] Found {len(results)} tweets from {nitter_url}")
+                return results
         
         except Exception as e:
             logger.debug(f"[X SCRAPER] {nitter_url} failed: {str(e)[:100]}")
@@ -164,7 +373,7 @@ def _try_twitter_api_v2(query: str, limit: int, bearer_token: str) -> list:
             }
             
             # Twitter API v2 search endpoint
-            search_url = "https://api.twitter.com/2/tweets/search/recent"
+            search_url = TWITTER_SEARCH_URL
             params = {
                 'query': f"{query} -is:retweet lang:fr OR lang:en",  # Exclude retweets, French or English
                 'max_results': min(100, limit - len(all_tweets)),  # Max 100 per request
@@ -209,45 +418,7 @@ def _try_twitter_api_v2(query: str, limit: int, bearer_token: str) -> list:
                 logger.info(f"[X SCRAPER API] No more tweets on page {page}")
                 break
             
-            # Get user information from includes
-            users = {}
-            if 'includes' in data and 'users' in data['includes']:
-                for user in data['includes']['users']:
-                    users[user['id']] = user
-            
-            for tweet in tweets:
-                if len(all_tweets) >= limit:
-                    break
-                
-                try:
-                    author_id = tweet.get('author_id', '')
-                    author_info = users.get(author_id, {})
-                    author = author_info.get('username', 'unknown')
-                    if not author or author == 'unknown':
-                        author = author_info.get('name', 'Unknown')
-                    
-                    content = tweet.get('text', '')
-                    if not content:
-                        continue
-                    
-                    created_at = tweet.get('created_at', datetime.now().isoformat())
-                    tweet_id = tweet.get('id', '')
-                    url = f"https://twitter.com/{author}/status/{tweet_id}" if tweet_id else ''
-                    
-                    lang = tweet.get('lang', 'unknown')
-                    
-                    all_tweets.append({
-                        'source': 'X/Twitter',
-                        'author': f"@{author}" if not author.startswith('@') else author,
-                        'content': content,
-                        'url': url,
-                        'created_at': created_at,
-                        'language': lang if lang in ['fr', 'en'] else detect_language(content),
-                    })
-                    logger.debug(f"✓ Twitter API: @{author} - {content[:50]}")
-                except Exception as e:
-                    logger.warning(f"Could not parse Twitter tweet: {e}")
-                    continue
+            all_tweets.extend(_parse_api_tweets(data, limit - len(all_tweets)))
             
             # Get pagination token
             meta = data.get('meta', {})
@@ -296,13 +467,7 @@ def scrape_x_multi_queries(limit: int = 50):
     - problems OVH domain registration
     """
     
-    queries = [
-        "OVH domain TLD complaint",
-        "OVH renew domain expensive",
-        "OVH registrar bad support",
-        "OVH domain expensive",
-        "problems OVH domain registration",
-    ]
+    queries = MULTI_QUERIES
     
     all_results = []
     seen_urls = set()
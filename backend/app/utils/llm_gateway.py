@@ -0,0 +1,412 @@
+"""
+LLM Gateway
+===========
+Single entry point for the chat completion calls to OpenAI, Anthropic, Mistral
+and OVH AI Endpoints (insights, recommended actions, ideas, language detection).
+
+- One pooled httpx.AsyncClient per provider and event loop: connections are
+  kept alive between calls instead of paying a TLS handshake every time.
+  Synchronous entry points use run(), which closes the clients of its loop.
+- Identical requests in flight (same provider, model, system prompt, prompt
+  and parameters) are coalesced: one HTTP call, every caller gets its result.
+- Responses are cached by content hash (provider + model + prompts +
+  parameters) for LLM_CACHE_TTL seconds, in Redis when available so all API
+  workers share it, in process memory otherwise.
+- At most LLM_MAX_CONCURRENCY calls per provider run at once.
+- Latency, token and cache metrics per provider (get_metrics()).
+
+HTTP errors are raised as-is (httpx.HTTPStatusError, httpx.TimeoutException),
+callers keep their own error handling.
+"""
+from __future__ import annotations
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Tuple
+
+import httpx
+
+from ..job_queue import REDIS_URL, REDIS_AVAILABLE, redis
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_TTL = int(os.getenv('LLM_CACHE_TTL', '3600'))
+LLM_MAX_CONCURRENCY = max(1, int(os.getenv('LLM_MAX_CONCURRENCY', '4')))
+LLM_LOCAL_CACHE_SIZE = int(os.getenv('LLM_LOCAL_CACHE_SIZE', '256'))
+OVH_MODELS_TTL = 600
+CACHE_PREFIX = "ocft:llm:cache:"
+
+
+@dataclass(frozen=True)
+class ProviderSpec:
+    """Where and how to call a provider."""
+    base_url: Optional[str]
+    model_env: str
+    default_model: Optional[str]
+
+
+PROVIDERS: Dict[str, ProviderSpec] = {
+    'openai': ProviderSpec('https://api.openai.com/v1', 'OPENAI_MODEL', 'gpt-4o-mini'),
+    'anthropic': ProviderSpec('https://api.anthropic.com/v1', 'ANTHROPIC_MODEL', 'claude-3-haiku-20240307'),
+    'mistral': ProviderSpec('https://api.mistral.ai/v1', 'MISTRAL_MODEL', 'mistral-small'),
+    # OpenAI-compatible, the endpoint URL and model come from the config
+    'ovh': ProviderSpec(None, 'OVH_MODEL', None),
+}
+
+
+@dataclass
+class ProviderMetrics:
+    """Counters of one provider (process-local)."""
+    calls: int = 0
+    errors: int = 0
+    cache_hits: int = 0
+    coalesced: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'cache_hits': self.cache_hits,
+            'coalesced': self.coalesced,
+            'avg_latency': round(self.total_latency / self.calls, 3) if self.calls else 0.0,
+            'max_latency': round(self.max_latency, 3),
+            'input_tokens': self.input_tokens,
+            'output_tokens': self.output_tokens,
+        }
+
+
+@dataclass
+class _LoopState:
+    """Clients, semaphores and in-flight calls of one event loop."""
+    clients: Dict[str, httpx.AsyncClient] = field(default_factory=dict)
+    semaphores: Dict[str, asyncio.Semaphore] = field(default_factory=dict)
+    inflight: Dict[str, asyncio.Task] = field(default_factory=dict)
+
+
+class LLMGateway:
+    """Pooled, coalescing, caching client for the LLM providers."""
+
+    def __init__(self, cache_ttl: int = LLM_CACHE_TTL, max_concurrency: int = LLM_MAX_CONCURRENCY,
+                 redis_url: str = REDIS_URL):
+        self.cache_ttl = cache_ttl
+        self.max_concurrency = max_concurrency
+        self.redis_url = redis_url
+        self._redis = None
+        self._redis_failed = False
+        self._local_cache: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+        self._ovh_models: Dict[str, Tuple[float, List[str]]] = {}
+        self.metrics: Dict[str, ProviderMetrics] = {}
+
+    # ---------- Public API ----------
+
+    async def complete(
+        self,
+        provider: str,
+        api_key: str,
+        prompt: str,
+        system: Optional[str] = None,
+        model: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        timeout: float = 60.0,
+        cache_ttl: Optional[int] = None,
+    ) -> str:
+        """
+        Run a chat completion and return the text of the answer.
+
+        Args:
+            provider: openai, anthropic, mistral or ovh
+            api_key: Provider API key
+            prompt: User message
+            system: System prompt
+            model: Model name (default: <PROVIDER>_MODEL env variable, then the provider default)
+            endpoint: Base URL (required for ovh)
+            temperature: Sampling temperature (not sent to Anthropic)
+            max_tokens: Maximum tokens of the answer
+            timeout: Request timeout in seconds
+            cache_ttl: Response cache TTL in seconds (default LLM_CACHE_TTL, 0 disables the cache)
+        """
+        url, headers, body = self._build_request(provider, api_key, prompt, system, model,
+                                                 endpoint, temperature, max_tokens)
+        key = self._cache_key(provider, url, body)
+        ttl = self.cache_ttl if cache_ttl is None else cache_ttl
+        metrics = self._metrics(provider)
+
+        if ttl > 0:
+            cached = await self._cache_get(key)
+            if cached is not None:
+                metrics.cache_hits += 1
+                return cached
+
+        state = self._loop_state()
+        task = state.inflight.get(key)
+        if task is not None:
+            metrics.coalesced += 1
+        else:
+            task = asyncio.ensure_future(self._send(provider, url, headers, body, timeout, key, ttl))
+            state.inflight[key] = task
+            task.add_done_callback(lambda t, key=key: self._call_done(state, key, t))
+        # shield: a caller going away (client disconnect) must not cancel the call of the others
+        return await asyncio.shield(task)
+
+    async def list_ovh_models(self, api_key: str, endpoint: str) -> List[str]:
+        """Models available on an OVH AI endpoint (cached OVH_MODELS_TTL seconds, [] on error)."""
+        cached = self._ovh_models.get(endpoint)
+        if cached and time.monotonic() - cached[0] < OVH_MODELS_TTL:
+            return cached[1]
+        models: List[str] = []
+        try:
+            response = await self._client('ovh').get(
+                f'{endpoint}/models',
+                headers={'Authorization': f'Bearer {api_key}'},
+                timeout=5.0
+            )
+            if response.status_code == 200:
+                data = response.json()
+                if isinstance(data, dict) and 'data' in data:
+                    models = [m.get('id', '') for m in data['data'] if 'id' in m]
+        except Exception as e:
+            logger.warning(f"Could not fetch available OVH models: {e}")
+            return []
+        self._ovh_models[endpoint] = (time.monotonic(), models)
+        return models
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Per-provider metrics and cache backend."""
+        return {
+            'providers': {name: m.to_dict() for name, m in self.metrics.items()},
+            'cache_backend': 'redis' if self._get_redis() is not None else 'memory',
+            'cache_ttl': self.cache_ttl,
+            'max_concurrency': self.max_concurrency,
+        }
+
+    async def aclose(self):
+        """Close the pooled clients of the current event loop."""
+        state = self._loops.pop(asyncio.get_running_loop(), None)
+        if state:
+            for client in state.clients.values():
+                await client.aclose()
+
+    # ---------- Requests ----------
+
+    def _build_request(self, provider: str, api_key: str, prompt: str, system: Optional[str],
+                       model: Optional[str], endpoint: Optional[str], temperature: float,
+                       max_tokens: int) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        spec = PROVIDERS.get(provider)
+        if spec is None:
+            raise ValueError(f"Unknown LLM provider: {provider}")
+        model = model or os.getenv(spec.model_env) or spec.default_model
+        if not model:
+            raise ValueError(f"No model configured for {provider}")
+
+        if provider == 'anthropic':
+            body: Dict[str, Any] = {
+                'model': model,
+                'max_tokens': max_tokens,
+                'messages': [{'role': 'user', 'content': prompt}],
+            }
+            if system:
+                body['system'] = system
+            headers = {
+                'x-api-key': api_key,
+                'anthropic-version': '2023-06-01',
+                'Content-Type': 'application/json'
+            }
+            return f'{spec.base_url}/messages', headers, body
+
+        base_url = spec.base_url or (endpoint or '').rstrip('/')
+        if not base_url:
+            raise ValueError(f"No endpoint URL configured for {provider}")
+        messages = [{'role': 'system', 'content': system}] if system else []
+        messages.append({'role': 'user', 'content': prompt})
+        body = {
+            'model': model,
+            'messages': messages,
+            'temperature': temperature,
+            'max_tokens': max_tokens,
+        }
+        headers = {
+            'Authorization': f'Bearer {api_key}',
+            'Content-Type': 'application/json'
+        }
+        return f'{base_url}/chat/completions', headers, body
+
+    async def _send(self, provider: str, url: str, headers: Dict[str, str], body: Dict[str, Any],
+                    timeout: float, key: str, ttl: int) -> str:
+        metrics = self._metrics(provider)
+        async with self._semaphore(provider):
+            start = time.monotonic()
+            try:
+                response = await self._client(provider).post(url, headers=headers, json=body, timeout=timeout)
+                response.raise_for_status()
+                content, input_tokens, output_tokens = self._parse(provider, response.json())
+            except Exception:
+                metrics.errors += 1
+                raise
+            finally:
+                latency = time.monotonic() - start
+                metrics.calls += 1
+                metrics.total_latency += latency
+                metrics.max_latency = max(metrics.max_latency, latency)
+
+        metrics.input_tokens += input_tokens
+        metrics.output_tokens += output_tokens
+        if ttl > 0:
+            await self._cache_set(key, content, ttl)
+        return content
+
+    @staticmethod
+    def _parse(provider: str, data: Dict[str, Any]) -> Tuple[str, int, int]:
+        usage = data.get('usage') or {}
+        if provider == 'anthropic':
+            return (data['content'][0]['text'],
+                    int(usage.get('input_tokens') or 0), int(usage.get('output_tokens') or 0))
+        return (data['choices'][0]['message']['content'],
+                int(usage.get('prompt_tokens') or 0), int(usage.get('completion_tokens') or 0))
+
+    def _call_done(self, state: _LoopState, key: str, task: asyncio.Task):
+        if state.inflight.get(key) is task:
+            del state.inflight[key]
+        # Mark the exception as retrieved if every caller went away
+        if not task.cancelled():
+            task.exception()
+
+    # ---------- Per event loop state ----------
+
+    def _loop_state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            state = self._loops[loop] = _LoopState()
+        return state
+
+    def _client(self, provider: str) -> httpx.AsyncClient:
+        state = self._loop_state()
+        client = state.clients.get(provider)
+        if client is None or client.is_closed:
+            client = state.clients[provider] = httpx.AsyncClient(
+                timeout=60.0,
+                limits=httpx.Limits(max_connections=self.max_concurrency * 2,
+                                    max_keepalive_connections=self.max_concurrency)
+            )
+        return client
+
+    def _semaphore(self, provider: str) -> asyncio.Semaphore:
+        state = self._loop_state()
+        semaphore = state.semaphores.get(provider)
+        if semaphore is None:
+            semaphore = state.semaphores[provider] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    def _metrics(self, provider: str) -> ProviderMetrics:
+        metrics = self.metrics.get(provider)
+        if metrics is None:
+            metrics = self.metrics.setdefault(provider, ProviderMetrics())
+        return metrics
+
+    # ---------- Response cache ----------
+
+    @staticmethod
+    def _cache_key(provider: str, url: str, body: Dict[str, Any]) -> str:
+        payload = json.dumps({'provider': provider, 'url': url, 'body': body},
+                             sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _get_redis(self):
+        if self._redis is None and not self._redis_failed and REDIS_AVAILABLE:
+            with self._lock:
+                if self._redis is None and not self._redis_failed:
+                    try:
+                        client = redis.from_url(self.redis_url, decode_responses=True,
+                                                socket_timeout=1.0, socket_connect_timeout=1.0)
+                        client.ping()
+                        self._redis = client
+                    except Exception as e:
+                        logger.warning(f"Redis not available ({e}), LLM responses cached in memory")
+                        self._redis_failed = True
+        return self._redis
+
+    async def _cache_get(self, key: str) -> Optional[str]:
+        client = self._get_redis()
+        if client is not None:
+            try:
+                return await asyncio.to_thread(client.get, CACHE_PREFIX + key)
+            except Exception as e:
+                logger.debug(f"LLM cache read failed: {e}")
+                return None
+        with self._lock:
+            entry = self._local_cache.get(key)
+            if entry is None:
+                return None
+            expires_at, content = entry
+            if expires_at < time.monotonic():
+                del self._local_cache[key]
+                return None
+            self._local_cache.move_to_end(key)
+            return content
+
+    async def _cache_set(self, key: str, content: str, ttl: int):
+        client = self._get_redis()
+        if client is not None:
+            try:
+                await asyncio.to_thread(client.set, CACHE_PREFIX + key, content, ex=ttl)
+            except Exception as e:
+                logger.debug(f"LLM cache write failed: {e}")
+            return
+        with self._lock:
+            self._local_cache[key] = (time.monotonic() + ttl, content)
+            self._local_cache.move_to_end(key)
+            while len(self._local_cache) > LLM_LOCAL_CACHE_SIZE:
+                self._local_cache.popitem(last=False)
+
+
+# ============================================
+# Global gateway instance
+# ============================================
+
+_gateway: Optional[LLMGateway] = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Get the global LLM gateway."""
+    global _gateway
+    if _gateway is None:
+        _gateway = LLMGateway()
+    return _gateway
+
+
+def run(coro):
+    """
+    asyncio.run() for synchronous entry points (worker jobs, scheduler):
+    closes the pooled clients of the new event loop before it ends.
+    """
+    async def main():
+        try:
+            return await coro
+        finally:
+            await get_llm_gateway().aclose()
+    return asyncio.run(main())
+
+
+async def complete(provider: str, api_key: str, prompt: str, **kwargs) -> str:
+    """Shortcut for get_llm_gateway().complete()."""
+    return await get_llm_gateway().complete(provider, api_key, prompt, **kwargs)
+
+
+def get_metrics() -> Dict[str, Any]:
+    """Shortcut for get_llm_gateway().get_metrics()."""
+    return get_llm_gateway().get_metrics()
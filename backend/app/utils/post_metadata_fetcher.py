@@ -1,12 +1,14 @@
 """
 Utility functions to fetch post metadata from URLs for re-checking answered status.
 """
+import os
 import re
+import json
 import logging
 import httpx
 import asyncio
 import random
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -101,12 +103,13 @@ async def fetch_reddit_post_metadata(url: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-async def fetch_github_issue_metadata(url: str) -> Optional[Dict[str, Any]]:
+async def fetch_github_issue_metadata(url: str, client: Optional[httpx.AsyncClient] = None) -> Optional[Dict[str, Any]]:
     """
     Fetch metadata for a specific GitHub issue from its URL.
     
     Args:
         url: GitHub issue URL (e.g., https://github.com/owner/repo/issues/123)
+        client: Shared client to reuse (a new one is opened when None)
     
     Returns:
         Dict with metadata (comments, comments_count, etc.) or None if failed
@@ -128,35 +131,37 @@ async def fetch_github_issue_metadata(url: str) -> Optional[Dict[str, Any]]:
         }
         
         # Add GitHub token if available
-        import os
         github_token = os.getenv('GITHUB_TOKEN')
         if github_token:
             headers['Authorization'] = f'token {github_token}'
         
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        if client is not None:
             response = await client.get(api_url, headers=headers)
-            
-            # Handle rate limiting
-            if response.status_code == 403:
-                logger.warning("GitHub API rate limit reached")
-                return None
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            # GitHub issues can be 'open' or 'closed'
-            # Only closed issues should be considered as potentially "answered"
-            # But even closed issues might not be answered (could be closed as "not planned", etc.)
-            state = data.get('state', 'open')
-            
-            return {
-                'source': 'github',
-                'comments': data.get('comments', 0),
-                'comments_count': data.get('comments', 0),
-                'state': state,  # 'open' or 'closed'
-                'closed_at': data.get('closed_at'),  # When issue was closed, if applicable
-                'url': url
-            }
+        else:
+            async with httpx.AsyncClient(timeout=10.0) as new_client:
+                response = await new_client.get(api_url, headers=headers)
+        
+        # Handle rate limiting
+        if response.status_code == 403:
+            logger.warning("GitHub API rate limit reached")
+            return None
+        
+        response.raise_for_status()
+        data = response.json()
+        
+        # GitHub issues can be 'open' or 'closed'
+        # Only closed issues should be considered as potentially "answered"
+        # But even closed issues might not be answered (could be closed as "not planned", etc.)
+        state = data.get('state', 'open')
+        
+        return {
+            'source': 'github',
+            'comments': data.get('comments', 0),
+            'comments_count': data.get('comments', 0),
+            'state': state,  # 'open' or 'closed'
+            'closed_at': data.get('closed_at'),  # When issue was closed, if applicable
+            'url': url
+        }
         
     except Exception as e:
         logger.debug(f"Error fetching GitHub metadata for {url}: {e}")
@@ -246,17 +251,323 @@ async def fetch_post_metadata_from_url(url: str, source: str) -> Optional[Dict[s
     Returns:
         Dict with metadata or None if failed
     """
-    source_lower = source.lower()
+    metadata_source = get_metadata_source(url, source)
     
-    if 'reddit.com' in url.lower() or source_lower == 'reddit':
+    if metadata_source == 'reddit':
         return await fetch_reddit_post_metadata(url)
-    elif 'github.com' in url.lower() or source_lower == 'github':
+    elif metadata_source == 'github':
         return await fetch_github_issue_metadata(url)
-    elif 'stackoverflow.com' in url.lower() or source_lower == 'stackoverflow' or source_lower == 'stack overflow':
+    elif metadata_source == 'stackoverflow':
         return await fetch_stackoverflow_question_metadata(url)
-    elif 'trustpilot.com' in url.lower() or source_lower == 'trustpilot':
+    elif metadata_source == 'trustpilot':
         return await fetch_trustpilot_review_metadata(url)
     else:
         logger.debug(f"Metadata fetching not implemented for source: {source}")
         return None
 
+
+def get_metadata_source(url: str, source: str) -> Optional[str]:
+    """
+    Metadata provider of a post ('reddit', 'github', 'stackoverflow', 'trustpilot'),
+    from its URL or its source name; None if metadata fetching is not implemented.
+    """
+    url_lower = (url or '').lower()
+    source_lower = (source or '').lower()
+    
+    if 'reddit.com' in url_lower or source_lower == 'reddit':
+        return 'reddit'
+    elif 'github.com' in url_lower or source_lower == 'github':
+        return 'github'
+    elif 'stackoverflow.com' in url_lower or source_lower in ('stackoverflow', 'stack overflow'):
+        return 'stackoverflow'
+    elif 'trustpilot.com' in url_lower or source_lower == 'trustpilot':
+        return 'trustpilot'
+    return None
+
+
+
+
+# ---------------------------------------------------------------------------
+# Batch fetching (answered-status rechecks)
+# ---------------------------------------------------------------------------
+# The providers' multi-id endpoints return up to this many posts per request
+STACKOVERFLOW_BATCH_SIZE = 100  # /questions/{id1;id2;...}
+REDDIT_BATCH_SIZE = 100  # /api/info?id=t3_a,t3_b
+GITHUB_GRAPHQL_BATCH_SIZE = 50  # aliased issue lookups per GraphQL query
+
+# Requests in flight per provider during a batch fetch
+METADATA_CONCURRENCY = {
+    'reddit': 1,
+    'github': 4,
+    'stackoverflow': 2,
+}
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+
+def create_metadata_client() -> httpx.AsyncClient:
+    """Pooled client shared by all the requests of a batch fetch (use as `async with`)."""
+    return httpx.AsyncClient(
+        timeout=15.0,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+    )
+
+
+def _chunks(items: List[Any], size: int) -> List[List[Any]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _urls_by_id(urls: List[str], pattern: str) -> Dict[Any, List[str]]:
+    """Group URLs by the id(s) captured by `pattern` (several URLs can point to the same post)."""
+    by_id: Dict[Any, List[str]] = {}
+    for url in urls:
+        match = re.search(pattern, url or '')
+        if not match:
+            logger.debug(f"Could not extract post ID from URL: {url}")
+            continue
+        key = match.group(1) if match.re.groups == 1 else match.groups()
+        by_id.setdefault(key, []).append(url)
+    return by_id
+
+
+async def fetch_stackoverflow_questions_metadata(urls: List[str], client: httpx.AsyncClient,
+                                                 semaphore: Optional[asyncio.Semaphore] = None,
+                                                 delay: float = 0.0) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch metadata for many Stack Overflow questions, 100 ids per API request.
+    
+    Args:
+        urls: Stack Overflow question URLs
+        client: Shared client
+        semaphore: Limits the requests in flight
+        delay: Pause after each request (seconds)
+    
+    Returns:
+        Dict of URL -> metadata (same shape as fetch_stackoverflow_question_metadata);
+        questions that could not be fetched are missing
+    """
+    urls_by_id = _urls_by_id(urls, r'stackoverflow\.com/questions/(\d+)')
+    semaphore = semaphore or asyncio.Semaphore(METADATA_CONCURRENCY['stackoverflow'])
+    results: Dict[str, Dict[str, Any]] = {}
+    
+    async def fetch_chunk(ids: List[str]):
+        async with semaphore:
+            try:
+                response = await client.get(
+                    "https://api.stackexchange.com/2.3/questions/" + ';'.join(ids),
+                    params={"site": "stackoverflow", "pagesize": len(ids)},
+                    headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
+                )
+                response.raise_for_status()
+                data = response.json()
+            except Exception as e:
+                logger.debug(f"Error fetching Stack Overflow metadata for {len(ids)} questions: {e}")
+                return
+            for item in data.get('items', []):
+                for url in urls_by_id.get(str(item.get('question_id')), []):
+                    results[url] = {
+                        'source': 'stackoverflow',
+                        'is_answered': item.get('is_answered', False),
+                        'answer_count': item.get('answer_count', 0),
+                        'answers': item.get('answer_count', 0),
+                        'url': url
+                    }
+            # The API asks clients to wait `backoff` seconds before the next request
+            await asyncio.sleep(max(delay, data.get('backoff', 0)))
+    
+    await asyncio.gather(*(fetch_chunk(ids) for ids in _chunks(list(urls_by_id), STACKOVERFLOW_BATCH_SIZE)))
+    return results
+
+
+async def fetch_reddit_posts_metadata(urls: List[str], client: httpx.AsyncClient,
+                                      semaphore: Optional[asyncio.Semaphore] = None,
+                                      delay: float = 0.0) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch metadata for many Reddit posts, 100 fullnames per /api/info request.
+    
+    Args:
+        urls: Reddit post URLs
+        client: Shared client
+        semaphore: Limits the requests in flight
+        delay: Pause after each request (seconds, randomized up to +1s)
+    
+    Returns:
+        Dict of URL -> metadata (same shape as fetch_reddit_post_metadata);
+        posts that could not be fetched are missing
+    """
+    urls_by_id = _urls_by_id(urls, r'/r/\w+/comments/(\w+)')
+    semaphore = semaphore or asyncio.Semaphore(METADATA_CONCURRENCY['reddit'])
+    results: Dict[str, Dict[str, Any]] = {}
+    
+    async def fetch_chunk(ids: List[str]):
+        async with semaphore:
+            headers = {
+                'User-Agent': get_random_user_agent(),
+                'Accept': 'application/json',
+                'Accept-Language': random.choice(['en-US,en;q=0.9', 'fr-FR,fr;q=0.9', 'en-GB,en;q=0.9']),
+                'Referer': 'https://www.reddit.com/',
+            }
+            try:
+                response = await client.get(
+                    "https://www.reddit.com/api/info.json",
+                    params={"id": ','.join(f"t3_{post_id}" for post_id in ids), "limit": len(ids)},
+                    headers=headers
+                )
+                if response.status_code == 403:
+                    logger.debug(f"Reddit API blocked a batch of {len(ids)} posts (403)")
+                    return
+                response.raise_for_status()
+                data = response.json()
+            except Exception as e:
+                logger.debug(f"Error fetching Reddit metadata for {len(ids)} posts: {e}")
+                return
+            finally:
+                # Irregular pauses to avoid pattern detection
+                await asyncio.sleep(get_random_delay(delay, delay + 1.0))
+            for child in data.get('data', {}).get('children', []):
+                post_data = child.get('data', {})
+                for url in urls_by_id.get(post_data.get('id'), []):
+                    results[url] = {
+                        'source': 'reddit',
+                        'num_comments': post_data.get('num_comments', 0),
+                        'comments': post_data.get('num_comments', 0),
+                        'url': url
+                    }
+    
+    await asyncio.gather(*(fetch_chunk(ids) for ids in _chunks(list(urls_by_id), REDDIT_BATCH_SIZE)))
+    return results
+
+
+async def fetch_github_issues_metadata(urls: List[str], client: httpx.AsyncClient,
+                                       semaphore: Optional[asyncio.Semaphore] = None,
+                                       delay: float = 0.0) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch metadata for many GitHub issues.
+    
+    With GITHUB_TOKEN, 50 issues are looked up per GraphQL query (one aliased
+    repository/issue field each); without it (GraphQL requires authentication)
+    issues are fetched one by one from the REST API on the shared client.
+    
+    Args:
+        urls: GitHub issue URLs
+        client: Shared client
+        semaphore: Limits the requests in flight
+        delay: Pause after each request (seconds)
+    
+    Returns:
+        Dict of URL -> metadata (same shape as fetch_github_issue_metadata);
+        issues that could not be fetched are missing
+    """
+    semaphore = semaphore or asyncio.Semaphore(METADATA_CONCURRENCY['github'])
+    results: Dict[str, Dict[str, Any]] = {}
+    github_token = os.getenv('GITHUB_TOKEN')
+    
+    if not github_token:
+        async def fetch_one(url: str):
+            async with semaphore:
+                metadata = await fetch_github_issue_metadata(url, client=client)
+                if metadata:
+                    results[url] = metadata
+                await asyncio.sleep(delay)
+        
+        await asyncio.gather(*(fetch_one(url) for url in urls))
+        return results
+    
+    urls_by_issue = _urls_by_id(urls, r'github\.com/([^/]+)/([^/]+)/issues/(\d+)')
+    headers = {
+        "Authorization": f"bearer {github_token}",
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+    }
+    
+    async def fetch_chunk(issues: List[tuple]):
+        # json.dumps quotes owner/repo names as GraphQL string literals
+        fields = [
+            f"i{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) "
+            f"{{ issue(number: {number}) {{ state closedAt comments {{ totalCount }} }} }}"
+            for i, (owner, repo, number) in enumerate(issues)
+        ]
+        async with semaphore:
+            try:
+                response = await client.post(
+                    GITHUB_GRAPHQL_URL,
+                    json={"query": "query { " + " ".join(fields) + " }"},
+                    headers=headers
+                )
+                if response.status_code == 403:
+                    logger.warning("GitHub API rate limit reached")
+                    return
+                response.raise_for_status()
+                # Missing repositories/issues come back as null with an `errors` entry
+                data = response.json().get('data') or {}
+            except Exception as e:
+                logger.debug(f"Error fetching GitHub metadata for {len(issues)} issues: {e}")
+                return
+            finally:
+                await asyncio.sleep(delay)
+        for i, issue_key in enumerate(issues):
+            issue = (data.get(f"i{i}") or {}).get('issue')
+            if not issue:
+                continue
+            comments = (issue.get('comments') or {}).get('totalCount', 0)
+            for url in urls_by_issue[issue_key]:
+                results[url] = {
+                    'source': 'github',
+                    'comments': comments,
+                    'comments_count': comments,
+                    'state': (issue.get('state') or 'OPEN').lower(),
+                    'closed_at': issue.get('closedAt'),
+                    'url': url
+                }
+    
+    await asyncio.gather(*(fetch_chunk(issues) for issues in _chunks(list(urls_by_issue), GITHUB_GRAPHQL_BATCH_SIZE)))
+    return results
+
+
+async def fetch_posts_metadata_batch(posts: List[Dict[str, Any]], client: Optional[httpx.AsyncClient] = None,
+                                     delay: float = 0.0) -> Dict[int, Dict[str, Any]]:
+    """
+    Fetch metadata for many posts with the providers' multi-id endpoints.
+    
+    Providers are queried concurrently, each with at most METADATA_CONCURRENCY
+    requests in flight; sources without a batch fetcher (Trustpilot...) are skipped.
+    
+    Args:
+        posts: Dicts with 'id', 'url' and 'source'
+        client: Shared client (one is opened for the call when None)
+        delay: Pause after each request, per provider (seconds)
+    
+    Returns:
+        Dict of post id -> metadata; posts that could not be fetched are missing
+    """
+    if client is None:
+        async with create_metadata_client() as new_client:
+            return await fetch_posts_metadata_batch(posts, client=new_client, delay=delay)
+    
+    fetchers = {
+        'reddit': fetch_reddit_posts_metadata,
+        'github': fetch_github_issues_metadata,
+        'stackoverflow': fetch_stackoverflow_questions_metadata,
+    }
+    urls_by_source: Dict[str, List[str]] = {}
+    for post in posts:
+        metadata_source = get_metadata_source(post.get('url'), post.get('source'))
+        if metadata_source in fetchers and post.get('url'):
+            urls_by_source.setdefault(metadata_source, []).append(post['url'])
+    
+    results = await asyncio.gather(*(
+        fetchers[metadata_source](urls, client, asyncio.Semaphore(METADATA_CONCURRENCY[metadata_source]), delay)
+        for metadata_source, urls in urls_by_source.items()
+    ), return_exceptions=True)
+    
+    metadata_by_url: Dict[str, Dict[str, Any]] = {}
+    for metadata_source, result in zip(urls_by_source, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Error fetching {metadata_source} metadata: {result}")
+            continue
+        metadata_by_url.update(result)
+    
+    return {
+        post['id']: metadata_by_url[post['url']]
+        for post in posts if post.get('url') in metadata_by_url
+    }
@@ -18,7 +18,8 @@ from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 
 from app.job_queue import (
-    enqueue_auto_scrape_job, enqueue_backup_job, get_job_queue
+    enqueue_auto_scrape_job, enqueue_backup_job, enqueue_refresh_insights_job,
+    get_job_queue
 )
 from app import database as db
 
@@ -77,6 +78,15 @@ def trigger_daily_backup():
         logger.error(f"Failed to trigger daily backup: {e}")
 
 
+def trigger_refresh_insights():
+    """Trigger a refresh of the precomputed insights via job queue."""
+    try:
+        job_id = enqueue_refresh_insights_job()
+        logger.info(f"Triggered insights refresh job: {job_id}")
+    except Exception as e:
+        logger.error(f"Failed to trigger insights refresh: {e}")
+
+
 def log_queue_stats():
     """Log queue statistics."""
     try:
@@ -84,7 +94,8 @@ def log_queue_stats():
         stats = queue.get_queue_stats()
         logger.info(f"Queue stats: pending={stats['pending']}, "
                    f"processing={stats['processing']}, "
-                   f"completed_today={stats['completed_today']}")
+                   f"completed_today={stats['completed_today']}, "
+                   f"failed_today={stats['failed_today']}")
     except Exception as e:
         logger.warning(f"Could not get queue stats: {e}")
 
@@ -118,6 +129,15 @@ def setup_jobs():
         replace_existing=True
     )
     
+    # Precomputed insights: hourly (only recomputed if their posts changed)
+    scheduler.add_job(
+        trigger_refresh_insights,
+        IntervalTrigger(hours=1),
+        id='refresh_insights',
+        name='Refresh Insights',
+        replace_existing=True
+    )
+    
     # Queue stats every 15 minutes
     scheduler.add_job(
         log_queue_stats,
@@ -0,0 +1,14 @@
+-- Migration: Add content_hash column to posts table
+-- Enables indexed duplicate detection (same normalized content for the same source)
+-- instead of scanning recent posts of the source on every insert.
+
+-- Add column if it doesn't exist
+ALTER TABLE posts
+ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+
+-- Unique per source; NULL hashes (short content, not yet backfilled) never conflict
+CREATE UNIQUE INDEX IF NOT EXISTS idx_posts_source_content_hash
+ON posts(source, content_hash) WHERE content_hash IS NOT NULL;
+
+-- Existing rows must be backfilled from Python (the hash uses the same
+-- normalization as the application): python scripts/backfill_content_hash.py
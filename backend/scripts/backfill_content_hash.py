@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Script de backfill de la colonne content_hash des posts existants.
+
+Calcule le hash du contenu normalisé (même normalisation que insert_post) pour
+tous les posts qui n'en ont pas encore. Les posts dont le contenu est un doublon
+d'un post plus ancien de la même source gardent un hash NULL (l'index unique
+(source, content_hash) l'interdit) et sont comptés comme doublons ; ils peuvent
+être supprimés avec --delete-duplicates.
+
+Usage:
+    python scripts/backfill_content_hash.py [--batch-size 1000] [--delete-duplicates]
+"""
+
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from psycopg2.extras import execute_values
+
+from app.db_postgres import get_pg_cursor, _compute_content_hash, _apply_schema_migrations
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def backfill(batch_size: int = 1000, delete_duplicates: bool = False) -> dict:
+    """Backfill content_hash by id order so the oldest post of a duplicate group keeps the hash."""
+    # Make sure the column and the unique index exist
+    _apply_schema_migrations()
+
+    with get_pg_cursor() as cur:
+        cur.execute("SELECT source, content_hash FROM posts WHERE content_hash IS NOT NULL")
+        seen = {(row['source'], row['content_hash']) for row in cur.fetchall()}
+
+    updated = 0
+    duplicate_ids = []
+    last_id = 0
+
+    while True:
+        with get_pg_cursor() as cur:
+            cur.execute("""
+                SELECT id, source, content FROM posts
+                WHERE content_hash IS NULL AND id > %s
+                ORDER BY id
+                LIMIT %s
+            """, (last_id, batch_size))
+            rows = cur.fetchall()
+
+        if not rows:
+            break
+        last_id = rows[-1]['id']
+
+        values = []
+        for row in rows:
+            content_hash = _compute_content_hash(row['content'] or '')
+            if not content_hash:
+                continue
+            key = (row['source'], content_hash)
+            if key in seen:
+                duplicate_ids.append(row['id'])
+                continue
+            seen.add(key)
+            values.append((row['id'], content_hash))
+
+        if values:
+            with get_pg_cursor() as cur:
+                execute_values(cur, """
+                    UPDATE posts SET content_hash = v.content_hash
+                    FROM (VALUES %s) AS v(id, content_hash)
+                    WHERE posts.id = v.id
+                """, values, page_size=len(values))
+                updated += cur.rowcount
+
+        logger.info(f"... {updated} hashes écrits, {len(duplicate_ids)} doublons (dernier id: {last_id})")
+
+    deleted = 0
+    if delete_duplicates and duplicate_ids:
+        with get_pg_cursor() as cur:
+            cur.execute("DELETE FROM posts WHERE id = ANY(%s)", (duplicate_ids,))
+            deleted = cur.rowcount
+
+    return {'updated': updated, 'duplicates': len(duplicate_ids), 'deleted': deleted}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill posts.content_hash")
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--delete-duplicates', action='store_true',
+                        help="Supprimer les doublons de contenu détectés (garde le plus ancien)")
+    args = parser.parse_args()
+
+    logger.info("🔍 Backfill de content_hash...")
+    try:
+        stats = backfill(batch_size=args.batch_size, delete_duplicates=args.delete_duplicates)
+    except Exception as e:
+        logger.error(f"❌ Erreur lors du backfill: {e}")
+        raise
+
+    logger.info(f"✅ {stats['updated']} posts mis à jour, {stats['duplicates']} doublons détectés, "
+                f"{stats['deleted']} supprimés")
+    return stats
+
+
+if __name__ == "__main__":
+    main()
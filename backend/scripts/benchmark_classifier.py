@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark du classifieur pain points / produits.
+
+Compare le coût par post des anciennes détections (detect_product_label avec
+ses regex recompilées à chaque appel, scans de sous-chaînes de
+get_product_opportunities et get_pain_points) avec le classifieur compilé de
+app/analysis/classifier.py, sur un corpus synthétique reproductible.
+
+Usage:
+    python scripts/benchmark_classifier.py [--posts 5000] [--repeat 3]
+"""
+
+import re
+import sys
+import random
+import argparse
+import importlib.util
+from pathlib import Path
+from timeit import timeit
+
+# Charger le module directement : importer le package app exige DATABASE_URL
+_spec = importlib.util.spec_from_file_location(
+    'classifier', Path(__file__).resolve().parents[1] / 'app' / 'analysis' / 'classifier.py'
+)
+classifier = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(classifier)
+
+SENTENCES = [
+    "My VPS has been down since this morning and support does not answer the ticket.",
+    "Le renouvellement du domaine a échoué, la facture a pourtant été payée.",
+    "Object storage S3 is really slow when uploading large backups.",
+    "Great experience with the dedicated server, installation was quick.",
+    "I can't configure the DNS zone for my domain, nameserver changes are ignored.",
+    "The public cloud instance lost its network connection after the upgrade.",
+    "Billing charged me twice for the same web hosting plan, need a refund.",
+    "Managed Kubernetes cluster: API endpoint returns error 502 randomly.",
+    "Email account on Exchange stopped receiving mail, SMTP timeout.",
+    "Just moved to OVHcloud, everything works fine so far.",
+    "The load balancer drops traffic and latency is terrible during a DDoS attack.",
+    "SSL certificate renewal failed on my hosting, HTTPS is broken.",
+]
+
+
+def legacy_detect_product_label(content: str):
+    """Ancienne version de db_postgres.detect_product_label (regex compilées à chaque appel)."""
+    if not content:
+        return None
+    content_lower = content.lower()
+    product_patterns = [
+        ('Domain', re.compile(r'\b(domain|domaine|dns|zone|registrar|nameserver|\.ovh|\.com|\.net|\.org)\b', re.I)),
+        ('WordPress', re.compile(r'\b(wordpress|wp\s*host|wp\s*config)\b', re.I)),
+        ('Email', re.compile(r'\b(email|exchange|mail|mx\s*record|zimbra|smtp|imap|pop3|mailbox)\b', re.I)),
+        ('Hosting', re.compile(r'\b(web\s*host|hosting|hébergement|mutualisé|shared\s*host|web\s*server)\b', re.I)),
+        ('VPS', re.compile(r'\b(vps|virtual\s*private\s*server|kimsufi)\b', re.I)),
+        ('Dedicated Server', re.compile(r'\b(dedicated|dédié|bare\s*metal|server\s*dedicated|serveur\s*dédié)\b', re.I)),
+        ('Public Cloud', re.compile(r'\b(public\s*cloud|openstack|instance|compute|ovhcloud|ovh\s*cloud)\b', re.I)),
+        ('Private Cloud', re.compile(r'\b(private\s*cloud|vmware|vsphere)\b', re.I)),
+        ('Managed Kubernetes', re.compile(r'\b(kubernetes|k8s|managed\s*k8s|container|pod|deployment)\b', re.I)),
+        ('Storage', re.compile(r'\b(object\s*storage|swift|s3|storage|cloud\s*storage|object\s*store)\b', re.I)),
+        ('Backup', re.compile(r'\b(backup|veeam|archive|snapshot|restore)\b', re.I)),
+        ('CDN', re.compile(r'\b(cdn|content\s*delivery|cache)\b', re.I)),
+        ('Load Balancer', re.compile(r'\b(load\s*balancer|iplb|lb|balancing)\b', re.I)),
+        ('DDoS Protection', re.compile(r'\b(ddos|anti-ddos|protection|mitigation)\b', re.I)),
+        ('Network', re.compile(r'\b(network|vrack|vlan|ip\s*address|subnet)\b', re.I)),
+        ('Billing', re.compile(r'\b(billing|facture|invoice|payment|paiement|refund|rembours|subscription)\b', re.I)),
+        ('Manager', re.compile(r'\b(manager|control\s*panel|espace\s*client|ovh\s*manager|panel)\b', re.I)),
+        ('API', re.compile(r'\b(api|sdk|integration|rest\s*api|webhook)\b', re.I)),
+        ('Support', re.compile(r'\b(support|ticket|assistance|help|service\s*client|customer\s*service)\b', re.I)),
+    ]
+    for label, pattern in product_patterns:
+        if pattern.search(content_lower):
+            return label
+    return None
+
+
+def legacy_classify(content: str):
+    """Anciens scans de sous-chaînes (get_pain_points + get_product_opportunities)."""
+    content = content.lower()
+    pain_points = [
+        title for title, info in classifier.DEFAULT_PAIN_POINTS.items()
+        if any(keyword.lower() in content for keyword in info['keywords'])
+    ]
+    products = [
+        product for product, keywords in classifier.PRODUCT_KEYWORDS.items()
+        if any(keyword in content for keyword in keywords)
+    ]
+    return pain_points, products
+
+
+def build_corpus(size: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [' '.join(rng.choices(SENTENCES, k=rng.randint(1, 6))) for _ in range(size)]
+
+
+def bench(label: str, func, posts, repeat: int):
+    seconds = min(timeit(lambda: func(posts), number=1) for _ in range(repeat))
+    per_post_us = seconds / len(posts) * 1e6
+    print(f"  {label:<52} {per_post_us:8.1f} µs/post")
+    return per_post_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du classifieur pain points / produits")
+    parser.add_argument('--posts', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    posts = build_corpus(args.posts)
+    compiled = classifier.get_classifier()
+    products = classifier.get_product_classifier()
+    print(f"📊 {len(posts)} posts, {sum(len(p) for p in posts) // len(posts)} caractères en moyenne\n")
+
+    print("Détection du produit (insert_post):")
+    before = bench("avant: detect_product_label (19 regex / appel)",
+                   lambda ps: [legacy_detect_product_label(p) for p in ps], posts, args.repeat)
+    after = bench("après: classifier.detect_product",
+                  lambda ps: [products.detect_product(p) for p in ps], posts, args.repeat)
+    print(f"  → x{before / after:.1f}\n")
+
+    print("Pain points + produits (agrégats):")
+    before = bench("avant: scans de sous-chaînes",
+                   lambda ps: [legacy_classify(p) for p in ps], posts, args.repeat)
+    after = bench("après: classifier.classify_many",
+                  compiled.classify_many, posts, args.repeat)
+    print(f"  → x{before / after:.1f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
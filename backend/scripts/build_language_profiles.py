@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Génère les profils n-grammes de caractères de la détection de langue.
+
+Lit app/analysis/data/language_seed_words.json (mots les plus fréquents par
+langue, par ordre de fréquence) et écrit app/analysis/data/language_profiles.json :
+pour chaque langue, le log de la probabilité de chaque n-gramme (1 à 3
+caractères, mots entourés d'espaces) et de chaque mot entier, pondérés par une
+loi de Zipf sur le rang du mot. Le résultat est déterministe : relancer le
+script après avoir modifié la liste de mots.
+
+Usage:
+    python scripts/build_language_profiles.py
+"""
+
+import json
+import math
+from collections import Counter
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parents[1] / 'app' / 'analysis' / 'data'
+SEED_FILE = DATA_DIR / 'language_seed_words.json'
+PROFILE_FILE = DATA_DIR / 'language_profiles.json'
+
+MAX_NGRAM = 3
+# Rangs décalés pour ne pas donner tout le poids aux tout premiers mots
+ZIPF_OFFSET = 10
+
+
+def word_ngrams(word: str, max_n: int = MAX_NGRAM):
+    """N-grammes de caractères d'un mot entouré d'espaces (" le " -> " l", "le ", " le"...)."""
+    padded = f' {word} '
+    for n in range(1, max_n + 1):
+        for i in range(len(padded) - n + 1):
+            gram = padded[i:i + n]
+            if gram.strip():
+                yield gram
+
+
+def _log_probabilities(counts: Counter):
+    total = sum(counts.values())
+    return {key: round(math.log(count / total), 4) for key, count in sorted(counts.items())}
+
+
+def build_profile(words):
+    """Retourne (n-grammes, mots) : log-probabilités pondérées par le rang."""
+    gram_counts = Counter()
+    word_counts = Counter()
+    rank = 0
+    for word in words:
+        word = word.lower().replace('’', "'")
+        if word in word_counts:
+            continue
+        weight = 1.0 / (rank + ZIPF_OFFSET)
+        rank += 1
+        word_counts[word] = weight
+        for gram in word_ngrams(word):
+            gram_counts[gram] += weight
+    return _log_probabilities(gram_counts), _log_probabilities(word_counts)
+
+
+def main():
+    seeds = json.loads(SEED_FILE.read_text(encoding='utf-8'))
+    profiles = {lang: build_profile(words) for lang, words in seeds.items() if not lang.startswith('_')}
+    payload = {
+        'max_ngram': MAX_NGRAM,
+        # Log-probabilité des entrées absentes d'un profil (un peu sous la plus rare)
+        'floor': {lang: round(min(grams.values()) - 1.0, 4) for lang, (grams, _) in profiles.items()},
+        'word_floor': {lang: round(min(words.values()) - 1.0, 4) for lang, (_, words) in profiles.items()},
+        'languages': {lang: grams for lang, (grams, _) in profiles.items()},
+        'words': {lang: words for lang, (_, words) in profiles.items()},
+    }
+    PROFILE_FILE.write_text(json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':')) + '\n', encoding='utf-8')
+    print(f"✅ {PROFILE_FILE.name}: " + ', '.join(f"{lang} ({len(grams)} n-grammes, {len(words)} mots)" for lang, (grams, words) in profiles.items()))
+
+
+if __name__ == "__main__":
+    main()
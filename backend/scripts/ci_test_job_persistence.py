@@ -9,6 +9,7 @@ proj_root = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(proj_root))
 
 from backend.app import main
+from backend.app.job_state import close_job_state_store
 
 client = TestClient(main.app)
 
@@ -28,18 +29,17 @@ print('Job id:', job_id)
 # Wait briefly for job record to be created in DB
 time.sleep(0.5)
 
-# Simulate process restart by removing job from in-memory JOBS
-if job_id in main.JOBS:
-    print('Simulating restart: removing job from main.JOBS')
-    main.JOBS.pop(job_id, None)
+# Simulate another API process: drop this process' connection to the job state store
+print('Simulating restart: closing the job state store')
+close_job_state_store()
 
-# Now query job via API; get_job_status should fall back to DB
+# Now query job via API; the state must come from the shared store (Redis or DB)
 print('GET /scrape/jobs/{job_id} (after simulated restart)')
 r2 = client.get(f'/scrape/jobs/{job_id}')
 print(r2.status_code, json.dumps(r2.json(), indent=2, ensure_ascii=False))
 
 if r2.status_code == 200 and r2.json().get('id') == job_id:
-    print('Persistence check: OK — job found in DB fallback')
+    print('Persistence check: OK — job found in the shared store')
     sys.exit(0)
 else:
     print('Persistence check: FAILED')
@@ -30,7 +30,10 @@ CREATE TABLE IF NOT EXISTS posts (
     answered_by VARCHAR(255),
     answer_detection_method VARCHAR(50),
     product VARCHAR(100),
-    inserted_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    content_hash VARCHAR(64),
+    inserted_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE,
+    change_xid xid8
 );
 
 -- Indexes for performance
@@ -39,10 +42,55 @@ CREATE INDEX IF NOT EXISTS idx_posts_sentiment ON posts(sentiment_label);
 CREATE INDEX IF NOT EXISTS idx_posts_created ON posts(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_posts_language ON posts(language);
 CREATE INDEX IF NOT EXISTS idx_posts_source_date ON posts(source, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_posts_lower_source_date ON posts(LOWER(source), created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_posts_url ON posts(url);
 CREATE INDEX IF NOT EXISTS idx_posts_product ON posts(product);
 CREATE INDEX IF NOT EXISTS idx_posts_is_answered ON posts(is_answered);
 CREATE INDEX IF NOT EXISTS idx_posts_content_trgm ON posts USING gin(content gin_trgm_ops);
+-- Duplicate detection: one row per normalized content per source
+CREATE UNIQUE INDEX IF NOT EXISTS idx_posts_source_content_hash ON posts(source, content_hash) WHERE content_hash IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_posts_change_xid ON posts(change_xid, id);
+CREATE INDEX IF NOT EXISTS idx_posts_updated_at ON posts(updated_at);
+
+-- ============================================
+-- Delta sync (/api/posts/changes): writes stamp posts with their transaction
+-- id, deletes leave a tombstone (pruned after POST_TOMBSTONE_RETENTION_DAYS)
+-- ============================================
+CREATE TABLE IF NOT EXISTS post_tombstones (
+    post_id BIGINT PRIMARY KEY,
+    deleted_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    change_xid xid8 NOT NULL DEFAULT pg_current_xact_id()
+);
+CREATE INDEX IF NOT EXISTS idx_post_tombstones_change_xid ON post_tombstones(change_xid);
+
+CREATE OR REPLACE FUNCTION posts_stamp_change() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := CURRENT_TIMESTAMP;
+    NEW.change_xid := pg_current_xact_id();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION posts_record_deletes() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO post_tombstones (post_id)
+    SELECT id FROM deleted_posts
+    ON CONFLICT (post_id) DO UPDATE
+    SET deleted_at = CURRENT_TIMESTAMP, change_xid = pg_current_xact_id();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS posts_change_insert ON posts;
+CREATE TRIGGER posts_change_insert BEFORE INSERT ON posts
+    FOR EACH ROW EXECUTE FUNCTION posts_stamp_change();
+DROP TRIGGER IF EXISTS posts_change_update ON posts;
+CREATE TRIGGER posts_change_update BEFORE UPDATE ON posts
+    FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*) EXECUTE FUNCTION posts_stamp_change();
+DROP TRIGGER IF EXISTS posts_change_delete ON posts;
+CREATE TRIGGER posts_change_delete AFTER DELETE ON posts
+    REFERENCING OLD TABLE AS deleted_posts
+    FOR EACH STATEMENT EXECUTE FUNCTION posts_record_deletes();
 
 -- ============================================
 -- Saved queries / keywords table
@@ -54,21 +102,24 @@ CREATE TABLE IF NOT EXISTS saved_queries (
 );
 
 -- ============================================
--- Scraping logs table
+-- Scraping logs table (partitioned by day)
 -- ============================================
+-- Daily partitions (scraping_logs_pYYYYMMDD) are created ahead and dropped
+-- after SCRAPING_LOG_RETENTION_DAYS by the backend (pg_maintain_scraping_logs)
 CREATE TABLE IF NOT EXISTS scraping_logs (
-    id BIGSERIAL PRIMARY KEY,
-    timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+    id BIGSERIAL,
+    timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
     source VARCHAR(50),
     level VARCHAR(20),
     message TEXT,
     details JSONB,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-);
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
+
+CREATE TABLE IF NOT EXISTS scraping_logs_default PARTITION OF scraping_logs DEFAULT;
 
-CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON scraping_logs(timestamp DESC);
-CREATE INDEX IF NOT EXISTS idx_logs_source ON scraping_logs(source);
-CREATE INDEX IF NOT EXISTS idx_logs_level ON scraping_logs(level);
+CREATE INDEX IF NOT EXISTS idx_scraping_logs_source_level_ts ON scraping_logs(source, level, timestamp DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_scraping_logs_ts ON scraping_logs(timestamp DESC, id DESC);
 
 -- ============================================
 -- Base keywords table
@@ -163,13 +214,79 @@ INSERT INTO app_config (key, value) VALUES
     ('max_posts_per_query', '50'::jsonb)
 ON CONFLICT (key) DO NOTHING;
 
+-- ============================================
+-- Pain points (settings) and post tag aggregates
+-- ============================================
+CREATE TABLE IF NOT EXISTS pain_points (
+    id SERIAL PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT,
+    icon TEXT,
+    keywords JSONB NOT NULL DEFAULT '[]'::jsonb,
+    enabled INTEGER DEFAULT 1,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Pain points / products matched by each post
+CREATE TABLE IF NOT EXISTS post_tags (
+    post_id BIGINT PRIMARY KEY REFERENCES posts(id) ON DELETE CASCADE,
+    pain_points TEXT[] NOT NULL DEFAULT '{}',
+    products TEXT[] NOT NULL DEFAULT '{}',
+    definitions_version VARCHAR(32),
+    tagged_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_post_tags_pain_points ON post_tags USING gin(pain_points);
+CREATE INDEX IF NOT EXISTS idx_post_tags_products ON post_tags USING gin(products);
+
+-- Daily rollups (/api/pain-points, /api/product-opportunities)
+CREATE TABLE IF NOT EXISTS post_tag_daily (
+    day DATE NOT NULL,
+    tag_type VARCHAR(20) NOT NULL,
+    tag TEXT NOT NULL,
+    sentiment_label VARCHAR(20) NOT NULL,
+    product VARCHAR(100) NOT NULL,
+    post_count INTEGER NOT NULL,
+    relevance_sum DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (day, tag_type, tag, sentiment_label, product)
+);
+
+CREATE INDEX IF NOT EXISTS idx_post_tag_daily_type_day ON post_tag_daily(tag_type, day);
+CREATE INDEX IF NOT EXISTS idx_posts_rollup_time ON posts ((COALESCE(created_at, inserted_at)));
+
+-- ============================================
+-- Precomputed LLM analyses (What's Happening, improvements), one per filter preset
+-- ============================================
+CREATE TABLE IF NOT EXISTS insight_snapshots (
+    kind VARCHAR(50) NOT NULL,
+    preset VARCHAR(20) NOT NULL,
+    fingerprint JSONB NOT NULL,
+    payload JSONB NOT NULL,
+    computed_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    duration_seconds REAL,
+    PRIMARY KEY (kind, preset)
+);
+
+-- ============================================
+-- Scrape watermarks: newest item seen per (source, normalized query),
+-- where incremental scrapes stop paginating
+-- ============================================
+CREATE TABLE IF NOT EXISTS scrape_watermarks (
+    source VARCHAR(50) NOT NULL,
+    query_key TEXT NOT NULL,
+    newest_created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    newest_external_id TEXT,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (source, query_key)
+);
+
 -- ============================================
 -- Function to clean old logs (keep 30 days)
 -- ============================================
 CREATE OR REPLACE FUNCTION clean_old_logs() RETURNS void AS $$
 BEGIN
     DELETE FROM scraping_logs 
-    WHERE created_at < NOW() - INTERVAL '30 days';
+    WHERE timestamp < NOW() - INTERVAL '30 days';
     
     DELETE FROM job_results 
     WHERE created_at < NOW() - INTERVAL '7 days';
@@ -1,20 +1,27 @@
 """
 Script to update existing posts with improved language detection and sentiment analysis.
 Run this script to update all posts in the database with:
-- Correct language detection (using Google Translate, DeepL, LLM, or fallback methods)
+- Correct language detection (local n-gram detector, for posts without a valid language)
 - Improved sentiment scores (especially for French)
 
-IMPORTANT: Stop the FastAPI server before running this script to avoid database lock issues.
+Posts are read by id pages, scored with sentiment.analyze_batch on a process
+pool (one worker per CPU by default) and written back with one UPDATE per page.
+
+Usage:
+    python scripts/update_posts_language_sentiment.py [--batch-size 5000] [--processes N]
 """
 import sys
-import os
+import argparse
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
 # Add backend to path
 backend_path = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(backend_path))
 
-from app import database as db
+from psycopg2.extras import execute_values
+
+from app.db_postgres import get_pg_cursor, pg_refresh_tag_rollups
 from app.analysis import sentiment, language_detection
 import logging
 
@@ -22,145 +29,102 @@ logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
 
-def update_posts():
+def update_posts(batch_size: int = 5000, processes: int = None) -> dict:
     """Update all posts with improved language detection and sentiment analysis."""
     logger.info("🚀 Starting update of posts with improved language detection and sentiment analysis...")
-    logger.info("⚠️  Make sure the FastAPI server is stopped to avoid database lock issues!")
-    
-    # Get all posts
-    all_posts = db.get_posts(limit=100000, offset=0)
-    total = len(all_posts)
+
+    with get_pg_cursor() as cur:
+        cur.execute("SELECT COUNT(*) AS count FROM posts")
+        total = cur.fetchone()['count']
     logger.info(f"📊 Found {total} posts to process")
-    
+
     if total == 0:
         logger.info("ℹ️  No posts found in database. Nothing to update.")
-        return
-    
+        return {'processed': 0, 'updated_language': 0, 'updated_sentiment': 0}
+
+    processed = 0
     updated_language = 0
     updated_sentiment = 0
-    skipped_language = 0
-    skipped_sentiment = 0
-    errors = 0
-    
-    # Process posts in batches for better performance
-    batch_size = 50
-    updates_batch = []
-    
-    for idx, post in enumerate(all_posts):
-        if (idx + 1) % 100 == 0:
-            logger.info(f"⏳ Processing {idx + 1}/{total} posts... (updated: {updated_language} lang, {updated_sentiment} sentiment)")
-        
-        post_id = post.get('id')
-        if not post_id:
-            continue
-        
-        try:
-            # Detect language
-            detected_language = language_detection.detect_language_from_post(post)
-            current_language = post.get('language', 'unknown')
-            
-            # Analyze sentiment with language awareness
-            content = post.get('content', '') or ''
-            an = sentiment.analyze(content, language=detected_language)
-            new_score = an.get('score', 0.0)
-            new_label = an.get('label', 'neutral')
-            
-            current_score = post.get('sentiment_score', 0.0)
-            current_label = post.get('sentiment_label', 'neutral')
-            
-            # Prepare updates
-            needs_language_update = detected_language != current_language and detected_language != 'unknown'
-            score_diff = abs(new_score - current_score)
-            needs_sentiment_update = score_diff > 0.1 or new_label != current_label
-            
-            # Batch updates for better performance
-            if needs_language_update or needs_sentiment_update:
-                update_data = {
-                    'id': post_id,
-                    'language': detected_language if needs_language_update else current_language,
-                    'sentiment_score': new_score if needs_sentiment_update else current_score,
-                    'sentiment_label': new_label if needs_sentiment_update else current_label,
-                    'needs_language_update': needs_language_update,
-                    'needs_sentiment_update': needs_sentiment_update,
-                }
-                updates_batch.append(update_data)
-            
-            # Execute batch updates
-            if len(updates_batch) >= batch_size:
-                try:
-                    with db.get_db() as conn:
-                        cursor = conn.cursor()
-                        for update in updates_batch:
-                            if update['needs_language_update']:
-                                cursor.execute(
-                                    'UPDATE posts SET language = ? WHERE id = ?',
-                                    (update['language'], update['id'])
-                                )
-                                updated_language += 1
-                            else:
-                                skipped_language += 1
-                            
-                            if update['needs_sentiment_update']:
-                                cursor.execute(
-                                    'UPDATE posts SET sentiment_score = ?, sentiment_label = ? WHERE id = ?',
-                                    (update['sentiment_score'], update['sentiment_label'], update['id'])
-                                )
-                                updated_sentiment += 1
-                            else:
-                                skipped_sentiment += 1
-                        conn.commit()
-                except Exception as e:
-                    logger.error(f"Error updating batch: {e}")
-                    errors += len(updates_batch)
-                finally:
-                    updates_batch = []
-        
-        except Exception as e:
-            errors += 1
-            logger.error(f"Error processing post {post_id}: {e}")
-            continue
-    
-    # Process remaining batch
-    if updates_batch:
-        try:
-            with db.get_db() as conn:
-                cursor = conn.cursor()
-                for update in updates_batch:
-                    if update['needs_language_update']:
-                        cursor.execute(
-                            'UPDATE posts SET language = ? WHERE id = ?',
-                            (update['language'], update['id'])
-                        )
-                        updated_language += 1
-                    else:
-                        skipped_language += 1
-                    
-                    if update['needs_sentiment_update']:
-                        cursor.execute(
-                            'UPDATE posts SET sentiment_score = ?, sentiment_label = ? WHERE id = ?',
-                            (update['sentiment_score'], update['sentiment_label'], update['id'])
-                        )
-                        updated_sentiment += 1
-                    else:
-                        skipped_sentiment += 1
-                conn.commit()
-        except Exception as e:
-            logger.error(f"Error updating final batch: {e}")
-            errors += len(updates_batch)
-    
+    last_id = 0
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        while True:
+            with get_pg_cursor() as cur:
+                cur.execute("""
+                    SELECT id, content, url, source, language, sentiment_score, sentiment_label
+                    FROM posts
+                    WHERE id > %s
+                    ORDER BY id
+                    LIMIT %s
+                """, (last_id, batch_size))
+                posts = cur.fetchall()
+            if not posts:
+                break
+            last_id = posts[-1]['id']
+            processed += len(posts)
+
+            languages = [language_detection.detect_language_from_post(post) for post in posts]
+            results = sentiment.analyze_batch(
+                [post['content'] or '' for post in posts], languages, executor=executor
+            )
+
+            changes = []
+            for post, detected_language, an in zip(posts, languages, results):
+                current_language = post['language'] or 'unknown'
+                current_score = post['sentiment_score'] or 0.0
+                current_label = post['sentiment_label'] or 'neutral'
+
+                needs_language_update = detected_language != current_language and detected_language != 'unknown'
+                needs_sentiment_update = abs(an['score'] - current_score) > 0.1 or an['label'] != current_label
+                if not (needs_language_update or needs_sentiment_update):
+                    continue
+
+                updated_language += needs_language_update
+                updated_sentiment += needs_sentiment_update
+                changes.append((
+                    post['id'],
+                    detected_language if needs_language_update else current_language,
+                    an['score'] if needs_sentiment_update else current_score,
+                    an['label'] if needs_sentiment_update else current_label,
+                ))
+
+            if changes:
+                with get_pg_cursor() as cur:
+                    execute_values(cur, """
+                        UPDATE posts SET language = v.language,
+                                         sentiment_score = v.sentiment_score,
+                                         sentiment_label = v.sentiment_label
+                        FROM (VALUES %s) AS v(id, language, sentiment_score, sentiment_label)
+                        WHERE posts.id = v.id
+                    """, changes, template="(%s, %s::varchar, %s::real, %s::varchar)", page_size=len(changes))
+
+            logger.info(f"⏳ Processed {processed}/{total} posts... (updated: {updated_language} lang, {updated_sentiment} sentiment)")
+
+    if updated_sentiment:
+        # post_tag_daily is broken down by sentiment label
+        pg_refresh_tag_rollups()
+
     logger.info(f"\n✅ Update completed!")
-    logger.info(f"   📝 Language: {updated_language} updated, {skipped_language} unchanged")
-    logger.info(f"   💭 Sentiment: {updated_sentiment} updated, {skipped_sentiment} unchanged")
-    logger.info(f"   ❌ Errors: {errors}")
-    logger.info(f"   📊 Total processed: {total} posts")
+    logger.info(f"   📝 Language: {updated_language} updated, {processed - updated_language} unchanged")
+    logger.info(f"   💭 Sentiment: {updated_sentiment} updated, {processed - updated_sentiment} unchanged")
+    logger.info(f"   📊 Total processed: {processed} posts")
+    return {'processed': processed, 'updated_language': updated_language, 'updated_sentiment': updated_sentiment}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-detect language and re-score sentiment of stored posts")
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--processes', type=int, default=None,
+                        help="Worker processes for sentiment scoring (default: one per CPU)")
+    args = parser.parse_args()
+    update_posts(batch_size=args.batch_size, processes=args.processes)
 
 
 if __name__ == "__main__":
     try:
-        update_posts()
+        main()
     except KeyboardInterrupt:
         logger.info("\n⚠️  Update interrupted by user")
     except Exception as e:
         logger.error(f"❌ Fatal error: {e}", exc_info=True)
         sys.exit(1)
-
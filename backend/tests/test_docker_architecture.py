@@ -185,6 +185,94 @@ class TestJobQueue:
         assert health["type"] == "in-memory"
 
 
+
+@pytest.fixture
+def redis_queue():
+    """RedisJobQueue on a throwaway key prefix (skipped without a Redis server)."""
+    from app.job_queue import RedisJobQueue, REDIS_AVAILABLE
+    if not REDIS_AVAILABLE:
+        pytest.skip("redis package not installed")
+    
+    class TestQueue(RedisJobQueue):
+        QUEUE_KEY = "ocft-test:jobs:queue"
+        PROCESSING_KEY = "ocft-test:jobs:processing"
+        LEASES_KEY = "ocft-test:jobs:leases"
+        DELAYED_KEY = "ocft-test:jobs:delayed"
+        SCORES_KEY = "ocft-test:jobs:scores"
+        METRICS_KEY = "ocft-test:jobs:metrics"
+        RESULTS_KEY = "ocft-test:jobs:results"
+        DAILY_PREFIX = "ocft-test:jobs:daily:"
+        JOB_PREFIX = "ocft-test:job:"
+    
+    queue = TestQueue()
+    try:
+        queue.client.ping()
+    except Exception:
+        pytest.skip("Redis server is not running")
+    keys = queue.client.keys("ocft-test:*")
+    if keys:
+        queue.client.delete(*keys)
+    yield queue
+    keys = queue.client.keys("ocft-test:*")
+    if keys:
+        queue.client.delete(*keys)
+    queue.close()
+
+
+class TestRedisJobLeases:
+    """Tests for leases, orphan recovery and delayed retries of RedisJobQueue."""
+    
+    def test_dequeue_leases_job(self, redis_queue):
+        """Test that a dequeued job is leased until completed."""
+        job_id = redis_queue.enqueue("test", {})
+        job = redis_queue.dequeue()
+        assert job.id == job_id and job.attempts == 1
+        assert redis_queue.get_queue_stats()["processing"] == 1
+        assert redis_queue.extend_lease(job_id)
+        
+        redis_queue.complete(job_id, {})
+        assert redis_queue.get_queue_stats()["processing"] == 0
+        assert not redis_queue.extend_lease(job_id)
+    
+    def test_expired_lease_is_requeued(self, redis_queue):
+        """Test that the job of a dead worker goes back to the queue."""
+        job_id = redis_queue.enqueue("test", {})
+        redis_queue.dequeue()
+        redis_queue.client.zadd(redis_queue.LEASES_KEY, {job_id: 0})  # lease deadline in the past
+        
+        assert redis_queue.reap_expired_leases()["leases_expired"] == 1
+        assert redis_queue.get_metrics()["leases_expired"] == 1
+        job = redis_queue.dequeue()
+        assert job.id == job_id and job.attempts == 2
+    
+    def test_retry_is_delayed(self, redis_queue):
+        """Test that a failed job waits in the delayed set before running again."""
+        job_id = redis_queue.enqueue("test", {})
+        redis_queue.dequeue()
+        redis_queue.fail(job_id, "boom", retry=True)
+        
+        stats = redis_queue.get_queue_stats()
+        assert stats["pending"] == 0 and stats["delayed"] == 1 and stats["processing"] == 0
+        assert redis_queue.dequeue() is None
+        
+        redis_queue.client.zadd(redis_queue.DELAYED_KEY, {job_id: 0})  # make it due
+        job = redis_queue.dequeue()
+        assert job.id == job_id and job.error_message == "boom"
+    
+    def test_daily_counters_and_recent_jobs(self, redis_queue):
+        """Test the per-day finished counters and the recent jobs listing."""
+        done_id = redis_queue.enqueue("test", {})
+        failed_id = redis_queue.enqueue("test", {})
+        redis_queue.dequeue()
+        redis_queue.dequeue()
+        redis_queue.complete(done_id, {})
+        redis_queue.fail(failed_id, "boom", retry=False)
+        
+        stats = redis_queue.get_queue_stats()
+        assert stats["completed_today"] == 1 and stats["failed_today"] == 1
+        assert [job.id for job in redis_queue.get_recent_jobs(10)] == [failed_id, done_id]
+
+
 class TestJobsRouter:
     """Tests for the jobs API router."""
     
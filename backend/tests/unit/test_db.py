@@ -3,6 +3,7 @@ import pytest
 from datetime import datetime
 from unittest.mock import patch
 from app import database as db
+from app.db_postgres import _compute_content_hash
 
 
 class TestInsertPost:
@@ -79,6 +80,7 @@ class TestGetPosts:
         for i in range(3):
             post = sample_post.copy()
             post['url'] = f'{base_url}-{i}'
+            post['content'] = f"{sample_post['content']} {base_url}-{i}"
             post['created_at'] = datetime.now().isoformat()
             post_id = db.insert_post(post)
             if post_id is not None:
@@ -104,6 +106,7 @@ class TestGetPosts:
         for i in range(5):
             post = sample_post.copy()
             post['url'] = f'{base_url}-{i}'
+            post['content'] = f"{sample_post['content']} {base_url}-{i}"
             post['created_at'] = datetime.now().isoformat()
             post_id = db.insert_post(post)
             if post_id is not None:
@@ -127,6 +130,7 @@ class TestGetPosts:
         for i in range(5):
             post = sample_post.copy()
             post['url'] = f'{base_url}-{i}'
+            post['content'] = f"{sample_post['content']} {base_url}-{i}"
             post['created_at'] = datetime.now().isoformat()
             post_id = db.insert_post(post)
             if post_id is not None:
@@ -251,13 +255,10 @@ class TestAnsweredStatus:
         post_id = db.insert_post(post)
         
         # Mock the metadata fetcher
-        with patch('app.utils.post_metadata_fetcher.fetch_post_metadata_from_url') as mock_fetch:
-            mock_fetch.return_value = {
-                'source': 'reddit',
-                'num_comments': 5,
-                'comments': 5
-            }
-            
+        async def fake_batch(posts, client=None, delay=0.0):
+            return {post['id']: {'source': 'reddit', 'num_comments': 5, 'comments': 5} for post in posts}
+        
+        with patch('app.utils.post_metadata_fetcher.fetch_posts_metadata_batch', fake_batch):
             result = await db.recheck_posts_answered_status(limit=10)
             
             assert result['success'] is True
@@ -268,6 +269,29 @@ class TestAnsweredStatus:
             assert 'skipped_count' in result
             assert 'total_posts' in result
             # mock_fetch peut ne pas être appelé si le post n'est pas dans la liste des posts à vérifier
+    
+    def test_update_posts_answered_status_bulk(self, test_db, sample_post):
+        """Test marking several posts as answered in one statement."""
+        import time
+        marker = f'bulk-answered-{int(time.time() * 1000)}'
+        ids = []
+        for i in range(3):
+            post = sample_post.copy()
+            post['url'] = f'https://example.com/{marker}-{i}'
+            post['content'] = f'Question {marker} number {i} about OVH'
+            ids.append(db.insert_post(post))
+        assert None not in ids
+        db.update_post_answered_status(ids[2], False, 'manual')
+        
+        updates = [(ids[0], 'auto-reddit-comments'), (ids[1], 'auto-stackoverflow'), (ids[2], 'auto-stackoverflow')]
+        assert db.update_posts_answered_status_bulk(updates) == 2
+        assert db.get_post_by_id(ids[0])['answer_detection_method'] == 'auto-reddit-comments'
+        assert db.get_post_by_id(ids[1])['is_answered'] == 1
+        # Manually marked posts are left alone
+        assert db.get_post_by_id(ids[2])['is_answered'] == 0
+        # Already answered with the same method: nothing to update
+        assert db.update_posts_answered_status_bulk(updates[:2]) == 0
+        assert db.update_posts_answered_status_bulk([]) == 0
 
 
 class TestDuplicateDetection:
@@ -288,11 +312,12 @@ class TestDuplicateDetection:
         base_url = f'https://example.com/test-diff-{int(time.time() * 1000)}'
         post1 = sample_post.copy()
         post1['url'] = f'{base_url}-post1'
+        post1['content'] = f"{sample_post['content']} {base_url}"
         
         post2 = sample_post.copy()
         post2['url'] = f'{base_url}-post2'
         # Modifier légèrement le contenu pour éviter la détection de doublon par contenu normalisé
-        post2['content'] = post2['content'] + ' (variant)'
+        post2['content'] = post1['content'] + ' (variant)'
         
         post_id1 = db.insert_post(post1)
         assert post_id1 is not None, f"Post 1 should be inserted with URL {post1['url']}"
@@ -311,3 +336,340 @@ class TestDuplicateDetection:
 
 
 
+    
+    def test_duplicate_detection_by_content_hash(self, test_db, sample_post):
+        """Test that same normalized content from the same source is rejected even with a new URL."""
+        import time
+        marker = int(time.time() * 1000)
+        post1 = sample_post.copy()
+        post1['url'] = f'https://example.com/test-hash-{marker}-1'
+        post1['content'] = f'Mon serveur VPS {marker} ne répond plus depuis la migration, aucune réponse du support.'
+        post2 = post1.copy()
+        post2['url'] = f'https://example.com/test-hash-{marker}-2'
+        # Same content after normalization (case, punctuation, HTML, whitespace)
+        post2['content'] = f'<p>mon serveur VPS {marker} ne répond plus  depuis la migration aucune réponse du support</p>'
+        
+        assert db.insert_post(post1) is not None
+        assert db.insert_post(post2) is None
+
+
+class TestContentHash:
+    """Tests for _compute_content_hash function."""
+    
+    def test_hash_ignores_formatting(self):
+        """Test that HTML, case, punctuation and whitespace don't change the hash."""
+        h1 = _compute_content_hash('OVH support is SLOW, my ticket is still open after a week!')
+        h2 = _compute_content_hash('<b>ovh support is slow</b> my ticket is   still open after a week')
+        assert h1 is not None
+        assert h1 == h2
+    
+    def test_hash_short_content_is_none(self):
+        """Test that short content is not hashed (too generic to deduplicate)."""
+        assert _compute_content_hash('Thanks OVH!') is None
+        assert _compute_content_hash('') is None
+
+
+class TestInsertPostsBulk:
+    """Tests for insert_posts_bulk function."""
+    
+    def test_bulk_insert_outcomes(self, test_db, sample_post):
+        """Test per-item outcomes: inserted, in-batch duplicate, existing duplicate, rejected."""
+        import time
+        base_url = f'https://example.com/test-bulk-{int(time.time() * 1000)}'
+        existing = sample_post.copy()
+        existing['url'] = f'{base_url}-existing'
+        existing['content'] = f'Existing post about OVH dedicated servers {base_url}'
+        assert db.insert_post(existing) is not None
+        
+        new_post = sample_post.copy()
+        new_post['url'] = f'{base_url}-new'
+        new_post['content'] = f'Brand new post about OVH object storage {base_url}'
+        
+        outcomes = db.insert_posts_bulk([
+            new_post,
+            new_post.copy(),          # duplicate within the batch
+            existing.copy(),          # duplicate of an existing row
+            {'source': 'TestSource'},  # missing content
+        ])
+        
+        assert [o['status'] for o in outcomes] == ['inserted', 'duplicate', 'duplicate', 'rejected']
+        assert isinstance(outcomes[0]['id'], int)
+        assert db.get_post_by_id(outcomes[0]['id'])['url'] == new_post['url']
+    
+    def test_bulk_insert_empty(self, test_db):
+        """Test that an empty batch is a no-op."""
+        assert db.insert_posts_bulk([]) == []
+
+
+class TestPostsForImprovement:
+    """Tests for get_posts_for_improvement function."""
+    
+    def test_negative_posts_ranked_first(self, test_db, sample_post):
+        """Test that negative posts get a higher opportunity score and exact total."""
+        import time
+        marker = f'improvement-{int(time.time() * 1000)}'
+        for label in ('positive', 'negative'):
+            post = sample_post.copy()
+            post['url'] = f'https://forum.test/{marker}-{label}'
+            post['content'] = f'Feedback {marker} about OVH billing, sentiment {label}'
+            post['sentiment_label'] = label
+            assert db.insert_post(post) is not None
+        
+        page = db.get_posts_for_improvement(limit=1, offset=0, search=marker)
+        assert page['total'] == 2
+        assert len(page['posts']) == 1
+        assert page['posts'][0]['sentiment_label'] == 'negative'
+        assert 0 <= page['posts'][0]['opportunity_score'] <= 100
+
+
+class TestPostTags:
+    """Tests for pain point / product tags and their daily rollups."""
+    
+    def test_insert_post_updates_rollups(self, test_db, sample_post):
+        """Test that a new negative post is counted in its pain point and product rollups."""
+        import time
+        definitions = db.get_pain_point_definitions()
+        title = next(iter(definitions))
+        keyword = definitions[title]['keywords'][0]
+        
+        def pain_point_count():
+            counts = db.get_pain_point_counts(days=None, limit=100)
+            return next((row['count'] for row in counts if row['title'] == title), 0)
+        
+        def vps_negative_posts():
+            stats = db.get_product_tag_stats()
+            return next((row['negative_posts'] for row in stats if row['product'] == 'VPS'), 0)
+        
+        before_count, before_vps = pain_point_count(), vps_negative_posts()
+        marker = f'tags-{int(time.time() * 1000)}'
+        post = sample_post.copy()
+        post['url'] = f'https://forum.test/{marker}'
+        post['content'] = f'My OVH VPS has a {keyword} problem again ({marker})'
+        post['sentiment_label'] = 'negative'
+        post_id = db.insert_post(post)
+        assert post_id is not None
+        
+        assert pain_point_count() == before_count + 1
+        assert vps_negative_posts() == before_vps + 1
+        
+        # False positives are excluded from the aggregates
+        db.mark_false_positive(post_id, True)
+        assert pain_point_count() == before_count
+        assert vps_negative_posts() == before_vps
+
+
+class TestScrapingLogs:
+    """Tests for the partitioned scraping_logs table."""
+    
+    def test_keyset_pagination(self, test_db):
+        """Test that cursor pages are disjoint and newest first."""
+        import time
+        from datetime import timedelta
+        source = f'LogTest{int(time.time() * 1000)}'
+        now = datetime.now()
+        db.add_scraping_logs([(now - timedelta(seconds=i), source, 'info', f'line {i}', {'i': i})
+                              for i in range(5)])
+        
+        first = db.get_scraping_logs(limit=3, source=source, level='info')
+        last = first[-1]
+        second = db.get_scraping_logs(limit=3, source=source, level='info',
+                                      before=(last['timestamp'], last['id']))
+        assert [log['message'] for log in first + second] == [f'line {i}' for i in range(5)]
+        assert first[0]['details'] == {'i': 0}
+        
+        assert db.clear_scraping_logs(source=source) == 5
+    
+    def test_partition_maintenance(self, test_db):
+        """Test that today's partition exists and maintenance is idempotent."""
+        db.maintain_scraping_logs()
+        result = db.maintain_scraping_logs()
+        assert result['partitions_created'] == 0
+
+
+class TestConfigCache:
+    """Tests for the cached app_config snapshot."""
+    
+    def test_set_and_delete_invalidate_snapshot(self, test_db):
+        """Test that config writes are visible immediately through the cache."""
+        key = 'TEST_CONFIG_CACHE_KEY'
+        db.pg_delete_config(key)
+        version = db.pg_get_config_snapshot().version
+        
+        assert db.pg_set_config(key, 'value-1')
+        assert db.pg_get_config(key) == 'value-1'
+        snapshot = db.pg_get_config_snapshot()
+        assert snapshot.version > version
+        assert db.pg_get_config_snapshot() is snapshot
+        
+        assert db.pg_delete_config(key)
+        assert db.pg_get_config(key) is None
+
+
+class TestInsightSnapshots:
+    """Tests for the precomputed insight snapshots."""
+    
+    def test_window_stats_count_new_posts(self, test_db, sample_post):
+        """Test that posts added after a fingerprint are counted as new."""
+        import time
+        marker = f'window-stats-{int(time.time() * 1000)}'
+        before = db.get_post_window_stats(30)
+        post = sample_post.copy()
+        post['url'] = f'https://forum.test/{marker}'
+        post['content'] = f'New post {marker} about OVH'
+        post['created_at'] = datetime.now().isoformat()
+        post['sentiment_label'] = 'negative'
+        assert db.insert_post(post) is not None
+        
+        after = db.get_post_window_stats(30, since_id=before['max_id'])
+        assert after['total'] == before['total'] + 1
+        assert after['negative'] == before['negative'] + 1
+        assert after['new_posts'] == 1
+        assert after['max_id'] > before['max_id']
+    
+    def test_save_replaces_snapshot(self, test_db):
+        """Test that saving a snapshot twice keeps the last one."""
+        fingerprint = {'total': 1, 'positive': 0, 'negative': 1, 'neutral': 0, 'max_id': 1}
+        assert db.save_insight_snapshot('whats_happening', 'test', fingerprint, {'insights': []})
+        assert db.save_insight_snapshot('whats_happening', 'test', {**fingerprint, 'total': 2},
+                                        {'insights': [], 'llm_available': True}, duration_seconds=1.5)
+        
+        snapshot = db.get_insight_snapshot('whats_happening', 'test')
+        assert snapshot['fingerprint']['total'] == 2
+        assert snapshot['payload'] == {'insights': [], 'llm_available': True}
+        assert snapshot['computed_at'] is not None
+        assert db.get_insight_snapshot('improvements', 'test') is None
+
+
+class TestDashboardAggregates:
+    """Tests for the server-side dashboard aggregates."""
+    
+    def test_series_follow_filters(self, test_db, sample_post):
+        """Test that every series and the posts page use the same filters."""
+        import time
+        marker = f'aggregates-{int(time.time() * 1000)}'
+        for index, (source, label) in enumerate([('GitHub Issues', 'negative'),
+                                                 ('GitHub Discussions', 'positive'),
+                                                 ('Reddit', 'negative')]):
+            post = sample_post.copy()
+            post['url'] = f'https://forum.test/{marker}-{index}'
+            post['content'] = f'Feedback {marker} number {index} about OVH'
+            post['source'] = source
+            post['sentiment_label'] = label
+            assert db.insert_post(post) is not None
+        
+        result = db.get_dashboard_aggregates(limit=1, search=marker, source='GitHub')
+        assert result['total'] == 2
+        assert result['sentiment'] == {'negative': 1, 'positive': 1}
+        assert {row['source'] for row in result['sources']} == {'GitHub Issues', 'GitHub Discussions'}
+        assert sum(day['count'] for day in result['timeline']) == 2
+        assert result['answered'] == {'answered': 0, 'unanswered': 2}
+        assert len(result['posts']) == 1
+        
+        negative = db.get_dashboard_aggregates(limit=0, search=marker, sentiment='negative')
+        assert negative['total'] == 2
+        assert negative['posts'] == []
+    
+    def test_posts_page_sort_and_day_products(self, test_db, sample_post):
+        """Test the posts page sort, the products of each day and the hidden posts."""
+        import time
+        marker = f'aggregates-sort-{int(time.time() * 1000)}'
+        for index, (score, product, url) in enumerate([(-0.8, 'VPS', 'https://forum.test'),
+                                                       (0.6, 'VPS', 'https://forum.test'),
+                                                       (0.1, 'Domain', 'https://forum.test'),
+                                                       (0.9, 'VPS', 'https://example.com')]):
+            post = sample_post.copy()
+            post['url'] = f'{url}/{marker}-{index}'
+            post['content'] = f'Feedback {marker} number {index} about OVH'
+            post['sentiment_score'] = score
+            post['product'] = product
+            assert db.insert_post(post) is not None
+        # No OVH mention and no relevance score: not shown
+        post = sample_post.copy()
+        post['url'] = f'https://forum.test/{marker}-unrelated'
+        post['content'] = f'Feedback {marker} about something else'
+        post['relevance_score'] = 0.0
+        assert db.insert_post(post) is not None
+        
+        result = db.get_dashboard_aggregates(limit=2, search=marker,
+                                             sort_by='sentiment_score', sort_order='ASC')
+        assert result['total'] == 3
+        assert [row['sentiment_score'] for row in result['posts']] == pytest.approx([-0.8, 0.1])
+        assert [day['products'] for day in result['timeline']] == [
+            [{'product': 'VPS', 'count': 2}, {'product': 'Domain', 'count': 1}]
+        ]
+
+
+class TestPostChanges:
+    """Tests for the posts delta sync (changes since a cursor)."""
+    
+    def test_insert_update_delete(self, test_db, sample_post):
+        """Test that inserts, updates and deletes after a cursor are returned once."""
+        import time
+        marker = f'changes-{int(time.time() * 1000)}'
+        start = db.get_post_changes()
+        assert start['posts'] == [] and start['deleted'] == []
+        
+        post = sample_post.copy()
+        post['url'] = f'https://forum.test/{marker}'
+        post['content'] = f'Changed post {marker} about OVH'
+        post_id = db.insert_post(post)
+        assert post_id is not None
+        
+        inserted = db.get_post_changes(start['next_xid'], start['next_id'])
+        assert post_id in [row['id'] for row in inserted['posts']]
+        assert not inserted['has_more']
+        
+        db.update_post_answered_status(post_id, True)
+        updated = db.get_post_changes(inserted['next_xid'], inserted['next_id'])
+        assert [row['id'] for row in updated['posts']] == [post_id]
+        assert updated['posts'][0]['is_answered'] == 1
+        
+        db.delete_post(post_id)
+        deleted = db.get_post_changes(updated['next_xid'], updated['next_id'])
+        assert deleted['posts'] == []
+        assert deleted['deleted'] == [post_id]
+        
+        unchanged = db.get_post_changes(deleted['next_xid'], deleted['next_id'])
+        assert unchanged['posts'] == [] and unchanged['deleted'] == []
+    
+    def test_pagination(self, test_db, sample_post):
+        """Test that has_more pages through the changes without gaps."""
+        import time
+        marker = f'changes-page-{int(time.time() * 1000)}'
+        start = db.get_post_changes()
+        ids = []
+        for index in range(3):
+            post = sample_post.copy()
+            post['url'] = f'https://forum.test/{marker}-{index}'
+            post['content'] = f'Paged change {marker} number {index} about OVH'
+            ids.append(db.insert_post(post))
+        assert None not in ids
+        
+        first = db.get_post_changes(start['next_xid'], start['next_id'], limit=2)
+        assert first['has_more']
+        second = db.get_post_changes(first['next_xid'], first['next_id'], limit=2)
+        assert not second['has_more']
+        assert [row['id'] for row in first['posts'] + second['posts']] == ids
+
+
+class TestIterPosts:
+    """Tests for streaming posts with a server-side cursor."""
+    
+    def test_streams_filtered_posts(self, test_db, sample_post):
+        """Test that every matching post is yielded across batches."""
+        import time
+        marker = f'iter-{int(time.time() * 1000)}'
+        for index in range(5):
+            post = sample_post.copy()
+            post['url'] = f'https://forum.test/{marker}-{index}'
+            post['content'] = f'Streamed {marker} number {index} about OVH'
+            assert db.insert_post(post) is not None
+        
+        rows = list(db.iter_posts({'search': marker}, batch_size=2, columns=['id', 'url']))
+        assert len(rows) == 5
+        assert set(rows[0]) == {'id', 'url'}
+    
+    def test_invalid_columns(self, test_db):
+        """Test that column names are validated."""
+        with pytest.raises(ValueError):
+            list(db.iter_posts(columns=['id; DROP TABLE posts']))
@@ -0,0 +1,112 @@
+"""Tests unitaires pour les analyses précalculées (What's Happening / improvements)."""
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+import sys
+import os
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.routers.dashboard import snapshots
+from app.routers.dashboard.snapshots import preset_days, needs_refresh, refresh_insight_snapshots
+
+
+def _stats(total=100, negative=20, new_posts=0, max_id=1000):
+    return {
+        'total': total, 'positive': 50, 'negative': negative, 'neutral': total - 50 - negative,
+        'recent_total': 10, 'recent_negative': 2, 'negative_7d': 7,
+        'new_posts': new_posts, 'max_id': max_id,
+    }
+
+
+def _snapshot(total=100, negative=20, age_hours=1):
+    return {
+        'fingerprint': {'total': total, 'positive': 50, 'negative': negative, 'neutral': 30, 'max_id': 1000},
+        'payload': {'insights': [], 'llm_available': True},
+        'computed_at': datetime.now(timezone.utc) - timedelta(hours=age_hours),
+    }
+
+
+class TestPresets:
+    """Tests pour les presets de période."""
+
+    def test_preset_days(self):
+        """Test la conversion d'un preset en nombre de jours."""
+        assert preset_days('30') == 30
+        assert preset_days('all') is None
+
+    def test_invalid_preset(self):
+        """Test le rejet d'un preset inconnu."""
+        for preset in ('0', 'week', '-7'):
+            with pytest.raises(ValueError):
+                preset_days(preset)
+
+
+class TestNeedsRefresh:
+    """Tests pour la détection d'un changement significatif."""
+
+    def test_missing_snapshot(self):
+        """Test qu'un preset sans snapshot est calculé."""
+        assert needs_refresh(None, _stats())
+
+    def test_unchanged_posts(self):
+        """Test qu'un snapshot récent sur les mêmes posts est conservé."""
+        assert not needs_refresh(_snapshot(), _stats(new_posts=3, total=103, negative=21))
+
+    def test_new_posts(self):
+        """Test qu'assez de nouveaux posts déclenchent un recalcul."""
+        assert needs_refresh(_snapshot(), _stats(new_posts=10, total=100))
+
+    def test_ratio_threshold(self):
+        """Test que le seuil suit la taille de l'ensemble de posts."""
+        big = _snapshot(total=1000, negative=200)
+        assert not needs_refresh(big, _stats(total=1030, negative=210, new_posts=30))
+        assert needs_refresh(big, _stats(total=1050, negative=200, new_posts=50))
+
+    def test_negative_shift(self):
+        """Test qu'une bascule de posts en négatif déclenche un recalcul."""
+        assert needs_refresh(_snapshot(), _stats(negative=30))
+
+    def test_expired_snapshot(self):
+        """Test qu'un snapshot trop ancien est recalculé."""
+        assert needs_refresh(_snapshot(age_hours=25), _stats())
+
+
+class TestRefresh:
+    """Tests pour le job de rafraîchissement."""
+
+    def test_only_changed_presets_computed(self):
+        """Test que seuls les presets modifiés sont envoyés au LLM."""
+        stored = {('whats_happening', '30'): _snapshot()}
+        saved = []
+
+        async def compute(preset, stats):
+            return {'insights': [], 'llm_available': True}
+
+        with patch.object(snapshots, 'db') as mock_db, \
+             patch.object(snapshots, 'compute_whats_happening', compute), \
+             patch.object(snapshots, 'compute_improvements', compute):
+            mock_db.get_insight_snapshot.side_effect = lambda kind, preset: stored.get((kind, preset))
+            mock_db.get_post_window_stats.return_value = _stats()
+            mock_db.save_insight_snapshot.side_effect = lambda kind, preset, *args, **kwargs: saved.append((kind, preset))
+            result = asyncio.run(refresh_insight_snapshots(presets=['30', 'all']))
+
+        assert result['skipped'] == ['whats_happening/30']
+        assert sorted(result['computed']) == ['improvements/30', 'whats_happening/all']
+        assert sorted(saved) == [('improvements', '30'), ('whats_happening', 'all')]
+
+    def test_llm_fallback_not_stored(self):
+        """Test qu'un résultat de repli (sans LLM) ne remplace pas le snapshot."""
+        async def compute(preset, stats):
+            return None
+
+        with patch.object(snapshots, 'db') as mock_db, \
+             patch.object(snapshots, 'compute_whats_happening', compute):
+            mock_db.get_insight_snapshot.return_value = None
+            mock_db.get_post_window_stats.return_value = _stats()
+            result = asyncio.run(refresh_insight_snapshots(presets=['all']))
+
+        assert result['failed'] == ['whats_happening/all']
+        mock_db.save_insight_snapshot.assert_not_called()
@@ -0,0 +1,53 @@
+"""Unit tests for analysis/language_detection.py module."""
+import pytest
+from app.analysis import language_detection
+
+
+class TestDetectLanguage:
+    """Tests for the local n-gram detector."""
+
+    @pytest.mark.parametrize("text,expected", [
+        ("My server has been down for three days and nobody answers my ticket.", 'en'),
+        ("Mon serveur est en panne depuis trois jours et personne ne répond au ticket.", 'fr'),
+        ("Mein Server ist seit drei Tagen down und niemand antwortet auf mein Ticket.", 'de'),
+        ("Mi servidor lleva tres días caído y nadie responde a mi ticket.", 'es'),
+        ("Il mio server è giù da tre giorni e nessuno risponde al ticket.", 'it'),
+        ("Mijn server ligt al drie dagen plat en niemand beantwoordt mijn ticket.", 'nl'),
+    ])
+    def test_supported_languages(self, text, expected):
+        """Test detection of each supported language."""
+        assert language_detection.detect_language(text) == expected
+
+    def test_short_or_ambiguous_text(self):
+        """Test that empty, tiny or non-significant texts are 'unknown'."""
+        assert language_detection.detect_language("") == 'unknown'
+        assert language_detection.detect_language("ok") == 'unknown'
+        assert language_detection.detect_language("https://ovh.com/fr/") == 'unknown'
+
+    def test_non_latin_script(self):
+        """Test that non-Latin scripts are 'other'."""
+        assert language_detection.detect_language("Сервер не работает уже три дня") == 'other'
+
+    def test_batch_matches_single(self):
+        """Test the batch API (duplicates included) against single detections."""
+        texts = [
+            "Très bon hébergeur, je recommande.",
+            "Great hosting, I recommend it.",
+            "Très bon hébergeur, je recommande.",
+            None,
+        ]
+        assert language_detection.detect_languages(texts) == ['fr', 'en', 'fr', 'unknown']
+        assert language_detection.detect_language(texts[1]) == 'en'
+
+
+class TestDetectLanguageFromPost:
+    """Tests for detect_language_from_post function."""
+
+    def test_existing_language_kept(self):
+        """Test that a valid existing language is kept."""
+        assert language_detection.detect_language_from_post({'language': 'de', 'content': 'Great hosting, I recommend it.'}) == 'de'
+
+    def test_url_hint_when_content_is_ambiguous(self):
+        """Test the URL fallback when the content is not enough."""
+        post = {'content': 'ok', 'url': 'https://community.ovh.de/t/123'}
+        assert language_detection.detect_language_from_post(post) == 'de'
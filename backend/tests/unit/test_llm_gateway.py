@@ -0,0 +1,92 @@
+"""Tests unitaires pour la passerelle LLM (coalescence, cache, métriques)."""
+import asyncio
+import json
+import sys
+import os
+
+import httpx
+import pytest
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.utils.llm_gateway import LLMGateway
+
+
+@pytest.fixture
+def gateway(monkeypatch):
+    """Passerelle avec cache mémoire et un transport HTTP simulé."""
+    gateway = LLMGateway(cache_ttl=60, max_concurrency=2)
+    gateway._redis_failed = True
+    gateway.requests = []
+
+    async def handler(request):
+        gateway.requests.append((str(request.url), json.loads(request.content)))
+        await asyncio.sleep(0.01)
+        if 'anthropic' in str(request.url):
+            return httpx.Response(200, json={'content': [{'text': 'bonjour'}],
+                                             'usage': {'input_tokens': 7, 'output_tokens': 3}})
+        return httpx.Response(200, json={'choices': [{'message': {'content': 'hello'}}],
+                                         'usage': {'prompt_tokens': 5, 'completion_tokens': 2}})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(gateway, '_client', lambda provider: client)
+    return gateway
+
+
+class TestLLMGateway:
+    """Tests pour LLMGateway."""
+
+    def test_identical_calls_are_coalesced(self, gateway):
+        """Test que deux prompts identiques en vol ne font qu'un appel."""
+        async def run():
+            return await asyncio.gather(
+                gateway.complete('openai', 'sk-test', 'Summarize', system='analyst'),
+                gateway.complete('openai', 'sk-test', 'Summarize', system='analyst'),
+            )
+
+        assert asyncio.run(run()) == ['hello', 'hello']
+        assert len(gateway.requests) == 1
+        metrics = gateway.get_metrics()['providers']['openai']
+        assert metrics['calls'] == 1 and metrics['coalesced'] == 1
+        assert metrics['input_tokens'] == 5 and metrics['output_tokens'] == 2
+
+    def test_response_cache(self, gateway):
+        """Test que la réponse est servie depuis le cache au second appel."""
+        assert asyncio.run(gateway.complete('mistral', 'key', 'Prompt')) == 'hello'
+        assert asyncio.run(gateway.complete('mistral', 'key', 'Prompt')) == 'hello'
+        assert len(gateway.requests) == 1
+        assert gateway.get_metrics()['providers']['mistral']['cache_hits'] == 1
+
+        # Un prompt différent ou un cache désactivé refait l'appel
+        asyncio.run(gateway.complete('mistral', 'key', 'Other prompt'))
+        asyncio.run(gateway.complete('mistral', 'key', 'Prompt', cache_ttl=0))
+        assert len(gateway.requests) == 3
+
+    def test_anthropic_request(self, gateway):
+        """Test le format de requête et de réponse Anthropic."""
+        content = asyncio.run(gateway.complete('anthropic', 'key', 'Prompt', system='analyst', max_tokens=150))
+        assert content == 'bonjour'
+        url, body = gateway.requests[0]
+        assert url.endswith('/v1/messages')
+        assert body['system'] == 'analyst' and body['max_tokens'] == 150
+        assert 'temperature' not in body
+
+    def test_ovh_requires_endpoint(self, gateway):
+        """Test qu'OVH sans endpoint est refusé avant tout appel."""
+        with pytest.raises(ValueError):
+            asyncio.run(gateway.complete('ovh', 'key', 'Prompt', model='Llama-3.1-70B-Instruct'))
+        assert gateway.requests == []
+
+    def test_run_closes_loop_clients(self, monkeypatch):
+        """Test que llm_gateway.run ferme les clients de sa boucle en sortant."""
+        from app.utils import llm_gateway
+        gateway = LLMGateway()
+        monkeypatch.setattr(llm_gateway, '_gateway', gateway)
+
+        async def use_client():
+            return gateway._client('openai')
+
+        client = llm_gateway.run(use_client())
+        assert client.is_closed
+        assert len(gateway._loops) == 0
@@ -0,0 +1,53 @@
+"""Tests unitaires pour le buffer des logs de scraping."""
+import sys
+import os
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.log_buffer import ScrapingLogBuffer
+
+
+class TestScrapingLogBuffer:
+    """Tests pour ScrapingLogBuffer."""
+
+    def test_flush_in_batches(self):
+        """Test que les logs sont écrits par lots de batch_size."""
+        batches = []
+        buffer = ScrapingLogBuffer(writer=batches.append, batch_size=2, flush_interval=60)
+        for i in range(5):
+            buffer.add('github', 'info', f"line {i}", {'attempt': i})
+
+        buffer.close()
+        assert all(len(batch) <= 2 for batch in batches)
+        rows = [row for batch in batches for row in batch]
+        assert [row[3] for row in rows] == [f"line {i}" for i in range(5)]
+        assert rows[0][1:3] == ('github', 'info')
+        assert rows[0][4] == {'attempt': 0}
+        assert buffer.stats()['written'] == 5
+
+    def test_backpressure_keeps_errors(self):
+        """Test que le buffer plein rejette les infos mais garde les erreurs."""
+        batches = []
+        buffer = ScrapingLogBuffer(writer=batches.append, max_size=2, batch_size=100, flush_interval=60)
+        assert buffer.add('reddit', 'info', 'a')
+        assert buffer.add('reddit', 'info', 'b')
+        assert not buffer.add('reddit', 'info', 'c')
+        assert buffer.add('reddit', 'error', 'd')
+
+        stats = buffer.stats()
+        assert stats['pending'] == 2
+        assert stats['dropped'] == 2
+        buffer.close()
+        assert [row[3] for batch in batches for row in batch] == ['b', 'd']
+
+    def test_writer_failure_is_counted(self):
+        """Test qu'une erreur d'écriture ne casse pas le scraping."""
+        def failing_writer(batch):
+            raise RuntimeError("db down")
+
+        buffer = ScrapingLogBuffer(writer=failing_writer, batch_size=10, flush_interval=60)
+        buffer.add('x', 'info', 'hello')
+        buffer.close()
+        stats = buffer.stats()
+        assert stats['failed'] == 1 and stats['pending'] == 0
@@ -11,7 +11,11 @@ from app.utils.post_metadata_fetcher import (
     fetch_reddit_post_metadata,
     fetch_github_issue_metadata,
     fetch_stackoverflow_question_metadata,
-    fetch_post_metadata_from_url
+    fetch_post_metadata_from_url,
+    fetch_stackoverflow_questions_metadata,
+    fetch_reddit_posts_metadata,
+    fetch_github_issues_metadata,
+    fetch_posts_metadata_batch
 )
 
 
@@ -228,3 +232,123 @@ class TestFetchPostMetadataFromUrl:
         result = await fetch_post_metadata_from_url(url, 'unknown')
         assert result is None
 
+
+def _mock_client(payload):
+    """Shared client mock whose get/post return `payload` as JSON."""
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = payload
+    response.raise_for_status = MagicMock()
+    client = MagicMock()
+    client.get = AsyncMock(return_value=response)
+    client.post = AsyncMock(return_value=response)
+    return client
+
+
+class TestBatchFetchers:
+    """Tests for the multi-id batch fetchers."""
+    
+    @pytest.mark.asyncio
+    async def test_stackoverflow_ids_in_one_request(self):
+        """Test that Stack Overflow questions are fetched with one /questions/{ids} call."""
+        urls = [f"https://stackoverflow.com/questions/{i}/title" for i in (11, 22, 33)]
+        client = _mock_client({'items': [
+            {'question_id': 11, 'is_answered': True, 'answer_count': 2},
+            {'question_id': 33, 'is_answered': False, 'answer_count': 0},
+        ]})
+        
+        result = await fetch_stackoverflow_questions_metadata(urls, client)
+        
+        client.get.assert_called_once()
+        assert client.get.call_args.args[0].endswith('/questions/11;22;33')
+        assert result[urls[0]]['is_answered'] is True
+        assert result[urls[0]]['answer_count'] == 2
+        assert urls[1] not in result
+        assert result[urls[2]]['is_answered'] is False
+    
+    @pytest.mark.asyncio
+    async def test_stackoverflow_chunks_of_100(self):
+        """Test that more than 100 questions are split across requests."""
+        urls = [f"https://stackoverflow.com/questions/{i}/title" for i in range(1, 251)]
+        client = _mock_client({'items': []})
+        
+        await fetch_stackoverflow_questions_metadata(urls, client)
+        
+        assert client.get.call_count == 3
+        assert max(len(call.args[0].rsplit('/', 1)[1].split(';')) for call in client.get.call_args_list) == 100
+    
+    @pytest.mark.asyncio
+    async def test_reddit_info_fullnames(self):
+        """Test that Reddit posts are fetched with one /api/info call."""
+        urls = [
+            "https://www.reddit.com/r/ovh/comments/abc123/first/",
+            "https://www.reddit.com/r/ovh/comments/def456/second/",
+        ]
+        client = _mock_client({'data': {'children': [
+            {'kind': 't3', 'data': {'id': 'abc123', 'num_comments': 4}},
+            {'kind': 't3', 'data': {'id': 'def456', 'num_comments': 0}},
+        ]}})
+        
+        with patch('app.utils.post_metadata_fetcher.asyncio.sleep', new=AsyncMock()):
+            result = await fetch_reddit_posts_metadata(urls, client)
+        
+        client.get.assert_called_once()
+        assert client.get.call_args.kwargs['params']['id'] == 't3_abc123,t3_def456'
+        assert result[urls[0]]['num_comments'] == 4
+        assert result[urls[1]]['num_comments'] == 0
+    
+    @pytest.mark.asyncio
+    async def test_github_graphql_batch(self, monkeypatch):
+        """Test that GitHub issues are looked up in one GraphQL query with a token."""
+        monkeypatch.setenv('GITHUB_TOKEN', 'test-token')
+        urls = [
+            "https://github.com/ovh/repo/issues/1",
+            "https://github.com/ovh/other/issues/2",
+        ]
+        client = _mock_client({'data': {
+            'i0': {'issue': {'state': 'CLOSED', 'closedAt': '2024-01-01T00:00:00Z', 'comments': {'totalCount': 2}}},
+            'i1': None,
+        }})
+        
+        result = await fetch_github_issues_metadata(urls, client)
+        
+        client.post.assert_called_once()
+        query = client.post.call_args.kwargs['json']['query']
+        assert 'repository(owner: "ovh", name: "other")' in query
+        assert result[urls[0]]['state'] == 'closed'
+        assert result[urls[0]]['comments'] == 2
+        assert urls[1] not in result
+    
+    @pytest.mark.asyncio
+    async def test_github_rest_without_token(self, monkeypatch):
+        """Test that GitHub issues fall back to REST on the shared client without a token."""
+        monkeypatch.delenv('GITHUB_TOKEN', raising=False)
+        urls = ["https://github.com/ovh/repo/issues/1"]
+        client = _mock_client({'state': 'open', 'comments': 5, 'closed_at': None})
+        
+        result = await fetch_github_issues_metadata(urls, client)
+        
+        client.post.assert_not_called()
+        client.get.assert_called_once()
+        assert result[urls[0]]['comments'] == 5
+    
+    @pytest.mark.asyncio
+    async def test_posts_grouped_by_source(self):
+        """Test that posts are dispatched per provider and keyed by post id."""
+        posts = [
+            {'id': 1, 'url': 'https://stackoverflow.com/questions/11/title', 'source': 'Stack Overflow'},
+            {'id': 2, 'url': 'https://www.reddit.com/r/ovh/comments/abc123/t/', 'source': 'Reddit'},
+            {'id': 3, 'url': 'https://www.trustpilot.com/review/ovh.com', 'source': 'Trustpilot'},
+        ]
+        
+        async def fake_stackoverflow(urls, client, semaphore, delay):
+            return {url: {'source': 'stackoverflow', 'is_answered': True} for url in urls}
+        
+        async def fake_reddit(urls, client, semaphore, delay):
+            raise RuntimeError("blocked")
+        
+        with patch('app.utils.post_metadata_fetcher.fetch_stackoverflow_questions_metadata', fake_stackoverflow), \
+             patch('app.utils.post_metadata_fetcher.fetch_reddit_posts_metadata', fake_reddit):
+            result = await fetch_posts_metadata_batch(posts, client=MagicMock())
+        
+        assert result == {1: {'source': 'stackoverflow', 'is_answered': True}}
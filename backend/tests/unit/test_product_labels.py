@@ -57,6 +57,50 @@ class TestDetectProductLabel:
         assert product == 'Domain'  # More specific pattern matches first
 
 
+class TestClassifier:
+    """Tests for the shared compiled classifier (app.analysis.classifier)."""
+    
+    def test_classify_all_matches_in_one_pass(self):
+        """Test that every pain point and product mentioned is returned, in definition order."""
+        from app.analysis import classifier
+        result = classifier.classify("Billing charged me twice and my VPS backup is slow")
+        assert result['products'] == ['VPS', 'Storage']
+        assert 'Billing Problems' in result['pain_points']
+        assert 'Performance Issues' in result['pain_points']
+    
+    def test_products_are_whole_words(self):
+        """Test that product keywords do not match inside other words."""
+        from app.analysis import classifier
+        assert classifier.detect_product("Rapid answer, thanks") is None
+        assert classifier.detect_product("The rest api is broken") == 'API'
+        assert classifier.detect_product("I bought example.com") == 'Domain'
+    
+    def test_pain_points_match_word_starts(self):
+        """Test that pain point keywords match inflections but not word middles."""
+        from app.analysis import classifier
+        assert 'Performance Issues' in classifier.classify("Everything loads slowly")['pain_points']
+        assert 'Performance Issues' not in classifier.classify("Excellent service")['pain_points']
+    
+    def test_classify_many_and_cache(self):
+        """Test the batch API and that a classifier is compiled once per definitions version."""
+        from app.analysis import classifier
+        custom = {'Noise': {'keywords': ['fan noise'], 'icon': '🔊'}}
+        assert classifier.get_classifier(custom) is classifier.get_classifier(dict(custom))
+        results = classifier.classify_many(["Loud fan noise on my server", ""], custom)
+        assert results == [
+            {'pain_points': ['Noise'], 'products': ['Dedicated Server']},
+            {'pain_points': [], 'products': []},
+        ]
+    
+    def test_detect_product_keeps_custom_definitions_compiled(self):
+        """Test that product detection does not evict the classifier of custom pain points."""
+        from app.analysis import classifier
+        custom = {'Noise': {'keywords': ['fan noise'], 'icon': '🔊'}}
+        compiled = classifier.get_classifier(custom)
+        assert classifier.detect_product("My VPS is down") == 'VPS'
+        assert classifier.get_classifier(custom) is compiled
+
+
 class TestUpdatePostProductLabel:
     """Tests for update_post_product_label function."""
     
@@ -66,6 +110,7 @@ class TestUpdatePostProductLabel:
         # Insert post avec URL unique
         post = sample_post.copy()
         post['url'] = f'https://example.com/test-product-{int(time.time() * 1000)}'
+        post['content'] = f"{sample_post['content']} {post['url']}"
         post_id = db.insert_post(post)
         assert post_id is not None, f"Post should be inserted with URL {post['url']}"
         
@@ -87,6 +132,7 @@ class TestUpdatePostProductLabel:
         # Insert post avec URL unique
         post = sample_post.copy()
         post['url'] = f'https://example.com/test-product-none-{int(time.time() * 1000)}'
+        post['content'] = f"{sample_post['content']} {post['url']}"
         post_id = db.insert_post(post)
         assert post_id is not None, f"Post should be inserted with URL {post['url']}"
         
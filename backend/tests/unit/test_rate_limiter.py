@@ -0,0 +1,96 @@
+"""Tests unitaires pour le rate limiter adaptatif par hôte des scrapers."""
+import time
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.scraper import rate_limiter
+from app.scraper.rate_limiter import HostRateLimiter, get_rate_limiter
+
+
+class FakeClock:
+    """Horloge monotone contrôlée par le test."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    fake = FakeClock()
+    with patch.object(rate_limiter.time, 'monotonic', fake):
+        yield fake
+
+
+class TestTokenBucket:
+    """Tests pour le token bucket."""
+
+    def test_burst_then_wait(self, clock):
+        """Test que les requêtes au-delà du burst attendent leur jeton."""
+        limiter = HostRateLimiter('example.com', rate=2.0, burst=2)
+        assert limiter.reserve() == 0
+        assert limiter.reserve() == 0
+        assert limiter.reserve() == pytest.approx(0.5)
+        assert limiter.reserve() == pytest.approx(1.0)
+
+    def test_refill(self, clock):
+        """Test que les jetons se rechargent avec le temps."""
+        limiter = HostRateLimiter('example.com', rate=2.0, burst=1)
+        limiter.reserve()
+        clock.now += 0.5
+        assert limiter.reserve() == 0
+
+
+class TestAdaptation:
+    """Tests pour l'adaptation du débit (AIMD) et les en-têtes de rate limit."""
+
+    def test_additive_increase(self, clock):
+        """Test que les succès augmentent le débit jusqu'au maximum."""
+        limiter = HostRateLimiter('example.com', rate=1.0, max_rate=1.2, increase=0.1)
+        limiter.on_response(200, {})
+        assert limiter.rate == pytest.approx(1.1)
+        for _ in range(5):
+            limiter.on_response(200, {})
+        assert limiter.rate == pytest.approx(1.2)
+
+    def test_429_halves_rate_and_honours_retry_after(self, clock):
+        """Test qu'un 429 divise le débit et met l'hôte en pause pendant Retry-After."""
+        limiter = HostRateLimiter('example.com', rate=4.0)
+        limiter.on_response(429, {'retry-after': '10'})
+        assert limiter.rate == pytest.approx(2.0)
+        assert limiter.blocked_for() == pytest.approx(10)
+        assert limiter.reserve() == pytest.approx(10)
+
+    def test_retry_after_capped(self, clock):
+        """Test qu'une pause trop longue est plafonnée."""
+        limiter = HostRateLimiter('example.com')
+        limiter.on_response(429, {'retry-after': '3600'})
+        assert limiter.blocked_for() == pytest.approx(rate_limiter.MAX_WAIT)
+
+    def test_quota_exhausted(self, clock):
+        """Test qu'un quota épuisé met l'hôte en pause jusqu'au reset (epoch GitHub)."""
+        limiter = HostRateLimiter('api.github.com')
+        limiter.on_response(403, {'x-ratelimit-remaining': '0', 'x-ratelimit-reset': str(time.time() + 30)})
+        assert limiter.blocked_for() == pytest.approx(30, abs=1)
+
+    def test_remaining_quota_spread(self, clock):
+        """Test que le débit est plafonné au quota restant sur la fenêtre (secondes Reddit)."""
+        limiter = HostRateLimiter('www.reddit.com', rate=2.0)
+        limiter.on_response(200, {'x-ratelimit-remaining': '10', 'x-ratelimit-reset': '20'})
+        assert limiter.rate == pytest.approx(0.5)
+        assert limiter.blocked_for() == 0
+
+
+def test_limiter_shared_per_host():
+    """Test qu'un même hôte partage un seul limiter, avec son débit connu."""
+    first = get_rate_limiter('https://api.github.com/search/issues?q=ovh')
+    assert get_rate_limiter('https://api.github.com/repos/ovh/x/issues') is first
+    assert first.rate == rate_limiter.HOST_RATES['api.github.com']
+    assert get_rate_limiter('https://mastodon.social/api/v2/search') is not first
@@ -2,6 +2,7 @@
 import pytest
 import asyncio
 import uuid
+from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, AsyncMock
 import sys
 import os
@@ -9,310 +10,349 @@ import os
 # Ajouter le répertoire parent au path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
+from app.job_state import InMemoryJobStateStore, set_job_state_store, is_stuck, _state_from_record
 from app.routers.scraping.jobs import (
-    JOBS,
     _process_single_source_job_async,
     _process_keyword_job_async,
     start_single_source_job,
     start_keyword_scrape,
     get_job_status,
     cancel_job,
-    cancel_all_jobs
+    cancel_all_jobs,
+    _apply_job_events
 )
 from app.routers.scraping.endpoints import KeywordsPayload
 
 
+@pytest.fixture
+def store():
+    """Store en mémoire utilisé par les endpoints pendant le test."""
+    store = InMemoryJobStateStore()
+    set_job_state_store(store)
+    yield store
+    set_job_state_store(None)
+
+
 class TestJobCreation:
     """Tests pour la création de jobs."""
-    
-    def setup_method(self):
-        """Nettoyer les jobs avant chaque test."""
-        JOBS.clear()
-    
-    def test_create_single_source_job(self):
+
+    def test_create_single_source_job(self, store):
         """Test la création d'un job pour une source unique."""
         job_id = str(uuid.uuid4())
-        JOBS[job_id] = {
-            'id': job_id,
-            'status': 'pending',
-            'progress': {'total': 1, 'completed': 0},
-            'results': [],
-            'errors': [],
-            'cancelled': False,
-            'error': None,
-        }
-        
-        assert job_id in JOBS
-        assert JOBS[job_id]['status'] == 'pending'
-        assert JOBS[job_id]['progress']['total'] == 1
-        assert JOBS[job_id]['progress']['completed'] == 0
-    
-    def test_create_keyword_job(self):
+        store.create(job_id, 'scrape_source', total=1, source='github', query='OVH')
+
+        job = store.get(job_id)
+        assert job['status'] == 'pending'
+        assert job['progress'] == {'total': 1, 'completed': 0}
+        assert job['results'] == [] and job['errors'] == []
+        assert job['cancelled'] is False
+        assert job['source'] == 'github'
+
+    def test_create_keyword_job(self, store):
         """Test la création d'un job avec keywords."""
         job_id = str(uuid.uuid4())
         keywords = ['OVH', 'cloud']
         sources = ['x', 'github', 'stackoverflow']
         total_tasks = len(keywords) * len(sources)
-        
-        JOBS[job_id] = {
-            'id': job_id,
-            'status': 'pending',
-            'progress': {'total': total_tasks, 'completed': 0},
-            'results': [],
-            'errors': [],
-            'cancelled': False,
-            'error': None,
-        }
-        
-        assert job_id in JOBS
-        assert JOBS[job_id]['status'] == 'pending'
-        assert JOBS[job_id]['progress']['total'] == total_tasks
-        assert JOBS[job_id]['progress']['completed'] == 0
+
+        store.create(job_id, 'scrape_keywords', total=total_tasks)
+
+        job = store.get(job_id)
+        assert job['status'] == 'pending'
+        assert job['progress']['total'] == total_tasks
+        assert job['progress']['completed'] == 0
+
+    def test_unknown_job(self, store):
+        """Test qu'un job inconnu n'a pas d'état."""
+        assert store.get(str(uuid.uuid4())) is None
 
 
 class TestJobStatus:
     """Tests pour le statut des jobs."""
-    
-    def setup_method(self):
-        """Nettoyer les jobs avant chaque test."""
-        JOBS.clear()
-    
-    def test_job_status_pending(self):
-        """Test que le statut initial est 'pending'."""
+
+    def test_job_status_transitions(self, store):
+        """Test les transitions pending -> running -> completed."""
         job_id = str(uuid.uuid4())
-        JOBS[job_id] = {
-            'id': job_id,
-            'status': 'pending',
-            'progress': {'total': 1, 'completed': 0},
-        }
-        
-        assert JOBS[job_id]['status'] == 'pending'
-    
-    def test_job_status_running(self):
-        """Test le changement de statut vers 'running'."""
+        store.create(job_id, 'scrape_source', total=10)
+
+        assert store.set_status(job_id, 'running')
+        assert store.get(job_id)['status'] == 'running'
+        store.set_progress(job_id, 10)
+        assert store.set_status(job_id, 'completed')
+
+        job = store.get(job_id)
+        assert job['status'] == 'completed'
+        assert job['progress']['completed'] == job['progress']['total']
+        assert job_id not in store.active_job_ids()
+
+    def test_job_status_failed(self, store):
+        """Test le changement de statut vers 'failed'."""
         job_id = str(uuid.uuid4())
-        JOBS[job_id] = {
-            'id': job_id,
-            'status': 'pending',
-            'progress': {'total': 1, 'completed': 0},
-        }
-        
-        JOBS[job_id]['status'] = 'running'
-        assert JOBS[job_id]['status'] == 'running'
-    
-    def test_job_status_completed(self):
-        """Test le changement de statut vers 'completed'."""
+        store.create(job_id, 'scrape_source', total=10)
+        store.set_status(job_id, 'running')
+
+        store.set_status(job_id, 'failed', 'Test error')
+        job = store.get(job_id)
+        assert job['status'] == 'failed'
+        assert job['error'] == 'Test error'
+
+    def test_get_job_status_endpoint(self, store):
+        """Test que l'endpoint de statut lit le store partagé."""
         job_id = str(uuid.uuid4())
-        JOBS[job_id] = {
-            'id': job_id,
-            'status': 'running',
-            'progress': {'total': 10, 'completed': 10},
-        }
-        
-        JOBS[job_id]['status'] = 'completed'
-        assert JOBS[job_id]['status'] == 'completed'
-        assert JOBS[job_id]['progress']['completed'] == JOBS[job_id]['progress']['total']
-    
-    def test_job_status_failed(self):
-        """Test le changement de statut vers 'failed'."""
+        store.create(job_id, 'scrape_source', total=100)
+        store.set_progress(job_id, 42)
+
+        job = asyncio.run(get_job_status(job_id))
+        assert job['id'] == job_id
+        assert job['progress'] == {'total': 100, 'completed': 42}
+
+    def test_get_job_status_not_found(self, store):
+        """Test le 404 pour un job inconnu."""
+        from fastapi import HTTPException
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(get_job_status(str(uuid.uuid4())))
+        assert exc_info.value.status_code == 404
+
+    def test_stuck_job_is_failed(self, store):
+        """Test qu'un job running sans mise à jour depuis 30 min est marqué failed."""
         job_id = str(uuid.uuid4())
-        JOBS[job_id] = {
-            'id': job_id,
-            'status': 'running',
-            'progress': {'total': 10, 'completed': 5},
-            'error': 'Test error',
-        }
-        
-        JOBS[job_id]['status'] = 'failed'
-        assert JOBS[job_id]['status'] == 'failed'
-        assert JOBS[job_id]['error'] == 'Test error'
+        store.create(job_id, 'scrape_source', total=100)
+        store.set_status(job_id, 'running')
+        store._jobs[job_id]['updated_at'] -= 31 * 60
+
+        assert is_stuck(store.get(job_id))
+        job = asyncio.run(get_job_status(job_id))
+        assert job['status'] == 'failed'
+        assert store.get(job_id)['status'] == 'failed'
 
 
 class TestJobProgress:
     """Tests pour la progression des jobs."""
-    
-    def setup_method(self):
-        """Nettoyer les jobs avant chaque test."""
-        JOBS.clear()
-    
-    def test_progress_initialization(self):
-        """Test l'initialisation de la progression."""
-        job_id = str(uuid.uuid4())
-        total_tasks = 100
-        JOBS[job_id] = {
-            'id': job_id,
-            'status': 'pending',
-            'progress': {'total': total_tasks, 'completed': 0},
-        }
-        
-        assert JOBS[job_id]['progress']['total'] == total_tasks
-        assert JOBS[job_id]['progress']['completed'] == 0
-    
-    def test_progress_update(self):
+
+    def test_progress_update(self, store):
         """Test la mise à jour de la progression."""
         job_id = str(uuid.uuid4())
-        total_tasks = 100
-        JOBS[job_id] = {
-            'id': job_id,
-            'status': 'running',
-            'progress': {'total': total_tasks, 'completed': 0},
-        }
-        
-        # Simuler la progression
+        store.create(job_id, 'scrape_source', total=100)
+
         for i in range(1, 11):
-            JOBS[job_id]['progress']['completed'] = i
-            assert JOBS[job_id]['progress']['completed'] == i
-        
-        assert JOBS[job_id]['progress']['completed'] == 10
-        assert JOBS[job_id]['progress']['completed'] < JOBS[job_id]['progress']['total']
-    
-    def test_progress_completion(self):
-        """Test la complétion de la progression."""
-        job_id = str(uuid.uuid4())
-        total_tasks = 10
-        JOBS[job_id] = {
-            'id': job_id,
-            'status': 'running',
-            'progress': {'total': total_tasks, 'completed': 0},
-        }
-        
-        JOBS[job_id]['progress']['completed'] = total_tasks
-        assert JOBS[job_id]['progress']['completed'] == JOBS[job_id]['progress']['total']
-    
-    def test_progress_percentage(self):
-        """Test le calcul du pourcentage de progression."""
+            store.set_progress(job_id, i)
+            assert store.get(job_id)['progress']['completed'] == i
+
+        progress = store.get(job_id)['progress']
+        assert progress['completed'] < progress['total']
+
+    def test_progress_total_update(self, store):
+        """Test que le total peut être fixé après la création."""
         job_id = str(uuid.uuid4())
-        total_tasks = 100
-        JOBS[job_id] = {
-            'id': job_id,
-            'status': 'running',
-            'progress': {'total': total_tasks, 'completed': 25},
-        }
-        
-        progress = JOBS[job_id]['progress']
-        percentage = (progress['completed'] / progress['total']) * 100
-        assert percentage == 25.0
-    
-    def test_progress_zero_division(self):
-        """Test que la progression gère correctement total=0."""
+        store.create(job_id, 'scrape_keywords')
+        store.set_progress(job_id, 0, 30)
+        assert store.get(job_id)['progress'] == {'total': 30, 'completed': 0}
+
+    def test_state_is_a_copy(self, store):
+        """Test que modifier l'état retourné ne modifie pas le store."""
         job_id = str(uuid.uuid4())
-        JOBS[job_id] = {
-            'id': job_id,
-            'status': 'pending',
-            'progress': {'total': 0, 'completed': 0},
-        }
-        
-        progress = JOBS[job_id]['progress']
-        if progress['total'] > 0:
-            percentage = (progress['completed'] / progress['total']) * 100
-        else:
-            percentage = 0
-        assert percentage == 0
+        store.create(job_id, 'scrape_source', total=100)
+        store.get(job_id)['progress']['completed'] = 50
+        assert store.get(job_id)['progress']['completed'] == 0
 
 
 class TestJobCancellation:
     """Tests pour l'annulation de jobs."""
-    
-    def setup_method(self):
-        """Nettoyer les jobs avant chaque test."""
-        JOBS.clear()
-    
-    def test_cancel_single_job(self):
+
+    def test_cancel_single_job(self, store):
         """Test l'annulation d'un job unique."""
         job_id = str(uuid.uuid4())
-        JOBS[job_id] = {
-            'id': job_id,
-            'status': 'running',
-            'progress': {'total': 100, 'completed': 50},
-            'cancelled': False,
-        }
-        
-        JOBS[job_id]['cancelled'] = True
-        JOBS[job_id]['status'] = 'cancelled'
-        
-        assert JOBS[job_id]['cancelled'] is True
-        assert JOBS[job_id]['status'] == 'cancelled'
-    
-    def test_cancel_all_jobs(self):
+        store.create(job_id, 'scrape_source', total=100)
+        store.set_status(job_id, 'running')
+
+        assert asyncio.run(cancel_job(job_id)) == {'cancelled': True}
+
+        job = store.get(job_id)
+        assert job['cancelled'] is True
+        assert job['status'] == 'cancelled'
+        assert store.is_cancelled(job_id)
+
+    def test_cancel_is_not_overridden(self, store):
+        """Test qu'un job annulé ne repasse pas en completed."""
+        job_id = str(uuid.uuid4())
+        store.create(job_id, 'scrape_source', total=100)
+        store.cancel(job_id)
+
+        assert not store.set_status(job_id, 'completed')
+        assert store.get(job_id)['status'] == 'cancelled'
+
+    def test_cancel_finished_job(self, store):
+        """Test qu'un job terminé n'est pas annulé."""
+        job_id = str(uuid.uuid4())
+        store.create(job_id, 'scrape_source', total=100)
+        store.set_status(job_id, 'completed')
+
+        assert asyncio.run(cancel_job(job_id)) == {'cancelled': False, 'status': 'completed'}
+
+    def test_cancel_all_jobs(self, store):
         """Test l'annulation de tous les jobs."""
-        # Créer plusieurs jobs
-        for i in range(3):
-            job_id = str(uuid.uuid4())
-            JOBS[job_id] = {
-                'id': job_id,
-                'status': 'running',
-                'progress': {'total': 100, 'completed': i * 10},
-                'cancelled': False,
-            }
-        
-        # Annuler tous les jobs
-        for job_id in JOBS:
-            JOBS[job_id]['cancelled'] = True
-            JOBS[job_id]['status'] = 'cancelled'
-        
-        # Vérifier que tous les jobs sont annulés
-        for job_id in JOBS:
-            assert JOBS[job_id]['cancelled'] is True
-            assert JOBS[job_id]['status'] == 'cancelled'
+        job_ids = [str(uuid.uuid4()) for _ in range(3)]
+        for job_id in job_ids:
+            store.create(job_id, 'scrape_source', total=100)
+            store.set_status(job_id, 'running')
+
+        with patch('app.routers.scraping.jobs.db') as mock_db:
+            mock_db.get_all_jobs.return_value = []
+            result = asyncio.run(cancel_all_jobs())
+
+        assert result['cancelled'] == 3
+        for job_id in job_ids:
+            assert store.get(job_id)['status'] == 'cancelled'
+        assert store.active_job_ids() == []
 
 
 class TestJobErrors:
     """Tests pour la gestion des erreurs dans les jobs."""
-    
-    def setup_method(self):
-        """Nettoyer les jobs avant chaque test."""
-        JOBS.clear()
-    
-    def test_job_error_tracking(self):
-        """Test le suivi des erreurs dans un job."""
-        job_id = str(uuid.uuid4())
-        JOBS[job_id] = {
-            'id': job_id,
-            'status': 'running',
-            'progress': {'total': 100, 'completed': 50},
-            'errors': [],
-            'error': None,
-        }
-        
-        # Ajouter une erreur
-        error_msg = "Test error message"
-        JOBS[job_id]['errors'].append(error_msg)
-        JOBS[job_id]['error'] = error_msg
-        
-        assert len(JOBS[job_id]['errors']) == 1
-        assert JOBS[job_id]['errors'][0] == error_msg
-        assert JOBS[job_id]['error'] == error_msg
-    
-    def test_job_multiple_errors(self):
+
+    def test_job_multiple_errors(self, store):
         """Test le suivi de plusieurs erreurs."""
         job_id = str(uuid.uuid4())
-        JOBS[job_id] = {
-            'id': job_id,
-            'status': 'running',
-            'progress': {'total': 100, 'completed': 50},
-            'errors': [],
-        }
-        
-        # Ajouter plusieurs erreurs
+        store.create(job_id, 'scrape_source', total=100)
+
         errors = ["Error 1", "Error 2", "Error 3"]
         for error in errors:
-            JOBS[job_id]['errors'].append(error)
-        
-        assert len(JOBS[job_id]['errors']) == 3
-        assert JOBS[job_id]['errors'] == errors
-    
-    def test_job_failure_status(self):
-        """Test que le statut passe à 'failed' en cas d'erreur."""
+            store.add_error(job_id, error)
+
+        assert store.get(job_id)['errors'] == errors
+
+    def test_job_results(self, store):
+        """Test le suivi des résultats partiels."""
         job_id = str(uuid.uuid4())
-        JOBS[job_id] = {
-            'id': job_id,
-            'status': 'running',
-            'progress': {'total': 100, 'completed': 50},
-            'error': 'Critical error',
-        }
-        
-        JOBS[job_id]['status'] = 'failed'
-        
-        assert JOBS[job_id]['status'] == 'failed'
-        assert JOBS[job_id]['error'] == 'Critical error'
+        store.create(job_id, 'scrape_source', total=100)
+        store.add_result(job_id, {'added': 3, 'source': 'github'})
+        assert store.get(job_id)['results'] == [{'added': 3, 'source': 'github'}]
+
+
+class TestStateFromRecord:
+    """Tests pour la lecture d'un job depuis la table jobs (fallback Postgres)."""
+
+    def test_record_conversion(self):
+        """Test la conversion d'une ligne de la table jobs."""
+        updated_at = datetime.now() - timedelta(minutes=5)
+        state = _state_from_record({
+            'id': 'abc',
+            'job_type': 'scrape_source',
+            'status': 'cancelled',
+            'payload': {'source': 'reddit', 'query': 'OVH'},
+            'progress': {'total': 100, 'completed': 30},
+            'errors': ['cancelled by user'],
+            'error': 'cancelled by user',
+            'updated_at': updated_at,
+        })
+        assert state['cancelled'] is True
+        assert state['source'] == 'reddit'
+        assert state['progress'] == {'total': 100, 'completed': 30}
+        assert state['errors'] == ['cancelled by user']
+        assert state['updated_at'] == pytest.approx(updated_at.timestamp())
+        assert not is_stuck(state)
+
+
+class TestJobEvents:
+    """Tests pour la fusion des événements du flux SSE."""
+
+    def test_progress_and_status_coalesced(self, store):
+        """Test que plusieurs événements d'une fenêtre donnent un seul état."""
+        job_id = str(uuid.uuid4())
+        store.create(job_id, 'scrape_source', total=10)
+        job = store.get(job_id)
+
+        changed, refresh, logs = _apply_job_events(job, [
+            {'type': 'progress', 'completed': 3},
+            {'type': 'progress', 'completed': 7, 'total': 12},
+            {'type': 'log', 'level': 'info', 'message': 'github: 4 posts'},
+            {'type': 'status', 'status': 'cancelled', 'error': None},
+        ])
+        assert changed and not refresh
+        assert job['progress'] == {'total': 12, 'completed': 7}
+        assert job['status'] == 'cancelled' and job['cancelled'] is True
+        assert logs == [{'level': 'info', 'message': 'github: 4 posts'}]
+
+    def test_error_event_requests_refresh(self, store):
+        """Test qu'une erreur ou un résultat demande une relecture de l'état."""
+        job = _state_from_record({'id': 'abc', 'status': 'running'})
+        changed, refresh, logs = _apply_job_events(job, [{'type': 'error', 'error': 'boom'}])
+        assert not changed and refresh and logs == []
+
+
+class TestScrapeWatermarks:
+    """Tests pour le scraping incrémental (watermarks par source / requête)."""
+
+    ITEMS = [
+        {'source': 'Reddit', 'author': 'u/a', 'content': 'OVH VPS down again', 'url': 'https://reddit.test/1',
+         'created_at': '2026-03-02T10:00:00'},
+        {'source': 'Reddit', 'author': 'u/b', 'content': 'OVH support answered fast', 'url': 'https://reddit.test/2',
+         'created_at': '2026-03-01T09:00:00'},
+    ]
+
+    def _run(self, mock_db, calls, items=None, limit=10):
+        from app.routers.scraping import jobs
+
+        async def fake_scraper(query, limit, since=None):
+            calls.append(since)
+            if items is not None:
+                return items(limit)
+            return [dict(item) for item in self.ITEMS]
+
+        with patch.object(jobs, 'db', mock_db), \
+             patch.object(jobs.reddit, 'scrape_reddit_async', fake_scraper), \
+             patch.object(jobs, 'should_insert_post', return_value=(True, 0.9)), \
+             patch.object(jobs.sentiment, 'analyze', return_value={'label': 'neutral', 'score': 0.0}):
+            return asyncio.run(jobs._run_scrape_for_source_async('reddit', 'OVH', limit, use_keyword_expansion=False))
+
+    def test_before_watermark(self):
+        """Test la comparaison des dates des items au watermark."""
+        from app.scraper.base_scraper import BaseScraper, parse_created_at
+        since = parse_created_at('2026-03-01T12:00:00Z')
+        assert BaseScraper._before_watermark('2026-03-01T09:00:00', since)
+        assert not BaseScraper._before_watermark('2026-03-01T12:00:00+00:00', since)
+        assert not BaseScraper._before_watermark('not a date', since)
+        assert not BaseScraper._before_watermark('2020-01-01T00:00:00', None)
+
+    def test_watermark_passed_and_advanced(self):
+        """Test que le scraper reçoit le watermark et qu'il avance au plus récent item stocké."""
+        since = datetime(2026, 3, 1, 8, 0)
+        mock_db = Mock()
+        mock_db.get_scrape_watermark.return_value = {'newest_created_at': since}
+        mock_db.insert_posts_bulk.return_value = [{'status': 'inserted'}, {'status': 'inserted'}]
+        calls = []
+
+        assert self._run(mock_db, calls) == 2
+        assert calls == [since]
+        source, query, newest, url = mock_db.advance_scrape_watermark.call_args.args
+        assert (source, query, url) == ('reddit', 'OVH', 'https://reddit.test/1')
+        assert newest.isoformat().startswith('2026-03-02T10:00:00')
+
+    def test_truncated_scrape_keeps_watermark(self):
+        """Test qu'un scrape arrêté par la limite ne fait pas avancer le watermark."""
+        def items(limit):
+            # Plus récent d'abord, autant d'items que la limite : le watermark n'a pas été atteint
+            return [{'source': 'Reddit', 'author': 'u/a', 'content': f'OVH post {index}',
+                     'url': f'https://reddit.test/page-{index}',
+                     'created_at': f'2026-03-{20 - index:02d}T10:00:00'} for index in range(limit)]
+
+        since = datetime(2026, 2, 1)
+        mock_db = Mock()
+        mock_db.get_scrape_watermark.return_value = {'newest_created_at': since}
+        mock_db.insert_posts_bulk.side_effect = lambda posts: [{'status': 'inserted'} for _ in posts]
+        calls = []
+
+        assert self._run(mock_db, calls, items=items, limit=20) == 20
+        assert calls == [since]
+        # Les posts entre le 1er février et le 1er mars n'ont pas encore été vus
+        mock_db.advance_scrape_watermark.assert_not_called()
+
+    def test_failed_insert_keeps_watermark(self):
+        """Test qu'un échec d'insertion ne fait pas avancer le watermark."""
+        mock_db = Mock()
+        mock_db.get_scrape_watermark.return_value = None
+        mock_db.insert_posts_bulk.side_effect = RuntimeError('database down')
+        calls = []
 
+        assert self._run(mock_db, calls) == 0
+        assert calls == [None]
+        mock_db.advance_scrape_watermark.assert_not_called()
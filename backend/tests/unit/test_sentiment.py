@@ -138,3 +138,35 @@ class TestAnalyze:
 
 
 
+
+
+class TestAnalyzeBatch:
+    """Tests for analyze_batch function."""
+    
+    def test_batch_matches_single_analysis(self):
+        """Test that batch results are identical to analyze() one text at a time."""
+        texts = [
+            "Service terrible, lent et inefficace. Je ne recommande pas.",
+            "I love OVH cloud services! They are amazing!",
+            "",
+            "Service terrible, lent et inefficace. Je ne recommande pas.",
+        ]
+        languages = ['fr', 'en', None, 'fr']
+        results = sentiment.analyze_batch(texts, languages)
+        assert results == [sentiment.analyze(text, language=lang) for text, lang in zip(texts, languages)]
+    
+    def test_batch_detects_missing_languages(self):
+        """Test that languages are detected when not provided."""
+        text = "J'avais un problème avec la facturation. Cependant, le support a été excellent et a résolu tout rapidement."
+        assert sentiment.analyze_batch([text]) == [sentiment.analyze(text, language='fr')]
+    
+    def test_batch_process_pool(self):
+        """Test that the process pool gives the same results as in-process scoring."""
+        texts = [f"Post {i}: the VPS is slow but support was great." for i in range(sentiment.BATCH_CHUNK_SIZE + 10)]
+        assert sentiment.analyze_batch(texts, ['en'] * len(texts), processes=2) == \
+            sentiment.analyze_batch(texts, ['en'] * len(texts))
+    
+    def test_batch_length_mismatch(self):
+        """Test that texts and languages must have the same length."""
+        with pytest.raises(ValueError):
+            sentiment.analyze_batch(["a", "b"], ['en'])
@@ -3,22 +3,31 @@ Worker Service
 ==============
 Isolated process for handling scraping jobs.
 Runs separately from the API to prevent server crashes.
+
+Up to WORKER_CONCURRENCY jobs run at the same time in a thread pool; scrape_all
+jobs fan their (query, source) pairs out with SCRAPE_SOURCE_CONCURRENCY
+scrapes in flight per source. On SIGTERM the worker stops taking jobs and
+waits for the running ones (scrape_all jobs stop starting new pairs).
 """
 import os
 import sys
 import time
 import signal
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Tuple
 
 # Setup path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from app.job_queue import (
-    get_job_queue, close_job_queue, Job, JobStatus, JobType
+    get_job_queue, close_job_queue, Job, JobStatus, JobType,
+    enqueue_refresh_insights_job
 )
 from app import database as db
+from app.log_buffer import close_log_buffer
 from app.keywords import keywords_base
 
 # Configure logging
@@ -35,16 +44,20 @@ logger = logging.getLogger('worker')
 WORKER_CONCURRENCY = int(os.getenv('WORKER_CONCURRENCY', '2'))
 POLL_INTERVAL = int(os.getenv('POLL_INTERVAL', '5'))
 MAX_JOB_DURATION = int(os.getenv('MAX_JOB_DURATION', '600'))  # 10 minutes
+# scrape_all: scrapes in flight per source, and in total per job
+SCRAPE_SOURCE_CONCURRENCY = max(1, int(os.getenv('SCRAPE_SOURCE_CONCURRENCY', '1')))
+SCRAPE_ALL_CONCURRENCY = int(os.getenv('SCRAPE_ALL_CONCURRENCY', '6'))
+# Lease heartbeat period; must stay well under JOB_LEASE_TIMEOUT (120s by default)
+HEARTBEAT_INTERVAL = int(os.getenv('HEARTBEAT_INTERVAL', '30'))
 
-# Graceful shutdown flag
-_shutdown_requested = False
+# Graceful shutdown flag (set from the signal handler, read by running jobs)
+_shutdown_event = threading.Event()
 
 
 def signal_handler(signum, frame):
     """Handle shutdown signals."""
-    global _shutdown_requested
     logger.info(f"Received signal {signum}, initiating graceful shutdown...")
-    _shutdown_requested = True
+    _shutdown_event.set()
 
 
 def process_scrape_source_job(job: Job) -> dict:
@@ -73,7 +86,12 @@ def process_scrape_source_job(job: Job) -> dict:
 
 
 def process_scrape_all_job(job: Job) -> dict:
-    """Process a job to scrape multiple sources."""
+    """Process a job to scrape multiple sources.
+    
+    Sources are scraped in parallel (at most SCRAPE_ALL_CONCURRENCY scrapes at a
+    time) with SCRAPE_SOURCE_CONCURRENCY scrapes in flight per source, so a
+    single site is not hammered. Queries not yet started are skipped on shutdown.
+    """
     from app.routers.scraping import _run_scrape_for_source
     
     payload = job.payload
@@ -81,38 +99,53 @@ def process_scrape_all_job(job: Job) -> dict:
     sources = payload.get('sources', [])
     limit = payload.get('limit_per_query', 50)
     
+    def run_lane(source: str, lane_queries: List[str]) -> List[Tuple[str, Any]]:
+        """Scrape one source for several queries, one after the other."""
+        outcomes = []
+        for query in lane_queries:
+            if _shutdown_event.is_set():
+                outcomes.append((query, None))
+                continue
+            try:
+                outcomes.append((query, _run_scrape_for_source(source, query, limit, True)))
+            except Exception as e:
+                outcomes.append((query, e))
+        return outcomes
+    
+    # SCRAPE_SOURCE_CONCURRENCY lanes per source, queries dealt round-robin
+    lanes = [
+        (source, queries[lane::SCRAPE_SOURCE_CONCURRENCY])
+        for source in sources
+        for lane in range(min(SCRAPE_SOURCE_CONCURRENCY, len(queries)))
+    ]
+    
     total_added = 0
     errors = []
     results = []
+    skipped = 0
     
-    for query in queries:
-        for source in sources:
-            if _shutdown_requested:
-                logger.info("Shutdown requested, stopping scrape job")
-                break
-            
-            try:
-                added = _run_scrape_for_source(source, query, limit, True)
-                total_added += added
-                results.append({
-                    'source': source,
-                    'query': query,
-                    'posts_added': added
-                })
-                
-                # Small delay between requests
-                time.sleep(0.5)
-                
-            except Exception as e:
-                error_msg = f"{source}/{query}: {str(e)}"
-                errors.append(error_msg)
-                logger.error(f"Error: {error_msg}")
-        
-        if _shutdown_requested:
-            break
-        
-        # Delay between queries
-        time.sleep(1.0)
+    workers = max(1, min(SCRAPE_ALL_CONCURRENCY, len(lanes)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"scrape-{job.id[:8]}") as executor:
+        futures = {executor.submit(run_lane, source, lane_queries): source for source, lane_queries in lanes}
+        for future in as_completed(futures):
+            source = futures[future]
+            for query, outcome in future.result():
+                if outcome is None:
+                    skipped += 1
+                elif isinstance(outcome, Exception):
+                    error_msg = f"{source}/{query}: {str(outcome)}"
+                    errors.append(error_msg)
+                    logger.error(f"Error: {error_msg}")
+                else:
+                    total_added += outcome
+                    results.append({
+                        'source': source,
+                        'query': query,
+                        'posts_added': outcome
+                    })
+    
+    if skipped:
+        logger.info(f"Shutdown requested, skipped {skipped} scrape(s) of job {job.id}")
     
     # Cleanup duplicates
     try:
@@ -122,6 +155,13 @@ def process_scrape_all_job(job: Job) -> dict:
     except Exception as e:
         logger.warning(f"Could not clean duplicates: {e}")
     
+    # Precomputed insights: recomputed by their own job if the post set changed enough
+    if total_added > 0:
+        try:
+            enqueue_refresh_insights_job(triggered_by='scrape_all')
+        except Exception as e:
+            logger.warning(f"Could not enqueue insights refresh: {e}")
+    
     return {
         'total_posts_added': total_added,
         'sources_scraped': len(sources),
@@ -213,6 +253,17 @@ def process_cleanup_job(job: Job) -> dict:
     return results
 
 
+def process_refresh_insights_job(job: Job) -> dict:
+    """Recompute the What's Happening / improvements snapshots whose posts changed."""
+    from app.routers.dashboard.snapshots import refresh_insight_snapshots
+    from app.utils import llm_gateway
+    
+    result = llm_gateway.run(refresh_insight_snapshots(force=job.payload.get('force', False)))
+    logger.info(f"Insight snapshots: {len(result['computed'])} computed, "
+                f"{len(result['skipped'])} unchanged, {len(result['failed'])} failed")
+    return result
+
+
 def process_job(job: Job) -> dict:
     """Route job to appropriate handler."""
     handlers = {
@@ -221,6 +272,7 @@ def process_job(job: Job) -> dict:
         JobType.AUTO_SCRAPE: process_auto_scrape_job,
         JobType.BACKUP: process_backup_job,
         JobType.CLEANUP: process_cleanup_job,
+        JobType.REFRESH_INSIGHTS: process_refresh_insights_job,
     }
     
     handler = handlers.get(job.job_type)
@@ -230,10 +282,36 @@ def process_job(job: Job) -> dict:
     return handler(job)
 
 
-def worker_loop():
-    """Main worker loop."""
-    global _shutdown_requested
+def run_job(queue, job: Job):
+    """Run one job and report its outcome to the queue (runs in a pool thread)."""
+    logger.info(f"Processing job: {job.id} ({job.job_type})")
+    start_time = time.time()
     
+    try:
+        result = process_job(job)
+        duration = time.time() - start_time
+        
+        queue.complete(job.id, result)
+        logger.info(f"Job {job.id} completed in {duration:.2f}s")
+        
+    except Exception as e:
+        error_msg = f"{type(e).__name__}: {str(e)}"
+        
+        # Decide if we should retry
+        retry = job.attempts < job.max_attempts
+        try:
+            queue.fail(job.id, error_msg, retry=retry)
+        except Exception as fail_error:
+            logger.error(f"Could not record failure of job {job.id}: {fail_error}")
+        
+        if retry:
+            logger.warning(f"Job {job.id} failed, will retry: {error_msg}")
+        else:
+            logger.error(f"Job {job.id} failed permanently: {error_msg}")
+
+
+def worker_loop():
+    """Main worker loop: dequeue jobs while a pool slot is free."""
     logger.info("=" * 50)
     logger.info("VibeCoding Worker Started")
     logger.info(f"Concurrency: {WORKER_CONCURRENCY}")
@@ -252,45 +330,63 @@ def worker_loop():
     consecutive_errors = 0
     max_consecutive_errors = 10
     
-    while not _shutdown_requested:
+    executor = ThreadPoolExecutor(max_workers=WORKER_CONCURRENCY, thread_name_prefix='job')
+    # One slot per pool thread: a job is only taken off the queue when it can start
+    slots = threading.BoundedSemaphore(WORKER_CONCURRENCY)
+    in_flight: Dict[str, Job] = {}
+    in_flight_lock = threading.Lock()
+    
+    def on_done(job_id: str):
+        with in_flight_lock:
+            in_flight.pop(job_id, None)
+        slots.release()
+    
+    def heartbeat():
+        """Keep the leases of running jobs alive and recover jobs of dead workers."""
+        while not heartbeat_stop.wait(HEARTBEAT_INTERVAL):
+            with in_flight_lock:
+                job_ids = list(in_flight)
+            try:
+                for job_id in job_ids:
+                    if not queue.extend_lease(job_id):
+                        logger.warning(f"Lease of job {job_id} was lost, it may run twice")
+                queue.reap_expired_leases()
+            except Exception as e:
+                logger.warning(f"Heartbeat error: {e}")
+    
+    try:
+        queue.reap_expired_leases()
+    except Exception as e:
+        logger.warning(f"Could not recover expired jobs: {e}")
+    heartbeat_stop = threading.Event()
+    heartbeat_thread = threading.Thread(target=heartbeat, name='lease-heartbeat', daemon=True)
+    heartbeat_thread.start()
+    
+    while not _shutdown_event.is_set():
+        if not slots.acquire(timeout=POLL_INTERVAL):
+            continue
         try:
             # Get next job (blocking with timeout)
             job = queue.dequeue(timeout=POLL_INTERVAL)
             
             if job is None:
+                slots.release()
                 consecutive_errors = 0  # Reset on successful poll
                 continue
             
-            logger.info(f"Processing job: {job.id} ({job.job_type})")
-            start_time = time.time()
-            
-            try:
-                result = process_job(job)
-                duration = time.time() - start_time
-                
-                queue.complete(job.id, result)
-                logger.info(f"Job {job.id} completed in {duration:.2f}s")
-                
-            except Exception as e:
-                duration = time.time() - start_time
-                error_msg = f"{type(e).__name__}: {str(e)}"
-                
-                # Decide if we should retry
-                retry = job.attempts < job.max_attempts
-                queue.fail(job.id, error_msg, retry=retry)
-                
-                if retry:
-                    logger.warning(f"Job {job.id} failed, will retry: {error_msg}")
-                else:
-                    logger.error(f"Job {job.id} failed permanently: {error_msg}")
-            
+            with in_flight_lock:
+                in_flight[job.id] = job
+            future = executor.submit(run_job, queue, job)
+            future.add_done_callback(lambda _, job_id=job.id: on_done(job_id))
             consecutive_errors = 0
             
         except KeyboardInterrupt:
+            slots.release()
             logger.info("Keyboard interrupt received")
-            _shutdown_requested = True
+            _shutdown_event.set()
             
         except Exception as e:
+            slots.release()
             consecutive_errors += 1
             logger.error(f"Worker error ({consecutive_errors}/{max_consecutive_errors}): {e}")
             
@@ -298,11 +394,20 @@ def worker_loop():
                 logger.critical("Too many consecutive errors, shutting down")
                 break
             
-            time.sleep(min(30, POLL_INTERVAL * consecutive_errors))
+            _shutdown_event.wait(min(30, POLL_INTERVAL * consecutive_errors))
     
-    # Cleanup
-    logger.info("Worker shutting down...")
+    # Cleanup: let in-flight jobs finish before closing the queue
+    with in_flight_lock:
+        running = list(in_flight)
+    if running:
+        logger.info(f"Worker shutting down, waiting for {len(running)} running job(s): {', '.join(running)}")
+    else:
+        logger.info("Worker shutting down...")
+    executor.shutdown(wait=True)
+    heartbeat_stop.set()
+    heartbeat_thread.join()
     close_job_queue()
+    close_log_buffer()
     logger.info("Worker stopped")
 
 
@@ -222,7 +222,38 @@ export class API {
         }
         return response.json();
     }
-    
+
+    async getDashboardAggregates(filters = {}, limit = 50, offset = 0) {
+        // Chart series computed server-side for a filter set, plus one page of posts.
+        // The response has an ETag: with 'no-cache' the browser revalidates and reuses
+        // its copy on 304 when nothing changed.
+        const params = new URLSearchParams({ limit, offset });
+        for (const [key, value] of Object.entries(filters)) {
+            if (value !== null && value !== undefined && value !== '' && value !== 'all') {
+                params.append(key, value);
+            }
+        }
+        const response = await fetch(`${this.baseURL}/api/dashboard/aggregates?${params.toString()}`, { cache: 'no-cache' });
+        if (!response.ok) {
+            throw new Error(`Failed to get dashboard aggregates: ${response.statusText}`);
+        }
+        return response.json();
+    }
+
+    async getWhatsHappeningSnapshot(preset) {
+        // Insights precomputed by the server for a date range preset (null if not computed yet)
+        try {
+            const response = await fetch(`${this.baseURL}/api/whats-happening/snapshot?preset=${encodeURIComponent(preset)}`);
+            if (!response.ok) {
+                return null;
+            }
+            return response.json();
+        } catch (error) {
+            console.warn('Failed to fetch What\'s Happening snapshot:', error);
+            return null;
+        }
+    }
+
     async startScrapingJob(keywords, limit = 50, concurrency = 2, delay = 0.5) {
         const response = await fetch(`${this.baseURL}/scrape/keywords?limit=${limit}&concurrency=${concurrency}&delay=${delay}`, {
             method: 'POST',
@@ -246,7 +277,12 @@ export class API {
         }
         return response.json();
     }
-    
+
+    subscribeJobEvents(jobId) {
+        // Server-Sent Events: 'state' (full job snapshot) and 'log' events until the job ends
+        return new EventSource(`${this.baseURL}/scrape/jobs/${jobId}/events`);
+    }
+
     async cancelJob(jobId) {
         const response = await fetch(`${this.baseURL}/scrape/jobs/${jobId}/cancel`, {
             method: 'POST'
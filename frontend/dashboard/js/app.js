@@ -82,7 +82,7 @@ class App {
     constructor() {
         try {
             this.api = new API();
-            this.state = new State();
+            this.state = new State(this.api);
             this.init();
         } catch (error) {
             console.error('App: Error in constructor:', error);
@@ -187,55 +187,21 @@ class App {
         }, 500);
     }
     
-    // Helper function to filter valid posts (exclude samples and relevance_score = 0)
-    // Same logic as in data collection page (index.html) and dashboard.js
-    filterValidPosts(posts) {
-        return posts.filter(post => {
-            // Filter out sample posts
-            const url = post.url || '';
-            const isSample = (
-                url.includes('/sample') || 
-                url.includes('example.com') ||
-                url.includes('/status/174') ||
-                url === 'https://trustpilot.com/sample'
-            );
-            if (isSample) return false;
-            
-            // Filter out posts with relevance_score = 0
-            // Calculate relevance score (same logic as calculateRelevanceScore)
-            let relevanceScore = post.relevance_score;
-            if (relevanceScore === undefined || relevanceScore === null || relevanceScore <= 0) {
-                // Calculate on frontend if not stored
-                const content = (post.content || '').toLowerCase();
-                const urlLower = (post.url || '').toLowerCase();
-                const OVH_BRANDS = ['ovh', 'ovhcloud', 'ovh cloud', 'kimsufi', 'ovh.com', 'ovhcloud.com'];
-                const hasBrand = OVH_BRANDS.some(brand => content.includes(brand) || urlLower.includes(brand));
-                relevanceScore = hasBrand ? 0.5 : 0.0; // Simple check, full calculation is in dashboard.js
-            }
-            
-            if (relevanceScore === 0 || relevanceScore === null || relevanceScore === undefined) {
-                return false;
-            }
-            
-            return true;
-        });
-    }
-
     async loadPosts() {
         console.log('[App] Starting loadPosts()...');
         console.log('[App] API baseURL:', this.api.baseURL);
         
         try {
-            console.log('[App] Calling api.getPosts(10000, 0)...');
-            const posts = await this.api.getPosts(10000, 0);  // Get all posts to ensure complete sync
+            // Aggregates (charts) and first page of posts of the current filters
+            console.log('[App] Loading dashboard aggregates...');
+            await this.state.refresh();
             
-            console.log('[App] Posts received from API:', {
-                isArray: Array.isArray(posts),
-                length: posts?.length || 0,
-                firstPost: posts?.[0] || null
+            console.log('[App] Aggregates received from API:', {
+                total: this.state.postsTotal,
+                loadedPosts: this.state.posts.length
             });
             
-            if (!posts || posts.length === 0) {
+            if (this.state.postsTotal === 0) {
                 console.warn('[App] No posts found in database');
                 this.showError('No posts found in database. Go to Feedbacks Collection to scrape some data.');
                 // Show empty state message
@@ -246,23 +212,6 @@ class App {
                 return;
             }
             
-            // Filter valid posts (exclude samples and relevance_score = 0) to match data collection page
-            console.log('[App] Filtering valid posts...');
-            const validPosts = this.filterValidPosts(posts);
-            console.log('[App] Valid posts after filtering:', {
-                originalCount: posts.length,
-                validCount: validPosts.length,
-                filteredOut: posts.length - validPosts.length
-            });
-            
-            // Set posts in state (will trigger dashboard update via subscription)
-            console.log('[App] Setting posts in state...');
-            this.state.setPosts(validPosts);
-            console.log('[App] Posts set in state:', {
-                statePostsCount: this.state.posts?.length || 0,
-                stateFilteredPostsCount: this.state.filteredPosts?.length || 0
-            });
-            
             // Hide loading indicator
             const loadingIndicator = document.getElementById('loadingIndicator');
             if (loadingIndicator) {
@@ -1,6 +1,5 @@
 // Charts management for dashboard
 import { State } from './state.js';
-import { getProductLabel } from './product-detection.js';
 
 let timelineChart = null;
 let currentTimelineData = null; // Store current timeline data for onClick handler
@@ -19,35 +18,18 @@ export function updateTimelineChart(state) {
     const canvas = document.getElementById('timelineChart');
     if (!canvas) return;
     
-    const posts = state.filteredPosts || [];
+    // Daily counts per sentiment of the posts matching the filters (computed server-side)
+    const timeline = state.aggregates?.timeline || [];
     
-    // Note: state.filteredPosts should already be filtered by date range
-    // But we ensure the timeline only shows posts within the date range filter
-    // This ensures alignment between timeline and date range filter
-    let filteredPosts = posts;
-    if (state.filters?.dateFrom || state.filters?.dateTo) {
-        filteredPosts = posts.filter(post => {
-            const postDate = new Date(post.created_at).toISOString().split('T')[0];
-            
-            if (state.filters.dateFrom && postDate < state.filters.dateFrom) {
-                return false;
-            }
-            if (state.filters.dateTo && postDate > state.filters.dateTo) {
-                return false;
-            }
-            return true;
-        });
-    }
-    
-    // Group posts by date
+    // Group by date
     const grouped = {};
-    filteredPosts.forEach(post => {
-        const date = new Date(post.created_at);
-        const key = date.toISOString().split('T')[0];
-        if (!grouped[key]) {
-            grouped[key] = { positive: 0, negative: 0, neutral: 0 };
-        }
-        grouped[key][post.sentiment_label || 'neutral']++;
+    timeline.forEach(day => {
+        grouped[day.date] = {
+            positive: day.positive,
+            negative: day.negative,
+            neutral: day.neutral,
+            products: day.products || []
+        };
     });
     
     // Sort by date
@@ -107,11 +89,10 @@ export function updateTimelineChart(state) {
         existingChart.destroy();
     }
     
-    // Store timeline data for onClick handler (use filtered posts to match date range)
+    // Store timeline data for onClick handler
     currentTimelineData = {
         sortedKeys: sortedKeys,
-        grouped: grouped,
-        posts: filteredPosts // Use filtered posts to ensure alignment with date range
+        grouped: grouped
     };
     
     // Wait a bit to ensure canvas is ready and previous chart is fully destroyed
@@ -217,22 +198,10 @@ export function updateTimelineChart(state) {
                             if (currentTimelineData) {
                                 const index = context.dataIndex;
                                 const dateKey = currentTimelineData.sortedKeys[index];
-                                const datePosts = currentTimelineData.posts.filter(p => {
-                                    const postDate = new Date(p.created_at).toISOString().split('T')[0];
-                                    return postDate === dateKey;
-                                });
-                                
-                                // Group by product
-                                const productCounts = {};
-                                datePosts.forEach(post => {
-                                    const product = getProductLabel(post.id, post.content, post.language) || 'General';
-                                    productCounts[product] = (productCounts[product] || 0) + 1;
-                                });
-                                
-                                const topProducts = Object.entries(productCounts)
-                                    .sort((a, b) => b[1] - a[1])
+                                // Products of the day, most frequent first
+                                const topProducts = (currentTimelineData.grouped[dateKey]?.products || [])
                                     .slice(0, 3)
-                                    .map(([product, count]) => `${product}: ${count}`)
+                                    .map(({ product, count }) => `${product}: ${count}`)
                                     .join(', ');
                                 
                                 return topProducts ? `Top products: ${topProducts}` : '';
@@ -326,11 +295,8 @@ export function updateTimelineChart(state) {
                     
                     if (!clickedDate) return;
                     
-                    // Get posts for this date
-                    const datePosts = currentTimelineData.posts.filter(p => {
-                        const postDate = new Date(p.created_at).toISOString().split('T')[0];
-                        return postDate === clickedDate;
-                    });
+                    // Products of this date, most frequent first
+                    const dateProducts = currentTimelineData.grouped[clickedDate]?.products || [];
                     
                     // Check if it's a double-click (filter by product) or single click (filter by date)
                     const now = Date.now();
@@ -338,23 +304,14 @@ export function updateTimelineChart(state) {
                     const isDoubleClick = (now - lastClickTime) < 300; // 300ms threshold
                     timelineChart._lastClickTime = now;
                     
-                    if (isDoubleClick && datePosts.length > 0) {
+                    if (isDoubleClick) {
                         // Double-click: Filter by most common product for this date
-                        const productCounts = {};
-                        datePosts.forEach(post => {
-                            const product = getProductLabel(post.id, post.content, post.language);
-                            if (product) {
-                                productCounts[product] = (productCounts[product] || 0) + 1;
-                            }
-                        });
-                        
-                        const topProduct = Object.entries(productCounts)
-                            .sort((a, b) => b[1] - a[1])[0];
+                        const topProduct = dateProducts[0];
                         
                         if (topProduct) {
                             // Dispatch event to filter by product
                             const filterEvent = new CustomEvent('filterByProductFromTimeline', {
-                                detail: { product: topProduct[0], date: clickedDate }
+                                detail: { product: topProduct.product, date: clickedDate }
                             });
                             window.dispatchEvent(filterEvent);
                         }
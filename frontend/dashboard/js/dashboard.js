@@ -49,10 +49,6 @@ export function initDashboard(appState) {
         state.filters.source = '';
         state.filters.search = '';
         
-        // Reapply filters to update filteredPosts with no filters
-        // This ensures filteredPosts contains all posts when no filters are active
-        state.applyFilters();
-        
         // Clear date inputs to ensure no default dates are displayed
         const dateFromInput = document.getElementById('dateFrom');
         const dateToInput = document.getElementById('dateTo');
@@ -126,11 +122,11 @@ export function initDashboard(appState) {
         debouncedUpdateDashboard();
     });
     
-    // IMPORTANT: Call updateDashboard immediately if posts are already loaded
+    // IMPORTANT: Call updateDashboard immediately if the aggregates are already loaded
     // The subscription will handle future updates, but we need an initial render
     // Add a delay on first load to ensure backend has loaded API keys from .env
-    if (state.posts && state.posts.length > 0) {
-        console.log('[dashboard.js] Posts already loaded, calling updateDashboard() after delay');
+    if (state.aggregates) {
+        console.log('[dashboard.js] Aggregates already loaded, calling updateDashboard() after delay');
         // Delay longer on first page load to ensure backend has loaded API keys
         const isFirstLoad = !sessionStorage.getItem('dashboardInitialized');
         const delay = isFirstLoad ? 1000 : 100; // 1 second on first load, 100ms otherwise
@@ -279,7 +275,6 @@ function setupEventListeners() {
             updateDashboard();
             // Sync with All Posts section - update display immediately
             if (document.getElementById('postsGallery')) {
-                postsCurrentOffset = 0; // Reset pagination
                 updatePostsDisplay();
             }
         });
@@ -313,7 +308,6 @@ function setupEventListeners() {
             updateDashboard();
             // Update All Posts display if it exists
             if (document.getElementById('postsGallery')) {
-                postsCurrentOffset = 0; // Reset pagination
                 updatePostsDisplay();
             }
         });
@@ -342,7 +336,6 @@ function setupEventListeners() {
             updateDashboard();
             // Update All Posts display if it exists
             if (document.getElementById('postsGallery')) {
-                postsCurrentOffset = 0; // Reset pagination
                 updatePostsDisplay();
             }
         });
@@ -363,7 +356,6 @@ function setupEventListeners() {
             updateDashboard();
             // Update All Posts display
             if (document.getElementById('postsGallery')) {
-                postsCurrentOffset = 0; // Reset pagination
                 updatePostsDisplay();
             }
         });
@@ -803,49 +795,18 @@ function setupEventListeners() {
     });
 }
 
-// Helper function to filter valid posts (exclude samples and relevance_score = 0)
-// Same logic as in data collection page (index.html)
-function filterValidPosts(posts) {
-    return posts.filter(post => {
-        // Filter out sample posts
-        const url = post.url || '';
-        const isSample = (
-            url.includes('/sample') || 
-            url.includes('example.com') ||
-            url.includes('/status/174') ||
-            url === 'https://trustpilot.com/sample'
-        );
-        if (isSample) return false;
-        
-        // Filter out posts with relevance_score = 0
-        const relevanceScore = calculateRelevanceScore(post);
-        if (relevanceScore === 0 || relevanceScore === null || relevanceScore === undefined) {
-            return false;
-        }
-        
-        return true;
-    });
-}
-
 async function loadDashboardData() {
     try {
-        const posts = await api.getPosts(1000, 0);
+        // Aggregates and first page of posts of the current filters
+        await state.refresh();
         
-        if (!posts || posts.length === 0) {
+        if (state.postsTotal === 0) {
             // Show empty state message
             const postsList = document.getElementById('postsList');
             if (postsList) {
                 postsList.innerHTML = '<div style="text-align: center; padding: 40px; color: var(--text-secondary);">No posts found. Go to Feedbacks Collection to scrape some data.</div>';
             }
-            return;
         }
-        
-        // Filter valid posts (exclude samples and relevance_score = 0) to match data collection page
-        const validPosts = filterValidPosts(posts);
-        
-        // Load posts first - don't apply date filter on initial load
-        // The default 12 months filter will only be applied when clicking "Clear Filter"
-        state.setPosts(validPosts);
     } catch (error) {
         console.error('Failed to load dashboard data:', error);
         // Show error message
@@ -865,15 +826,14 @@ export function updateDashboard() {
     }
     
     console.log('[dashboard.js] State in updateDashboard():', {
-        hasPosts: !!state.posts,
-        postsCount: state.posts?.length || 0,
-        hasFilteredPosts: !!state.filteredPosts,
-        filteredPostsCount: state.filteredPosts?.length || 0
+        hasAggregates: !!state.aggregates,
+        postsTotal: state.postsTotal,
+        loadedPosts: state.posts?.length || 0
     });
     
-    if (!state.posts || state.posts.length === 0) {
-        console.log('[dashboard.js] No posts in state, trying to load...');
-        // Try to load posts if state is empty
+    if (!state.aggregates) {
+        console.log('[dashboard.js] No aggregates in state, trying to load...');
+        // Try to load the aggregates if the state is empty
         loadDashboardData().then(() => {
             // After loading, update again
             setTimeout(() => {
@@ -900,8 +860,6 @@ export function updateDashboard() {
     const postsGallery = document.getElementById('postsGallery');
     if (postsGallery) {
         console.log('[dashboard.js] postsGallery found, calling updatePostsDisplay()');
-        // Reset offset when dashboard updates to show first page
-        postsCurrentOffset = 0;
         updatePostsDisplay();
     } else {
         console.warn('[dashboard.js] postsGallery not found');
@@ -923,14 +881,12 @@ function updateStatsBanner() {
         return;
     }
     
-    const posts = state.filteredPosts || [];
-    const allPosts = state.posts || [];
-    
-    const total = posts.length;
-    const totalAll = allPosts.length;
-    const positive = posts.filter(p => p.sentiment_label === 'positive').length;
-    const negative = posts.filter(p => p.sentiment_label === 'negative').length;
-    const neutral = posts.filter(p => p.sentiment_label === 'neutral' || !p.sentiment_label).length;
+    // Counts of all the posts matching the filters (computed server-side)
+    const sentiment = state.aggregates?.sentiment || {};
+    const total = state.aggregates?.total || 0;
+    const positive = sentiment.positive || 0;
+    const negative = sentiment.negative || 0;
+    const neutral = total - positive - negative;
     
     statsBanner.innerHTML = `
         <div class="stats-banner-title">
@@ -953,10 +909,6 @@ function updateStatsBanner() {
                 <div class="stats-banner-card-value">${neutral}</div>
                 <div class="stats-banner-card-label">Neutral</div>
             </div>
-            <div class="stats-banner-card">
-                <div class="stats-banner-card-value">${totalAll}</div>
-                <div class="stats-banner-card-label">In Database</div>
-            </div>
         </div>
     `;
 }
@@ -970,28 +922,16 @@ function updateProductDistribution() {
         return;
     }
     
-    const posts = state.filteredPosts || [];
-    const productCounts = {};
-    
-    
     // List of language codes to exclude from product distribution
     const languageCodes = ['FR', 'EN', 'ES', 'DE', 'IT', 'PT', 'NL', 'PL', 'RU', 'ZH', 'JA', 'KO', 'AR', 'HI', 'TR', 'SV', 'DA', 'FI', 'NO', 'CS', 'HU', 'RO', 'BG', 'HR', 'SK', 'SL', 'ET', 'LV', 'LT', 'MT', 'EL', 'UK', 'BE', 'GA', 'CY', 'LU', 'UNKNOWN'];
     
-    posts.forEach(post => {
-        // Get product label (simplified - you may need to import getProductLabel from v1)
-        const productLabel = getProductLabelSimple(post);
-        // Only count if it's a real product, not a language code
-        if (productLabel && !languageCodes.includes(productLabel.toUpperCase())) {
-            productCounts[productLabel] = (productCounts[productLabel] || 0) + 1;
-        }
-    });
-    
-    
-    // Sort by count
-    const allProducts = Object.entries(productCounts)
-        .sort((a, b) => b[1] - a[1]);
+    // Post counts per product of the current filters (computed server-side, most frequent first)
+    // Only count if it's a real product, not a language code
+    const allProducts = (state.aggregates?.products || [])
+        .filter(row => !languageCodes.includes(row.product.toUpperCase()))
+        .map(row => [row.product, row.count]);
     
-    const total = posts.length;
+    const total = state.aggregates?.total || 0;
     const colors = ['#0099ff', '#34d399', '#f59e0b', '#ef4444', '#8b5cf6'];
     
     // Calculate how many products can fit in the available space dynamically
@@ -1614,9 +1554,6 @@ function resetFilters() {
     const postsSortBy = document.getElementById('postsSortBy');
     if (postsSortBy) postsSortBy.value = 'date-desc';
     
-    // Reset pagination
-    postsCurrentOffset = 0;
-    
     // Clear critical filter flag
     state.criticalFilterActive = false;
     
@@ -1658,6 +1595,7 @@ function updateResetFiltersButtonVisibility() {
 // Job tracking for background scraping
 let currentJobId = null;
 let jobStatusInterval = null;
+let jobEventSource = null;
 
 // Persist job ID to localStorage so it can be resumed after page navigation
 function persistLastJob(jobId, sourceName = '') {
@@ -1840,10 +1778,7 @@ async function scrapeAll() {
     }
     
     // Stop any existing job polling
-    if (jobStatusInterval) {
-        clearInterval(jobStatusInterval);
-        jobStatusInterval = null;
-    }
+    stopJobStatusUpdates();
     
     const scrapeBtn = document.getElementById('scrapeAllBtn');
     const progressBar = document.getElementById('scrapingProgressBar');
@@ -1908,9 +1843,7 @@ async function scrapeAll() {
 }
 
 async function pollJobStatus(jobId) {
-    if (jobStatusInterval) {
-        clearInterval(jobStatusInterval);
-    }
+    stopJobStatusUpdates();
     
     const progressBar = document.getElementById('scrapingProgressBar');
     const progressText = document.getElementById('scrapingProgressText');
@@ -1927,102 +1860,8 @@ async function pollJobStatus(jobId) {
     let lastProgress = { completed: 0, total: 0, timestamp: Date.now() };
     const STUCK_THRESHOLD_MS = 5 * 60 * 1000; // 5 minutes
     
-    // Poll immediately first time
-    (async () => {
+    const applyJobStatus = async (job) => {
         try {
-            const job = await api.getJobStatus(jobId);
-            console.log(`[Progress] 🔄 First poll result:`, job);
-            if (job && job.progress) {
-                const completed = Number(job.progress.completed) || 0;
-                const total = Number(job.progress.total) || 0;
-                console.log(`[Progress] 📊 First poll progress: ${completed}/${total}`);
-            }
-        } catch (error) {
-            console.error(`[Progress] ❌ First poll error:`, error);
-        }
-    })();
-    
-    jobStatusInterval = setInterval(async () => {
-        try {
-            let job;
-            try {
-                job = await api.getJobStatus(jobId);
-                } catch (error) {
-                // If job doesn't exist (404) or is gone (410), stop polling
-                if (error.status === 404 || error.status === 410 || 
-                    (error.message && (error.message.includes('404') || error.message.includes('410') || error.message.includes('not found')))) {
-                    const statusCode = error.status || (error.message.includes('410') ? 410 : 404);
-                    console.warn(`Job ${jobId.substring(0, 8)}... not found (${statusCode}), stopping polling`);
-                    clearInterval(jobStatusInterval);
-                    jobStatusInterval = null;
-                    currentJobId = null;
-                    persistLastJob(null); // Clear persisted job
-                    const progressContainer = document.getElementById('scrapingProgressContainer');
-                    if (progressContainer) {
-                        if (statusCode === 410) {
-                            if (progressText) {
-                                progressText.textContent = '⚠️ Job was permanently removed. Please refresh the page.';
-                            }
-                            setTimeout(() => {
-                                if (progressContainer) {
-                                    progressContainer.style.display = 'none';
-                                }
-                            }, 5000);
-                        } else {
-                            if (progressText) {
-                                progressText.textContent = '⚠️ Job not found (server may have restarted). Please start a new scraping job.';
-                            }
-                            setTimeout(() => {
-                                if (progressContainer) {
-                                    progressContainer.style.display = 'none';
-                                }
-                            }, 5000);
-                        }
-                    }
-                    showCancelButton(false);
-                    return;
-                }
-                
-                // Network errors - server might be restarting, don't stop polling
-                const isNetworkError = error.message && (
-                    error.message.includes('NetworkError') || 
-                    error.message.includes('Failed to fetch') ||
-                    error.message.includes('fetch')
-                );
-                
-                if (isNetworkError) {
-                    // Only log network errors occasionally to avoid spam (every 10th error)
-                    if (!window._networkErrorCount) window._networkErrorCount = 0;
-                    window._networkErrorCount++;
-                    
-                    if (window._networkErrorCount % 10 === 1) {
-                        console.warn(`[Progress] ⚠️ Network error polling job status (server might be restarting): ${error.message}`);
-                    }
-                    
-                    // Update progress text to show connection issue but keep polling
-                    if (progressText) {
-                        const currentText = progressText.textContent;
-                        // Only update if not already showing connection error
-                        if (!currentText.includes('Connection')) {
-                            // Use last known progress or show generic message
-                            const lastCompleted = lastProgress.completed || 0;
-                            const lastTotal = lastProgress.total || 0;
-                            if (lastTotal > 0) {
-                                progressText.textContent = `⚠️ Connection issue - retrying... (${lastCompleted}/${lastTotal})`;
-                            } else {
-                                progressText.textContent = `⚠️ Connection issue - retrying...`;
-                            }
-                        }
-                    }
-                    // Don't stop polling - server might come back
-                    return;
-                }
-                
-                console.error(`Error polling job status: ${error.message}`);
-                // Don't stop polling for other errors, just log them and return early
-                return;
-            }
-            
             // If job is undefined (error was caught), skip processing
             if (!job) {
                 console.warn('[Progress] Job data is undefined');
@@ -2192,8 +2031,7 @@ async function pollJobStatus(jobId) {
             
             // Check if job is complete
             if (status === 'completed') {
-                clearInterval(jobStatusInterval);
-                jobStatusInterval = null;
+                stopJobStatusUpdates();
                 currentJobId = null;
                 persistLastJob(null); // Clear persisted job
                 
@@ -2229,11 +2067,8 @@ async function pollJobStatus(jobId) {
                 // Reload dashboard data
                 if (state && api) {
                     try {
-                        const posts = await api.getPosts(1000, 0);
-                        if (posts && posts.length > 0) {
-                            state.setPosts(posts);
-                            updateDashboard();
-                        }
+                        // Reloads the aggregates of the current filters (revalidated with their ETag)
+                        await state.refresh();
                     } catch (error) {
                         console.error('Failed to reload posts after scraping:', error);
                     }
@@ -2241,8 +2076,7 @@ async function pollJobStatus(jobId) {
                 
                 showCancelButton(false);
             } else if (status === 'failed' || status === 'cancelled') {
-                clearInterval(jobStatusInterval);
-                jobStatusInterval = null;
+                stopJobStatusUpdates();
                 currentJobId = null;
                 persistLastJob(null); // Clear persisted job
                 
@@ -2265,24 +2099,145 @@ async function pollJobStatus(jobId) {
                 showCancelButton(false);
             }
         } catch (e) {
-            // If job doesn't exist (404), stop polling
-            if (e.status === 404 || (e.message && e.message.includes('404'))) {
-                console.warn(`Job ${jobId.substring(0, 8)}... not found (404), stopping polling`);
-                clearInterval(jobStatusInterval);
-                jobStatusInterval = null;
-                currentJobId = null;
-                persistLastJob(null); // Clear persisted job
-                const progressContainer = document.getElementById('scrapingProgressContainer');
-                if (progressContainer) {
-                    progressContainer.style.display = 'none';
+            console.error(`[Progress] Error applying job status: ${e.message}`);
+        }
+    };
+    
+    const startPolling = () => {
+        jobStatusInterval = setInterval(async () => {
+            try {
+                let job;
+                try {
+                    job = await api.getJobStatus(jobId);
+                    } catch (error) {
+                    // If job doesn't exist (404) or is gone (410), stop polling
+                    if (error.status === 404 || error.status === 410 || 
+                        (error.message && (error.message.includes('404') || error.message.includes('410') || error.message.includes('not found')))) {
+                        const statusCode = error.status || (error.message.includes('410') ? 410 : 404);
+                        console.warn(`Job ${jobId.substring(0, 8)}... not found (${statusCode}), stopping polling`);
+                        stopJobStatusUpdates();
+                        currentJobId = null;
+                        persistLastJob(null); // Clear persisted job
+                        const progressContainer = document.getElementById('scrapingProgressContainer');
+                        if (progressContainer) {
+                            if (statusCode === 410) {
+                                if (progressText) {
+                                    progressText.textContent = '⚠️ Job was permanently removed. Please refresh the page.';
+                                }
+                                setTimeout(() => {
+                                    if (progressContainer) {
+                                        progressContainer.style.display = 'none';
+                                    }
+                                }, 5000);
+                            } else {
+                                if (progressText) {
+                                    progressText.textContent = '⚠️ Job not found (server may have restarted). Please start a new scraping job.';
+                                }
+                                setTimeout(() => {
+                                    if (progressContainer) {
+                                        progressContainer.style.display = 'none';
+                                    }
+                                }, 5000);
+                            }
+                        }
+                        showCancelButton(false);
+                        return;
+                    }
+                
+                    // Network errors - server might be restarting, don't stop polling
+                    const isNetworkError = error.message && (
+                        error.message.includes('NetworkError') || 
+                        error.message.includes('Failed to fetch') ||
+                        error.message.includes('fetch')
+                    );
+                
+                    if (isNetworkError) {
+                        // Only log network errors occasionally to avoid spam (every 10th error)
+                        if (!window._networkErrorCount) window._networkErrorCount = 0;
+                        window._networkErrorCount++;
+                    
+                        if (window._networkErrorCount % 10 === 1) {
+                            console.warn(`[Progress] ⚠️ Network error polling job status (server might be restarting): ${error.message}`);
+                        }
+                    
+                        // Update progress text to show connection issue but keep polling
+                        if (progressText) {
+                            const currentText = progressText.textContent;
+                            // Only update if not already showing connection error
+                            if (!currentText.includes('Connection')) {
+                                // Use last known progress or show generic message
+                                const lastCompleted = lastProgress.completed || 0;
+                                const lastTotal = lastProgress.total || 0;
+                                if (lastTotal > 0) {
+                                    progressText.textContent = `⚠️ Connection issue - retrying... (${lastCompleted}/${lastTotal})`;
+                                } else {
+                                    progressText.textContent = `⚠️ Connection issue - retrying...`;
+                                }
+                            }
+                        }
+                        // Don't stop polling - server might come back
+                        return;
+                    }
+                
+                    console.error(`Error polling job status: ${error.message}`);
+                    // Don't stop polling for other errors, just log them and return early
+                    return;
                 }
-                showCancelButton(false);
-                return;
+            
+                await applyJobStatus(job);
+            } catch (e) {
+                // If job doesn't exist (404), stop polling
+                if (e.status === 404 || (e.message && e.message.includes('404'))) {
+                    console.warn(`Job ${jobId.substring(0, 8)}... not found (404), stopping polling`);
+                    stopJobStatusUpdates();
+                    currentJobId = null;
+                    persistLastJob(null); // Clear persisted job
+                    const progressContainer = document.getElementById('scrapingProgressContainer');
+                    if (progressContainer) {
+                        progressContainer.style.display = 'none';
+                    }
+                    showCancelButton(false);
+                    return;
+                }
+                console.error(`Error polling job status: ${e.message}`);
+                // Don't stop polling for other errors, just log them
             }
-            console.error(`Error polling job status: ${e.message}`);
-            // Don't stop polling for other errors, just log them
-        }
-    }, 2000); // Poll every 2 seconds
+        }, 2000); // Poll every 2 seconds
+    };
+    
+    // Prefer the server push stream (one connection, updates pushed as they happen);
+    // fall back to polling if EventSource is unsupported or the stream cannot be opened
+    if (window.EventSource) {
+        const source = api.subscribeJobEvents(jobId);
+        jobEventSource = source;
+        source.addEventListener('state', (event) => applyJobStatus(JSON.parse(event.data)));
+        source.addEventListener('log', (event) => {
+            const log = JSON.parse(event.data);
+            console.log(`[Job ${jobId.substring(0, 8)}] ${log.message}`);
+        });
+        source.onerror = () => {
+            // EventSource reconnects by itself after network errors; CLOSED means the
+            // stream was refused (404, proxy without SSE support...)
+            if (source.readyState === EventSource.CLOSED && jobEventSource === source) {
+                console.warn('[Progress] Job event stream unavailable, falling back to polling');
+                jobEventSource = null;
+                startPolling();
+            }
+        };
+    } else {
+        startPolling();
+    }
+}
+
+function stopJobStatusUpdates() {
+    if (jobStatusInterval) {
+        clearInterval(jobStatusInterval);
+        jobStatusInterval = null;
+    }
+    if (jobEventSource) {
+        jobEventSource.close();
+        jobEventSource = null;
+    }
 }
 
 function showCancelButton(show) {
@@ -2309,11 +2264,8 @@ async function cancelScraping() {
     console.log(`[Cancel] Cancelling job ${jobIdToCancel.substring(0, 8)}...`);
     
     // Stop polling IMMEDIATELY to prevent network errors during cancellation
-    if (jobStatusInterval) {
-        clearInterval(jobStatusInterval);
-        jobStatusInterval = null;
-        console.log('[Cancel] ✅ Polling stopped');
-    }
+    stopJobStatusUpdates();
+    console.log('[Cancel] ✅ Job status updates stopped');
     
     // Clear job ID immediately to prevent resume
     currentJobId = null;
@@ -2381,47 +2333,22 @@ function openPost(url) {
     }
 }
 
-function updateCriticalPostsButton() {
+async function updateCriticalPostsButton() {
     if (!state) return;
     
     const btn = document.getElementById('openCriticalPostsBtn');
     const countSpan = document.getElementById('criticalPostsCount');
     if (!btn || !countSpan) return;
     
-    // Calculate critical posts (negative + last 7 days)
+    // Count critical posts (negative + last 7 days) server-side
     // Apply global search filter if present
-    const allPosts = state.posts || [];
-    const globalSearch = state.filters?.search || '';
-    const now = new Date();
-    const last7Days = new Date(now.getTime() - 7 * 24 * 60 * 60 * 1000);
-    const criticalPosts = allPosts.filter(p => {
-        const postDate = new Date(p.created_at);
-        const isRecent = postDate >= last7Days;
-        const isNegative = p.sentiment_label === 'negative';
-        
-        if (!isRecent || !isNegative) {
-            return false;
-        }
-        
-        // Apply global search filter if present
-        if (globalSearch && globalSearch.trim() !== '') {
-            const searchLower = globalSearch.toLowerCase();
-            const productLabel = getProductLabel(p.id, p.content, p.language);
-            const matchesSearch = 
-                p.content?.toLowerCase().includes(searchLower) ||
-                p.author?.toLowerCase().includes(searchLower) ||
-                p.url?.toLowerCase().includes(searchLower) ||
-                p.source?.toLowerCase().includes(searchLower) ||
-                (productLabel && productLabel.toLowerCase().includes(searchLower));
-            if (!matchesSearch) {
-                return false;
-            }
-        }
-        
-        return true;
-    });
-    
-    const count = criticalPosts.length;
+    let count = 0;
+    try {
+        const result = await api.getDashboardAggregates(getCriticalPostsQuery('negative', 7), 0);
+        count = result.total;
+    } catch (error) {
+        console.error('Failed to count critical posts:', error);
+    }
     if (countSpan) countSpan.textContent = count;
     
     if (count > 0) {
@@ -2438,104 +2365,28 @@ function openCriticalPosts() {
     openCriticalPostsDrawer({ periodDays: 7, sortBy: 'score' });
 }
 
-function getFilteredCriticalPosts(sentiment, periodDays, sortBy = 'score') {
-    if (!state) return [];
-    
-    // Get all posts (not just filtered ones)
-    const allPosts = state.posts || [];
-    
-    // Get global search filter from state
-    const globalSearch = state.filters?.search || '';
-    
-    // Filter by sentiment and period
-    const now = new Date();
-    const periodStart = new Date(now.getTime() - periodDays * 24 * 60 * 60 * 1000);
-    // Set to start of day for accurate comparison
-    periodStart.setHours(0, 0, 0, 0);
-    
-    console.log(`Filtering posts: periodDays=${periodDays}, periodStart=${periodStart.toISOString()}, sentiment=${sentiment}, search=${globalSearch}`);
-    
-    let filteredPosts = allPosts.filter(p => {
-        if (!p.created_at) return false;
-        
-        const postDate = new Date(p.created_at);
-        // Reset time to start of day for accurate comparison
-        postDate.setHours(0, 0, 0, 0);
-        
-        const isRecent = postDate >= periodStart;
-        const matchesSentiment = sentiment === 'all' || p.sentiment_label === sentiment;
-        
-        if (!isRecent || !matchesSentiment) {
-            return false;
-        }
-        
-        // Apply global search filter if present
-        if (globalSearch && globalSearch.trim() !== '') {
-            const searchLower = globalSearch.toLowerCase();
-            const productLabel = getProductLabel(p.id, p.content, p.language);
-            const matchesSearch = 
-                p.content?.toLowerCase().includes(searchLower) ||
-                p.author?.toLowerCase().includes(searchLower) ||
-                p.url?.toLowerCase().includes(searchLower) ||
-                p.source?.toLowerCase().includes(searchLower) ||
-                (productLabel && productLabel.toLowerCase().includes(searchLower));
-            if (!matchesSearch) {
-                return false;
-            }
-        }
-        
-        return true;
-    });
-    
-    console.log(`Filtered ${filteredPosts.length} posts from ${allPosts.length} total`);
+function getCriticalPostsQuery(sentiment, periodDays, sortBy = 'score') {
+    // /api/dashboard/aggregates filters of the posts of a sentiment over the last periodDays days
+    // (not the dashboard filters, except the global search)
+    const periodStart = new Date(Date.now() - periodDays * 24 * 60 * 60 * 1000);
+    return {
+        sentiment: sentiment,
+        date_from: periodStart.toISOString().split('T')[0],
+        search: (state.filters?.search || '').trim(),
+        // Score: most negative first, recent: most recent first
+        sort_by: sortBy === 'recent' ? 'created_at' : 'sentiment_score',
+        sort_order: sortBy === 'recent' ? 'DESC' : 'ASC'
+    };
+}
+
+async function getFilteredCriticalPosts(sentiment, periodDays, sortBy = 'score') {
+    if (!state) return { posts: [], total: 0 };
     
-    // Sort based on sortBy parameter
-    if (sortBy === 'score') {
-        // Sort by score (most negative/positive first) then by date (most recent first)
-        filteredPosts = filteredPosts.sort((a, b) => {
-            const scoreA = a.sentiment_score || 0;
-            const scoreB = b.sentiment_score || 0;
-            
-            // For negative posts: more negative (lower score) = higher priority
-            // For positive posts: more positive (higher score) = higher priority
-            // Use absolute value for comparison, but preserve sign for negative priority
-            if (sentiment === 'negative') {
-                // For negative: -0.9 is more critical than -0.5
-                // So we want lower scores (more negative) first
-                if (scoreA !== scoreB) {
-                    return scoreA - scoreB; // Lower score (more negative) first
-                }
-            } else {
-                // For positive/neutral/all: higher absolute score first
-                const absA = Math.abs(scoreA);
-                const absB = Math.abs(scoreB);
-                if (absB !== absA) {
-                    return absB - absA; // Higher absolute score first
-                }
-            }
-            // If scores are equal, sort by date (most recent first)
-            return new Date(b.created_at) - new Date(a.created_at);
-        });
-    } else if (sortBy === 'recent') {
-        // Sort by date (most recent first) then by score
-        filteredPosts = filteredPosts.sort((a, b) => {
-            const dateA = new Date(a.created_at);
-            const dateB = new Date(b.created_at);
-            if (dateB.getTime() !== dateA.getTime()) {
-                return dateB - dateA; // Most recent first
-            }
-            // If dates are equal, sort by score (most negative/positive first)
-            const scoreA = a.sentiment_score || 0;
-            const scoreB = b.sentiment_score || 0;
-            if (sentiment === 'negative') {
-                return scoreA - scoreB; // More negative first
-            } else {
-                return Math.abs(scoreB) - Math.abs(scoreA); // Higher absolute score first
-            }
-        });
-    }
+    console.log(`Loading critical posts: periodDays=${periodDays}, sentiment=${sentiment}, sortBy=${sortBy}`);
     
-    return filteredPosts;
+    // The drawer shows the first 50 posts
+    const result = await api.getDashboardAggregates(getCriticalPostsQuery(sentiment, periodDays, sortBy), 50);
+    return { posts: result.posts, total: result.total };
 }
 
 function openCriticalPostsDrawer(filters) {
@@ -2560,7 +2411,7 @@ function openCriticalPostsDrawer(filters) {
     updateCriticalPostsDrawer(defaultFilters);
 }
 
-function updateCriticalPostsDrawer(filters) {
+async function updateCriticalPostsDrawer(filters) {
     const drawerContent = document.getElementById('filteredPostsDrawerContent');
     if (!drawerContent) {
         console.error('drawerContent not found');
@@ -2577,10 +2428,16 @@ function updateCriticalPostsDrawer(filters) {
     };
     
     // Get filtered posts based on current filters
-    const posts = getFilteredCriticalPosts(effectiveFilters.sentiment, effectiveFilters.periodDays, effectiveFilters.sortBy);
-    const totalPosts = state?.posts?.length || 0;
+    let posts = [];
+    let criticalTotal = 0;
+    try {
+        ({ posts, total: criticalTotal } = await getFilteredCriticalPosts(effectiveFilters.sentiment, effectiveFilters.periodDays, effectiveFilters.sortBy));
+    } catch (error) {
+        console.error('Failed to load critical posts:', error);
+    }
+    const totalPosts = state?.postsTotal || 0;
     
-    console.log(`Filtered ${posts.length} posts from ${totalPosts} total posts`);
+    console.log(`Loaded ${posts.length} of ${criticalTotal} critical posts`);
     
     // Helper functions (same as in whats-happening.js)
     function getTimeAgo(dateString) {
@@ -2655,7 +2512,7 @@ function updateCriticalPostsDrawer(filters) {
         </div>
         <div class="drawer-info">
             <div class="drawer-stats">
-                <span class="drawer-stat-value" style="color: #ef4444; font-weight: 700;">${posts.length}</span>
+                <span class="drawer-stat-value" style="color: #ef4444; font-weight: 700;">${criticalTotal}</span>
                 <span class="drawer-stat-label">of ${totalPosts} posts</span>
             </div>
             <div class="drawer-filters" style="display: flex; gap: 12px; align-items: center; flex-wrap: wrap;">
@@ -2682,8 +2539,7 @@ function updateCriticalPostsDrawer(filters) {
         `;
     } else {
         // Show first 50 posts
-        const postsToShow = posts.slice(0, 50);
-        postsToShow.forEach(post => {
+        posts.forEach(post => {
             const timeAgo = getTimeAgo(post.created_at);
             const sourceIcon = getSourceIcon(post.source);
             const sentiment = post.sentiment_label || 'neutral';
@@ -2721,10 +2577,10 @@ function updateCriticalPostsDrawer(filters) {
             `;
         });
         
-        if (posts.length > 50) {
+        if (criticalTotal > posts.length) {
             html += `
                 <div class="drawer-more">
-                    <p>Showing 50 of ${posts.length} posts</p>
+                    <p>Showing ${posts.length} of ${criticalTotal} posts</p>
                 </div>
             `;
         }
@@ -2844,8 +2700,8 @@ function clearCriticalFilter() {
 function updatePositiveSatisfactionKPI() {
     if (!state) return;
     
-    const posts = state.filteredPosts || [];
-    const total = posts.length;
+    // Counts of all the posts matching the filters (computed server-side)
+    const total = state.aggregates?.total || 0;
     
     const kpiCard = document.querySelector('.kpi-card-left');
     const kpiIcon = kpiCard?.querySelector('.kpi-icon');
@@ -2870,8 +2726,7 @@ function updatePositiveSatisfactionKPI() {
         return;
     }
     
-    const positive = posts.filter(p => p.sentiment_label === 'positive').length;
-    const negative = posts.filter(p => p.sentiment_label === 'negative').length;
+    const positive = state.aggregates.sentiment.positive || 0;
     const percentage = Math.round((positive / total) * 100);
     
     if (kpiValue) {
@@ -2953,40 +2808,19 @@ async function markPostAnswered(postId, answered) {
         const result = await response.json();
         console.log(`✅ Post ${postId} successfully marked as ${answered ? 'answered' : 'not answered'} in database`);
         
-        // Reload ALL posts from server to ensure complete sync with database
-        try {
-            console.log('🔄 Reloading all posts from server to sync with database...');
-            const postsResponse = await fetch(`/api/posts?limit=10000`);
-            if (postsResponse.ok) {
-                const updatedPosts = await postsResponse.json();
-                console.log(`✅ Reloaded ${updatedPosts.length} posts from server`);
-                
-                if (state) {
-                    // Filter valid posts (exclude samples and relevance_score = 0)
-                    const validPosts = filterValidPosts(updatedPosts);
-                    
-                    // Completely replace state.posts with fresh data from server
-                    state.setPosts(validPosts);
-                    console.log(`✅ State updated with ${validPosts.length} valid posts`);
-                    console.log(`📊 Posts answered in fresh data: ${validPosts.filter(p => p.is_answered === 1 || p.is_answered === true).length}`);
-                }
+        // The server confirmed the write: update the loaded post in place, reload the
+        // posts only if they are filtered on their answered status
+        if (state) {
+            state.updatePost(postId, {
+                is_answered: answered ? 1 : 0,
+                answered_at: answered ? new Date().toISOString() : null,
+                answered_by: answered ? 'Manual' : null,
+                answer_detection_method: 'manual'
+            });
+            if (state.filters.answered !== 'all') {
+                state.refresh();
             } else {
-                throw new Error(`Failed to reload posts: ${postsResponse.status} ${postsResponse.statusText}`);
-            }
-        } catch (reloadError) {
-            console.error('❌ Could not reload posts from server:', reloadError);
-            // Fallback: update local state only (but this is not ideal)
-            if (state && state.posts) {
-                const post = state.posts.find(p => p.id === postId);
-                if (post) {
-                    post.is_answered = answered ? 1 : 0;
-                    post.answered_at = answered ? new Date().toISOString() : null;
-                    post.answered_by = answered ? 'Manual' : null;
-                    post.answer_detection_method = 'manual';
-                    state.applyFilters();
-                    state.notifyListeners();
-                    console.warn('⚠️ Using local state update (not synced with database)');
-                }
+                state.notifyListeners();
             }
         }
         
@@ -3025,36 +2859,10 @@ async function markAsFalsePositive(postId, isFalsePositive) {
         const result = await response.json();
         console.log(`✅ Post ${postId} successfully ${isFalsePositive ? 'marked as' : 'removed from'} false positive`);
         
-        // Reload ALL posts from server to ensure complete sync with database
-        try {
-            console.log('🔄 Reloading posts from server...');
-            const postsResponse = await fetch(`/api/posts?limit=10000`);
-            if (postsResponse.ok) {
-                const updatedPosts = await postsResponse.json();
-                console.log(`✅ Reloaded ${updatedPosts.length} posts from server`);
-                
-                if (state) {
-                    // Filter valid posts (exclude samples and relevance_score = 0)
-                    const validPosts = filterValidPosts(updatedPosts);
-                    
-                    // Completely replace state.posts with fresh data from server
-                    state.setPosts(validPosts);
-                    console.log(`✅ State updated with ${validPosts.length} valid posts`);
-                }
-            } else {
-                throw new Error(`Failed to reload posts: ${postsResponse.status} ${postsResponse.statusText}`);
-            }
-        } catch (reloadError) {
-            console.error('❌ Could not reload posts from server:', reloadError);
-            // Fallback: update local state only
-            if (state && state.posts) {
-                const post = state.posts.find(p => p.id === postId);
-                if (post) {
-                    post.is_false_positive = isFalsePositive;
-                    state.applyFilters();
-                    state.notifyListeners();
-                }
-            }
+        // The server confirmed the write: false positives are left out of the aggregates,
+        // reload them (and the first page of posts)
+        if (state) {
+            state.refresh();
         }
         
         // Refresh the dashboard and posts display
@@ -3211,8 +3019,18 @@ async function generatePowerPointReport() {
 }
 
 // Posts Section Functions
-let postsCurrentOffset = 0;
-const postsPerPage = 20;
+// State filter -> control of the posts section
+const POSTS_FILTER_CONTROLS = {
+    sentiment: 'postsSentimentFilter',
+    source: 'postsSourceFilter',
+    product: 'postsProductFilter',
+    language: 'postsLanguageFilter',
+    answered: 'postsAnsweredFilter',
+    dateFrom: 'postsDateFrom',
+    dateTo: 'postsDateTo'
+};
+// Values of the posts section controls at the last display
+const postsFilterValues = {};
 
 function scrollToPostsSection() {
     // Try multiple selectors to find posts section
@@ -3311,289 +3129,41 @@ function updatePostsDisplay() {
     if (!gallery) return;
 
     const sortBy = document.getElementById('postsSortBy')?.value || 'date-desc';
-    const sentimentFilter = document.getElementById('postsSentimentFilter')?.value || 'all';
-    const sourceFilter = document.getElementById('postsSourceFilter')?.value || 'all';
-    const productFilter = document.getElementById('postsProductFilter')?.value || 'all';
-    const languageFilter = document.getElementById('postsLanguageFilter')?.value || 'all';
-    const answeredFilter = document.getElementById('postsAnsweredFilter')?.value || 'all';
-    const dateFrom = document.getElementById('postsDateFrom')?.value || '';
-    const dateTo = document.getElementById('postsDateTo')?.value || '';
-    
-    // OVH Product patterns for filtering (aligned with product-detection.js labels)
-    const ovhProductPatterns = {
-        // Web & Hosting
-        'Domain': /\b(domain|domaine|dns|zone|registrar|nameserver|\.ovh|\.com|\.net|\.org)\b/i,
-        'WordPress': /\b(wordpress|wp\s*host|wp\s*config)\b/i,
-        'Email': /\b(email|exchange|mail|mx\s*record|zimbra|smtp|imap|pop3|mailbox)\b/i,
-        'Hosting': /\b(web\s*host|hosting|hébergement|mutualisé|shared\s*host|web\s*server)\b/i,
-        
-        // Cloud & Servers
-        'VPS': /\b(vps|virtual\s*private\s*server|kimsufi)\b/i,
-        'Dedicated': /\b(dedicated|dédié|bare\s*metal|server\s*dedicated|serveur\s*dédié)\b/i,
-        'Public Cloud': /\b(public\s*cloud|openstack|instance|compute|ovhcloud|ovh\s*cloud)\b/i,
-        'Private Cloud': /\b(private\s*cloud|vmware|vsphere)\b/i,
-        'Kubernetes': /\b(kubernetes|k8s|managed\s*k8s|container|pod|deployment)\b/i,
-        
-        // Storage & Backup
-        'Storage': /\b(object\s*storage|swift|s3|storage|cloud\s*storage|object\s*store)\b/i,
-        'Backup': /\b(backup|veeam|archive|snapshot|restore)\b/i,
-        
-        // Network & CDN
-        'CDN': /\b(cdn|content\s*delivery|cache)\b/i,
-        'Load Balancer': /\b(load\s*balancer|iplb|lb|balancing)\b/i,
-        'DDoS Protection': /\b(ddos|anti-ddos|protection|mitigation)\b/i,
-        'Network': /\b(network|vrack|vlan|ip\s*address|subnet)\b/i,
-        
-        // Support & Billing
-        'Support': /\b(support|ticket|assistance|help|service\s*client|customer\s*service)\b/i,
-        'Billing': /\b(billing|facture|invoice|payment|paiement|refund|rembours|subscription)\b/i,
-        'Manager': /\b(manager|control\s*panel|espace\s*client|ovh\s*manager|panel)\b/i,
-        'API': /\b(api|sdk|integration|rest\s*api|webhook)\b/i
-    };
     
-    // Get global search filter from state
-    const globalSearch = state.filters?.search || '';
-    
-    // Sync local filters with global state filters if they exist
-    // BUT: For source filter, DON'T sync from state to dropdown - let dropdown control it completely
-    // This allows user to freely change the dropdown without it being overridden
-    if (state.filters) {
-        // Sync sentiment filter - only if state has a different value AND dropdown hasn't been manually changed
-        const currentSentimentValue = document.getElementById('postsSentimentFilter')?.value || 'all';
-        if (state.filters.sentiment && state.filters.sentiment !== 'all' && currentSentimentValue === 'all') {
-            const postsSentimentFilterEl = document.getElementById('postsSentimentFilter');
-            if (postsSentimentFilterEl && postsSentimentFilterEl.value !== state.filters.sentiment) {
-                postsSentimentFilterEl.value = state.filters.sentiment;
+    // Sync the posts section filters with the state filters: a control changed by the user
+    // since the last display updates the state, the others show the state filters (set from
+    // the charts, the global filters...)
+    let filtersChanged = false;
+    for (const [key, controlId] of Object.entries(POSTS_FILTER_CONTROLS)) {
+        const control = document.getElementById(controlId);
+        if (!control) continue;
+        const isDate = key === 'dateFrom' || key === 'dateTo';
+        if (key in postsFilterValues && control.value !== postsFilterValues[key]) {
+            // 'all' means no filter (empty string) for the source
+            const value = key === 'source' && control.value === 'all' ? '' : control.value;
+            if (state.filters[key] !== value) {
+                state.setFilter(key, value, false); // false = don't reload for each filter
+                filtersChanged = true;
             }
+        } else {
+            control.value = isDate ? (state.filters[key] || '') : (state.filters[key] || 'all');
         }
-        
-        // DON'T sync source filter from state to dropdown - dropdown controls the filter completely
-        // User can freely change it, and state will be updated to match dropdown below
-        // This prevents the dropdown from being overridden when user changes it manually
-        
-        // Sync language filter
-        if (state.filters.language && state.filters.language !== 'all') {
-            const postsLanguageFilterEl = document.getElementById('postsLanguageFilter');
-            if (postsLanguageFilterEl && postsLanguageFilterEl.value !== state.filters.language) {
-                postsLanguageFilterEl.value = state.filters.language;
-            }
-        }
-        
-        // Sync answered filter
-        if (state.filters.answered !== undefined) {
-            const postsAnsweredFilterEl = document.getElementById('postsAnsweredFilter');
-            if (postsAnsweredFilterEl && postsAnsweredFilterEl.value !== state.filters.answered) {
-                postsAnsweredFilterEl.value = state.filters.answered;
-            }
-        }
-        
-        // Sync date filters
-        if (state.filters.dateFrom) {
-            const postsDateFromEl = document.getElementById('postsDateFrom');
-            if (postsDateFromEl && postsDateFromEl.value !== state.filters.dateFrom) {
-                postsDateFromEl.value = state.filters.dateFrom;
-            }
-        }
-        
-        if (state.filters.dateTo) {
-            const postsDateToEl = document.getElementById('postsDateTo');
-            if (postsDateToEl && postsDateToEl.value !== state.filters.dateTo) {
-                postsDateToEl.value = state.filters.dateTo;
-            }
-        }
-        
-        // Note: Product filter sync removed - dropdown value takes priority
-        // When user changes dropdown manually, it should not be overwritten by state
-    }
-    
-    // Use synced values after potential updates
-    const finalSentimentFilter = document.getElementById('postsSentimentFilter')?.value || 'all';
-    const finalSourceFilter = document.getElementById('postsSourceFilter')?.value || 'all';
-    const finalProductFilter = document.getElementById('postsProductFilter')?.value || 'all';
-    const finalLanguageFilter = document.getElementById('postsLanguageFilter')?.value || 'all';
-    const finalAnsweredFilter = document.getElementById('postsAnsweredFilter')?.value || 'all';
-    const finalDateFrom = document.getElementById('postsDateFrom')?.value || '';
-    const finalDateTo = document.getElementById('postsDateTo')?.value || '';
-    
-    // Update state with filters if they changed (but suppress notifications to avoid loops)
-    if (state && state.filters) {
-        // Temporarily disable notifications to prevent infinite loops
-        const originalNotify = state.notifyListeners;
-        let shouldNotify = false;
-        state.notifyListeners = () => {
-            shouldNotify = true;
-        };
-        
-        if (state.filters.answered !== finalAnsweredFilter) {
-            state.setFilter('answered', finalAnsweredFilter, false); // false = don't notify
-        }
-        if (state.filters.sentiment !== finalSentimentFilter) {
-            state.setFilter('sentiment', finalSentimentFilter, false);
-        }
-        // Sync source filter - allow user to change it freely
-        // Normalize: 'all' means no filter (empty string)
-        const normalizedSourceFilter = finalSourceFilter === 'all' ? '' : finalSourceFilter;
-        // Always update state to match dropdown (user's choice takes priority)
-        // This ensures that when user selects 'all', the state filter is cleared
-        if (state.filters.source !== normalizedSourceFilter) {
-            state.setFilter('source', normalizedSourceFilter, false);
-        }
-        if (state.filters.language !== finalLanguageFilter) {
-            state.setFilter('language', finalLanguageFilter, false);
-        }
-        // Always sync product filter from dropdown to state
-        if (state.filters.product !== finalProductFilter) {
-            state.setFilter('product', finalProductFilter, false);
-        }
-        if (state.filters.dateFrom !== finalDateFrom) {
-            state.setFilter('dateFrom', finalDateFrom, false);
-        }
-        if (state.filters.dateTo !== finalDateTo) {
-            state.setFilter('dateTo', finalDateTo, false);
-        }
-        
-        // Restore notifications - only notify if filters actually changed
-        state.notifyListeners = originalNotify;
-        // Don't trigger notification here - updatePostsDisplay is called from updateDashboard
-        // which is already handling the update cycle
+        postsFilterValues[key] = control.value;
     }
-
-    // Filter posts manually (don't rely on filteredPosts as it might not include all filters)
-    let filtered = state.posts.filter(post => {
-        // Filter out sample data
-        const isSample = post.url && (
-            post.url.includes('/sample') || 
-            post.url.includes('example.com') ||
-            post.url.includes('/status/174') ||
-            post.url === 'https://trustpilot.com/sample'
-        );
-        if (isSample) return false;
-        
-        // Apply global search filter (from main search bar)
-        if (globalSearch) {
-            const searchLower = globalSearch.toLowerCase();
-            const productLabel = getProductLabel(post.id, post.content, post.language);
-            const matchesSearch = 
-                post.content?.toLowerCase().includes(searchLower) ||
-                post.author?.toLowerCase().includes(searchLower) ||
-                post.url?.toLowerCase().includes(searchLower) ||
-                post.source?.toLowerCase().includes(searchLower) ||
-                (productLabel && productLabel.toLowerCase().includes(searchLower));
-            if (!matchesSearch) return false;
-        }
-
-        // Apply filters
-        const normalizedSource = (post.source === 'GitHub Issues' || post.source === 'GitHub Discussions') ? 'GitHub' : post.source;
-        const matchesSource = !finalSourceFilter || finalSourceFilter === 'all' || normalizedSource === finalSourceFilter || post.source === finalSourceFilter;
-        const matchesSentiment = !finalSentimentFilter || finalSentimentFilter === 'all' || post.sentiment_label === finalSentimentFilter;
-        // Language filter - handle null/undefined and normalize comparison
-        const postLanguage = (post.language || '').toLowerCase();
-        const filterLanguage = (finalLanguageFilter || '').toLowerCase();
-        const matchesLanguage = !finalLanguageFilter || finalLanguageFilter === 'all' || postLanguage === filterLanguage;
-        
-        // Answered filter
-        const isAnswered = post.is_answered === 1 || post.is_answered === true || post.is_answered === '1';
-        let matchesAnswered = true;
-        if (finalAnsweredFilter && finalAnsweredFilter !== 'all') {
-            if (finalAnsweredFilter === '1') {
-                // Filter for answered posts only
-                matchesAnswered = isAnswered;
-            } else if (finalAnsweredFilter === '0') {
-                // Filter for not answered posts only
-                matchesAnswered = !isAnswered;
-            }
-        }
-        
-        // Date range filter
-        let matchesDate = true;
-        if (finalDateFrom || finalDateTo) {
-            const postDate = new Date(post.created_at).toISOString().split('T')[0];
-            if (finalDateFrom && postDate < finalDateFrom) matchesDate = false;
-            if (finalDateTo && postDate > finalDateTo) matchesDate = false;
-        }
-        
-        // Product filter - check both dropdown patterns AND state filter
-        let matchesProduct = true;
-        const stateProductFilter = state.filters?.product;
-        
-        // Determine which product filter to use (dropdown takes priority if set, otherwise use state)
-        const activeProductFilter = (finalProductFilter && finalProductFilter !== 'all') ? finalProductFilter : 
-                                    (stateProductFilter && stateProductFilter !== 'all') ? stateProductFilter : null;
-        
-        if (activeProductFilter) {
-            // First try pattern matching (for dropdown values)
-            if (ovhProductPatterns[activeProductFilter]) {
-                matchesProduct = ovhProductPatterns[activeProductFilter].test(post.content || '');
-            } else {
-                // Fallback to keyword matching (for Distribution panel values)
-                const content = (post.content || '').toLowerCase();
-                const productLower = activeProductFilter.toLowerCase();
-                // Extended keywords for common products from Distribution panel
-                const distributionKeywords = {
-                    'vps': ['vps', 'virtual private server'],
-                    'hosting': ['hosting', 'web hosting', 'hébergement'],
-                    'domain': ['domain', 'domaine', 'dns', 'registrar'],
-                    'public cloud': ['public cloud', 'openstack', 'horizon'],
-                    'dedicated': ['dedicated', 'dedicated server', 'serveur dédié', 'bare metal'],
-                    'dedicated server': ['dedicated', 'dedicated server', 'serveur dédié', 'bare metal'],
-                    'email': ['email', 'mail', 'exchange', 'smtp'],
-                    'storage': ['storage', 'stockage', 's3', 'object storage'],
-                    'cdn': ['cdn', 'content delivery'],
-                    'kubernetes': ['kubernetes', 'k8s'],
-                    'database': ['database', 'mysql', 'postgresql', 'mongodb']
-                };
-                const keywords = distributionKeywords[productLower] || [productLower];
-                matchesProduct = keywords.some(kw => content.includes(kw));
-            }
-        }
-
-        return matchesSource && matchesSentiment && matchesLanguage && matchesAnswered && matchesDate && matchesProduct;
-    });
-
-    // Filter out posts with relevance_score = 0 BEFORE pagination
-    filtered = filtered.filter(post => {
-        const relevanceScore = calculateRelevanceScore(post);
-        return relevanceScore !== 0 && relevanceScore !== null && relevanceScore !== undefined;
-    });
-
-    // Apply sorting
-    if (sortBy === 'date-desc') {
-        filtered.sort((a, b) => new Date(b.created_at) - new Date(a.created_at));
-    } else if (sortBy === 'date-asc') {
-        filtered.sort((a, b) => new Date(a.created_at) - new Date(b.created_at));
-    } else if (sortBy === 'sentiment-desc') {
-        filtered.sort((a, b) => (a.sentiment_score || 0) - (b.sentiment_score || 0));
-    } else if (sortBy === 'sentiment-asc') {
-        filtered.sort((a, b) => (b.sentiment_score || 0) - (a.sentiment_score || 0));
-    } else if (sortBy === 'relevancy-desc') {
-        filtered.sort((a, b) => {
-            const relevanceA = calculateRelevanceScore(a);
-            const relevanceB = calculateRelevanceScore(b);
-            if (relevanceB !== relevanceA) {
-                return relevanceB - relevanceA; // Highest first
-            }
-            // If same relevance, sort by date (most recent first)
-            return new Date(b.created_at) - new Date(a.created_at);
-        });
-    } else if (sortBy === 'relevancy-asc') {
-        filtered.sort((a, b) => {
-            const relevanceA = calculateRelevanceScore(a);
-            const relevanceB = calculateRelevanceScore(b);
-            if (relevanceA !== relevanceB) {
-                return relevanceA - relevanceB; // Lowest first
-            }
-            // If same relevance, sort by date (most recent first)
-            return new Date(b.created_at) - new Date(a.created_at);
-        });
-    } else if (sortBy === 'source-asc') {
-        filtered.sort((a, b) => (a.source || '').localeCompare(b.source || ''));
-    } else if (sortBy === 'source-desc') {
-        filtered.sort((a, b) => (b.source || '').localeCompare(a.source || ''));
+    
+    // Posts are filtered, sorted and paginated server-side: reload them if the filters
+    // or the sort changed (the state notifies its listeners, which display them)
+    if (filtersChanged) {
+        state.refresh();
+        return;
     }
-
-    // Pagination (after filtering relevance_score = 0)
-    const totalPosts = filtered.length;
-    const paginated = filtered.slice(postsCurrentOffset, postsCurrentOffset + postsPerPage);
+    if (sortBy !== state.postsSort) {
+        state.setPostsSort(sortBy);
+        return;
+    }
+    
+    const totalPosts = state.postsTotal;
+    const filtered = state.posts;
 
     // Render posts - using same format as data collection page
     if (filtered.length === 0) {
@@ -3601,7 +3171,7 @@ function updatePostsDisplay() {
         return;
     }
 
-    gallery.innerHTML = paginated.map(post => {
+    gallery.innerHTML = filtered.map(post => {
         // Use shared post card component
         return renderPostCard(post, {
             getProductLabel: getProductLabel,
@@ -3618,10 +3188,10 @@ function updatePostsDisplay() {
     // Update pagination
     const paginationDiv = document.getElementById('postsPagination');
     if (paginationDiv) {
-        if (postsCurrentOffset + postsPerPage < totalPosts) {
+        if (filtered.length < totalPosts) {
             paginationDiv.innerHTML = `
                 <button onclick="loadMorePosts()" style="padding: 12px 30px; background: #00d4ff; color: #1a1a2e; border: none; border-radius: 8px; font-weight: bold; cursor: pointer; font-size: 1em;">
-                    📥 Load More (${totalPosts - (postsCurrentOffset + postsPerPage)} remaining)
+                    📥 Load More (${totalPosts - filtered.length} remaining)
                 </button>
             `;
         } else {
@@ -3634,8 +3204,8 @@ function updatePostsDisplay() {
 }
 
 function loadMorePosts() {
-    postsCurrentOffset += postsPerPage;
-    updatePostsDisplay();
+    // Next page from the server (the state notifies its listeners, which display it)
+    state.loadMorePosts();
 }
 
 function handlePostsLanguageFilterChange() {
@@ -3649,8 +3219,7 @@ function handlePostsLanguageFilterChange() {
     if (languageFilterEl && languageFilterEl.value !== value) {
         languageFilterEl.value = value;
     }
-    // Reset pagination and update display
-    postsCurrentOffset = 0;
+    // Update display
     updatePostsDisplay();
     // Update dashboard stats
     updateDashboard();
@@ -3710,9 +3279,6 @@ function clearPostsFilters() {
         productFilterEl.value = 'all';
     }
     
-    // Reset pagination
-    postsCurrentOffset = 0;
-    
     // Use setTimeout to ensure DOM and state are fully synchronized before updating display
     setTimeout(() => {
         updatePostsDisplay();
@@ -3860,10 +3426,7 @@ window.handlePostsLanguageFilterChange = handlePostsLanguageFilterChange;
             localStorage.removeItem('ovh_last_job');
             localStorage.removeItem('ovh_last_job_source');
             // Stop any running intervals
-            if (typeof jobStatusInterval !== 'undefined' && jobStatusInterval) {
-                clearInterval(jobStatusInterval);
-                jobStatusInterval = null;
-            }
+            stopJobStatusUpdates();
             return; // Don't resume this job
         }
         
@@ -3918,10 +3481,7 @@ window.handlePostsLanguageFilterChange = handlePostsLanguageFilterChange;
                     console.warn(`Job ${lastJobId.substring(0, 8)}... not found (404), clearing persisted job`);
                     persistLastJob(null);
                     // Clear any polling intervals
-                    if (jobStatusInterval) {
-                        clearInterval(jobStatusInterval);
-                        jobStatusInterval = null;
-                    }
+                    stopJobStatusUpdates();
                     currentJobId = null;
                     const progressContainer = document.getElementById('scrapingProgressContainer');
                     if (progressContainer) {
@@ -3992,10 +3552,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 if (error.status === 404 || (error.message && error.message.includes('404')) || (error.message && error.message.includes('not found'))) {
                     console.warn(`Job ${lastJobId.substring(0, 8)}... not found (404), clearing persisted job`);
                     persistLastJob(null);
-                    if (jobStatusInterval) {
-                        clearInterval(jobStatusInterval);
-                        jobStatusInterval = null;
-                    }
+                    stopJobStatusUpdates();
                     currentJobId = null;
                     const progressContainer = document.getElementById('scrapingProgressContainer');
                     if (progressContainer) {
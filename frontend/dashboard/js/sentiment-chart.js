@@ -19,7 +19,7 @@ export function initSentimentChart(state) {
     }
     
     // Initial load
-    if (state && state.posts) {
+    if (state && state.aggregates) {
         updateSentimentChart(state);
     }
 }
@@ -34,24 +34,16 @@ function updateSentimentChart(state) {
         return;
     }
     
-    const posts = state.filteredPosts || state.posts || [];
-    
-    // Count sentiments
+    // Post counts per sentiment of the current filters (computed server-side)
+    const sentiment = state.aggregates?.sentiment || {};
+    const positive = sentiment.positive || 0;
+    const negative = sentiment.negative || 0;
     const sentimentCounts = {
-        positive: 0,
-        negative: 0,
-        neutral: 0
+        positive: positive,
+        negative: negative,
+        neutral: (state.aggregates?.total || 0) - positive - negative
     };
     
-    posts.forEach(post => {
-        const sentiment = post.sentiment_label || 'neutral';
-        if (sentimentCounts.hasOwnProperty(sentiment)) {
-            sentimentCounts[sentiment]++;
-        } else {
-            sentimentCounts.neutral++;
-        }
-    });
-    
     renderSentimentChart(sentimentCounts, state);
 }
 
@@ -30,17 +30,14 @@ export function initSourceChart(state) {
     
     currentState = state;
     console.log('[source-chart-v2.js] State received:', {
-        hasPosts: !!state.posts,
-        postsCount: state.posts?.length || 0,
-        hasFilteredPosts: !!state.filteredPosts,
-        filteredPostsCount: state.filteredPosts?.length || 0
+        hasAggregates: !!state.aggregates,
+        total: state.aggregates?.total || 0
     });
     
     // Subscribe to state changes to update chart with filtered data
     state.subscribe((updatedState) => {
         console.log('[source-chart-v2.js] State updated via subscription:', {
-            postsCount: updatedState.posts?.length || 0,
-            filteredPostsCount: updatedState.filteredPosts?.length || 0
+            total: updatedState.aggregates?.total || 0
         });
         currentState = updatedState;
         try {
@@ -52,9 +49,9 @@ export function initSourceChart(state) {
     
     // Initial load from state (if posts are already loaded)
     // NEVER make API calls - only use state data
-    const posts = state.filteredPosts || state.posts || [];
-    if (posts.length > 0) {
-        console.log(`[source-chart-v2.js] Posts already available (${posts.length}), updating chart immediately`);
+    const sources = state.aggregates?.sources || [];
+    if (sources.length > 0) {
+        console.log(`[source-chart-v2.js] Aggregates already available (${sources.length} sources), updating chart immediately`);
         try {
             // Wait for DOM to be ready
             if (document.readyState === 'loading') {
@@ -77,9 +74,9 @@ export function initSourceChart(state) {
             const delay = attempt * 200; // 200ms, 400ms, 600ms, etc.
             
             setTimeout(() => {
-                const currentPosts = currentState?.filteredPosts || currentState?.posts || [];
-                if (currentPosts.length > 0) {
-                    console.log(`[source-chart-v2.js] Posts loaded after ${delay}ms (${currentPosts.length} posts), updating chart`);
+                const currentSources = currentState?.aggregates?.sources || [];
+                if (currentSources.length > 0) {
+                    console.log(`[source-chart-v2.js] Aggregates loaded after ${delay}ms (${currentSources.length} sources), updating chart`);
                     try {
                         updateSourceChartFromState(currentState);
                     } catch (e) {
@@ -99,7 +96,7 @@ export function initSourceChart(state) {
 }
 
 /**
- * Update chart from state (uses filtered posts)
+ * Update chart from state (uses the aggregates of the current filters)
  */
 function updateSourceChartFromState(state) {
     if (!state) {
@@ -107,15 +104,14 @@ function updateSourceChartFromState(state) {
         return;
     }
     
-    const posts = state.filteredPosts || state.posts || [];
-    console.log(`[source-chart-v2.js] Updating chart with ${posts.length} posts (filtered: ${state.filteredPosts?.length || 0}, total: ${state.posts?.length || 0})`);
+    // Post counts per source of the current filters (computed server-side)
+    const sources = state.aggregates?.sources || [];
+    console.log(`[source-chart-v2.js] Updating chart with ${sources.length} sources (${state.aggregates?.total || 0} posts)`);
     
-    if (posts.length === 0) {
+    if (sources.length === 0) {
         console.warn('[source-chart-v2.js] No posts available to render chart. State:', {
-            hasPosts: !!state.posts,
-            postsCount: state.posts?.length || 0,
-            hasFilteredPosts: !!state.filteredPosts,
-            filteredPostsCount: state.filteredPosts?.length || 0
+            hasAggregates: !!state.aggregates,
+            total: state.aggregates?.total || 0
         });
         // Don't return - try to render empty chart or wait
         // Maybe data is still loading, so we'll retry via subscription
@@ -126,26 +122,25 @@ function updateSourceChartFromState(state) {
     const sourceData = {};
     const sentimentBySource = {};
     
-    posts.forEach(post => {
+    sources.forEach(row => {
         // Normalize GitHub sources: GitHub Issues and GitHub Discussions → GitHub
         // Normalize Mastodon sources: Mastodon (instance) → Mastodon
-        let source = post.source || 'Unknown';
+        let source = row.source || 'Unknown';
         if (source === 'GitHub Issues' || source === 'GitHub Discussions') {
             source = 'GitHub';
         } else if (source && source.startsWith('Mastodon (')) {
             source = 'Mastodon';
         }
-        const sentiment = post.sentiment_label || 'neutral';
         
         if (!sourceData[source]) {
             sourceData[source] = 0;
             sentimentBySource[source] = { positive: 0, negative: 0, neutral: 0 };
         }
         
-        sourceData[source]++;
-        if (sentimentBySource[source][sentiment] !== undefined) {
-            sentimentBySource[source][sentiment]++;
-        }
+        sourceData[source] += row.count;
+        sentimentBySource[source].positive += row.positive;
+        sentimentBySource[source].negative += row.negative;
+        sentimentBySource[source].neutral += row.count - row.positive - row.negative;
     });
     
     console.log(`[source-chart-v2.js] Source data:`, sourceData);
@@ -1,12 +1,33 @@
 // Application state management
-import { getProductLabel } from './product-detection.js';
+// Posts are filtered, counted and paginated server-side by /api/dashboard/aggregates:
+// the state keeps the aggregates of the current filters and the pages of posts loaded so far.
+
+// Sort options of the posts list -> sort_by / sort_order of /api/dashboard/aggregates
+const POSTS_SORTS = {
+    'date-desc': { sort_by: 'created_at', sort_order: 'DESC' },
+    'date-asc': { sort_by: 'created_at', sort_order: 'ASC' },
+    'sentiment-desc': { sort_by: 'sentiment_score', sort_order: 'ASC' }, // Negative first
+    'sentiment-asc': { sort_by: 'sentiment_score', sort_order: 'DESC' },
+    'relevancy-desc': { sort_by: 'relevance_score', sort_order: 'DESC' },
+    'relevancy-asc': { sort_by: 'relevance_score', sort_order: 'ASC' },
+    'source-asc': { sort_by: 'source', sort_order: 'ASC' },
+    'source-desc': { sort_by: 'source', sort_order: 'DESC' }
+};
 
 export class State {
-    constructor() {
-        this.posts = [];
-        this.filteredPosts = [];
+    constructor(api = null) {
+        this.api = api;
+        this.posts = []; // Loaded pages of the posts matching the filters
+        this.filteredPosts = []; // Same posts (already filtered by the server)
+        this.aggregates = null; // /api/dashboard/aggregates of the current filters
+        this.postsTotal = 0; // Posts matching the filters (all pages)
+        this.postsPageSize = 50;
+        this.postsSort = 'date-desc';
+        this.loading = false;
         this.listeners = [];
         this.postsPage = 1; // Pagination for posts list
+        this.refreshTimeout = null;
+        this.refreshSeq = 0;
         this.filters = {
             search: '',
             sentiment: 'all',
@@ -18,13 +39,22 @@ export class State {
             answered: 'all'
         };
     }
-    
+
     setPosts(posts) {
         this.posts = posts;
-        this.applyFilters();
+        this.filteredPosts = posts;
         this.notifyListeners();
     }
-    
+
+    updatePost(postId, changes) {
+        // Update a loaded post in place (e.g. after marking it answered)
+        const post = this.posts.find(p => p.id === postId);
+        if (post) {
+            Object.assign(post, changes);
+        }
+        return post;
+    }
+
     setFilter(key, value, notify = true) {
         // Don't apply filter if value is empty string and it's a date filter (allow showing all dates)
         if ((key === 'dateFrom' || key === 'dateTo') && value === '') {
@@ -34,169 +64,87 @@ export class State {
         }
         // Reset pagination when filters change
         this.postsPage = 1;
-        this.applyFilters();
-        // Only notify listeners if requested (prevents infinite loops)
+        // Only reload if requested (the caller refreshes once after setting several filters)
         if (notify) {
-            this.notifyListeners();
+            this.refresh();
+        }
+    }
+
+    setPostsSort(sort) {
+        if (sort !== this.postsSort) {
+            this.postsSort = POSTS_SORTS[sort] ? sort : 'date-desc';
+            this.postsPage = 1;
+            this.refresh();
         }
     }
-    
+
     applyFilters() {
-        let filteredCount = 0;
-        let excludedBySample = 0;
-        let excludedBySearch = 0;
-        let excludedBySentiment = 0;
-        let excludedBySource = 0;
-        let excludedByLanguage = 0;
-        let excludedByProduct = 0;
-        let excludedByDate = 0;
-        let excludedByAnswered = 0;
-        
-        this.filteredPosts = this.posts.filter(post => {
-            // Filter out sample posts
-            const url = post.url || '';
-            const isSample = (
-                url.includes('/sample') || 
-                url.includes('example.com') ||
-                url.includes('/status/174') ||
-                url === 'https://trustpilot.com/sample'
-            );
-            if (isSample) return false;
-            
-            // Filter out false positives by default (unless explicitly included in filters)
-            const isFalsePositive = post.is_false_positive === true || post.is_false_positive === 1 || post.is_false_positive === '1';
-            if (isFalsePositive && !this.filters.includeFalsePositives) {
-                return false;
-            }
-            
-            // Search filter
-            if (this.filters.search) {
-                const searchLower = this.filters.search.toLowerCase();
-                // Get detected product label for this post
-                const productLabel = getProductLabel(post.id, post.content, post.language);
-                const matchesSearch = 
-                    post.content?.toLowerCase().includes(searchLower) ||
-                    post.author?.toLowerCase().includes(searchLower) ||
-                    post.url?.toLowerCase().includes(searchLower) ||
-                    post.source?.toLowerCase().includes(searchLower) ||
-                    (productLabel && productLabel.toLowerCase().includes(searchLower));
-                if (!matchesSearch) {
-                    excludedBySearch++;
-                    return false;
-                }
-            }
-            
-            // Sentiment filter
-            if (this.filters.sentiment && this.filters.sentiment !== 'all' && post.sentiment_label !== this.filters.sentiment) {
-                excludedBySentiment++;
-                return false;
-            }
-            
-            // Source filter (normalize GitHub and Mastodon sources)
-            // Only filter if source is set and not empty
-            if (this.filters.source && this.filters.source !== '' && this.filters.source !== 'all') {
-                let normalizedSource = post.source;
-                if (post.source === 'GitHub Issues' || post.source === 'GitHub Discussions') {
-                    normalizedSource = 'GitHub';
-                } else if (post.source && post.source.startsWith('Mastodon (')) {
-                    normalizedSource = 'Mastodon';
-                }
-                if (normalizedSource !== this.filters.source && post.source !== this.filters.source) {
-                    excludedBySource++;
-                    return false;
-                }
-            }
-            
-            // Language filter - handle null/undefined and normalize comparison
-            if (this.filters.language && this.filters.language !== 'all') {
-                const postLanguage = (post.language || '').toLowerCase();
-                const filterLanguage = (this.filters.language || '').toLowerCase();
-                if (postLanguage !== filterLanguage) {
-                    excludedByLanguage++;
-                    return false;
-                }
-            }
-            
-            // Product filter - use keyword matching based on official OVH products
-            if (this.filters.product && this.filters.product !== 'all') {
-                const content = (post.content || '').toLowerCase();
-                const productLower = this.filters.product.toLowerCase();
-                // Extended keyword matching based on official OVH products (aligned with insights.py)
-                const productKeywords = {
-                    'VPS': ['vps', 'virtual private server', 'ovh vps', 'vps cloud', 'cloud vps'],
-                    'Hosting': ['hosting', 'web hosting', 'shared hosting', 'ovh hosting', 'web hosting plan'],
-                    'Domain': ['domain', 'domaine', 'domain name', 'domain registration', 'domain renewal', 'domain transfer', 'domain expiration', 'registrar', 'bureau d\'enregistrement', 'whois', 'domain management', '.ovh', '.com', '.net', '.org', '.fr', '.eu'],
-                    'DNS': ['dns', 'dns zone', 'dns anycast', 'dnssec', 'dns record', 'dns configuration', 'nameserver', 'ns record', 'a record', 'mx record', 'cname record', 'txt record', 'dns management', 'dns hosting'],
-                    'Email': ['email', 'mail', 'smtp', 'imap', 'pop3', 'email hosting', 'exchange', 'email account'],
-                    'Storage': ['storage', 'object storage', 's3', 'cloud storage', 'object storage s3', 'high performance storage'],
-                    'CDN': ['cdn', 'content delivery', 'content delivery network', 'ovh cdn'],
-                    'Public Cloud': ['public cloud', 'publiccloud', 'ovh public cloud', 'public cloud instance', 'horizon', 'openstack'],
-                    'Private Cloud': ['private cloud', 'privatecloud', 'ovh private cloud', 'vmware', 'vsphere', 'hosted private cloud'],
-                    'Dedicated Server': ['dedicated', 'dedicated server', 'serveur dédié', 'bare metal', 'ovh dedicated', 'server', 'serveur'],
-                    'API': ['api', 'rest api', 'graphql', 'ovh api', 'api ovh', 'ovhcloud api'],
-                    'Load Balancer': ['load balancer', 'loadbalancer', 'lb', 'ip load balancing'],
-                    'Failover IP': ['failover ip', 'failover', 'ip failover', 'additional ip'],
-                    'SSL Certificate': ['ssl', 'ssl certificate', 'certificate', 'tls', 'https certificate'],
-                    'Managed Kubernetes': ['kubernetes', 'k8s', 'managed kubernetes', 'ovh kubernetes'],
-                    'Managed Databases': ['database', 'mysql', 'postgresql', 'mongodb', 'redis', 'managed database', 'ovh database'],
-                    'Network': ['network', 'vrack', 'private network', 'vlan'],
-                    'IP': ['ip address', 'ipv4', 'ipv6', 'ip block', 'ip range']
-                };
-                const keywords = productKeywords[this.filters.product] || [productLower];
-                if (!keywords.some(kw => content.includes(kw))) {
-                    return false;
-                }
-            }
-            
-            // Date filters
-            if (this.filters.dateFrom) {
-                const postDateStr = new Date(post.created_at).toISOString().split('T')[0];
-                const filterDateFromStr = this.filters.dateFrom;
-                // Compare date strings (YYYY-MM-DD format)
-                if (postDateStr < filterDateFromStr) {
-                    excludedByDate++;
-                    return false;
-                }
-            }
-            
-            if (this.filters.dateTo) {
-                const postDateStr = new Date(post.created_at).toISOString().split('T')[0];
-                const filterDateToStr = this.filters.dateTo;
-                // Compare date strings (YYYY-MM-DD format)
-                if (postDateStr > filterDateToStr) {
-                    excludedByDate++;
-                    return false;
-                }
+        return this.refresh();
+    }
+
+    queryFilters() {
+        // State filters -> /api/dashboard/aggregates query parameters
+        const answered = { '1': true, '0': false }[this.filters.answered];
+        return {
+            date_from: this.filters.dateFrom,
+            date_to: this.filters.dateTo,
+            source: this.filters.source,
+            sentiment: this.filters.sentiment,
+            language: this.filters.language,
+            product: this.filters.product,
+            search: (this.filters.search || '').trim(),
+            answered: answered,
+            ...POSTS_SORTS[this.postsSort]
+        };
+    }
+
+    refresh() {
+        // Reload the aggregates and the first page of posts. Calls made in the same tick
+        // (several setFilter in a row) share one request; responses of older requests are dropped.
+        if (!this.refreshTimeout) {
+            this.refreshTimeout = new Promise(resolve => setTimeout(resolve, 0)).then(() => {
+                this.refreshTimeout = null;
+                return this.fetchPosts(0);
+            });
+        }
+        return this.refreshTimeout;
+    }
+
+    loadMorePosts() {
+        // Append the next page of posts
+        if (this.loading || this.posts.length >= this.postsTotal) {
+            return Promise.resolve();
+        }
+        this.postsPage += 1;
+        return this.fetchPosts(this.posts.length);
+    }
+
+    async fetchPosts(offset) {
+        if (!this.api) {
+            return;
+        }
+        const seq = ++this.refreshSeq;
+        this.loading = true;
+        try {
+            const data = await this.api.getDashboardAggregates(this.queryFilters(), this.postsPageSize, offset);
+            if (seq !== this.refreshSeq) {
+                return;
             }
-            
-            // Answered filter
-            if (this.filters.answered && this.filters.answered !== 'all') {
-                const isAnswered = post.is_answered === 1 || post.is_answered === true;
-                if (this.filters.answered === '1' && !isAnswered) {
-                    excludedByAnswered++;
-                    return false;
-                }
-                if (this.filters.answered === '0' && isAnswered) {
-                    excludedByAnswered++;
-                    return false;
-                }
+            this.aggregates = data;
+            this.postsTotal = data.total;
+            this.setPosts(offset > 0 ? this.posts.concat(data.posts) : data.posts);
+        } finally {
+            if (seq === this.refreshSeq) {
+                this.loading = false;
             }
-            
-            filteredCount++;
-            return true;
-        });
-        
-        // REMOVED: Auto-clear source filter logic that was causing infinite loops
-        // If a source filter results in 0 posts, that's valid - user may want to see empty state
-        // Users can manually clear the filter if needed
+        }
     }
-    
+
     subscribe(listener) {
         this.listeners.push(listener);
     }
-    
+
     notifyListeners() {
         this.listeners.forEach(listener => listener(this));
     }
 }
-
@@ -68,11 +68,11 @@ export async function updateWhatsHappening(state) {
     
     // Don't hide overlay immediately if posts.length === 0
     // Wait a bit to see if posts will be loaded
-    if (posts.length === 0) {
+    if (!state.aggregates?.total) {
         // Wait a bit before hiding overlay in case posts are still loading
         setTimeout(() => {
             const currentOverlay = document.getElementById('whatsHappeningOverlay');
-            if (currentOverlay && (state.filteredPosts || []).length === 0) {
+            if (currentOverlay && !state.aggregates?.total) {
                 currentOverlay.style.display = 'none';
             }
         }, 2000);
@@ -87,31 +87,33 @@ export async function updateWhatsHappening(state) {
         return;
     }
     
-    // Calculate statistics based on filtered posts
-    const total = posts.length;
-    const positive = posts.filter(p => p.sentiment_label === 'positive').length;
-    const negative = posts.filter(p => p.sentiment_label === 'negative').length;
-    const neutral = posts.filter(p => p.sentiment_label === 'neutral' || !p.sentiment_label).length;
+    // Calculate statistics based on all the filtered posts (aggregates computed server-side)
+    const aggregates = state.aggregates || {};
+    const total = aggregates.total || 0;
+    const positive = aggregates.sentiment?.positive || 0;
+    const negative = aggregates.sentiment?.negative || 0;
+    const neutral = total - positive - negative;
     
-    // Calculate recent posts (last 48 hours) from filtered posts
+    // Days of the daily timeline since a date (YYYY-MM-DD)
     const now = new Date();
+    const timelineSince = (since) => {
+        const sinceKey = since.toISOString().split('T')[0];
+        return (aggregates.timeline || []).filter(day => day.date >= sinceKey);
+    };
+    
+    // Calculate recent posts (last 48 hours) from filtered posts
     const last48h = new Date(now.getTime() - 48 * 60 * 60 * 1000);
-    const recentPosts = posts.filter(p => {
-        const postDate = new Date(p.created_at);
-        return postDate >= last48h;
-    });
-    const recentNegative = recentPosts.filter(p => p.sentiment_label === 'negative').length;
+    const recentDays = timelineSince(last48h);
+    const recentTotal = recentDays.reduce((sum, day) => sum + day.count, 0);
+    const recentNegative = recentDays.reduce((sum, day) => sum + day.negative, 0);
+    // Loaded recent posts, sent as samples to the recommended actions
+    const recentPosts = posts.filter(p => new Date(p.created_at) >= last48h);
     
     // Calculate average negative posts per 48h (from filtered posts, last 7 days)
     // This makes the spike detection relative to the current filter context
     const last7days = new Date(now.getTime() - 7 * 24 * 60 * 60 * 1000);
-    const filteredRecentPosts = posts.filter(p => {
-        const postDate = new Date(p.created_at);
-        return postDate >= last7days;
-    });
-    const avgNegativePer48h = filteredRecentPosts.length > 0 
-        ? Math.round((filteredRecentPosts.filter(p => p.sentiment_label === 'negative').length / 7) * 2)
-        : 0;
+    const weekNegative = timelineSince(last7days).reduce((sum, day) => sum + day.negative, 0);
+    const avgNegativePer48h = Math.round((weekNegative / 7) * 2);
     
     // Detect spike
     const spikeDetected = avgNegativePer48h > 0 && recentNegative > avgNegativePer48h * 2.3; // 230% increase
@@ -128,7 +130,7 @@ export async function updateWhatsHappening(state) {
         negative,
         neutral,
         recent_negative: recentNegative,
-        recent_total: recentPosts.length,
+        recent_total: recentTotal,
         spike_detected: spikeDetected,
         spike_percentage: spikePercentage,
         search_term: activeFilters.search || ''  // Include search term explicitly
@@ -156,8 +158,15 @@ export async function updateWhatsHappening(state) {
             if (typeof apiInstance.getWhatsHappeningInsights === 'function') {
                 // Get analysis focus from settings
                 const analysisFocus = localStorage.getItem('analysisFocus') || '';
-                console.log('[whats-happening.js] Calling LLM API for insights...');
-                const response = await apiInstance.getWhatsHappeningInsights(posts, statsForLLM, activeFiltersDescription, analysisFocus);
+                // Plain date range presets are precomputed by the server: no LLM wait
+                const snapshotPreset = analysisFocus ? null : getSnapshotPreset(activeFilters);
+                const snapshot = snapshotPreset ? await apiInstance.getWhatsHappeningSnapshot(snapshotPreset) : null;
+                if (snapshot) {
+                    console.log('[whats-happening.js] Using precomputed insights for preset', snapshotPreset, 'computed at', snapshot.computed_at);
+                } else {
+                    console.log('[whats-happening.js] Calling LLM API for insights...');
+                }
+                const response = snapshot || await apiInstance.getWhatsHappeningInsights(posts, statsForLLM, activeFiltersDescription, analysisFocus);
                 insights = response.insights || [];
                 llmAvailable = true; // Toujours true car pas de fallback
                 console.log('[whats-happening.js] LLM API response received, insights:', insights.length);
@@ -308,28 +317,10 @@ export async function updateWhatsHappening(state) {
     }
     
     // Calculate answered stats from filtered posts (for display in filtered context)
-    // Debug: log first post to see structure
-    if (posts.length > 0) {
-        console.log('[whats-happening.js] First post structure:', {
-            id: posts[0].id,
-            has_is_answered: 'is_answered' in posts[0],
-            is_answered_value: posts[0].is_answered,
-            is_answered_type: typeof posts[0].is_answered
-        });
-    }
+    const totalForAnswered = total;
     
-    const totalForAnswered = posts.length;
-    
-    const answered = posts.filter(p => {
-        const val = p.is_answered;
-        // Check multiple formats: 1, true, '1', 'true', or any truthy value
-        return val === 1 || val === true || val === '1' || val === 'true';
-    }).length;
-    const notAnswered = posts.filter(p => {
-        const val = p.is_answered;
-        // Check multiple formats: 0, false, '0', 'false', null, undefined, or any falsy value
-        return !val || val === 0 || val === false || val === '0' || val === 'false' || val === null || val === undefined;
-    }).length;
+    const answered = aggregates.answered?.answered || 0;
+    const notAnswered = aggregates.answered?.unanswered || 0;
     
     const answeredPercentage = totalForAnswered > 0 ? ((answered / totalForAnswered) * 100).toFixed(0) : '0';
     
@@ -337,14 +328,11 @@ export async function updateWhatsHappening(state) {
         totalPosts: totalForAnswered,
         answered,
         notAnswered,
-        answeredPercentage,
-        postsWithIsAnswered: posts.filter(p => 'is_answered' in p).length,
-        postsWithoutIsAnswered: posts.filter(p => !('is_answered' in p)).length,
-        sampleValues: posts.slice(0, 5).map(p => ({ id: p.id, is_answered: p.is_answered, type: typeof p.is_answered }))
+        answeredPercentage
     });
     
     // Calculate satisfaction (same logic as updatePositiveSatisfactionKPI)
-    const satisfactionPositive = posts.filter(p => p.sentiment_label === 'positive').length;
+    const satisfactionPositive = positive;
     const satisfactionPercentage = total > 0 ? Math.round((satisfactionPositive / total) * 100) : 0;
     
     // Fetch global answered stats from API (for accurate global statistics)
@@ -365,7 +353,7 @@ export async function updateWhatsHappening(state) {
     const positivePercentage = total > 0 ? Math.round((positive / total) * 100) : 0;
     const negativePercentage = total > 0 ? Math.round((negative / total) * 100) : 0;
     const neutralPercentage = total > 0 ? Math.round((neutral / total) * 100) : 0;
-    const recentPercentage = total > 0 ? Math.round((recentPosts.length / total) * 100) : 0;
+    const recentPercentage = total > 0 ? Math.round((recentTotal / total) * 100) : 0;
     
     // Create stats cards with clickable-stat-card class (except Total Posts)
     const htmlContent = `
@@ -411,7 +399,7 @@ export async function updateWhatsHappening(state) {
             <div class="stat-card-value" style="font-size: 1.8em; font-weight: 700; color: var(--accent-primary);">${recentPercentage}%</div>
             <div class="stat-card-label">Recent (48h)</div>
             <div style="display: flex; gap: 8px; margin-top: 6px; font-size: 0.75em; justify-content: center;">
-                <span style="color: var(--accent-primary); font-weight: 600;">⏰ ${recentPosts.length}</span>
+                <span style="color: var(--accent-primary); font-weight: 600;">⏰ ${recentTotal}</span>
                 <span style="color: var(--text-muted); font-weight: 600;">/ ${total}</span>
             </div>
         </div>
@@ -663,7 +651,7 @@ export async function updateWhatsHappening(state) {
     
     // Update recommended actions (this is async but we don't wait for it)
     // But we wait for it to complete before hiding overlay
-    updateRecommendedActions(posts, recentPosts, recentNegative, spikeDetected, topProduct, topIssue, activeFilters)
+    updateRecommendedActions(posts, recentPosts, { total, positive, negative, neutral, recentTotal }, recentNegative, spikeDetected, topProduct, topIssue, activeFilters)
         .then(() => {
             console.log('[whats-happening.js] Recommended actions updated, hiding overlay now');
             // Hide overlay AFTER recommended actions are also displayed AND content is rendered
@@ -870,7 +858,7 @@ function updateFilteredPostsDrawer(state) {
     if (!drawerContent || !state) return;
     
     const posts = state.filteredPosts || [];
-    const totalPosts = state.posts?.length || 0;
+    const totalPosts = state.postsTotal || 0;
     
     // Get active filters for display
     const activeFilters = [];
@@ -1338,14 +1326,27 @@ function getActiveFilters(state) {
     };
 }
 
-async function updateRecommendedActions(posts, recentPosts, recentNegative, spikeDetected, topProduct, topIssue, activeFilters) {
+function getSnapshotPreset(filters) {
+    // Server-side snapshots exist for the date range presets only, without other filters
+    if (filters.search || filters.sentiment !== 'all' || filters.language !== 'all' ||
+        filters.product !== 'all' || filters.source !== 'all') {
+        return null;
+    }
+    if (!filters.dateFrom && !filters.dateTo) {
+        return 'all';
+    }
+    const preset = document.getElementById('dateRangePreset')?.value;
+    return preset && preset !== 'custom' && preset !== 'all' ? preset : null;
+}
+
+async function updateRecommendedActions(posts, recentPosts, counts, recentNegative, spikeDetected, topProduct, topIssue, activeFilters) {
     const actionsContainer = document.getElementById('recommendedActions');
     if (!actionsContainer) {
         console.warn('[Recommended Actions] Container not found');
         return;
     }
     
-    console.log('[Recommended Actions] Updating with', posts.length, 'posts, recent:', recentPosts.length);
+    console.log('[Recommended Actions] Updating with', counts.total, 'posts, recent:', counts.recentTotal);
     
     // Show loading state
     actionsContainer.innerHTML = `
@@ -1355,7 +1356,7 @@ async function updateRecommendedActions(posts, recentPosts, recentNegative, spik
         <div class="recommended-actions-list">
             <div class="action-item" style="opacity: 0.6;">
                 <span class="action-icon">⏳</span>
-                <span class="action-text">Analyzing ${posts.length} posts...</span>
+                <span class="action-text">Analyzing ${counts.total} posts...</span>
             </div>
         </div>
     `;
@@ -1363,12 +1364,12 @@ async function updateRecommendedActions(posts, recentPosts, recentNegative, spik
     try {
         // Prepare comprehensive stats for LLM
         const stats = {
-            total: posts.length,
-            positive: posts.filter(p => p.sentiment_label === 'positive').length,
-            negative: posts.filter(p => p.sentiment_label === 'negative').length,
-            neutral: posts.filter(p => p.sentiment_label === 'neutral' || !p.sentiment_label).length,
+            total: counts.total,
+            positive: counts.positive,
+            negative: counts.negative,
+            neutral: counts.neutral,
             recent_negative: recentNegative,
-            recent_total: recentPosts.length,
+            recent_total: counts.recentTotal,
             spike_detected: spikeDetected,
             top_product: topProduct ? topProduct[0] : 'N/A',
             top_product_count: topProduct ? topProduct[1] : 0,
@@ -70,12 +70,8 @@ export function initWorldMap() {
 async function loadAndRenderMap() {
     try {
         const api = new API();
-        const response = await fetch(`${api.baseURL}/api/posts-by-country`);
-        if (!response.ok) {
-            throw new Error(`Failed to fetch country data: ${response.statusText}`);
-        }
-        
-        const data = await response.json();
+        // Country totals only (no posts page)
+        const data = await api.getDashboardAggregates({}, 0);
         const countryData = data.countries || {};
         const countryNames = data.country_names || {};
         
@@ -1081,47 +1081,59 @@ async function loadImprovementsAnalysis() {
             product_filter: currentProductFilter || null
         };
         
-        // Log request size for debugging
-        const requestBodyStr = JSON.stringify(requestBody);
-        const requestSizeKB = (new Blob([requestBodyStr]).size / 1024).toFixed(2);
-        console.log(`[improvements] Request size: ${requestSizeKB} KB, Posts: ${requestBody.posts.length}`);
-        
-        // Call LLM analysis endpoint with posts and filters
-        // Add timeout to prevent hanging requests
-        const controller = new AbortController();
-        const timeoutId = setTimeout(() => controller.abort(), 120000); // 2 minutes timeout
-        
-        let analysisResponse;
-        try {
-            analysisResponse = await fetch('/api/improvements-analysis', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: requestBodyStr,
-                signal: controller.signal
-            });
-            clearTimeout(timeoutId);
-        } catch (fetchError) {
-            clearTimeout(timeoutId);
-            if (fetchError.name === 'AbortError') {
-                throw new Error('Request timeout: The analysis is taking too long. Please try again.');
+        // Precomputed analysis of the period (no product filter / analysis focus): no LLM wait
+        let analysis = null;
+        if (!currentProductFilter && !analysisFocus) {
+            const snapshotResponse = await fetch(`/api/improvements-analysis/snapshot?preset=${currentPeriodDays}`).catch(() => null);
+            if (snapshotResponse && snapshotResponse.ok) {
+                analysis = await snapshotResponse.json();
+                console.log('[improvements] Using precomputed analysis computed at', analysis.computed_at);
             }
-            throw new Error(`Network error: ${fetchError.message}. Please check if the server is running.`);
         }
         
-        if (!analysisResponse.ok) {
-            const errorText = await analysisResponse.text();
-            let errorMessage = `Failed to generate analysis (${analysisResponse.status})`;
+        if (!analysis) {
+            // Log request size for debugging
+            const requestBodyStr = JSON.stringify(requestBody);
+            const requestSizeKB = (new Blob([requestBodyStr]).size / 1024).toFixed(2);
+            console.log(`[improvements] Request size: ${requestSizeKB} KB, Posts: ${requestBody.posts.length}`);
+        
+            // Call LLM analysis endpoint with posts and filters
+            // Add timeout to prevent hanging requests
+            const controller = new AbortController();
+            const timeoutId = setTimeout(() => controller.abort(), 120000); // 2 minutes timeout
+        
+            let analysisResponse;
             try {
-                const errorJson = JSON.parse(errorText);
-                errorMessage = errorJson.detail || errorMessage;
-            } catch (e) {
-                // Si ce n'est pas du JSON, utiliser le texte brut
-                errorMessage = errorText || analysisResponse.statusText || errorMessage;
+                analysisResponse = await fetch('/api/improvements-analysis', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: requestBodyStr,
+                    signal: controller.signal
+                });
+                clearTimeout(timeoutId);
+            } catch (fetchError) {
+                clearTimeout(timeoutId);
+                if (fetchError.name === 'AbortError') {
+                    throw new Error('Request timeout: The analysis is taking too long. Please try again.');
+                }
+                throw new Error(`Network error: ${fetchError.message}. Please check if the server is running.`);
+            }
+        
+            if (!analysisResponse.ok) {
+                const errorText = await analysisResponse.text();
+                let errorMessage = `Failed to generate analysis (${analysisResponse.status})`;
+                try {
+                    const errorJson = JSON.parse(errorText);
+                    errorMessage = errorJson.detail || errorMessage;
+                } catch (e) {
+                    // Si ce n'est pas du JSON, utiliser le texte brut
+                    errorMessage = errorText || analysisResponse.statusText || errorMessage;
+                }
+                throw new Error(errorMessage);
             }
-            throw new Error(errorMessage);
-        }
         
-        const analysis = await analysisResponse.json();
+            analysis = await analysisResponse.json();
+        }
         console.log('[improvements] Analysis received, insights:', analysis.insights?.length || 0, 'llm_available:', analysis.llm_available);
         
         // Vérifier si l'analyse vient du LLM ou du fallback